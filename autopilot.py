@@ -0,0 +1,265 @@
+# autopilot.py
+
+import numpy as np
+import rng
+from simulation import MAX_SHIP_VELOCITY, SHIP_DRAG
+from config import (WORLD_RADIUS, WORLD_CENTER_X, WORLD_CENTER_Y, AUTOPILOT_SHIP_RADIUS_APPROX,
+                    ROTATION_SPEED, THRUST_MAGNITUDE,
+                    AUTOPILOT_DANGER_PROXIMITY_OBSTACLE, AUTOPILOT_DANGER_PROXIMITY_BOUNDARY,
+                    AUTOPILOT_GARBAGE_SEEK_RADIUS, AUTOPILOT_ARRIVE_SLOWDOWN_RADIUS,
+                    AUTOPILOT_WANDER_CHANGE_DIR_INTERVAL, AUTOPILOT_WANDER_CONE_ANGLE,
+                    AUTOPILOT_LOOKAHEAD_TICKS, AUTOPILOT_LOOKAHEAD_STEP, AUTOPILOT_PREDICT_CLEARANCE,
+                    AUTOPILOT_STATIC_LOOKAHEAD_TICKS, AUTOPILOT_EVASION_HEADINGS, AUTOPILOT_EVASION_THRUST_CONE)
+
+# Batched version of main.get_autopilot_decision for many AI ships: the same flee / seek / wander
+# priorities, computed for every ship at once with numpy. Headings follow the ship convention
+# (degrees, 0 East, 90 up, world Y pointing down).
+
+RESERVATION_ROUNDS = 8     # Matching rounds per decision; ships still unmatched after these wander.
+CELL_KEY_STRIDE = 1 << 21  # Packs (cell x, cell y) into one int64 key; cells are offset to stay positive.
+
+def cell_keys(x, y, cell_size, offset_x=0, offset_y=0):
+    """Grid cells (cell_size wide, shifted by the offsets) of the positions x, y, packed into int64 keys."""
+    cx = np.floor(x / cell_size).astype(np.int64) + offset_x + CELL_KEY_STRIDE // 2
+    cy = np.floor(y / cell_size).astype(np.int64) + offset_y + CELL_KEY_STRIDE // 2
+    return cx * CELL_KEY_STRIDE + cy
+
+def headings_to(from_x, from_y, to_x, to_y):
+    """Vectorized simulation.angle_to_target."""
+    return np.degrees(np.arctan2(-(to_y - from_y), to_x - from_x)) % 360
+
+class ObstacleIndex:
+    """The suns and planets as flat arrays, refreshed once per tick and shared by every ship's decision."""
+    def __init__(self):
+        self.x = self.y = self.radius = np.zeros(0)
+
+    def update(self, suns, planets_list):
+        bodies = list(suns) + list(planets_list)
+        self.x = np.array([b['world_pos'][0] for b in bodies], dtype=float)
+        self.y = np.array([b['world_pos'][1] for b in bodies], dtype=float)
+        self.radius = np.array([b['radius'] for b in bodies], dtype=float)
+
+class OrbitEphemeris:
+    """
+    Where the suns (the first rows) and each planet will be at each sampled tick of the look-ahead, as (body,
+    sample) arrays. Planet positions come in closed form from the orbit (angle + orbit_speed * dt * ticks, about
+    its 'orbit_center'), so update() rebuilds the whole table from the current angles once per tick and every
+    path tested that tick shares it. Planets are watched over the whole look-ahead since they can catch the ship
+    from behind; the suns and the world edge stay put and only matter within the shorter static look-ahead
+    (about the time needed to turn).
+    """
+    def __init__(self, horizon=AUTOPILOT_LOOKAHEAD_TICKS, step=AUTOPILOT_LOOKAHEAD_STEP,
+                 static_horizon=AUTOPILOT_STATIC_LOOKAHEAD_TICKS):
+        self.horizon = horizon
+        self.ticks = np.arange(step, horizon + 1, step) # Sampled ticks ahead of now
+        self.static_samples = self.ticks <= static_horizon # Samples at which the suns and the edge are checked
+        self.x = self.y = np.zeros((0, len(self.ticks)))
+        self.radius = np.zeros(0)
+        self.watched = np.zeros((0, len(self.ticks)), dtype=bool) # (body, sample) pairs that count as collisions
+        self._sun_count = 0
+
+    def update(self, suns, planets_list, dt):
+        """suns and planets_list: the bodies near the ship (CelestialIndex.bodies_near)."""
+        ahead = self.ticks * dt # Seconds ahead of each sample
+        angles = np.array([p['current_orbit_angle'] for p in planets_list], dtype=float)[:, None] + \
+                 np.array([p['orbit_speed'] for p in planets_list], dtype=float)[:, None] * ahead
+        orbit_radius = np.array([p['orbit_radius'] for p in planets_list], dtype=float)[:, None]
+        center_x = np.array([p['orbit_center'][0] for p in planets_list], dtype=float)[:, None]
+        center_y = np.array([p['orbit_center'][1] for p in planets_list], dtype=float)[:, None]
+        sun_x = np.array([sun['world_pos'][0] for sun in suns], dtype=float)[:, None]
+        sun_y = np.array([sun['world_pos'][1] for sun in suns], dtype=float)[:, None]
+        self.x = np.vstack((np.repeat(sun_x, len(ahead), axis=1), center_x + orbit_radius * np.cos(angles)))
+        self.y = np.vstack((np.repeat(sun_y, len(ahead), axis=1), center_y + orbit_radius * np.sin(angles)))
+        self.radius = np.array([sun['radius'] for sun in suns] + [p['radius'] for p in planets_list], dtype=float)
+        if len(self.watched) != len(self.radius) or self._sun_count != len(suns):
+            self.watched = np.ones((len(self.radius), len(self.ticks)), dtype=bool)
+            self.watched[:len(suns)] = self.static_samples
+            self._sun_count = len(suns)
+
+def projected_paths(ship, headings, thrust_cones, ephemeris):
+    """
+    Ship positions at the ephemeris' sampled ticks if it steers towards each heading (degrees) from now on,
+    turning at ROTATION_SPEED and thrusting along its current heading while the turn still left is within that
+    path's thrust cone (360 thrusts all along, as steer_towards_heading does; a negative cone coasts).
+    Follows SpaceShip.update (thrust, then drag, per-axis cap) in closed form. Returns (paths, samples) x and y.
+    """
+    k = np.arange(1, ephemeris.horizon + 1)
+    decay = SHIP_DRAG ** k
+    turn = ((np.asarray(headings, dtype=float) - ship.current_angle + 180) % 360 - 180)[:, None]
+    turned = np.clip(turn, -ROTATION_SPEED * k, ROTATION_SPEED * k)
+    radians = np.radians(ship.current_angle + turned)
+    # v_k = drag * (v_k-1 + a_k), so v_k = drag^k * (v_0 + sum over j <= k of a_j * drag^(1 - j)).
+    thrust = np.where(np.abs(turn - turned) <= np.asarray(thrust_cones, dtype=float)[:, None], THRUST_MAGNITUDE, 0.0) * SHIP_DRAG / decay
+    cap = MAX_SHIP_VELOCITY * SHIP_DRAG
+    path_vx = np.clip(decay * (ship.vx_0 + np.cumsum(thrust * np.cos(radians), axis=1)), -cap, cap)
+    path_vy = np.clip(decay * (ship.vy_0 + np.cumsum(thrust * np.sin(radians), axis=1)), -cap, cap)
+    sample = ephemeris.ticks - 1
+    return ship.x + np.cumsum(path_vx, axis=1)[:, sample], ship.y - np.cumsum(path_vy, axis=1)[:, sample]
+
+def time_to_collision(path_x, path_y, ephemeris, clearance=AUTOPILOT_PREDICT_CLEARANCE):
+    """
+    Per projected path, the first watched sample at which the ship comes within clearance of a body's surface
+    (at that body's position then) or touches the world edge; inf for paths that stay clear.
+    """
+    reach = (ephemeris.radius + AUTOPILOT_SHIP_RADIUS_APPROX + clearance)[None, :, None]
+    dx = path_x[:, None, :] - ephemeris.x[None]
+    dy = path_y[:, None, :] - ephemeris.y[None]
+    hit = ((dx * dx + dy * dy < reach * reach) & ephemeris.watched[None]).any(axis=1)
+    hit |= ((path_x - WORLD_CENTER_X) ** 2 + (path_y - WORLD_CENTER_Y) ** 2 >
+            (WORLD_RADIUS - AUTOPILOT_SHIP_RADIUS_APPROX) ** 2) & ephemeris.static_samples
+    return np.where(hit.any(axis=1), ephemeris.ticks[hit.argmax(axis=1)], np.inf)
+
+def evade_predicted_collision(ship, desired_heading, should_thrust, ephemeris):
+    """
+    Checks the planned heading and thrust against the ephemeris. If the projected path collides within the
+    look-ahead, returns an evasion (heading, thrust): the plan without thrust if coasting stays clear, else the
+    heading that stays clear longest (the one closest to the plan among those that stay clear all the way),
+    thrusting once the ship points within AUTOPILOT_EVASION_THRUST_CONE of it. Returns None when the plan is clear.
+    """
+    plan = time_to_collision(*projected_paths(ship, [desired_heading], [360.0 if should_thrust else -1.0], ephemeris), ephemeris)
+    if plan[0] == np.inf: return None # The usual case: one path tested
+    evasions = (ship.current_angle + np.arange(AUTOPILOT_EVASION_HEADINGS) * 360.0 / AUTOPILOT_EVASION_HEADINGS) % 360
+    headings = np.concatenate(([desired_heading], evasions))
+    cones = np.full(len(headings), float(AUTOPILOT_EVASION_THRUST_CONE))
+    cones[0] = -1.0 # The plan, coasting
+    ttc = time_to_collision(*projected_paths(ship, headings, cones, ephemeris), ephemeris)
+    if should_thrust and ttc[0] == np.inf: return desired_heading, False
+    away_from_plan = np.abs((evasions - desired_heading + 180) % 360 - 180)
+    best = np.lexsort((away_from_plan, -ttc[1:]))[0] # Latest collision first, then the smallest turn from the plan
+    turn_left = abs((evasions[best] - ship.current_angle + 180) % 360 - 180) - ROTATION_SPEED
+    return float(evasions[best]), bool(turn_left <= AUTOPILOT_EVASION_THRUST_CONE)
+
+class GarbageIndex:
+    """
+    Garbage positions bucketed into square cells one seek radius wide (sorted by cell key), so all
+    garbage a ship could chase lies in the 3x3 cells around it.
+    """
+    def __init__(self, cell_size=AUTOPILOT_GARBAGE_SEEK_RADIUS):
+        self.cell_size = cell_size
+        self.items = []
+        self.x = self.y = np.zeros(0)
+        self._sorted_keys = np.zeros(0, dtype=np.int64)
+        self._order = np.zeros(0, dtype=np.int64)
+
+    def rebuild(self, garbage_items):
+        self.items = list(garbage_items)
+        count = len(self.items)
+        self.x = np.fromiter((G_item.world_x for G_item in self.items), dtype=float, count=count)
+        self.y = np.fromiter((G_item.world_y for G_item in self.items), dtype=float, count=count)
+        keys = cell_keys(self.x, self.y, self.cell_size)
+        self._order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._order]
+
+    def candidates(self, x, y):
+        """(ship index, garbage index) pairs for every garbage in the 3x3 cells around each position."""
+        ship_parts, garbage_parts = [], []
+        for offset_x in (-1, 0, 1):
+            for offset_y in (-1, 0, 1):
+                keys = cell_keys(x, y, self.cell_size, offset_x, offset_y)
+                lo = np.searchsorted(self._sorted_keys, keys, 'left')
+                counts = np.searchsorted(self._sorted_keys, keys, 'right') - lo
+                total = int(counts.sum())
+                if total == 0: continue
+                # Expand each ship's [lo, lo + count) range into one entry per garbage.
+                starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+                ship_parts.append(np.repeat(np.arange(len(x)), counts))
+                garbage_parts.append(self._order[starts + np.arange(total)])
+        if not ship_parts: return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(ship_parts), np.concatenate(garbage_parts)
+
+def reserve_targets(ship_idx, garbage_idx, dist_sq, ship_count):
+    """
+    Gives each ship at most one garbage item and each item at most one ship. Every round each
+    unmatched ship claims its nearest free item and each claimed item goes to its closest claimant.
+    Returns per-ship target indices (-1 for none) and the squared distances to them.
+    """
+    target = np.full(ship_count, -1, dtype=np.int64)
+    target_dist_sq = np.full(ship_count, np.inf)
+    order = np.argsort(dist_sq, kind='stable')
+    ship_idx, garbage_idx, dist_sq = ship_idx[order], garbage_idx[order], dist_sq[order]
+    for _ in range(RESERVATION_ROUNDS):
+        if ship_idx.size == 0: break
+        _, claims = np.unique(ship_idx, return_index=True) # Each ship's nearest remaining pair
+        claims.sort()                                      # Back into distance order...
+        _, winners = np.unique(garbage_idx[claims], return_index=True) # ...so the first claim per item is the closest
+        winners = claims[winners]
+        target[ship_idx[winners]] = garbage_idx[winners]
+        target_dist_sq[ship_idx[winners]] = dist_sq[winners]
+        keep = (target[ship_idx] < 0) & ~np.isin(garbage_idx, garbage_idx[winners])
+        ship_idx, garbage_idx, dist_sq = ship_idx[keep], garbage_idx[keep], dist_sq[keep]
+    return target, target_dist_sq
+
+class FleetAutopilot:
+    """
+    Autopilot for `count` ships whose per-ship wander state lives in arrays. decide() returns every
+    ship's desired heading and thrust for one tick; feed them to simulation.steer_towards_heading.
+    Thrust rolls come from a generator seeded from the sim stream, so a seeded world stays reproducible.
+    """
+    def __init__(self, count, seed=None):
+        self.count = count
+        self.wander_timer = np.zeros(count)
+        self.wander_heading = np.zeros(count)
+        self.wander_pending = np.ones(count, dtype=bool) # Pick a fresh wander heading on the next wander tick
+        self.target = np.full(count, -1, dtype=np.int64) # Reserved garbage (index into the GarbageIndex) or -1
+        self._random = np.random.default_rng(seed if seed is not None else rng.sim.getrandbits(64))
+
+    def reset_ship(self, i):
+        """Clears one ship's state (e.g. after it respawns)."""
+        self.wander_timer[i] = 0.0
+        self.wander_pending[i] = True
+        self.target[i] = -1
+
+    def decide(self, x, y, heading, obstacles, garbage, dt, active=None):
+        """
+        x, y, heading: arrays with one entry per ship. obstacles: ObstacleIndex. garbage: GarbageIndex.
+        active: optional bool array; inactive (e.g. destroyed) ships keep their heading and do not thrust.
+        Returns (desired_heading, thrust) arrays.
+        """
+        n = self.count
+        active = np.ones(n, dtype=bool) if active is None else active
+        desired = heading.astype(float).copy()
+        thrust = np.zeros(n, dtype=bool)
+        rolls = self._random.random(n)
+
+        # Priority 1: flee the closest sun/planet in danger range, or the world edge if that is closer.
+        if len(obstacles.x): # None when every ship is in deep space, far from all star systems
+            surface = np.hypot(x[:, None] - obstacles.x, y[:, None] - obstacles.y) - obstacles.radius - AUTOPILOT_SHIP_RADIUS_APPROX
+            closest = np.argmin(surface, axis=1)
+            closest_surface = surface[np.arange(n), closest]
+        else:
+            closest = np.zeros(n, dtype=np.int64); closest_surface = np.full(n, np.inf)
+        flee_body = active & (closest_surface < AUTOPILOT_DANGER_PROXIMITY_OBSTACLE)
+        to_boundary = WORLD_RADIUS - (np.hypot(x - WORLD_CENTER_X, y - WORLD_CENTER_Y) + AUTOPILOT_SHIP_RADIUS_APPROX)
+        flee_boundary = active & (to_boundary < AUTOPILOT_DANGER_PROXIMITY_BOUNDARY) & \
+                        (~flee_body | (to_boundary < closest_surface))
+        if flee_body.any(): desired = np.where(flee_body, headings_to(obstacles.x[closest], obstacles.y[closest], x, y), desired)
+        desired = np.where(flee_boundary, headings_to(x, y, WORLD_CENTER_X, WORLD_CENTER_Y), desired)
+        flee = flee_body | flee_boundary
+        thrust |= flee
+
+        # Priority 2: chase the reserved garbage item.
+        seeking = active & ~flee
+        ship_idx, garbage_idx = garbage.candidates(x, y)
+        pair_ok = seeking[ship_idx]
+        ship_idx, garbage_idx = ship_idx[pair_ok], garbage_idx[pair_ok]
+        dist_sq = (garbage.x[garbage_idx] - x[ship_idx]) ** 2 + (garbage.y[garbage_idx] - y[ship_idx]) ** 2
+        in_range = dist_sq < AUTOPILOT_GARBAGE_SEEK_RADIUS ** 2
+        self.target, target_dist_sq = reserve_targets(ship_idx[in_range], garbage_idx[in_range], dist_sq[in_range], n)
+        seek = self.target >= 0
+        chase = np.maximum(self.target, 0)
+        desired = np.where(seek, headings_to(x, y, garbage.x[chase], garbage.y[chase]), desired)
+        far = target_dist_sq > AUTOPILOT_ARRIVE_SLOWDOWN_RADIUS ** 2
+        thrust |= seek & (rolls < np.where(far, 0.4, 0.2)) # Pulse thrust, less often when arriving
+
+        # Priority 3: wander, re-rolling the heading within a cone every few seconds.
+        self.wander_pending |= flee | seek
+        wander = seeking & ~seek
+        self.wander_timer[wander] += dt
+        change = wander & (self.wander_pending | (self.wander_timer >= AUTOPILOT_WANDER_CHANGE_DIR_INTERVAL))
+        offsets = self._random.uniform(-AUTOPILOT_WANDER_CONE_ANGLE / 2, AUTOPILOT_WANDER_CONE_ANGLE / 2, n)
+        self.wander_heading = np.where(change, (heading + offsets + 360) % 360, self.wander_heading)
+        self.wander_timer[change] = 0.0
+        self.wander_pending[change] = False
+        desired = np.where(wander, self.wander_heading, desired)
+        thrust |= wander & (rolls < 0.7)
+        return desired, thrust
@@ -0,0 +1,455 @@
+# benchmark.py
+
+import os
+import sys
+import copy
+import json
+import math
+import random
+import time
+import platform
+import argparse
+import statistics
+import tempfile
+import contextlib
+
+# Benchmarks always run headless so results do not depend on a window manager or vsync.
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+import pygame
+import numpy as np
+import rng
+import config
+from config import (WORLD_RADIUS, WORLD_CENTER_X, WORLD_CENTER_Y, SUN_RADIUS, CELL_SIZE, GARBAGE_SIZE_RANGE, SHIP_MAGNET_RANGE,
+                    SYSTEM_RADIUS)
+import galaxy
+from galaxy import Background
+from garbage import Garbage
+from spaceship import SpaceShip
+from resolution import RenderResolution
+from quality import GOVERNOR
+from autopilot import FleetAutopilot, ObstacleIndex, GarbageIndex, OrbitEphemeris, evade_predicted_collision
+from clumping import GarbageCollisions
+from gravity import GravityField
+from worldframe import WorldFrame
+from poisson import poisson_disk_annulus
+from celestial import CelestialIndex
+from simulation import check_ship_crash
+from pilotenv import VectorPilotEnv, ACTION_COUNT
+import main as game
+
+BENCH_SEED = 1234                 # World and stream seed used by every case.
+DEFAULT_REGRESSION_THRESHOLD = 0.10 # A median more than 10% slower than the baseline is a regression.
+DT = 1 / 60.0
+
+_cache = {}
+
+def shared_background():
+    """One seeded Background reused by the cases that only read or lightly mutate it."""
+    if 'background' not in _cache:
+        _cache['background'] = Background(seed=BENCH_SEED)
+    return _cache['background']
+
+def private_background(systems=1):
+    """
+    A copy of the shared world whose planets move independently of it, so orbit updates do not leak into
+    other cases. With systems > 1, copies of its star system are added on a square lattice around it.
+    """
+    bg = copy.copy(shared_background())
+    home = copy.deepcopy(bg.systems[0])
+    home_planets = [p for p in bg.solar_system_planets if p['system'] == 0]
+    spacing = 3 * SYSTEM_RADIUS
+    side = int(math.ceil(math.sqrt(systems))) | 1
+    cells = sorted(((i - side // 2, j - side // 2) for i in range(side) for j in range(side)), key=lambda c: math.hypot(*c))
+    bg.systems, bg.solar_system_planets = [], []
+    for k, (i, j) in enumerate(cells[:systems]):
+        center = (WORLD_CENTER_X + i * spacing, WORLD_CENTER_Y + j * spacing)
+        sun = copy.deepcopy(home['sun']); sun['world_pos'] = list(center)
+        bg.systems.append({'center': center, 'radius': SYSTEM_RADIUS, 'sun': sun, 'planets': []})
+        for p in home_planets:
+            p = copy.deepcopy(p); p['system'] = k; p['current_orbit_angle'] += k # Spread the systems' phases
+            bg.solar_system_planets.append(p)
+    bg.sun_data, bg.suns = bg.systems[0]['sun'], [system['sun'] for system in bg.systems]
+    bg.celestial = CelestialIndex(bg.systems, bg.solar_system_planets)
+    bg.celestial.sync_all()
+    return bg
+
+def find_camera_positions(bg):
+    """Picks cameras centred on the sun, on its edge, on the densest galactic-band cell and on a sparse outer-space cell."""
+    densest, sparsest = None, None
+    static = bg.static
+    for gy in range(static.grid_rows):
+        for gx in range(static.grid_cols):
+            cx = static.world_min_x + (gx + 0.5) * CELL_SIZE
+            cy = static.world_min_y + (gy + 0.5) * CELL_SIZE
+            r = math.hypot(cx - WORLD_CENTER_X, cy - WORLD_CENTER_Y)
+            if r > WORLD_RADIUS * 0.9 or r < SUN_RADIUS + config.SCREEN_WIDTH: continue
+            count = len(static.grid.get((gx, gy), ()))
+            if densest is None or count > densest[0]: densest = (count, cx, cy)
+            if r > WORLD_RADIUS * 0.5 and (sparsest is None or count < sparsest[0]): sparsest = (count, cx, cy)
+    to_camera = lambda x, y: (x - config.SCREEN_WIDTH // 2, y - config.SCREEN_HEIGHT // 2)
+    return {'sun': to_camera(WORLD_CENTER_X, WORLD_CENTER_Y),
+            'sun_limb': to_camera(WORLD_CENTER_X + SUN_RADIUS * 0.75, WORLD_CENTER_Y + SUN_RADIUS * 0.66),
+            'band': to_camera(densest[1], densest[2]),
+            'sparse': to_camera(sparsest[1], sparsest[2])}
+
+def scatter_garbage(count, seed=BENCH_SEED):
+    """Places `count` garbage items uniformly over the home system's playable annulus."""
+    placer = random.Random(seed)
+    items = []
+    for _ in range(count):
+        angle = placer.uniform(0, 2 * math.pi)
+        r = math.sqrt(placer.uniform((SUN_RADIUS + 200) ** 2, (SYSTEM_RADIUS - GARBAGE_SIZE_RANGE[1]) ** 2))
+        items.append(Garbage(WORLD_CENTER_X + r * math.cos(angle), WORLD_CENTER_Y + r * math.sin(angle), rng=placer))
+    return items
+
+# --- Cases ---
+# Each case is (name, repeats, setup) where setup() returns the callable to time.
+# Setups run untimed; anything needing a fresh state per sample does it inside its own closure.
+
+def case_background_construction():
+    def run():
+        galaxy._static_galaxies.clear() # Generate the static layers too, as for a world nothing else shows
+        Background(seed=BENCH_SEED)
+    return run
+
+def case_background_construction_shared():
+    shared_background() # Keeps the world's StaticGalaxy alive, as the menu's Background does for the first game
+    return lambda: Background(seed=BENCH_SEED)
+
+def make_poisson_placement_case(count):
+    def setup():
+        # Poisson-disk positions for `count` items over the general garbage annulus of the shared world.
+        # Spacing floor of the smallest garbage size: 100,000 items at the largest size do not fit in the world.
+        bg = shared_background()
+        exclusions = bg._celestial_exclusions(bg.systems[0]) # The home system, as in a single-system world
+        bound = (WORLD_CENTER_X, WORLD_CENTER_Y, WORLD_RADIUS - bg.max_garbage_radius)
+        r_min = SUN_RADIUS + 200 + bg.max_garbage_radius
+        return lambda: poisson_disk_annulus(random.Random(BENCH_SEED), count, WORLD_CENTER_X, WORLD_CENTER_Y, r_min,
+                                            WORLD_RADIUS, exclusions, bound, min_spacing=GARBAGE_SIZE_RANGE[0])
+    return setup
+
+def make_draw_case(where, scale=1.0, zoom=1.0):
+    def setup():
+        bg = shared_background()
+        cam_x, cam_y = find_camera_positions(bg)[where]
+        # Zoom keeps the same world point at the centre of the view, as main.view_camera does.
+        cam_x += config.SCREEN_WIDTH // 2 * (1 - 1 / zoom); cam_y += config.SCREEN_HEIGHT // 2 * (1 - 1 / zoom)
+        surface = pygame.Surface((int(config.SCREEN_WIDTH * scale), int(config.SCREEN_HEIGHT * scale)))
+        return lambda: bg.draw(surface, cam_x, cam_y, scale * zoom)
+    return setup
+
+def make_star_layer_case(width, height, zoom=1.0):
+    def setup():
+        # Only the star layer of Background.draw, on a width x height frame centred on the galactic band.
+        bg = shared_background()
+        cam_x, cam_y = find_camera_positions(bg)['band']
+        cam_x += config.SCREEN_WIDTH // 2 - width / zoom / 2; cam_y += config.SCREEN_HEIGHT // 2 - height / zoom / 2
+        surface = pygame.Surface((width, height))
+        return lambda: bg._draw_static_items(surface, cam_x, cam_y, zoom, 'full', 1.0, layers=('star',))
+    return setup
+
+def make_zoom_tile_build_case(zoom):
+    def setup():
+        # Cost of the first frame at a new zoom level, when every visible static-layer tile is built.
+        bg = shared_background()
+        draw = make_draw_case('band', zoom=zoom)()
+        def run():
+            bg._static_tiles.clear(); draw()
+        return run
+    return setup
+
+def case_render_upscale():
+    resolution = RenderResolution(pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT)), fixed_scale=0.5)
+    resolution.begin_frame()
+    return resolution.present
+
+def make_explosion_case(tier='high'):
+    def setup():
+        surface = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        def run():
+            GOVERNOR.set_fixed_tier(tier)
+            ship = SpaceShip(0.0, 0.0)
+            ship.explode(); ship.update(); ship.draw(surface, -config.SCREEN_WIDTH // 2, -config.SCREEN_HEIGHT // 2)
+            GOVERNOR.set_fixed_tier('high')
+        return quietly(run) # Tier changes are logged
+    return setup
+
+def make_garbage_tick_case(count):
+    def setup():
+        bg = private_background()
+        bg.all_garbage_items = scatter_garbage(count)
+        ship_x, ship_y = bg.all_garbage_items[0].world_x + 300, bg.all_garbage_items[0].world_y # Some garbage in magnet range
+        def run():
+            bg.update(DT)
+            for G_item in bg.all_garbage_items: G_item.update(ship_x, ship_y, DT)
+        return run
+    return setup
+
+def make_world_frame_tick_case(count):
+    def setup():
+        # The same tick through WorldFrame: body pushes, drift and magnet pull vectorized over every item.
+        bg = private_background()
+        bg.all_garbage_items = scatter_garbage(count)
+        ship = SpaceShip(bg.all_garbage_items[0].world_x + 300, bg.all_garbage_items[0].world_y)
+        frame = WorldFrame()
+        frame.refresh(ship, [bg.sun_data], bg.solar_system_planets, bg.all_garbage_items)
+        def run():
+            bg.update(DT, frame)
+            frame.update_bodies(ship, [bg.sun_data], bg.solar_system_planets)
+            frame.move_garbage(bg.all_garbage_items, DT)
+            frame.sync_garbage(bg.all_garbage_items)
+        return run
+    return setup
+
+def make_celestial_tick_case(systems, garbage_count=2000):
+    def setup():
+        # The celestial part of a tick in a galaxy of `systems` star systems, with the same garbage in the home
+        # system each time: body queries, orbits, garbage contacts, frame, ephemeris and crash check.
+        bg = private_background(systems)
+        bg.all_garbage_items = scatter_garbage(garbage_count)
+        planet = bg.solar_system_planets[0]
+        ship = SpaceShip(WORLD_CENTER_X + (planet['orbit_radius'] + 4000) * math.cos(planet['current_orbit_angle']),
+                         WORLD_CENTER_Y + (planet['orbit_radius'] + 4000) * math.sin(planet['current_orbit_angle']))
+        frame, ephemeris = WorldFrame(), OrbitEphemeris()
+        frame.refresh(ship, *bg.celestial.bodies_near(ship.x, ship.y), bg.all_garbage_items)
+        def run():
+            suns, planets = bg.celestial.bodies_near(ship.x, ship.y)
+            ephemeris.update(suns, planets, DT)
+            planet_start_angles = [p['current_orbit_angle'] for p in planets]
+            bg.update(DT, frame)
+            frame.update_bodies(ship, suns, planets)
+            check_ship_crash(ship, suns, planets, (ship.x, ship.y), planet_start_angles, frame)
+        return run
+    return setup
+
+def make_garbage_clump_case(count):
+    def setup():
+        # `count` items packed into magnet range of a resting ship; one sample is one tick of pull and collisions.
+        placer = random.Random(BENCH_SEED)
+        ship_x, ship_y = WORLD_CENTER_X, WORLD_CENTER_Y + WORLD_RADIUS / 2
+        items = []
+        for _ in range(count):
+            angle, r = placer.uniform(0, 2 * math.pi), SHIP_MAGNET_RANGE * math.sqrt(placer.random())
+            items.append(Garbage(ship_x + r * math.cos(angle), ship_y + r * math.sin(angle), rng=placer))
+        collisions = GarbageCollisions()
+        def run():
+            for G_item in items: G_item.update(ship_x, ship_y, DT)
+            collisions.resolve(items)
+        return run
+    return setup
+
+def make_gravity_case(count, debris):
+    def setup():
+        # One tick of gravity on `count` orbiting items: gather positions, accelerations, velocity write-back.
+        bg = shared_background()
+        items = scatter_garbage(count)
+        field = GravityField(debris=debris)
+        field.launch_orbits(items, bg.celestial)
+        return lambda: field.apply(DT, None, items, bg.celestial)
+    return setup
+
+def make_fleet_autopilot_case(count, deep_space=False):
+    def setup():
+        # Ships spread over the playable annulus; one sample is a full tick of decisions, indexes included.
+        # deep_space leaves out every sun and planet, as for a fleet far from all star systems (server bots).
+        bg = shared_background()
+        placer = np.random.default_rng(BENCH_SEED)
+        angle = placer.uniform(0, 2 * math.pi, count)
+        r = np.sqrt(placer.uniform((SUN_RADIUS + 1000) ** 2, (WORLD_RADIUS - 100) ** 2, count))
+        x, y = WORLD_CENTER_X + r * np.cos(angle), WORLD_CENTER_Y + r * np.sin(angle)
+        heading = placer.uniform(0, 360, count)
+        fleet, obstacles, garbage = FleetAutopilot(count, seed=BENCH_SEED), ObstacleIndex(), GarbageIndex()
+        def run():
+            if deep_space: obstacles.update([], [])
+            else: obstacles.update([bg.sun_data], bg.solar_system_planets)
+            garbage.rebuild(bg.all_garbage_items)
+            fleet.decide(x, y, heading, obstacles, garbage, DT)
+        return run
+    return setup
+
+def make_pilot_env_case(count):
+    def setup():
+        # One training-environment step of `count` worlds with random inputs; episodes that end restart inside it.
+        env = VectorPilotEnv(count)
+        env.reset(BENCH_SEED)
+        actions = np.random.default_rng(BENCH_SEED).integers(0, ACTION_COUNT, (64, count))
+        tick = [0]
+        def run():
+            env.step(actions[tick[0] % len(actions)]); tick[0] += 1
+        return run
+    return setup
+
+def case_autopilot_evasion():
+    # A ship flying fast straight at the innermost planet, so every check has to pick an evasion.
+    bg = shared_background()
+    planet = bg.solar_system_planets[0]
+    angle = planet['current_orbit_angle']
+    r = planet['orbit_radius'] - planet['radius'] - 600
+    ship = SpaceShip(WORLD_CENTER_X + r * math.cos(angle), WORLD_CENTER_Y + r * math.sin(angle))
+    ship.current_angle = math.degrees(math.atan2(-math.sin(angle), math.cos(angle))) % 360
+    ship.vx_0, ship.vy_0 = 7.0 * math.cos(angle), -7.0 * math.sin(angle)
+    ephemeris = OrbitEphemeris()
+    def run():
+        ephemeris.update([bg.sun_data], bg.solar_system_planets, DT)
+        evade_predicted_collision(ship, ship.current_angle, True, ephemeris)
+    return run
+
+def case_draw_minimap():
+    bg = shared_background()
+    ship = SpaceShip(WORLD_CENTER_X + WORLD_RADIUS * 0.5, WORLD_CENTER_Y)
+    surface = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    items = bg.all_garbage_items
+    view = {'ship': ship, 'background': bg, 'planets': bg.celestial.planet_positions(),
+            'garbage': (np.array([g.world_x for g in items]), np.array([g.world_y for g in items]), np.array([g.size for g in items]))}
+    return lambda: game.draw_minimap(surface, view)
+
+def quietly(fn):
+    """Wraps a game function so its progress prints do not flood the benchmark output."""
+    def run():
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull): fn()
+    return run
+
+def _prepare_game_for_save():
+    game.SAVE_FILE = os.path.join(tempfile.gettempdir(), f"greenspace_bench_{os.getpid()}.json")
+    rng.seed_all(BENCH_SEED)
+    game.restore_game_state({"world_seed": BENCH_SEED,
+        "spaceship": {"x": WORLD_RADIUS * 0.5, "y": 0.0, "vx_0": 0.0, "vy_0": 0.0, "current_angle": 90.0},
+        "game_progress": {"score": 0, "game_time": 0.0, "ship_crash_count": 0, "autopilot_on": False},
+        "solar_system_planets_state": [], "remaining_garbage": []}, shared_background())
+    game.all_garbage_objects = game.main_game_background.all_garbage_items = list(shared_background().all_garbage_items)
+
+def case_save_game():
+    _prepare_game_for_save()
+    return quietly(game.save_game)
+
+def case_load_game():
+    _prepare_game_for_save()
+    quietly(game.save_game)()
+    return quietly(game.load_game)
+
+CASES = [
+    ('background_construction', 5, case_background_construction),
+    ('background_construction_shared', 5, case_background_construction_shared),
+    ('poisson_placement_1000', 100, make_poisson_placement_case(1000)),
+    ('poisson_placement_10000', 30, make_poisson_placement_case(10000)),
+    ('poisson_placement_100000', 5, make_poisson_placement_case(100000)),
+    ('background_draw_sun', 100, make_draw_case('sun')),
+    ('background_draw_sun_limb', 100, make_draw_case('sun_limb')),
+    ('background_draw_band', 100, make_draw_case('band')),
+    ('background_draw_sparse', 100, make_draw_case('sparse')),
+    ('background_draw_band_half_res', 100, make_draw_case('band', scale=0.5)),
+    ('background_draw_band_zoom_1_4', 100, make_draw_case('band', zoom=0.25)),
+    ('background_draw_band_zoom_1_32', 100, make_draw_case('band', zoom=1 / 32)),
+    ('background_draw_sun_zoom_1_32', 100, make_draw_case('sun', zoom=1 / 32)),
+    ('star_layer_1080p', 100, make_star_layer_case(1920, 1080)),
+    ('star_layer_4k', 100, make_star_layer_case(3840, 2160)),
+    ('star_layer_4k_zoom_1_2', 100, make_star_layer_case(3840, 2160, zoom=0.5)),
+    ('zoom_tile_build_1_4', 10, make_zoom_tile_build_case(0.25)),
+    ('zoom_tile_build_1_32', 10, make_zoom_tile_build_case(1 / 32)),
+    ('render_upscale_half_res', 100, case_render_upscale),
+    ('ship_explosion_frame', 30, make_explosion_case()),
+    ('ship_explosion_frame_low', 30, make_explosion_case('low')),
+    ('garbage_tick_200', 200, make_garbage_tick_case(200)),
+    ('garbage_tick_10000', 30, make_garbage_tick_case(10000)),
+    ('garbage_tick_100000', 5, make_garbage_tick_case(100000)),
+    ('world_frame_tick_200', 200, make_world_frame_tick_case(200)),
+    ('world_frame_tick_10000', 30, make_world_frame_tick_case(10000)),
+    ('world_frame_tick_100000', 5, make_world_frame_tick_case(100000)),
+    ('celestial_tick_1_system', 200, make_celestial_tick_case(1)),
+    ('celestial_tick_100_systems', 200, make_celestial_tick_case(100)),
+    ('celestial_tick_1000_systems', 200, make_celestial_tick_case(1000)),
+    ('garbage_clump_1000', 100, make_garbage_clump_case(1000)),
+    ('gravity_bodies_10000', 30, make_gravity_case(10000, debris=False)),
+    ('gravity_bodies_100000', 5, make_gravity_case(100000, debris=False)),
+    ('gravity_debris_10000', 10, make_gravity_case(10000, debris=True)),
+    ('gravity_debris_100000', 3, make_gravity_case(100000, debris=True)),
+    ('autopilot_fleet_10', 200, make_fleet_autopilot_case(10)),
+    ('autopilot_fleet_100', 200, make_fleet_autopilot_case(100)),
+    ('autopilot_fleet_1000', 100, make_fleet_autopilot_case(1000)),
+    ('autopilot_fleet_100_deep_space', 200, make_fleet_autopilot_case(100, deep_space=True)),
+    ('autopilot_evasion', 200, case_autopilot_evasion),
+    ('pilot_env_step_1', 200, make_pilot_env_case(1)),
+    ('pilot_env_step_1024', 200, make_pilot_env_case(1024)),
+    ('draw_minimap', 200, case_draw_minimap),
+    ('save_game', 20, case_save_game),
+    ('load_game', 5, case_load_game),
+]
+
+# --- Harness ---
+
+def summarize(samples):
+    """Median, spread and tail percentiles (milliseconds) for a list of durations in seconds."""
+    ms = sorted(s * 1000.0 for s in samples)
+    if len(ms) > 1: cuts = statistics.quantiles(ms, n=100, method='inclusive')
+    else: cuts = ms * 99
+    return {'median_ms': statistics.median(ms), 'p90_ms': cuts[89], 'p99_ms': cuts[98],
+            'mean_ms': statistics.fmean(ms), 'min_ms': ms[0], 'max_ms': ms[-1], 'samples': len(ms)}
+
+def run_case(repeats, setup, warmup):
+    rng.seed_all(BENCH_SEED)
+    run = setup()
+    for _ in range(warmup): run()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter(); run(); samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+def compare(results, baseline, threshold):
+    """Prints a comparison table and returns the names of cases slower than the threshold allows."""
+    regressions = []
+    print(f"\n{'case':<28}{'baseline ms':>12}{'current ms':>12}{'change':>9}")
+    for name, current in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            print(f"{name:<28}{'-':>12}{current['median_ms']:>12.3f}{'new':>9}"); continue
+        ratio = current['median_ms'] / base['median_ms'] if base['median_ms'] > 0 else 1.0
+        flag = "  REGRESSION" if ratio > 1.0 + threshold else ""
+        print(f"{name:<28}{base['median_ms']:>12.3f}{current['median_ms']:>12.3f}{(ratio - 1) * 100:>+8.1f}%{flag}")
+        if flag: regressions.append(name)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless, seeded benchmarks for GreenSpace.io hot paths.")
+    parser.add_argument('--filter', default='', help="only run cases whose name contains this text")
+    parser.add_argument('--repeat-scale', type=float, default=1.0, help="multiply every case's repeat count")
+    parser.add_argument('--output', metavar='FILE', help="write results JSON here (default: stdout only)")
+    parser.add_argument('--baseline', metavar='FILE', help="compare medians against this results file")
+    parser.add_argument('--save-baseline', metavar='FILE', help="store these results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="allowed median slowdown vs the baseline as a fraction (default 0.10)")
+    args = parser.parse_args(argv)
+
+    config.init_display()
+    results = {}
+    for name, repeats, setup in CASES:
+        if args.filter not in name: continue
+        repeats = max(1, int(repeats * args.repeat_scale))
+        results[name] = run_case(repeats, setup, warmup=min(5, max(1, repeats // 10)))
+        r = results[name]
+        print(f"{name:<28} median {r['median_ms']:9.3f} ms  p90 {r['p90_ms']:9.3f}  p99 {r['p99_ms']:9.3f}  (n={r['samples']})",
+              file=sys.stderr)
+
+    report = {'meta': {'seed': BENCH_SEED, 'resolution': [config.SCREEN_WIDTH, config.SCREEN_HEIGHT],
+                       'python': platform.python_version(), 'pygame': pygame.version.ver,
+                       'machine': platform.machine(), 'timestamp': time.time()},
+              'results': results}
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f: f.write(encoded)
+    else:
+        print(encoded)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f: f.write(encoded)
+
+    if args.baseline:
+        with open(args.baseline) as f: baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}"); return 1
+        print("\nNo regressions.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
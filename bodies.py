@@ -0,0 +1,131 @@
+# bodies.py
+
+import random
+import numpy as np
+import pygame
+from config import (BODY_TEXTURE_MAX_SIZE, BODY_TEXTURE_MIN_SIZE, BODY_TILE_SIZE, BODY_TILE_CACHE_SIZE,
+                    BODY_EXACT_CACHE_SIZE, BODY_COLORKEY, BODY_NOISE_OCTAVES)
+
+def _fractal_noise(size, seed, octaves=BODY_NOISE_OCTAVES):
+    """
+    size x size value noise in [-1, 1]: random grids doubling in resolution, upsampled by smoothscale.
+    The octaves are summed at no more than 256 px (the finest has 48 cells) and the sum upsampled once.
+    """
+    generator = np.random.default_rng(seed)
+    work = min(size, 256)
+    total = np.zeros((work, work), dtype=np.float32)
+    cells, amplitude, norm = 6, 1.0, 0.0
+    for _ in range(octaves):
+        grid = (generator.random((cells, cells)) * 255).astype(np.uint8)
+        small = pygame.surfarray.make_surface(np.repeat(grid[:, :, None], 3, axis=2))
+        total += amplitude * pygame.surfarray.array_red(pygame.transform.smoothscale(small, (work, work)))
+        norm += amplitude
+        cells *= 2; amplitude *= 0.5
+    summed = pygame.surfarray.make_surface(np.repeat((total / norm).astype(np.uint8)[:, :, None], 3, axis=2))
+    if work != size: summed = pygame.transform.smoothscale(summed, (size, size))
+    return pygame.surfarray.array_red(summed).astype(np.float32) / 127.5 - 1.0
+
+def render_body_texture(size, color, limb_darkening, noise_amount, seed):
+    """
+    A size x size shaded disc: per-channel linear limb darkening (1 - u * (1 - mu)) times surface noise.
+    Outside the disc the limb color continues, so resampling never blends in a background color;
+    cut_disc() masks it off at the final size.
+    """
+    coords = ((np.arange(size) + 0.5) / size * 2.0 - 1.0).astype(np.float32)
+    x, y = np.meshgrid(coords, coords, indexing='ij') # surfarray arrays are indexed [x][y]
+    r_sq = x * x + y * y
+    mu = np.sqrt(np.clip(1.0 - r_sq, 0.0, 1.0)) # Cosine of the angle between the view ray and the surface normal
+    shade = (1.0 + noise_amount * _fractal_noise(size, seed))[:, :, None]
+    rgb = np.array(color, dtype=np.float32) * shade * (1.0 - np.array(limb_darkening, dtype=np.float32) * (1.0 - mu[:, :, None]))
+    rgb = np.clip(rgb, 0, 255)
+    rgb[:, :, 1] = np.maximum(rgb[:, :, 1], 1) # Keeps the body distinct from the colorkey
+    surface = pygame.surfarray.make_surface(rgb.astype(np.uint8))
+    return surface.convert() if pygame.display.get_surface() else surface
+
+def cut_disc(image, center_x, center_y, radius):
+    """Sets everything outside the circle to BODY_COLORKEY and makes that the colorkey (edge drawn at full resolution)."""
+    stencil = pygame.Surface(image.get_size())
+    stencil.fill(BODY_COLORKEY)
+    pygame.draw.circle(stencil, (0, 0, 0), (center_x, center_y), radius)
+    stencil.set_colorkey((0, 0, 0))
+    image.blit(stencil, (0, 0))
+    image.set_colorkey(BODY_COLORKEY, pygame.RLEACCEL) # RLE makes the many blits of the kept image cheap
+    return image
+
+class BodySprite:
+    """
+    Pre-rendered texture of one sun or planet at a few LOD sizes. draw() only touches the part of the
+    body that is on screen, so its cost depends on the covered screen area rather than the body's radius.
+    """
+    def __init__(self, radius, color, limb_darkening, noise_amount, seed):
+        top = min(BODY_TEXTURE_MAX_SIZE, int(radius * 2))
+        base = render_body_texture(top, color, limb_darkening, noise_amount, seed)
+        self.levels = [base] # Largest first, each half the size of the previous one
+        size = top // 2
+        while size >= BODY_TEXTURE_MIN_SIZE:
+            self.levels.append(pygame.transform.smoothscale(self.levels[-1], (size, size)))
+            size //= 2
+        self._exact = {}          # diameter -> whole body resized to it (small diameters only)
+        self._tiles = {}          # (column, row) -> (offset, image) of magnified tiles, or None outside the disc
+        self._tile_diameter = None
+
+    def _level_for(self, diameter):
+        """Smallest LOD texture at least diameter wide (the largest one if none is)."""
+        for level in reversed(self.levels):
+            if level.get_width() >= diameter: return level
+        return self.levels[0]
+
+    def draw(self, surface, center_x, center_y, radius):
+        """Draws the body centred at (center_x, center_y) screen pixels with the given screen radius."""
+        diameter = max(1, int(round(radius * 2)))
+        left, top = int(round(center_x - diameter / 2)), int(round(center_y - diameter / 2))
+        view = pygame.Rect(-left, -top, *surface.get_size()).clip((0, 0, diameter, diameter)) # Visible part, body-local
+        if not view.width or not view.height: return
+
+        if diameter <= BODY_EXACT_CACHE_SIZE:
+            image = self._exact.get(diameter)
+            if image is None:
+                if len(self._exact) >= 8: self._exact.clear() # Zooming produces many sizes; keep only recent ones
+                image = pygame.transform.smoothscale(self._level_for(diameter), (diameter, diameter))
+                self._exact[diameter] = cut_disc(image, diameter / 2, diameter / 2, diameter / 2)
+            surface.blit(image, (left + view.x, top + view.y), view)
+            return
+
+        # Magnified: draw from BODY_TILE_SIZE tiles of the scaled texture, built the first time they are in view.
+        if diameter != self._tile_diameter:
+            self._tiles = {}; self._tile_diameter = diameter
+        t = BODY_TILE_SIZE
+        for row in range(view.top // t, (view.bottom - 1) // t + 1):
+            for column in range(view.left // t, (view.right - 1) // t + 1):
+                key = (column, row)
+                if key not in self._tiles:
+                    if len(self._tiles) >= BODY_TILE_CACHE_SIZE: del self._tiles[next(iter(self._tiles))] # Oldest first
+                    self._tiles[key] = self._build_tile(diameter, pygame.Rect(column * t, row * t, t, t).clip(0, 0, diameter, diameter))
+                tile = self._tiles[key]
+                if tile is None: continue
+                offset, image = tile
+                area = view.clip(column * t, row * t, t, t)
+                surface.blit(image, (left + area.x, top + area.y), area.move(-offset[0], -offset[1]))
+
+    def _build_tile(self, diameter, rect):
+        """The part of the magnified texture covering rect (body-local pixels), cut to the disc; None if outside it."""
+        radius = diameter / 2
+        nearest_x = min(max(radius, rect.left), rect.right); nearest_y = min(max(radius, rect.top), rect.bottom)
+        if (nearest_x - radius) ** 2 + (nearest_y - radius) ** 2 > radius ** 2: return None
+        texture = self.levels[0]
+        size = texture.get_width()
+        magnification = diameter / size
+        # Whole texels, placed where the full magnified texture would put them, so neighbouring tiles line up.
+        tx0, ty0 = int(rect.left / magnification), int(rect.top / magnification)
+        tx1 = min(size, int(rect.right / magnification) + 1); ty1 = min(size, int(rect.bottom / magnification) + 1)
+        x0, y0 = int(round(tx0 * magnification)), int(round(ty0 * magnification))
+        x1, y1 = int(round(tx1 * magnification)), int(round(ty1 * magnification))
+        image = pygame.transform.scale(texture.subsurface((tx0, ty0, tx1 - tx0, ty1 - ty0)), (x1 - x0, y1 - y0))
+        corners = ((rect.left, rect.top), (rect.right, rect.top), (rect.left, rect.bottom), (rect.right, rect.bottom))
+        if any((x - radius) ** 2 + (y - radius) ** 2 > radius ** 2 for x, y in corners): # Crosses the limb
+            cut_disc(image, radius - x0, radius - y0, radius)
+        return (x0, y0), image
+
+def body_seed(world_seed, index):
+    """Stable per-body noise seed derived from the world seed (without touching the shared streams)."""
+    return random.Random(f"{world_seed}:body{index}").getrandbits(64)
@@ -0,0 +1,162 @@
+# celestial.py
+
+import math
+import numpy as np
+from config import SYSTEM_RADIUS, CELESTIAL_QUERY_REACH
+from autopilot import CELL_KEY_STRIDE, cell_keys
+
+class CelestialIndex:
+    """
+    The star systems in a uniform grid of cells two system radii wide, each system listing its sun and planets
+    (systems, then bodies). Queries find the systems around a point and only look at their bodies, so they
+    cost the same in a galaxy of 1,000 systems as in a single one. Systems are dicts:
+    {'center': (x, y), 'radius': r, 'sun': sun dict, 'planets': [planet dicts], 'planet_start': index of
+    its first planet in the background's flat planet list}.
+
+    Planet orbit angles live in arrays that advance() moves forward with one numpy step per tick. A system's
+    planet dicts ('current_orbit_angle', 'world_pos') are brought up to date when a query returns it and
+    again by the advance() that follows, so bodies a caller got this tick stay current after the planets
+    move. Dicts of systems nobody asked about are left behind until they are asked for.
+    """
+    def __init__(self, systems, planets_list):
+        self.systems = systems
+        self.cell_size = 2.0 * SYSTEM_RADIUS
+        self._cells = {} # (cell x, cell y) -> system indices
+        for k, system in enumerate(systems):
+            self._cells.setdefault(self._cell(*system['center']), []).append(k)
+        center_x = np.array([s['center'][0] for s in systems], dtype=float)
+        center_y = np.array([s['center'][1] for s in systems], dtype=float)
+        self.center_x, self.center_y = center_x, center_y
+        keys = cell_keys(center_x, center_y, self.cell_size)
+        self._order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._order]
+        self.rebuild(planets_list)
+
+    def rebuild(self, planets_list):
+        """
+        Re-reads the planets' orbits and angles from their dicts (after generation, or after a load replaced them)
+        and gives each its system's centre as 'orbit_center'.
+        """
+        self.planets = planets_list
+        for system in self.systems: system['planets'] = []
+        for p in planets_list:
+            self.systems[p['system']]['planets'].append(p)
+            p['orbit_center'] = self.systems[p['system']]['center']
+        start = 0
+        for system in self.systems:
+            system['planet_start'] = start; start += len(system['planets'])
+        self.angles = np.array([p['current_orbit_angle'] for p in planets_list], dtype=float)
+        self.speeds = np.array([p['orbit_speed'] for p in planets_list], dtype=float)
+        system = np.array([p['system'] for p in planets_list], dtype=np.int64)
+        self.planet_center_x, self.planet_center_y = self.center_x[system], self.center_y[system]
+        self.planet_orbit = np.array([p['orbit_radius'] for p in planets_list], dtype=float)
+        self.planet_radius = np.array([p['radius'] for p in planets_list], dtype=float)
+        # (system, slot) -> index of the system's slot-th planet, -1 past its last one
+        most = max([len(s['planets']) for s in self.systems] + [0])
+        self.planet_table = np.full((len(self.systems), most), -1, dtype=np.int64)
+        for k, system in enumerate(self.systems):
+            count = len(system['planets'])
+            self.planet_table[k, :count] = np.arange(system['planet_start'], system['planet_start'] + count)
+        self.sun_radius = np.array([s['sun']['radius'] for s in self.systems], dtype=float)
+        self._version = 0 # advance() calls so far...
+        self._synced = [0] * len(self.systems) # ...as of which each system's planet dicts match the arrays
+        self._queried = set() # Systems returned by a query since the last advance()
+
+    def _cell(self, x, y):
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def advance(self, dt):
+        """Moves every planet along its orbit by dt, as Background.update did per planet, and refreshes the systems in use."""
+        self.angles += self.speeds * dt
+        self._version += 1
+        queried, self._queried = self._queried, set()
+        for k in sorted(queried): self._refresh(k)
+
+    def sync(self, k):
+        """Brings system k's planet dicts up to date with the arrays, and keeps them so through the next advance()."""
+        self._queried.add(k)
+        self._refresh(k)
+
+    def _refresh(self, k):
+        if self._synced[k] == self._version: return
+        self._synced[k] = self._version
+        system = self.systems[k]
+        center_x, center_y = system['center']
+        start = system['planet_start']
+        for i, p in enumerate(system['planets'], start):
+            angle = p['current_orbit_angle'] = float(self.angles[i])
+            p['world_pos'][0] = center_x + p['orbit_radius'] * math.cos(angle)
+            p['world_pos'][1] = center_y + p['orbit_radius'] * math.sin(angle)
+
+    def sync_all(self):
+        """Brings every planet dict up to date (before saving, or anything else that reads them all)."""
+        for k in range(len(self.systems)): self._refresh(k)
+
+    def systems_near(self, x, y, reach=CELESTIAL_QUERY_REACH, sync=True):
+        """
+        Indices (ascending) of the systems whose disc comes within reach of (x, y); their planets are synced
+        unless sync is False (a read-only query, safe while another thread advances the planets).
+        """
+        span = int(math.ceil((reach + SYSTEM_RADIUS) / self.cell_size))
+        cell_x, cell_y = self._cell(x, y)
+        found = []
+        for gx in range(cell_x - span, cell_x + span + 1):
+            for gy in range(cell_y - span, cell_y + span + 1):
+                for k in self._cells.get((gx, gy), ()):
+                    system = self.systems[k]
+                    if math.hypot(system['center'][0] - x, system['center'][1] - y) < system['radius'] + reach:
+                        found.append(k)
+        found.sort()
+        if sync:
+            for k in found: self.sync(k)
+        return found
+
+    def bodies_near(self, x, y, reach=CELESTIAL_QUERY_REACH):
+        """(suns, planets) of the systems near (x, y), in system order."""
+        systems = [self.systems[k] for k in self.systems_near(x, y, reach)]
+        return [s['sun'] for s in systems], [p for s in systems for p in s['planets']]
+
+    def system_at(self, x, y):
+        """Index of the system whose centre is nearest to (x, y) among those within two system radii, or -1."""
+        cell_x, cell_y = self._cell(x, y)
+        best, best_dist = -1, math.inf
+        for gx in (cell_x - 1, cell_x, cell_x + 1):
+            for gy in (cell_y - 1, cell_y, cell_y + 1):
+                for k in self._cells.get((gx, gy), ()):
+                    dist = math.hypot(self.systems[k]['center'][0] - x, self.systems[k]['center'][1] - y)
+                    if dist < best_dist or (dist == best_dist and k < best): best, best_dist = k, dist
+        return best if best_dist < 2.0 * SYSTEM_RADIUS else -1
+
+    def bodies_at(self, x, y):
+        """The sun and planets of the system at (x, y) (see system_at), sun first; empty in deep space."""
+        k = self.system_at(x, y)
+        if k < 0: return []
+        self.sync(k)
+        return [self.systems[k]['sun']] + self.systems[k]['planets']
+
+    def systems_at(self, x, y):
+        """system_at for arrays of points (exact ties between two centres may resolve either way)."""
+        cells, inverse = np.unique(cell_keys(x, y, self.cell_size), return_inverse=True)
+        # Systems in the 3x3 cells around each distinct cell the points fall in, -1 padded
+        columns = []
+        for offset_x in (-1, 0, 1):
+            for offset_y in (-1, 0, 1):
+                keys = cells + (offset_x * CELL_KEY_STRIDE + offset_y)
+                lo = np.searchsorted(self._sorted_keys, keys, 'left')
+                hi = np.searchsorted(self._sorted_keys, keys, 'right')
+                for j in range(int((hi - lo).max(initial=0))): # Cells hold a system or two at most
+                    columns.append(np.where(lo + j < hi, self._order[np.minimum(lo + j, len(self._order) - 1)], -1))
+        if not columns: return np.full(len(x), -1, dtype=np.int64)
+        candidates = np.stack(columns, axis=1)[inverse.reshape(-1)]
+        k = np.maximum(candidates, 0)
+        dist = np.where(candidates >= 0, np.hypot(self.center_x[k] - x[:, None], self.center_y[k] - y[:, None]), np.inf)
+        nearest = dist.argmin(axis=1)
+        rows = np.arange(len(x))
+        best = k[rows, nearest]
+        best[dist[rows, nearest] >= 2.0 * SYSTEM_RADIUS] = -1
+        return best
+
+    def planet_positions(self):
+        """Where every planet is now, as (x, y) arrays in planet order, computed from the arrays (dicts untouched)."""
+        return (self.planet_center_x + self.planet_orbit * np.cos(self.angles),
+                self.planet_center_y + self.planet_orbit * np.sin(self.angles))
@@ -0,0 +1,66 @@
+# clumping.py
+
+import numpy as np
+from autopilot import GarbageIndex
+from config import GARBAGE_SIZE_RANGE, GARBAGE_COLLISION_RADIUS_FACTOR, GARBAGE_COLLISION_ITERATIONS
+
+class GarbageCollisions:
+    """
+    Pushes overlapping garbage apart so pieces pulled by the magnet clump around the ship instead of
+    stacking on one point. Only awake items (those that moved this tick) take part. Candidate pairs come
+    from a uniform grid one largest-item wide, so each item is only tested against the 3x3 cells around it.
+    Overlaps are relaxed in parallel: every contact splits its overlap by mass (size squared), and each
+    item moves by the average of its contacts' pushes. Positions are moved directly; drift velocities
+    are left alone.
+    """
+    def __init__(self, iterations=GARBAGE_COLLISION_ITERATIONS):
+        self.iterations = iterations
+        self.index = GarbageIndex(cell_size=2 * GARBAGE_COLLISION_RADIUS_FACTOR * GARBAGE_SIZE_RANGE[1])
+        self.awake = 0    # Items that took part in the last resolve()...
+        self.pairs = 0    # ...candidate pairs the grid found for them...
+        self.contacts = 0 # ...and how many of those overlapped
+
+    def resolve(self, garbage_items, awake=None):
+        """
+        Separates the awake items of garbage_items in place (world position and rect); returns how many moved.
+        awake, if given, lists them already (in garbage_items order), e.g. from WorldFrame.move_garbage.
+        """
+        if awake is None:
+            awake = [G_item for G_item in garbage_items if G_item.world_x != G_item.prev_x or G_item.world_y != G_item.prev_y]
+        self.awake = len(awake); self.pairs = self.contacts = 0
+        if len(awake) < 2: return 0
+        index = self.index
+        index.rebuild(awake)
+        first, second = index.candidates(index.x, index.y)
+        keep = first < second # The 3x3 lookup finds every pair twice, and each item itself
+        first, second = first[keep], second[keep]
+        self.pairs = len(first)
+        if not self.pairs: return 0
+        count = len(awake)
+        size = np.fromiter((G_item.size for G_item in awake), dtype=float, count=count)
+        reach = GARBAGE_COLLISION_RADIUS_FACTOR * (size[first] + size[second])
+        mass = size * size
+        first_share = mass[second] / (mass[first] + mass[second]) # Lighter items give way more
+        x, y = index.x.copy(), index.y.copy()
+        for _ in range(self.iterations):
+            dx, dy = x[second] - x[first], y[second] - y[first]
+            dist_sq = dx * dx + dy * dy
+            hit = dist_sq < reach * reach
+            if not hit.any(): break
+            a, b, dx, dy = first[hit], second[hit], dx[hit], dy[hit]
+            dist = np.sqrt(dist_sq[hit])
+            stacked = dist == 0 # Items on exactly the same point separate along x
+            dist[stacked] = 1.0; dx[stacked] = 1.0; dy[stacked] = 0.0
+            overlap = reach[hit] - dist
+            push_x, push_y = dx / dist * overlap, dy / dist * overlap
+            share = first_share[hit]
+            contacts = np.maximum(np.bincount(a, minlength=count) + np.bincount(b, minlength=count), 1)
+            x += (np.bincount(b, push_x * (1 - share), count) - np.bincount(a, push_x * share, count)) / contacts
+            y += (np.bincount(b, push_y * (1 - share), count) - np.bincount(a, push_y * share, count)) / contacts
+            self.contacts = max(self.contacts, len(a))
+        moved = np.flatnonzero((x != index.x) | (y != index.y))
+        for i in moved.tolist():
+            G_item = awake[i]
+            G_item.world_x = float(x[i]); G_item.world_y = float(y[i])
+            G_item.rect.center = (G_item.world_x, G_item.world_y)
+        return len(moved)
@@ -0,0 +1,84 @@
+# collision.py
+
+import math
+
+# Continuous collision tests. Each returns the earliest fraction t of the step (0.0 = start, 1.0 = end)
+# at which the shapes touch, or None if they never do, so outcomes do not depend on how far things
+# move in one step.
+
+ORBIT_SWEEP_TOLERANCE = 1.0 # Max distance (px) between an orbit arc and the chords used to sweep against it.
+
+def segment_circle_entry(start_x, start_y, end_x, end_y, center_x, center_y, radius):
+    """Earliest t at which a point moving from start to end is within radius of center (0.0 if it starts inside)."""
+    dx, dy = end_x - start_x, end_y - start_y
+    fx, fy = start_x - center_x, start_y - center_y
+    c = fx*fx + fy*fy - radius*radius
+    if c <= 0: return 0.0
+    a = dx*dx + dy*dy
+    b = fx*dx + fy*dy
+    if a == 0 or b >= 0: return None # Not moving, or moving away from the center
+    disc = b*b - a*c
+    if disc < 0: return None
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= 1.0 else None
+
+def segment_circle_exit(start_x, start_y, end_x, end_y, center_x, center_y, radius):
+    """Earliest t at which a point moving from start to end is farther than radius from center (0.0 if it starts outside)."""
+    dx, dy = end_x - start_x, end_y - start_y
+    fx, fy = start_x - center_x, start_y - center_y
+    c = fx*fx + fy*fy - radius*radius
+    if c > 0: return 0.0
+    a = dx*dx + dy*dy
+    if a == 0: return None
+    b = fx*dx + fy*dy
+    t = (-b + math.sqrt(max(0.0, b*b - a*c))) / a # Starting inside, the larger root is where the point leaves
+    return t if t < 1.0 else None
+
+def swept_circles(a_start, a_end, a_radius, b_start, b_end, b_radius):
+    """Earliest t at which two circles moving linearly over the step touch."""
+    # In b's frame of reference a moves along a single segment.
+    return segment_circle_entry(a_start[0] - b_start[0], a_start[1] - b_start[1],
+                                a_end[0] - b_end[0], a_end[1] - b_end[1], 0.0, 0.0, a_radius + b_radius)
+
+def swept_circle_vs_orbit(a_start, a_end, a_radius, orbit_center, orbit_radius, angle_start, angle_end, body_radius):
+    """
+    Earliest t at which a circle moving linearly touches a body moving along a circular orbit from
+    angle_start to angle_end. The arc is followed by chords within ORBIT_SWEEP_TOLERANCE of it.
+    """
+    sweep = abs(angle_end - angle_start)
+    max_chord_angle = 2.0 * math.sqrt(2.0 * ORBIT_SWEEP_TOLERANCE / orbit_radius) if orbit_radius > 0 else math.pi
+    segments = max(1, math.ceil(sweep / max_chord_angle))
+    body_radius += ORBIT_SWEEP_TOLERANCE # Covers the gap between the chords and the arc
+    previous = None
+    for i in range(segments + 1):
+        t = i / segments
+        angle = angle_start + (angle_end - angle_start) * t
+        a_pos = (a_start[0] + (a_end[0] - a_start[0]) * t, a_start[1] + (a_end[1] - a_start[1]) * t)
+        b_pos = (orbit_center[0] + orbit_radius * math.cos(angle), orbit_center[1] + orbit_radius * math.sin(angle))
+        if previous:
+            hit = swept_circles(previous[1], a_pos, a_radius, previous[2], b_pos, body_radius)
+            if hit is not None: return previous[0] + hit / segments
+        previous = (t, a_pos, b_pos)
+    return None
+
+def swept_rects(a_start, a_end, b_start, b_end):
+    """
+    Earliest t at which two axis-aligned rects (pygame.Rect, constant size) moving linearly overlap,
+    using pygame's colliderect convention (touching edges do not overlap).
+    """
+    # Slab test on a's motion relative to b.
+    vx = (a_end.x - a_start.x) - (b_end.x - b_start.x)
+    vy = (a_end.y - a_start.y) - (b_end.y - b_start.y)
+    t_enter, t_exit = 0.0, 1.0
+    for a_min, a_size, b_min, b_size, v in ((a_start.x, a_start.width, b_start.x, b_start.width, vx),
+                                            (a_start.y, a_start.height, b_start.y, b_start.height, vy)):
+        gap_before = b_min - (a_min + a_size) # a must travel this far (positive direction) to start overlapping
+        gap_after = (b_min + b_size) - a_min  # ...and overlaps until it has travelled this far
+        if v == 0:
+            if gap_before >= 0 or gap_after <= 0: return None
+            continue
+        t0, t1 = gap_before / v, gap_after / v
+        if t0 > t1: t0, t1 = t1, t0
+        t_enter, t_exit = max(t_enter, t0), min(t_exit, t1)
+        if t_enter >= t_exit: return None
+    return t_enter
@@ -3,18 +3,64 @@
 import pygame
 import os
 
-# Prevents the game window from minimizing when focus is lost (e.g., alt-tabbing).
-os.environ['SDL_VIDEO_MINIMIZE_ON_FOCUS_LOSS'] = '0'
+# Display state. Nothing here touches the display at import time; init_display() fills these in.
+SCREEN = None              # Main screen surface (set by init_display()).
+SCREEN_WIDTH = 0           # Width of the main screen in pixels (set by init_display()).
+SCREEN_HEIGHT = 0          # Height of the main screen in pixels (set by init_display()).
+WINDOW_SIZE_ENV_VAR = "GREENSPACE_WINDOW_SIZE" # e.g. "1280x720" runs windowed at that size instead of fullscreen.
 
-pygame.init()
+def init_display(size=None):
+    """
+    Initializes only the pygame modules the game uses and opens the main screen.
+    Fullscreen at the desktop resolution unless a size is given (or set through GREENSPACE_WINDOW_SIZE).
+    """
+    global SCREEN, SCREEN_WIDTH, SCREEN_HEIGHT
+    if SCREEN is not None: return SCREEN
+    # Prevents the game window from minimizing when focus is lost (e.g., alt-tabbing).
+    os.environ['SDL_VIDEO_MINIMIZE_ON_FOCUS_LOSS'] = '0'
+    pygame.display.init()
+    pygame.font.init()
 
-# Dynamically get current screen dimensions for fullscreen mode.
-info = pygame.display.Info()
-SCREEN_WIDTH = info.current_w
-SCREEN_HEIGHT = info.current_h
+    if size is None and os.environ.get(WINDOW_SIZE_ENV_VAR):
+        size = tuple(int(v) for v in os.environ[WINDOW_SIZE_ENV_VAR].lower().split('x'))
+    if size is None:
+        # Dynamically get current screen dimensions for fullscreen mode.
+        info = pygame.display.Info()
+        SCREEN_WIDTH, SCREEN_HEIGHT = info.current_w, info.current_h
+        SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
+    else:
+        SCREEN_WIDTH, SCREEN_HEIGHT = size
+        SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return SCREEN
 
-# Initialize the main screen surface in fullscreen.
-SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
+# Dynamic Render Resolution
+RENDER_SCALE_LEVELS = (1.0, 0.85, 0.7, 0.6, 0.5) # Internal world resolution as a fraction of the screen, best first.
+RENDER_FRAME_BUDGET_MS = 15.0 # Target CPU time per frame (excluding the frame-rate wait); leaves headroom at 60 FPS.
+RENDER_SCALE_DOWN_RATIO = 0.95 # Drop a level when the smoothed frame time exceeds this fraction of the budget.
+RENDER_SCALE_UP_RATIO = 0.75  # Raise a level when the frame time predicted at that level is below this fraction.
+RENDER_SCALE_SETTLE_FRAMES = 45 # Frames to wait after a change before judging the new level.
+
+# Adaptive Quality Governor
+# Tiers from best to cheapest. particle_factor scales thrust and explosion particle counts, star_glow is
+# 'full', 'cross' (simple glow for every star) or 'none', blob_density is the fraction of gas/dust blobs drawn,
+# minimap_interval is the number of frames between minimap redraws.
+QUALITY_TIERS = (
+    {'name': 'high',    'particle_factor': 1.0,  'star_glow': 'full',  'blob_density': 1.0,  'minimap_interval': 1},
+    {'name': 'medium',  'particle_factor': 0.5,  'star_glow': 'cross', 'blob_density': 0.6,  'minimap_interval': 2},
+    {'name': 'low',     'particle_factor': 0.25, 'star_glow': 'none',  'blob_density': 0.35, 'minimap_interval': 4},
+    {'name': 'minimal', 'particle_factor': 0.1,  'star_glow': 'none',  'blob_density': 0.15, 'minimap_interval': 10},
+)
+QUALITY_WINDOW_FRAMES = 45         # Rolling window of frame times the governor judges.
+QUALITY_DOWNGRADE_RATIO = 1.0      # Drop a tier when the window's mean frame time exceeds the budget.
+QUALITY_UPGRADE_RATIO = 0.6        # Raise a tier when the mean stays below this fraction of the budget...
+QUALITY_UPGRADE_HOLD_FRAMES = 300  # ...for at least this many frames since the last change (~5 s).
+
+# Frame Loop
+TARGET_FRAME_RATE = 60         # Frames drawn per second, and with --threaded simulation ticks per second.
+
+# Idle Screens (pause, game over, win)
+IDLE_FRAME_RATE = 15           # Frame rate while an idle screen is shown.
+IDLE_MINIMAP_REFRESH_MS = 1000 # Minimap refresh period on idle screens where planets keep orbiting.
 
 # Gameplay Constants
 ROTATION_SPEED = 2         # Angular speed of the spaceship in degrees per frame.
@@ -22,7 +68,13 @@ THRUST_MAGNITUDE = 0.2     # Acceleration magnitude when the spaceship is thrust
 DESIRED_SIZE = (100, 100)    # Target scaled dimensions for the spaceship sprite.
 
 # World Configuration
-WORLD_RADIUS = 24000       # Radius of the playable game world.
+STAR_SYSTEMS_ENV_VAR = "GREENSPACE_SYSTEMS" # e.g. "200" generates a galaxy of that many star systems instead of one.
+NUM_STAR_SYSTEMS = max(1, int(os.environ.get(STAR_SYSTEMS_ENV_VAR) or 1)) # Star systems, each with a sun, planets and garbage.
+SYSTEM_RADIUS = 24000      # Radius of one star system (its sun, planet orbits and garbage).
+GALAXY_SYSTEM_FILL = 0.25  # With several systems, the world is sized so their discs cover about this fraction of it.
+WORLD_RADIUS = SYSTEM_RADIUS if NUM_STAR_SYSTEMS == 1 else \
+               int(SYSTEM_RADIUS * (1 + (NUM_STAR_SYSTEMS / GALAXY_SYSTEM_FILL + 4) ** 0.5)) # Radius of the playable game world.
+CELESTIAL_QUERY_REACH = 5000 # Per-tick body checks look at the systems within this distance of the ship.
 WORLD_CENTER_X = 0         # World center X-coordinate.
 WORLD_CENTER_Y = 0         # World center Y-coordinate.
 
@@ -33,10 +85,36 @@ SUN_COLOR = (255, 230, 100) # Color of the sun.
 # Solar System Planets Configuration
 NUM_SOLAR_SYSTEM_PLANETS = 5 # Number of planets to generate in the solar system.
 MIN_ORBIT_RADIUS = SUN_RADIUS + 1000 # Minimum orbit radius for planets, relative to sun's edge.
-MAX_ORBIT_RADIUS = WORLD_RADIUS * 0.85 # Maximum orbit radius for planets, within world bounds.
+MAX_ORBIT_RADIUS = SYSTEM_RADIUS * 0.85 # Maximum orbit radius for planets, within the system's bounds.
+
+# Sun and Planet Textures
+BODY_TEXTURE_MAX_SIZE = 1024   # Largest pre-rendered texture per body; bigger on-screen sizes magnify it.
+BODY_TEXTURE_MIN_SIZE = 16     # Smallest LOD texture kept (each LOD halves the previous one).
+BODY_EXACT_CACHE_SIZE = 1024   # Bodies up to this on-screen diameter are drawn from a copy resized to fit.
+BODY_TILE_SIZE = 256           # Larger bodies are drawn from magnified tiles of this many screen px, built on demand...
+BODY_TILE_CACHE_SIZE = 64      # ...and kept until this many exist (about three screens' worth).
+BODY_SPRITE_CACHE_SIZE = 64    # Bodies whose textures are kept (least recently drawn dropped first); a system has six.
+BODY_COLORKEY = (255, 0, 255)  # Transparent color around the disc in body textures.
+BODY_NOISE_OCTAVES = 4         # Octaves of surface noise.
+SUN_LIMB_DARKENING = (0.35, 0.55, 0.9) # Per-channel (R, G, B) darkening at the limb; stronger in blue reddens the edge.
+SUN_SURFACE_NOISE = 0.12       # Brightness variation of the sun's granulation.
+PLANET_LIMB_DARKENING = (0.6, 0.6, 0.6)
+PLANET_SURFACE_NOISE = 0.3     # Brightness variation of planet surface features.
+
+# Camera Zoom
+CAMERA_ZOOM_LEVELS = tuple(2 ** (-i / 2) for i in range(11)) # 1x out to 1/32x; each mouse-wheel notch is one level.
+BG_TILE_MAX_SCALE = 0.5        # Static background layers drawn at a smaller scale come from cached tiles...
+BG_TILE_SIZE = 256             # ...of this many screen px...
+BG_TILE_CACHE_SIZE = 96        # ...kept until this many exist (least recently drawn dropped first).
+BG_DENSITY_MAX_SCALE = 0.25    # Below this scale tiles are density maps of the static items rather than the items drawn.
+GARBAGE_DOT_SIZE = 4           # Garbage smaller than this on screen is drawn as a dot of GARBAGE_DOT_COLOR.
+GARBAGE_DOT_COLOR = (120, 220, 120)
 
 # Galaxy Generation
 CELL_SIZE = 200            # Size of cells in the spatial grid for rendering optimization.
+STAR_GLOW_VARIANTS = 4     # Pre-rendered glows per star; one is picked at random each frame so stars twinkle.
+STAR_SPRITE_CACHE_SIZE = 8192 # Star sprites kept before the cache is cleared and rebuilt for the stars in view.
+STAR_POINT_MAX_CORE = 2    # Stars with cores up to this many px wide are written into the frame's pixels, not blitted (0: blit all).
 
 # Garbage Configuration
 NUM_GENERAL_GARBAGE = 50       # Number of garbage items to scatter generally in space.
@@ -44,10 +122,59 @@ GARBAGE_PER_PLANET_CLUSTER = 30 # Number of garbage items to cluster around each
 PLANET_GARBAGE_ZONE_RADIUS_FACTOR = 3.0 # Factor of planet's radius to define its garbage cluster zone.
 MIN_DIST_GARBAGE_FROM_PLANET_SURFACE = 50 # Minimum distance garbage should spawn from a planet's surface.
 GARBAGE_SIZE_RANGE = (40, 120)   # Range (min, max) for the size of garbage items.
+GARBAGE_MIN_SPACING = GARBAGE_SIZE_RANGE[1] # Generated garbage is at least this far apart (centre to centre), so no two items overlap...
+POISSON_FILL = 0.3             # ...and spread out so their spacing discs cover this fraction of the area (random packing jams near 0.55).
+POISSON_DARTS_PER_ITEM = 30    # Candidate positions the Poisson-disk sampler may try per item before giving up on the rest.
 GARBAGE_SPRITE_FILE = "garbageSprite.png" # Filename for the garbage sprite.
 SHIP_MAGNET_RANGE = 800        # Range of the spaceship's garbage collection magnet.
 BASE_MAGNET_STRENGTH = 2000000   # Base strength of the magnet's pull.
 MIN_GARBAGE_ATTRACTION_SPEED_FACTOR = 0.1 # Minimum speed factor for garbage under magnet influence.
+GARBAGE_COLLISION_RADIUS_FACTOR = 0.45 # Moving garbage collides as circles of this fraction of its size...
+GARBAGE_COLLISION_ITERATIONS = 2 # ...with overlaps relaxed this many times per tick.
+
+# Gravity (--gravity bodies|debris)
+GRAVITY_CONSTANT = 3e-4        # G * mass per cubed px of radius: circular orbits around the sun about as fast as the planets'.
+GRAVITY_SOFTENING = 100        # Softening length (px) of the sun's and planets' pull.
+GRAVITY_DEBRIS_SCALE = 200     # Debris mass per cubed px relative to the bodies', so clumps form within minutes.
+GRAVITY_DEBRIS_SOFTENING = 60  # Softening length (px) between debris items, about an item wide.
+GRAVITY_OPENING_ANGLE = 0.6    # Barnes-Hut opening angle: a cell narrower than this times its distance acts as one mass.
+GRAVITY_LEAF_SIZE = 16         # Quadtree cells with at most this many items are not split further.
+
+# Endless Mode
+ENDLESS_SPAWN_RATE = 2.0       # Debris items per second arriving from planet streams and drifting belts...
+ENDLESS_MAX_GARBAGE = 500      # ...tapering off as the population nears this cap (also the size of the object pool).
+ENDLESS_STREAM_SHARE = 0.5     # Fraction of the steady arrivals that stream off planets; the rest join a drifting belt.
+ENDLESS_STREAM_SPEED_RANGE = (20, 60)    # Speed (px/s) of debris streaming away from a planet.
+ENDLESS_BELT_RADIUS_RANGE = (0.55, 0.8)  # Drifting belt annulus, as fractions of SYSTEM_RADIUS.
+ENDLESS_BELT_SPEED_RANGE = (10, 30)      # Speed (px/s) of belt debris, drifting along the belt.
+ENDLESS_SHOWER_INTERVAL_RANGE = (45, 90) # Seconds between meteor showers.
+ENDLESS_SHOWER_SIZE = 25       # Debris items per meteor shower.
+ENDLESS_SHOWER_SPREAD = 1500   # Radius of the area a shower enters the world over.
+ENDLESS_SHOWER_SPEED_RANGE = (80, 140)   # Speed (px/s) of shower debris crossing the world.
+
+# Autopilot Settings (shared by the player's autopilot and the batched cleaner bots)
+AUTOPILOT_SHIP_RADIUS_APPROX = max(DESIRED_SIZE) / 2.0 if DESIRED_SIZE else 50.0
+AUTOPILOT_DANGER_PROXIMITY_OBSTACLE = 550  # Flee when the ship's edge is this close to the sun or a planet.
+AUTOPILOT_DANGER_PROXIMITY_BOUNDARY = 600  # Head back to the center when this close to the world edge.
+AUTOPILOT_GARBAGE_SEEK_RADIUS = SHIP_MAGNET_RANGE * 2.0 # Garbage within this distance is chased.
+AUTOPILOT_ARRIVE_SLOWDOWN_RADIUS = 360     # Thrust less often when this close to the chased garbage.
+AUTOPILOT_WANDER_CHANGE_DIR_INTERVAL = 3.0 # Seconds between wander heading changes.
+AUTOPILOT_WANDER_CONE_ANGLE = 90           # Wander headings stay within this cone (degrees) of the current heading.
+AUTOPILOT_LOOKAHEAD_TICKS = 180            # Ticks (~3 s) the autopilot projects its path and the orbits ahead...
+AUTOPILOT_LOOKAHEAD_STEP = 3               # ...testing for contact every this many ticks.
+AUTOPILOT_STATIC_LOOKAHEAD_TICKS = 90      # The sun and world edge do not move, so they are only watched this far ahead (a half turn).
+AUTOPILOT_PREDICT_CLEARANCE = 150          # A projected path passing closer than this to a body's surface counts as a collision.
+AUTOPILOT_EVASION_HEADINGS = 16            # Headings tried when the planned path is predicted to collide...
+AUTOPILOT_EVASION_THRUST_CONE = 60         # ...thrusting once the ship points within this many degrees of the chosen one.
+
+# Training Environments (pilotenv.py)
+ENV_TICK_DT = 1 / 60.0         # Seconds per environment step: one game tick at 60 FPS.
+ENV_MAX_STEPS = 3600           # Steps before an episode is cut off (truncated); a minute of play.
+ENV_OBSERVED_GARBAGE = 8       # Nearest garbage items in each observation...
+ENV_OBSERVED_BODIES = 3        # ...and nearest of the sun and planets (by clearance from their surface).
+ENV_OBSERVATION_SCALE = AUTOPILOT_GARBAGE_SEEK_RADIUS # Observed offsets and clearances are in units of this many px.
+ENV_COLLECT_REWARD = 1.0       # Reward per garbage item collected...
+ENV_CRASH_REWARD = -10.0       # ...and for crashing into a body or the system's edge (which ends the episode).
 
 # Spaceship Collision / Game Over Effects
 SHIP_COLLISION_PARTICLE_COUNT = 1500     # Number of particles in the ship's explosion.
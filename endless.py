@@ -0,0 +1,97 @@
+# endless.py
+
+import math
+import rng
+from garbage import GarbagePool
+from config import (WORLD_RADIUS, SYSTEM_RADIUS, WORLD_CENTER_X, WORLD_CENTER_Y, GARBAGE_SIZE_RANGE, MIN_DIST_GARBAGE_FROM_PLANET_SURFACE,
+                    ENDLESS_SPAWN_RATE, ENDLESS_MAX_GARBAGE, ENDLESS_STREAM_SHARE, ENDLESS_STREAM_SPEED_RANGE,
+                    ENDLESS_BELT_RADIUS_RANGE, ENDLESS_BELT_SPEED_RANGE, ENDLESS_SHOWER_INTERVAL_RANGE,
+                    ENDLESS_SHOWER_SIZE, ENDLESS_SHOWER_SPREAD, ENDLESS_SHOWER_SPEED_RANGE)
+
+class DebrisSpawner:
+    """
+    Keeps debris arriving in endless mode. Steady arrivals stream off the planets or join a drifting belt
+    at `rate` items per second, tapering off as the population nears `cap`, and a meteor shower crosses
+    the home system every minute or so. Items come from a GarbagePool that holds `cap` objects in total together
+    with the garbage already out, so the population never exceeds the cap and nothing is allocated.
+    Draws only from rng.sim, so endless sessions replay exactly.
+    """
+    def __init__(self, background, rate=ENDLESS_SPAWN_RATE, cap=ENDLESS_MAX_GARBAGE):
+        self.background = background
+        self.rate = rate
+        self.cap = cap
+        self.pool = GarbagePool(cap - len(background.all_garbage_items))
+        background.garbage_pool = self.pool # Garbage the background loses goes back to the pool too
+        self.spawn_budget = 0.0 # Fraction of an item owed by the steady arrivals
+        self.shower_timer = float(ENDLESS_SHOWER_INTERVAL_RANGE[0]) # Seconds until the next meteor shower
+        self.spawned = 0
+
+    def update(self, dt):
+        """Spawns this tick's arrivals. Called once per simulated tick, after the garbage has moved."""
+        items = self.background.all_garbage_items
+        self.spawn_budget += self.rate * dt * max(0.0, 1.0 - len(items) / self.cap)
+        while self.spawn_budget >= 1.0:
+            self.spawn_budget -= 1.0
+            if self.background.solar_system_planets and rng.sim.random() < ENDLESS_STREAM_SHARE: self._spawn_stream_item(items)
+            else: self._spawn_belt_item(items)
+        self.shower_timer -= dt
+        if self.shower_timer <= 0:
+            self._spawn_shower(items)
+            self.shower_timer = rng.sim.uniform(*ENDLESS_SHOWER_INTERVAL_RANGE)
+
+    def _spawn(self, items, x, y, vx, vy):
+        """Places one pooled item unless the spot is outside the world or inside a body (the arrival is then lost)."""
+        size = rng.sim.randint(GARBAGE_SIZE_RANGE[0], GARBAGE_SIZE_RANGE[1])
+        if math.hypot(x - WORLD_CENTER_X, y - WORLD_CENTER_Y) + size / 2.0 >= WORLD_RADIUS: return
+        for body in self.background.celestial.bodies_at(x, y):
+            bx, by = body['world_pos']
+            if (x - bx)**2 + (y - by)**2 < (body['radius'] + size / 2.0)**2: return
+        G_item = self.pool.acquire(x, y, size, vx, vy)
+        if G_item is not None:
+            items.append(G_item); self.spawned += 1
+
+    def _spawn_stream_item(self, items):
+        """Debris thrown off a random planet, leaving it radially while keeping the planet's orbital velocity."""
+        p = rng.sim.choice(self.background.solar_system_planets)
+        self.background.celestial.sync(p['system']) # Its position, were its system out of everyone's reach
+        angle = rng.sim.uniform(0, 2 * math.pi)
+        speed = rng.sim.uniform(*ENDLESS_STREAM_SPEED_RANGE)
+        dist = p['radius'] + MIN_DIST_GARBAGE_FROM_PLANET_SURFACE + GARBAGE_SIZE_RANGE[1]
+        orbit_angle = p['current_orbit_angle']
+        orbit_speed = p['orbit_speed'] * p['orbit_radius'] # Planet's speed along its orbit in px/s
+        self._spawn(items, p['world_pos'][0] + dist * math.cos(angle), p['world_pos'][1] + dist * math.sin(angle),
+                    speed * math.cos(angle) - orbit_speed * math.sin(orbit_angle),
+                    speed * math.sin(angle) + orbit_speed * math.cos(orbit_angle))
+
+    def _spawn_belt_item(self, items):
+        """Debris joining the belt, drifting along it (slowly spiralling outwards, since it moves in a straight line)."""
+        angle = rng.sim.uniform(0, 2 * math.pi)
+        r = rng.sim.uniform(*ENDLESS_BELT_RADIUS_RANGE) * SYSTEM_RADIUS
+        speed = rng.sim.uniform(*ENDLESS_BELT_SPEED_RANGE)
+        self._spawn(items, WORLD_CENTER_X + r * math.cos(angle), WORLD_CENTER_Y + r * math.sin(angle),
+                    -speed * math.sin(angle), speed * math.cos(angle))
+
+    def _spawn_shower(self, items):
+        """A cluster of fast debris entering at the home system's edge, heading across its inner part."""
+        entry_angle = rng.sim.uniform(0, 2 * math.pi)
+        entry_r = SYSTEM_RADIUS - ENDLESS_SHOWER_SPREAD - GARBAGE_SIZE_RANGE[1]
+        entry_x = WORLD_CENTER_X + entry_r * math.cos(entry_angle)
+        entry_y = WORLD_CENTER_Y + entry_r * math.sin(entry_angle)
+        aim_angle = rng.sim.uniform(0, 2 * math.pi)
+        aim_r = rng.sim.uniform(0, SYSTEM_RADIUS * 0.5)
+        heading = math.atan2(WORLD_CENTER_Y + aim_r * math.sin(aim_angle) - entry_y,
+                             WORLD_CENTER_X + aim_r * math.cos(aim_angle) - entry_x)
+        for _ in range(ENDLESS_SHOWER_SIZE):
+            offset_angle = rng.sim.uniform(0, 2 * math.pi)
+            offset = ENDLESS_SHOWER_SPREAD * math.sqrt(rng.sim.random()) # Uniform over the entry disc
+            speed = rng.sim.uniform(*ENDLESS_SHOWER_SPEED_RANGE)
+            self._spawn(items, entry_x + offset * math.cos(offset_angle), entry_y + offset * math.sin(offset_angle),
+                        speed * math.cos(heading), speed * math.sin(heading))
+
+    def capture_state(self):
+        """JSON-serialisable spawner state (saves and replay keyframes)."""
+        return {"rate": self.rate, "cap": self.cap, "spawn_budget": self.spawn_budget,
+                "shower_timer": self.shower_timer, "spawned": self.spawned}
+
+    def restore_state(self, data):
+        self.spawn_budget = data['spawn_budget']; self.shower_timer = data['shower_timer']; self.spawned = data['spawned']
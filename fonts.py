@@ -0,0 +1,51 @@
+# fonts.py
+
+import os
+import json
+import pygame
+
+# Resolving a system font by name can trigger a full fontconfig scan, so resolved paths are kept on disk.
+FONT_CACHE_FILE = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                               'greenspace', 'fonts.json')
+UI_FONT_NAME = 'Arial'
+
+_resolved_paths = None # {"Arial": path or None, "Arial:bold": ...}, loaded from FONT_CACHE_FILE on first use
+_fonts = {}            # (name, size, bold) -> pygame.font.Font
+
+def _load_path_cache():
+    global _resolved_paths
+    if _resolved_paths is None:
+        try:
+            with open(FONT_CACHE_FILE, 'r') as f: _resolved_paths = json.load(f)
+        except (OSError, ValueError):
+            _resolved_paths = {}
+    return _resolved_paths
+
+def _save_path_cache():
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+        with open(FONT_CACHE_FILE, 'w') as f: json.dump(_resolved_paths, f, indent=2)
+    except OSError as e: print(f"Could not write font cache {FONT_CACHE_FILE}: {e}")
+
+def resolve_font_path(name, bold=False):
+    """Returns the file path for a system font (None means pygame's default font), using the disk cache."""
+    paths = _load_path_cache()
+    key = f"{name}:bold" if bold else name
+    if key in paths and (paths[key] is None or os.path.exists(paths[key])):
+        return paths[key]
+    paths[key] = pygame.font.match_font(name, bold=bold) # The slow lookup, done once per machine
+    _save_path_cache()
+    return paths[key]
+
+def get_font(size, bold=False, name=UI_FONT_NAME):
+    """Equivalent to pygame.font.SysFont(name, size, bold), but memoised and without repeated font scans."""
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init(): pygame.font.init()
+        path = resolve_font_path(name, bold)
+        font = pygame.font.Font(path, size)
+        # Like SysFont: embolden synthetically when no dedicated bold face exists.
+        if bold and (path is None or path == resolve_font_path(name)): font.set_bold(True)
+        _fonts[key] = font
+    return font
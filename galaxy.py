@@ -3,100 +3,244 @@
 import pygame
 import random
 import math
-from config import (SCREEN_WIDTH, SCREEN_HEIGHT, WORLD_RADIUS, WORLD_CENTER_X, WORLD_CENTER_Y,
+import threading
+import weakref
+import numpy as np
+import rng
+from config import (WORLD_RADIUS, WORLD_CENTER_X, WORLD_CENTER_Y, NUM_STAR_SYSTEMS, SYSTEM_RADIUS,
                     SUN_RADIUS, SUN_COLOR, NUM_SOLAR_SYSTEM_PLANETS, MIN_ORBIT_RADIUS,
                     MAX_ORBIT_RADIUS, CELL_SIZE,
                     NUM_GENERAL_GARBAGE, GARBAGE_PER_PLANET_CLUSTER,
                     PLANET_GARBAGE_ZONE_RADIUS_FACTOR, MIN_DIST_GARBAGE_FROM_PLANET_SURFACE,
-                    GARBAGE_SIZE_RANGE)
+                    GARBAGE_SIZE_RANGE, GARBAGE_MIN_SPACING, SUN_LIMB_DARKENING, SUN_SURFACE_NOISE, PLANET_LIMB_DARKENING,
+                    PLANET_SURFACE_NOISE, BG_TILE_MAX_SCALE, BG_TILE_SIZE, BG_TILE_CACHE_SIZE, BG_DENSITY_MAX_SCALE,
+                    STAR_GLOW_VARIANTS, STAR_SPRITE_CACHE_SIZE, STAR_POINT_MAX_CORE, BODY_SPRITE_CACHE_SIZE)
 from garbage import Garbage
-
-# Helper function to draw a filled circle, with basic off-screen culling.
-def draw_pixel_circle(surface, color, center_x, center_y, radius):
-    radius = int(radius)
-    # Cull if entirely off-screen.
-    if center_x + radius < 0 or center_x - radius > SCREEN_WIDTH or \
-       center_y + radius < 0 or center_y - radius > SCREEN_HEIGHT:
-        return
-    pygame.draw.circle(surface, color, (int(center_x), int(center_y)), radius)
-
-# Helper function to draw a 'pixel art' style star with a simple glow effect.
-def draw_pixel_star(surface, screen_x, screen_y, base_color, size_category):
+from poisson import poisson_disk_annulus
+from celestial import CelestialIndex
+from bodies import BodySprite, body_seed
+from profiler import (PROFILER, PHASE_BG_GAS, PHASE_BG_DUST, PHASE_BG_DISTANT_PLANETS, PHASE_BG_STARS, PHASE_BG_TILES,
+                      PHASE_BG_BODIES)
+from quality import GOVERNOR
+from renderqueue import RENDER_QUEUE, LAYER_GAS, LAYER_DUST, LAYER_DISTANT_PLANETS, LAYER_STARS
+
+# Profiler phase and render queue layer for each static layer drawn by Background.draw.
+_LAYER_PHASES = {'gas_blob': PHASE_BG_GAS, 'dust_blob': PHASE_BG_DUST,
+                 'distant_planet': PHASE_BG_DISTANT_PLANETS, 'star': PHASE_BG_STARS}
+_QUEUE_LAYERS = {'gas_blob': LAYER_GAS, 'dust_blob': LAYER_DUST,
+                 'distant_planet': LAYER_DISTANT_PLANETS, 'star': LAYER_STARS}
+
+_disc_sprites = {} # (color, radius) -> small filled circle
+
+def disc_sprite(color, radius):
+    """A filled circle of radius px on a transparent 2r x 2r surface (a distant planet), made on first use."""
+    sprite = _disc_sprites.get((color, radius))
+    if sprite is None:
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        if pygame.display.get_surface(): sprite = sprite.convert_alpha()
+        _disc_sprites[(color, radius)] = sprite
+    return sprite
+
+_star_sprites = {} # (color, size_category, core_size, glow, variant) -> (sprite, offset)
+
+def star_sprite(color, size_category, glow='full'):
+    """
+    A 'pixel art' star with a simple glow, baked into one sprite: returns (sprite, offset), where offset
+    is the sprite's top-left relative to the star's pixel. glow is 'full' (spread-out glow for large
+    stars), 'cross' (simple glow for every star) or 'none'. Each star has STAR_GLOW_VARIANTS glows with
+    their own alpha and pattern; picking one at random per call keeps the stars twinkling.
+    """
     core_size = 1
     if size_category == 'medium': core_size = 2
-    elif size_category == 'large': core_size = random.choice([3, 4, 5])
-
-    core_rect_x_int = int(screen_x - core_size // 2)
-    core_rect_y_int = int(screen_y - core_size // 2)
-
-    # Cull if core is off-screen.
-    if core_rect_x_int + core_size < 0 or core_rect_x_int > SCREEN_WIDTH or \
-       core_rect_y_int + core_size < 0 or core_rect_y_int > SCREEN_HEIGHT:
-        return
-
-    pygame.draw.rect(surface, base_color, (core_rect_x_int, core_rect_y_int, core_size, core_size))
-
-    glow_alpha_value = random.randint(25, 75)
-    r, g, b = base_color
-    glow_color = (r, g, b, glow_alpha_value)
-
-    if size_category == 'medium' or size_category == 'small': # Simpler cross-shaped glow.
-        for dx_glow, dy_glow in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            gx_int, gy_int = int(screen_x + dx_glow), int(screen_y + dy_glow)
-            if 0 <= gx_int < SCREEN_WIDTH and 0 <= gy_int < SCREEN_HEIGHT:
-                glow_pixel_surface = pygame.Surface((1,1), pygame.SRCALPHA)
-                glow_pixel_surface.fill(glow_color)
-                surface.blit(glow_pixel_surface, (gx_int, gy_int))
-    elif size_category == 'large': # More spread-out glow.
-        glow_radius = core_size
-        for dx_glow in range(-glow_radius, glow_radius + 1):
-            for dy_glow in range(-glow_radius, glow_radius + 1):
-                if abs(dx_glow) + abs(dy_glow) > 0 and abs(dx_glow) + abs(dy_glow) <= glow_radius:
-                    if random.random() < 0.4: # Sparsely populate glow.
-                        gx_int, gy_int = int(screen_x + dx_glow), int(screen_y + dy_glow)
-                        if 0 <= gx_int < SCREEN_WIDTH and 0 <= gy_int < SCREEN_HEIGHT:
-                            glow_pixel_surface = pygame.Surface((1,1), pygame.SRCALPHA)
-                            glow_pixel_surface.fill(glow_color)
-                            surface.blit(glow_pixel_surface, (gx_int, gy_int))
-
-class Background:
+    elif size_category == 'large': core_size = rng.render.choice([3, 4, 5])
+    variant = rng.render.randrange(STAR_GLOW_VARIANTS) if glow != 'none' else 0
+    key = (color, size_category, core_size, glow, variant)
+    entry = _star_sprites.get(key)
+    if entry is None:
+        if len(_star_sprites) >= STAR_SPRITE_CACHE_SIZE: _star_sprites.clear() # Rebuilt for the stars in view
+        reach = core_size # Furthest any glow pixel is from the star's pixel
+        sprite = pygame.Surface((reach * 2 + 1, reach * 2 + 1), pygame.SRCALPHA)
+        if glow != 'none':
+            glow_color = (color[0], color[1], color[2], rng.render.randint(25, 75))
+            if size_category == 'large' and glow == 'full': # More spread-out glow, sparsely populated
+                offsets = [(dx, dy) for dx in range(-reach, reach + 1) for dy in range(-reach, reach + 1)
+                           if 0 < abs(dx) + abs(dy) <= reach and rng.render.random() < 0.4]
+            else: # Simpler cross-shaped glow
+                offsets = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+            for dx, dy in offsets: sprite.set_at((reach + dx, reach + dy), glow_color)
+        sprite.fill(color, (reach - core_size // 2, reach - core_size // 2, core_size, core_size)) # Core over the glow
+        if pygame.display.get_surface(): sprite = sprite.convert_alpha()
+        entry = _star_sprites[key] = (sprite, -reach)
+    return entry
+
+# Core width in pixels of a star of each size category ('large' stars are 3 to 5 px wide).
+_STAR_PIXELS = {'small': 1, 'medium': 2, 'large': 4}
+_MAX_SPLAT = 8 # Widest square (px) an item is spread over in a density tile.
+# Pixels of a point star relative to the star's pixel: its cross-shaped glow, and its core by core width
+# (placed as star_sprite places them; a 1 px core lists its pixel four times).
+_STAR_GLOW_DX, _STAR_GLOW_DY = np.array([-1, 1, 0, 0]), np.array([0, 0, -1, 1])
+_STAR_CORE_DX = np.array([[0, 0, 0, 0], [0, 0, 0, 0], [-1, 0, -1, 0]])
+_STAR_CORE_DY = np.array([[0, 0, 0, 0], [0, 0, 0, 0], [-1, -1, 0, 0]])
+_twinkle = None # numpy generator for the point stars' glow, seeded from rng.render on first use
+
+def _density_layers(galaxy):
     """
-    Manages procedural generation and rendering of the game's environment,
-    including celestial bodies, decorative elements, and initial garbage distribution.
+    The static layers as arrays for _density_tile, in drawing order. Each item is a square of color and
+    opacity whose side is `side` world px times the scale, but never less than `min_px` screen px:
+    blobs and distant planets shrink with the scale, stars keep their pixel size.
     """
-    def __init__(self):
-        self.bg_color = (15, 0, 30) # Deep space color.
-
+    layers = []
+    for items in (galaxy.gas_blobs, galaxy.dust_blobs):
+        colors = [item['surface'].get_at((0, 0)) for item in items]
+        sizes = np.array([item['surface'].get_size() for item in items], dtype=float).reshape(-1, 2)
+        layers.append((items, [tuple(c)[:3] for c in colors], [c.a / 255.0 for c in colors],
+                       np.sqrt(sizes[:, 0] * sizes[:, 1]), 1.0, False))
+    planets = galaxy.distant_planets
+    layers.append((planets, [p['color'] for p in planets], np.ones(len(planets)),
+                   np.array([p['radius'] for p in planets], dtype=float) * math.sqrt(math.pi), math.sqrt(math.pi), True))
+    stars = galaxy.stars
+    layers.append((stars, [s['color'] for s in stars], np.ones(len(stars)), np.zeros(len(stars)),
+                   np.array([_STAR_PIXELS[s['size_cat']] for s in stars], dtype=float), True))
+    return [{'x': np.array([item['world_pos'][0] for item in items], dtype=float),
+             'y': np.array([item['world_pos'][1] for item in items], dtype=float),
+             'color': np.array(colors, dtype=float).reshape(-1, 3), 'opacity': np.asarray(opacity, dtype=float),
+             'side': side, 'min_px': np.broadcast_to(np.asarray(min_px, dtype=float), len(items)), 'centered': centered}
+            for items, colors, opacity, side, min_px, centered in layers]
+
+def _draw_density_tile(tile, layers, world_x, world_y, scale):
+    """
+    Composites the static layers seen from (world_x, world_y) at scale onto the square tile surface.
+    Per pixel, each layer's items are combined from their summed optical depth, so many faint blobs
+    blend much like drawing them one by one. Only the pixels an item touches are read and written.
+    """
+    size = tile.get_width()
+    pixels = pygame.surfarray.pixels3d(tile) # Locks the tile until this returns
+    margin = _MAX_SPLAT / scale # Items just outside the tile can still spill into it
+    for layer in layers:
+        inside = (layer['x'] >= world_x - margin) & (layer['x'] < world_x + size / scale) & \
+                 (layer['y'] >= world_y - margin) & (layer['y'] < world_y + size / scale)
+        if not inside.any(): continue
+        side_px = np.maximum(layer['side'][inside] * scale, layer['min_px'][inside])
+        width = np.clip(np.round(side_px), 1, _MAX_SPLAT).astype(np.int64)
+        # Opacity spread evenly over the width x width square; an item covering fraction c lets (1 - c) through.
+        coverage = np.minimum(layer['opacity'][inside] * side_px * side_px / (width * width), 0.99)
+        depth = -np.log1p(-coverage)
+        x0 = np.floor((layer['x'][inside] - world_x) * scale).astype(np.int64)
+        y0 = np.floor((layer['y'][inside] - world_y) * scale).astype(np.int64)
+        if layer['centered']: x0 -= width // 2; y0 -= width // 2
+        colors = layer['color'][inside]
+        index_parts, item_parts = [], []
+        for dx in range(int(width.max())):
+            for dy in range(int(width.max())):
+                items = np.nonzero(width > max(dx, dy))[0]
+                px, py = x0[items] + dx, y0[items] + dy
+                keep = (px >= 0) & (px < size) & (py >= 0) & (py < size)
+                index_parts.append(px[keep] * size + py[keep]); item_parts.append(items[keep])
+        index, items = np.concatenate(index_parts), np.concatenate(item_parts)
+        if index.size == 0: continue
+        hit, index = np.unique(index, return_inverse=True) # Only the pixels this layer touches
+        total = np.bincount(index, depth[items], hit.size)
+        mean = np.stack([np.bincount(index, depth[items] * colors[items, c], hit.size) for c in range(3)], axis=1)
+        transmitted = np.exp(-total)[:, None]
+        hit_x, hit_y = hit // size, hit % size
+        blended = pixels[hit_x, hit_y] * transmitted + mean / total[:, None] * (1.0 - transmitted)
+        pixels[hit_x, hit_y] = np.clip(blended, 0, 255).astype(np.uint8)
+
+def _star_index(galaxy):
+    """
+    Every star as arrays sorted by grid cell (row * grid_cols + column, in 'cells'), for _draw_star_layer:
+    the stars of a row of cells are one contiguous run. 'point' marks the stars narrow enough to be rasterized.
+    """
+    stars = galaxy.stars
+    x = np.array([s['world_pos'][0] for s in stars], dtype=float)
+    y = np.array([s['world_pos'][1] for s in stars], dtype=float)
+    # Same clamped cells as StaticGalaxy._get_grid_coords.
+    gx = np.clip(((x - galaxy.world_min_x) / CELL_SIZE).astype(np.int64), 0, galaxy.grid_cols - 1)
+    gy = np.clip(((y - galaxy.world_min_y) / CELL_SIZE).astype(np.int64), 0, galaxy.grid_rows - 1)
+    cells = gy * galaxy.grid_cols + gx
+    order = np.argsort(cells, kind='stable')
+    core = np.array([_STAR_PIXELS[s['size_cat']] for s in stars], dtype=np.int64)[order]
+    return {'x': x[order], 'y': y[order], 'items': [stars[i] for i in order.tolist()],
+            'color': np.array([s['color'] for s in stars], dtype=np.uint16).reshape(-1, 3)[order],
+            'core': core, 'point': core <= min(STAR_POINT_MAX_CORE, 2), # Wider cores are always sprites
+            'cells': cells[order]}
+
+def _rasterize_point_stars(surface, sx, sy, color, core, glow):
+    """
+    Writes small stars straight into surface's pixels: an additive cross of glow around each star's pixel
+    (its strength redrawn every frame, so the stars twinkle) and then its 1 or 2 px core over it.
+    """
+    global _twinkle
+    width, height = surface.get_size()
+    pixels = pygame.surfarray.pixels3d(surface) # Locks the surface until this returns
+    if glow != 'none':
+        if _twinkle is None: _twinkle = np.random.default_rng(rng.render.getrandbits(64))
+        glow_color = color * _twinkle.integers(25, 76, len(sx))[:, None] // 255 # Same alphas as star_sprite's glows
+        px = (sx[:, None] + _STAR_GLOW_DX).ravel(); py = (sy[:, None] + _STAR_GLOW_DY).ravel()
+        keep = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        px, py = px[keep], py[keep]
+        add = np.repeat(glow_color, len(_STAR_GLOW_DX), axis=0)[keep]
+        pixels[px, py] = np.minimum(pixels[px, py] + add, 255) # Saturating add; where glows overlap one wins
+    # Four core pixels per star; a 1 px core repeats its one pixel.
+    px = (sx[:, None] + _STAR_CORE_DX[core]).ravel(); py = (sy[:, None] + _STAR_CORE_DY[core]).ravel()
+    keep = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+    pixels[px[keep], py[keep]] = np.repeat(color, _STAR_CORE_DX.shape[1], axis=0)[keep]
+
+_static_galaxies = weakref.WeakValueDictionary() # Generator state the layers were made from -> StaticGalaxy
+_static_galaxies_lock = threading.Lock()
+
+def static_galaxy(generator):
+    """
+    The StaticGalaxy that generator (a Background's world stream, just before its static layers) makes, and
+    generator moved past it. One that is still in use by another Background of the same world is reused
+    instead of generated again; its end state stands in for the draws generating it would have made.
+    """
+    key = generator.getstate()
+    with _static_galaxies_lock: # A Background built beside the menu's waits for its galaxy rather than making another
+        galaxy = _static_galaxies.get(key)
+        if galaxy is None:
+            galaxy = _static_galaxies[key] = StaticGalaxy(generator)
+        else:
+            generator.setstate(galaxy.end_state)
+    return galaxy
+
+class StaticGalaxy:
+    """
+    The static layers of a world (stars, galactic gas and dust, distant planets) and the grid they are drawn
+    from. Nothing changes them once generated, so every Background of the same world shares one (see
+    static_galaxy()), along with the arrays built from them on first use.
+    """
+    def __init__(self, generator):
+        self._rng = generator # Only while generating
         self.world_min_x = WORLD_CENTER_X - WORLD_RADIUS
         self.world_min_y = WORLD_CENTER_Y - WORLD_RADIUS
-        self.world_width = WORLD_RADIUS * 2
-        self.world_height = WORLD_RADIUS * 2
-        self.grid_cols = math.ceil(self.world_width / CELL_SIZE)
-        self.grid_rows = math.ceil(self.world_height / CELL_SIZE)
-        self.grid = [[[] for _ in range(self.grid_cols)] for _ in range(self.grid_rows)]
-
-        self._all_stars_data = []
-        self._all_galactic_gas_data = []
-        self._all_dust_lanes_data = []
-        self._all_distant_planets_data = []
-        self.solar_system_planets = []
-        self.all_garbage_items = [] # Master list of all garbage, populated by generation methods
-
-        self.sun_data = {
-            'type': 'sun', 'world_pos': (WORLD_CENTER_X, WORLD_CENTER_Y),
-            'radius': SUN_RADIUS, 'color': SUN_COLOR
-        }
-        # Max radius a garbage item can have (half of its max size), for boundary checks.
-        self.max_garbage_radius = GARBAGE_SIZE_RANGE[1] / 2.0
-
-
-        self._generate_solar_system_orbiting_planets()
+        self.grid_cols = math.ceil(WORLD_RADIUS * 2 / CELL_SIZE)
+        self.grid_rows = math.ceil(WORLD_RADIUS * 2 / CELL_SIZE)
+        self.grid = {} # (column, row) -> static items in that cell; only cells holding any are present
+        self._density_layers = None # Static items as arrays for density tiles, built on first use
+        self._star_index = None # Stars as arrays sorted by grid cell, built on first use
+
+        self.stars = []
+        self.gas_blobs = []
+        self.dust_blobs = []
+        self.distant_planets = []
         self._generate_galactic_band_data()
         self._generate_outer_stars_data()
         self._generate_distant_planets_data()
-        self._generate_general_garbage()
+        self.end_state = generator.getstate()
+        del self._rng
         self._populate_grid() # Populates grid with static elements for efficient rendering
 
+    def density_layers(self):
+        """The layers as arrays for _draw_density_tile."""
+        if self._density_layers is None: self._density_layers = _density_layers(self)
+        return self._density_layers
+
+    def star_index(self):
+        """The stars as arrays sorted by grid cell (see _star_index)."""
+        if self._star_index is None: self._star_index = _star_index(self)
+        return self._star_index
 
     def _get_grid_coords(self, world_x, world_y):
         """Converts world coordinates to grid cell indices, clamping to grid bounds."""
@@ -109,166 +253,41 @@ class Background:
     def _populate_grid(self):
         """Adds static background elements (stars, gas, dust, distant planets) to the spatial grid."""
         # Sun and orbiting planets are dynamic or drawn separately, not added to this static grid.
-        all_static_elements = self._all_stars_data + self._all_galactic_gas_data + \
-                              self._all_dust_lanes_data + self._all_distant_planets_data
+        all_static_elements = self.stars + self.gas_blobs + self.dust_blobs + self.distant_planets
+        for i, item in enumerate(self.gas_blobs + self.dust_blobs):
+            # Golden-ratio sequence: any density threshold keeps an evenly spread subset of the blobs.
+            item['lod_rank'] = (i * 0.6180339887498949) % 1.0
         for item in all_static_elements:
             gx, gy = self._get_grid_coords(item['world_pos'][0], item['world_pos'][1])
             # The _get_grid_coords clamps, so indices should be valid.
-            self.grid[gy][gx].append(item)
-
-    def _is_position_colliding_with_celestial(self, x, y, item_radius):
-        """Checks if a circular item at (x,y) with item_radius would overlap the sun or solar system planets."""
-        sun_dist_sq = (x - WORLD_CENTER_X)**2 + (y - WORLD_CENTER_Y)**2
-        if sun_dist_sq < (SUN_RADIUS + item_radius)**2:
-            return True
-        for p_data in self.solar_system_planets: # Assumes solar_system_planets are generated before this is heavily used by garbage
-            planet_x, planet_y = p_data['world_pos']
-            planet_radius = p_data['radius']
-            dist_sq_to_planet = (x - planet_x)**2 + (y - planet_y)**2
-            if dist_sq_to_planet < (planet_radius + item_radius)**2:
-                return True
-        return False
+            self.grid.setdefault((gx, gy), []).append(item)
 
     def _generate_element_in_world_circle(self, radius_factor=1.0, min_radius_factor=0.0):
         """Generates a random (x, y) position within a specified annulus of the world, uniformly distributed by area."""
-        angle = random.uniform(0, 2 * math.pi)
+        angle = self._rng.uniform(0, 2 * math.pi)
         # Square root of uniform random for radius squared ensures uniform area distribution.
-        r_norm = math.sqrt(random.uniform(min_radius_factor**2, radius_factor**2))
+        r_norm = math.sqrt(self._rng.uniform(min_radius_factor**2, radius_factor**2))
         r = WORLD_RADIUS * r_norm
         x = WORLD_CENTER_X + r * math.cos(angle)
         y = WORLD_CENTER_Y + r * math.sin(angle)
         return int(x), int(y)
 
-    def _generate_garbage_around_point(self, center_x, center_y, object_radius, count):
-        """Generates a cluster of garbage items in an annulus around a central point (e.g., a planet)."""
-        for _ in range(count):
-            for attempt in range(20): # Try a few times to place each garbage item
-                min_r_from_center = object_radius + MIN_DIST_GARBAGE_FROM_PLANET_SURFACE
-                max_r_from_center = object_radius + object_radius * PLANET_GARBAGE_ZONE_RADIUS_FACTOR
-
-                if max_r_from_center <= min_r_from_center: # Ensure a valid range for distance generation
-                    max_r_from_center = min_r_from_center + 100
-
-                angle = random.uniform(0, 2 * math.pi)
-                distance = math.sqrt(random.uniform(min_r_from_center**2, max_r_from_center**2)) # Uniform area distribution
-
-                gx = center_x + distance * math.cos(angle)
-                gy = center_y + distance * math.sin(angle)
-
-                # Boundary Check: Ensure new garbage is fully within WORLD_RADIUS
-                dist_from_world_core = math.hypot(gx - WORLD_CENTER_X, gy - WORLD_CENTER_Y)
-                if dist_from_world_core + self.max_garbage_radius >= WORLD_RADIUS:
-                    continue # Position is too close to or outside world boundary; try new position
-
-                # Celestial Collision Check (using max garbage radius for conservative placement)
-                if not self._is_position_colliding_with_celestial(gx, gy, self.max_garbage_radius):
-                    self.all_garbage_items.append(Garbage(gx, gy))
-                    break # Successfully placed, move to next garbage item
-
-    def _generate_solar_system_orbiting_planets(self):
-        """Generates planets that orbit the central sun, ensuring unique orbital radii."""
-        planet_colors_ss = [(150,100,50), (100,150,100), (100,100,200), (200,150,100), (180,180,180)]
-        min_planet_radius, max_planet_radius = 800, 2000
-        available_orbital_span = MAX_ORBIT_RADIUS - MIN_ORBIT_RADIUS
-
-        num_planets_for_spacing = NUM_SOLAR_SYSTEM_PLANETS if NUM_SOLAR_SYSTEM_PLANETS > 0 else 1
-        avg_spacing_needed = available_orbital_span / num_planets_for_spacing
-        if avg_spacing_needed <= 0 and NUM_SOLAR_SYSTEM_PLANETS > 0 : # Handle case where MAX_ORBIT_RADIUS is too small
-             avg_spacing_needed = (min_planet_radius + max_planet_radius) # Fallback reasonable spacing
-
-        current_orbit_base = MIN_ORBIT_RADIUS
-        generated_orbit_radii_info = []
-
-        for i in range(NUM_SOLAR_SYSTEM_PLANETS):
-            planet_radius = random.randint(min_planet_radius, max_planet_radius)
-            chosen_orbit_radius = -1
-
-            for _ in range(20): # Attempts to find a non-colliding orbit for the current planet
-                # Define a potential orbital segment for this planet
-                seg_start = current_orbit_base + i * avg_spacing_needed
-                seg_end = current_orbit_base + (i + 1) * avg_spacing_needed - (planet_radius * 2.5) # Buffer for next planet
-
-                seg_end = min(seg_end, MAX_ORBIT_RADIUS - planet_radius) # Orbit must be within max_orbit_radius
-                seg_start = min(seg_start, seg_end - 100) # Ensure seg_start is meaningfully less than seg_end
-                seg_start = max(seg_start, MIN_ORBIT_RADIUS + planet_radius) # Orbit must be beyond min_orbit_radius
-
-                test_r = random.uniform(seg_start, seg_end) if seg_start < seg_end else current_orbit_base + planet_radius + random.uniform(100,300)
-
-                test_r = max(MIN_ORBIT_RADIUS + planet_radius, test_r) # Clamp to lower bound considering planet size
-                test_r = min(MAX_ORBIT_RADIUS - planet_radius, test_r) # Clamp to upper bound considering planet size
-
-                is_too_close = False
-                for prev_info in generated_orbit_radii_info:
-                    min_dist_between_planets = prev_info['radius'] + planet_radius + 300 # Minimum separation buffer
-                    if abs(test_r - prev_info['orbit_radius']) < min_dist_between_planets:
-                        is_too_close = True; break
-                if not is_too_close: chosen_orbit_radius = test_r; break
-
-            if chosen_orbit_radius == -1: # Fallback if no suitable distinct orbit was found easily
-                last_r_edge = generated_orbit_radii_info[-1]['orbit_radius'] + generated_orbit_radii_info[-1]['radius'] if generated_orbit_radii_info else MIN_ORBIT_RADIUS
-                chosen_orbit_radius = last_r_edge + planet_radius + random.uniform(300, 600)
-                chosen_orbit_radius = min(chosen_orbit_radius, MAX_ORBIT_RADIUS - planet_radius)
-                chosen_orbit_radius = max(chosen_orbit_radius, MIN_ORBIT_RADIUS + planet_radius)
-
-            generated_orbit_radii_info.append({'orbit_radius': chosen_orbit_radius, 'radius': planet_radius})
-            angle = random.uniform(0, 2 * math.pi)
-
-            # Planets further out orbit slower for a more natural feel
-            speed_numerator = random.uniform(0.008, 0.02)
-            speed_denominator = 1 + (chosen_orbit_radius / MAX_ORBIT_RADIUS) * 3
-            orbit_speed = speed_numerator / speed_denominator if speed_denominator > 0 else speed_numerator
-
-            px = WORLD_CENTER_X + chosen_orbit_radius * math.cos(angle)
-            py = WORLD_CENTER_Y + chosen_orbit_radius * math.sin(angle)
-            self.solar_system_planets.append({
-                'type': 'solar_system_planet', 'world_pos': [px, py], 'radius': planet_radius,
-                'color': random.choice(planet_colors_ss), 'orbit_radius': chosen_orbit_radius,
-                'orbit_speed': orbit_speed, 'current_orbit_angle': angle
-            })
-            self._generate_garbage_around_point(px, py, planet_radius, GARBAGE_PER_PLANET_CLUSTER)
-            current_orbit_base = chosen_orbit_radius + planet_radius # Update base for next planet's placement consideration
-
-    def _generate_general_garbage(self):
-        """Scatters general garbage items throughout the world, ensuring they are within bounds."""
-        for _ in range(NUM_GENERAL_GARBAGE):
-            for attempt in range(20):
-                # Min radius factor for general garbage: avoid Sun's immediate proximity, account for garbage size
-                min_r_factor_from_center = (SUN_RADIUS + 200 + self.max_garbage_radius) / WORLD_RADIUS if WORLD_RADIUS > 0 else 0.1
-                # Max radius factor: ensure garbage center allows its edge to be within world boundary
-                max_r_factor_from_center = (WORLD_RADIUS - self.max_garbage_radius) / WORLD_RADIUS if WORLD_RADIUS > 0 else 0.95
-
-                if min_r_factor_from_center >= max_r_factor_from_center :
-                    # Fallback if world is too small for these rules, place more freely but still try to be inside
-                    gx, gy = self._generate_element_in_world_circle(0.95, 0.1)
-                else:
-                    gx, gy = self._generate_element_in_world_circle(max_r_factor_from_center, min_r_factor_from_center)
-
-                # The generation with max_r_factor_from_center should place the center appropriately.
-                # A direct check is still good for robustness.
-                dist_from_world_core = math.hypot(gx - WORLD_CENTER_X, gy - WORLD_CENTER_Y)
-                if dist_from_world_core + self.max_garbage_radius >= WORLD_RADIUS:
-                    continue # This position would place garbage outside bounds; try again
-
-                if not self._is_position_colliding_with_celestial(gx, gy, self.max_garbage_radius):
-                    self.all_garbage_items.append(Garbage(gx, gy))
-                    break # Successfully placed
-
     def _generate_galactic_band_data(self):
         """Generates a visually dense band of stars, gas, and dust across the world."""
         num_segments = 32; path_points = []
         path_start_x = WORLD_CENTER_X - WORLD_RADIUS*0.8; path_end_x = WORLD_CENTER_X + WORLD_RADIUS*0.8
-        current_y = WORLD_CENTER_Y + random.randint(-WORLD_RADIUS//4, WORLD_RADIUS//4)
+        current_y = WORLD_CENTER_Y + self._rng.randint(-WORLD_RADIUS//4, WORLD_RADIUS//4)
         path_points.append((path_start_x, current_y))
         for i in range(1,num_segments+1):
             px = path_start_x+(i/num_segments)*(path_end_x-path_start_x); py_offset_scale=WORLD_RADIUS/2.5
-            py_offset=math.sin(i/num_segments*math.pi*random.uniform(1.5,2.5)+random.uniform(-0.5,0.5))*py_offset_scale
-            py_drift=random.randint(-WORLD_RADIUS//15, WORLD_RADIUS//15); current_y=current_y+py_drift/num_segments
+            py_offset=math.sin(i/num_segments*math.pi*self._rng.uniform(1.5,2.5)+self._rng.uniform(-0.5,0.5))*py_offset_scale
+            py_drift=self._rng.randint(-WORLD_RADIUS//15, WORLD_RADIUS//15); current_y=current_y+py_drift/num_segments
             py=max(WORLD_CENTER_Y-WORLD_RADIUS*0.4,min(WORLD_CENTER_Y+WORLD_RADIUS*0.4, current_y+py_offset))
             path_points.append((int(px),int(py)))
-        path_points.append((path_end_x,WORLD_CENTER_Y+random.randint(-WORLD_RADIUS//4,WORLD_RADIUS//4)))
+        path_points.append((path_end_x,WORLD_CENTER_Y+self._rng.randint(-WORLD_RADIUS//4,WORLD_RADIUS//4)))
 
         band_colors=[(255,220,180),(255,200,150),(240,180,120),(255,150,100),(230,120,80)]
-        num_gas_blobs=2000; band_thickness=WORLD_RADIUS/random.uniform(4.0,6.0)
+        num_gas_blobs=2000; band_thickness=WORLD_RADIUS/self._rng.uniform(4.0,6.0)
 
         # Populate gas blobs along the generated path
         for i in range(len(path_points)-1):
@@ -278,13 +297,13 @@ class Background:
             world_segment_equiv = ((WORLD_RADIUS * 2) / (num_segments if num_segments > 0 else 1)) # Avg segment length across world width
             seg_blobs = int(seg_blobs_density * (seg_len / world_segment_equiv if world_segment_equiv > 0 else 1))
             for _ in range(seg_blobs):
-                t=random.random(); cur_pos=p1.lerp(p2,t)
-                dist=random.normalvariate(0,band_thickness/2.5); dist=max(-band_thickness*0.8,min(band_thickness*0.8,dist))
+                t=self._rng.random(); cur_pos=p1.lerp(p2,t)
+                dist=self._rng.normalvariate(0,band_thickness/2.5); dist=max(-band_thickness*0.8,min(band_thickness*0.8,dist))
                 perp=(p2-p1).rotate(90).normalize() if (p2-p1).length_squared()>0 else pygame.math.Vector2(0,1)
-                blob_pos=cur_pos+perp*dist+pygame.math.Vector2(random.uniform(-10,10),random.uniform(-10,10))
-                s=pygame.Surface((random.randint(5,15),random.randint(5,15)),pygame.SRCALPHA)
-                c=random.choice(band_colors); s.fill((c[0],c[1],c[2],random.randint(10,40)))
-                self._all_galactic_gas_data.append({'type':'gas_blob','surface':s,'world_pos':(int(blob_pos.x),int(blob_pos.y))})
+                blob_pos=cur_pos+perp*dist+pygame.math.Vector2(self._rng.uniform(-10,10),self._rng.uniform(-10,10))
+                s=pygame.Surface((self._rng.randint(5,15),self._rng.randint(5,15)),pygame.SRCALPHA)
+                c=self._rng.choice(band_colors); s.fill((c[0],c[1],c[2],self._rng.randint(10,40)))
+                self.gas_blobs.append({'type':'gas_blob','surface':s,'world_pos':(int(blob_pos.x),int(blob_pos.y))})
 
         num_band_stars=2000; star_colors_band=[(255,255,240),(255,240,220),(255,200,200),(200,220,255)]
         # Populate stars in the band
@@ -295,14 +314,14 @@ class Background:
             world_segment_equiv = ((WORLD_RADIUS * 2) / (num_segments if num_segments > 0 else 1))
             seg_stars = int(seg_stars_density * (seg_len / world_segment_equiv if world_segment_equiv > 0 else 1))
             for _ in range(seg_stars):
-                t=random.random();cur_pos=p1.lerp(p2,t)
-                dist=random.normalvariate(0,band_thickness/1.5); dist=max(-band_thickness*1.2,min(band_thickness*1.2,dist))
+                t=self._rng.random();cur_pos=p1.lerp(p2,t)
+                dist=self._rng.normalvariate(0,band_thickness/1.5); dist=max(-band_thickness*1.2,min(band_thickness*1.2,dist))
                 perp=(p2-p1).rotate(90).normalize() if (p2-p1).length_squared()>0 else pygame.math.Vector2(0,1)
-                star_pos=cur_pos+perp*dist+pygame.math.Vector2(random.uniform(-30,30),random.uniform(-30,30))
+                star_pos=cur_pos+perp*dist+pygame.math.Vector2(self._rng.uniform(-30,30),self._rng.uniform(-30,30))
                 if math.hypot(star_pos.x-WORLD_CENTER_X,star_pos.y-WORLD_CENTER_Y)<=WORLD_RADIUS: # Ensure within world
-                    cat=random.choice(['small','medium','medium','large']); c=random.choice(star_colors_band)
-                    mod=random.uniform(0.8,1.2); final_c=(min(255,int(c[0]*mod)),min(255,int(c[1]*mod)),min(255,int(c[2]*mod)))
-                    self._all_stars_data.append({'type':'star','world_pos':(int(star_pos.x),int(star_pos.y)),'color':final_c,'size_cat':cat})
+                    cat=self._rng.choice(['small','medium','medium','large']); c=self._rng.choice(star_colors_band)
+                    mod=self._rng.uniform(0.8,1.2); final_c=(min(255,int(c[0]*mod)),min(255,int(c[1]*mod)),min(255,int(c[2]*mod)))
+                    self.stars.append({'type':'star','world_pos':(int(star_pos.x),int(star_pos.y)),'color':final_c,'size_cat':cat})
 
         num_dust_lanes=6000; dust_color=(20,15,10)
         # Populate dust lanes
@@ -313,30 +332,30 @@ class Background:
             world_segment_equiv = ((WORLD_RADIUS * 2) / (num_segments if num_segments > 0 else 1))
             seg_dust = int(seg_dust_density * (seg_len / world_segment_equiv if world_segment_equiv > 0 else 1))
             for _ in range(seg_dust):
-                t=random.random();cur_pos=p1.lerp(p2,t)
-                dist=random.normalvariate(0,band_thickness/2.5); dist=max(-band_thickness*0.7,min(band_thickness*0.7,dist))
-                perp=(p2-p1).rotate(random.choice([-80,-90,-100,80,90,100])).normalize() if (p2-p1).length_squared()>0 else pygame.math.Vector2(0,1)
-                dust_pos=cur_pos+perp*dist+pygame.math.Vector2(random.uniform(-15,15),random.uniform(-15,15))
+                t=self._rng.random();cur_pos=p1.lerp(p2,t)
+                dist=self._rng.normalvariate(0,band_thickness/2.5); dist=max(-band_thickness*0.7,min(band_thickness*0.7,dist))
+                perp=(p2-p1).rotate(self._rng.choice([-80,-90,-100,80,90,100])).normalize() if (p2-p1).length_squared()>0 else pygame.math.Vector2(0,1)
+                dust_pos=cur_pos+perp*dist+pygame.math.Vector2(self._rng.uniform(-15,15),self._rng.uniform(-15,15))
                 if math.hypot(dust_pos.x-WORLD_CENTER_X,dust_pos.y-WORLD_CENTER_Y)<=WORLD_RADIUS: # Ensure within world
-                    s=pygame.Surface((random.randint(8,25),random.randint(8,25)),pygame.SRCALPHA)
-                    s.fill((dust_color[0],dust_color[1],dust_color[2],random.randint(50,120)))
-                    self._all_dust_lanes_data.append({'type':'dust_blob','surface':s,'world_pos':(int(dust_pos.x),int(dust_pos.y))})
+                    s=pygame.Surface((self._rng.randint(8,25),self._rng.randint(8,25)),pygame.SRCALPHA)
+                    s.fill((dust_color[0],dust_color[1],dust_color[2],self._rng.randint(50,120)))
+                    self.dust_blobs.append({'type':'dust_blob','surface':s,'world_pos':(int(dust_pos.x),int(dust_pos.y))})
 
     def _generate_outer_stars_data(self):
         """Generates stars in the sparser, outer regions of the game world."""
         num_outer_stars = 20000
         star_colors_outer = [(200,200,220), (180,180,200), (220,220,255)]
         for _ in range(num_outer_stars):
-            angle=random.uniform(0,2*math.pi)
+            angle=self._rng.uniform(0,2*math.pi)
             # Distribute more stars towards the outer edge (sqrt for area uniformity)
-            r_norm = 0.4 + (1.0 - 0.4) * math.sqrt(random.random())
+            r_norm = 0.4 + (1.0 - 0.4) * math.sqrt(self._rng.random())
             r=WORLD_RADIUS*r_norm
             x=int(WORLD_CENTER_X+r*math.cos(angle)); y=int(WORLD_CENTER_Y+r*math.sin(angle))
             # r_norm should keep stars within bounds, but an explicit check is harmless for robustness
             if math.hypot(x-WORLD_CENTER_X,y-WORLD_CENTER_Y) <= WORLD_RADIUS:
-                cat=random.choice(['small','small','medium']); c=random.choice(star_colors_outer)
-                mod=random.uniform(0.5,0.9); final_c=(min(255,int(c[0]*mod)),min(255,int(c[1]*mod)),min(255,int(c[2]*mod)))
-                self._all_stars_data.append({'type':'star','world_pos':(x,y),'color':final_c,'size_cat':cat})
+                cat=self._rng.choice(['small','small','medium']); c=self._rng.choice(star_colors_outer)
+                mod=self._rng.uniform(0.5,0.9); final_c=(min(255,int(c[0]*mod)),min(255,int(c[1]*mod)),min(255,int(c[2]*mod)))
+                self.stars.append({'type':'star','world_pos':(x,y),'color':final_c,'size_cat':cat})
 
     def _generate_distant_planets_data(self):
         """Generates small, decorative planets for the distant background."""
@@ -345,24 +364,194 @@ class Background:
         for _ in range(num_distant_planets):
             # Generate within 95% of world radius to keep them "distant"
             x,y=self._generate_element_in_world_circle(0.95)
-            radius=random.randint(3,7)
+            radius=self._rng.randint(3,7)
             # Avoid cluttering the central y-band if a galactic band is prominent there
             if (WORLD_CENTER_Y-WORLD_RADIUS*0.2) < y < (WORLD_CENTER_Y+WORLD_RADIUS*0.2):
-                if random.random() < 0.7: continue # 70% chance to skip if in this band
-            self._all_distant_planets_data.append({'type':'distant_planet','world_pos':(x,y),'radius':radius,'color':random.choice(planet_colors)})
+                if self._rng.random() < 0.7: continue # 70% chance to skip if in this band
+            self.distant_planets.append({'type':'distant_planet','world_pos':(x,y),'radius':radius,'color':self._rng.choice(planet_colors)})
+
+class Background:
+    """
+    Manages procedural generation and rendering of the game's environment,
+    including celestial bodies, decorative elements, and initial garbage distribution.
+    The decorative layers are a StaticGalaxy, shared with other Backgrounds of the same world.
+    """
+    def __init__(self, seed=None):
+        self.bg_color = (15, 0, 30) # Deep space color.
+
+        # All generation draws from a private stream so the same seed always yields the same world.
+        self.seed = seed if seed is not None else rng.new_seed()
+        self._rng = random.Random(self.seed)
 
-    def update(self, dt):
-        """Updates positions of orbiting planets and handles garbage interactions."""
-        # Update orbiting planets
-        for p_data in self.solar_system_planets:
-            p_data['current_orbit_angle'] += p_data['orbit_speed'] * dt
-            p_data['world_pos'][0] = WORLD_CENTER_X + p_data['orbit_radius'] * math.cos(p_data['current_orbit_angle'])
-            p_data['world_pos'][1] = WORLD_CENTER_Y + p_data['orbit_radius'] * math.sin(p_data['current_orbit_angle'])
+        self.world_min_x = WORLD_CENTER_X - WORLD_RADIUS
+        self.world_min_y = WORLD_CENTER_Y - WORLD_RADIUS
+        self.world_width = WORLD_RADIUS * 2
+        self.world_height = WORLD_RADIUS * 2
+        self._scaled_blob_cache = {} # blob surface -> copy resized for _blob_cache_scale
+        self._blob_cache_scale = None
+        self._body_sprites = {} # body index (0 = sun) -> ((radius, color), BodySprite)
+        self._static_tiles = {} # (scale, column, row) -> tile Surface or None, least recently drawn first
+
+        self.solar_system_planets = []
+        self.all_garbage_items = [] # Master list of all garbage, populated by generation methods
+        self.garbage_pool = None # GarbagePool that removed garbage is returned to (endless mode)
+
+        self.sun_data = {
+            'type': 'sun', 'world_pos': (WORLD_CENTER_X, WORLD_CENTER_Y),
+            'radius': SUN_RADIUS, 'color': SUN_COLOR
+        }
+        # Max radius a garbage item can have (half of its max size), for boundary checks.
+        self.max_garbage_radius = GARBAGE_SIZE_RANGE[1] / 2.0
+
+
+        # Star systems: the home system at the world centre, then any others (config.NUM_STAR_SYSTEMS).
+        self.systems = [{'center': (WORLD_CENTER_X, WORLD_CENTER_Y), 'radius': SYSTEM_RADIUS, 'sun': self.sun_data, 'planets': []}]
+        self.suns = [self.sun_data]
+        self._system_garbage = [[]] # Garbage placed so far in each system, while generating
+        self._generate_solar_system_orbiting_planets(0)
+        self._generate_star_systems()
+        self.static = static_galaxy(self._rng) # Stars, gas, dust and distant planets
+        self._generate_general_garbage()
+        del self._system_garbage
+        self.celestial = CelestialIndex(self.systems, self.solar_system_planets)
+
+
+    def _celestial_exclusions(self, system):
+        """A system's sun and planets as discs garbage must stay out of, widened by the largest garbage radius."""
+        return [(b['world_pos'][0], b['world_pos'][1], b['radius'] + self.max_garbage_radius)
+                for b in [system['sun']] + system['planets']]
+
+    def _place_garbage(self, k, center_x, center_y, r_min, r_max, count):
+        """
+        Adds count garbage items to system k, Poisson-disk spaced over an annulus, clear of the system's bodies,
+        its other garbage and its edge (the world's, for a single system).
+        """
+        system = self.systems[k]
+        xs, ys = poisson_disk_annulus(self._rng, count, center_x, center_y, r_min, r_max,
+                                      exclusions=self._celestial_exclusions(system),
+                                      bound=(system['center'][0], system['center'][1], system['radius'] - self.max_garbage_radius),
+                                      min_spacing=GARBAGE_MIN_SPACING, occupied=self._system_garbage[k])
+        if len(xs) < count:
+            print(f"Warning: only room for {len(xs)} of {count} garbage items around ({center_x:.0f}, {center_y:.0f}).")
+        for gx, gy in zip(xs.tolist(), ys.tolist()):
+            G_item = Garbage(gx, gy, rng=self._rng)
+            self.all_garbage_items.append(G_item); self._system_garbage[k].append(G_item)
+
+    def _generate_garbage_around_point(self, k, center_x, center_y, object_radius, count):
+        """Generates a cluster of garbage items in an annulus around a central point (e.g., a planet) of system k."""
+        min_r_from_center = object_radius + MIN_DIST_GARBAGE_FROM_PLANET_SURFACE
+        max_r_from_center = object_radius + object_radius * PLANET_GARBAGE_ZONE_RADIUS_FACTOR
+        if max_r_from_center <= min_r_from_center: # Ensure a valid range for distance generation
+            max_r_from_center = min_r_from_center + 100
+        self._place_garbage(k, center_x, center_y, min_r_from_center, max_r_from_center, count)
+
+    def _generate_star_systems(self):
+        """Spreads the other star systems over the world, Poisson-disk spaced so their discs never overlap."""
+        if NUM_STAR_SYSTEMS < 2: return
+        xs, ys = poisson_disk_annulus(self._rng, NUM_STAR_SYSTEMS - 1, WORLD_CENTER_X, WORLD_CENTER_Y, 2 * SYSTEM_RADIUS,
+                                      WORLD_RADIUS, bound=(WORLD_CENTER_X, WORLD_CENTER_Y, WORLD_RADIUS - SYSTEM_RADIUS),
+                                      min_spacing=2 * SYSTEM_RADIUS)
+        if len(xs) < NUM_STAR_SYSTEMS - 1:
+            print(f"Warning: only room for {len(xs) + 1} of {NUM_STAR_SYSTEMS} star systems.")
+        for center_x, center_y in zip(xs.tolist(), ys.tolist()):
+            sun = {'type': 'sun', 'world_pos': (center_x, center_y), 'radius': SUN_RADIUS, 'color': SUN_COLOR}
+            self.systems.append({'center': (center_x, center_y), 'radius': SYSTEM_RADIUS, 'sun': sun, 'planets': []})
+            self.suns.append(sun); self._system_garbage.append([])
+            self._generate_solar_system_orbiting_planets(len(self.systems) - 1)
+
+    def _generate_solar_system_orbiting_planets(self, k):
+        """Generates planets that orbit system k's sun, ensuring unique orbital radii."""
+        system = self.systems[k]
+        center_x, center_y = system['center']
+        planet_colors_ss = [(150,100,50), (100,150,100), (100,100,200), (200,150,100), (180,180,180)]
+        min_planet_radius, max_planet_radius = 800, 2000
+        available_orbital_span = MAX_ORBIT_RADIUS - MIN_ORBIT_RADIUS
+
+        num_planets_for_spacing = NUM_SOLAR_SYSTEM_PLANETS if NUM_SOLAR_SYSTEM_PLANETS > 0 else 1
+        avg_spacing_needed = available_orbital_span / num_planets_for_spacing
+        if avg_spacing_needed <= 0 and NUM_SOLAR_SYSTEM_PLANETS > 0 : # Handle case where MAX_ORBIT_RADIUS is too small
+             avg_spacing_needed = (min_planet_radius + max_planet_radius) # Fallback reasonable spacing
+
+        current_orbit_base = MIN_ORBIT_RADIUS
+        generated_orbit_radii_info = []
+
+        for i in range(NUM_SOLAR_SYSTEM_PLANETS):
+            planet_radius = self._rng.randint(min_planet_radius, max_planet_radius)
+            chosen_orbit_radius = -1
+
+            for _ in range(20): # Attempts to find a non-colliding orbit for the current planet
+                # Define a potential orbital segment for this planet
+                seg_start = current_orbit_base + i * avg_spacing_needed
+                seg_end = current_orbit_base + (i + 1) * avg_spacing_needed - (planet_radius * 2.5) # Buffer for next planet
+
+                seg_end = min(seg_end, MAX_ORBIT_RADIUS - planet_radius) # Orbit must be within max_orbit_radius
+                seg_start = min(seg_start, seg_end - 100) # Ensure seg_start is meaningfully less than seg_end
+                seg_start = max(seg_start, MIN_ORBIT_RADIUS + planet_radius) # Orbit must be beyond min_orbit_radius
+
+                test_r = self._rng.uniform(seg_start, seg_end) if seg_start < seg_end else current_orbit_base + planet_radius + self._rng.uniform(100,300)
+
+                test_r = max(MIN_ORBIT_RADIUS + planet_radius, test_r) # Clamp to lower bound considering planet size
+                test_r = min(MAX_ORBIT_RADIUS - planet_radius, test_r) # Clamp to upper bound considering planet size
+
+                is_too_close = False
+                for prev_info in generated_orbit_radii_info:
+                    min_dist_between_planets = prev_info['radius'] + planet_radius + 300 # Minimum separation buffer
+                    if abs(test_r - prev_info['orbit_radius']) < min_dist_between_planets:
+                        is_too_close = True; break
+                if not is_too_close: chosen_orbit_radius = test_r; break
+
+            if chosen_orbit_radius == -1: # Fallback if no suitable distinct orbit was found easily
+                last_r_edge = generated_orbit_radii_info[-1]['orbit_radius'] + generated_orbit_radii_info[-1]['radius'] if generated_orbit_radii_info else MIN_ORBIT_RADIUS
+                chosen_orbit_radius = last_r_edge + planet_radius + self._rng.uniform(300, 600)
+                chosen_orbit_radius = min(chosen_orbit_radius, MAX_ORBIT_RADIUS - planet_radius)
+                chosen_orbit_radius = max(chosen_orbit_radius, MIN_ORBIT_RADIUS + planet_radius)
+
+            generated_orbit_radii_info.append({'orbit_radius': chosen_orbit_radius, 'radius': planet_radius})
+            angle = self._rng.uniform(0, 2 * math.pi)
+
+            # Planets further out orbit slower for a more natural feel
+            speed_numerator = self._rng.uniform(0.008, 0.02)
+            speed_denominator = 1 + (chosen_orbit_radius / MAX_ORBIT_RADIUS) * 3
+            orbit_speed = speed_numerator / speed_denominator if speed_denominator > 0 else speed_numerator
+
+            px = center_x + chosen_orbit_radius * math.cos(angle)
+            py = center_y + chosen_orbit_radius * math.sin(angle)
+            planet = {
+                'type': 'solar_system_planet', 'world_pos': [px, py], 'radius': planet_radius,
+                'color': self._rng.choice(planet_colors_ss), 'orbit_radius': chosen_orbit_radius,
+                'orbit_speed': orbit_speed, 'current_orbit_angle': angle, 'system': k
+            }
+            self.solar_system_planets.append(planet); system['planets'].append(planet)
+            self._generate_garbage_around_point(k, px, py, planet_radius, GARBAGE_PER_PLANET_CLUSTER)
+            current_orbit_base = chosen_orbit_radius + planet_radius # Update base for next planet's placement consideration
+
+    def _generate_general_garbage(self, count=NUM_GENERAL_GARBAGE):
+        """Scatters count general garbage items throughout each star system, ensuring they are within bounds."""
+        # Avoid the sun's immediate proximity; the edge is kept clear through the sampler's bound.
+        min_r_from_center = SUN_RADIUS + 200 + self.max_garbage_radius
+        for k, system in enumerate(self.systems):
+            self._place_garbage(k, system['center'][0], system['center'][1], min_r_from_center, system['radius'], count)
+
+    def update(self, dt, frame=None):
+        """
+        Updates positions of orbiting planets and handles garbage interactions. numpy first finds the few items
+        touching a body or outside the world, from frame (a WorldFrame holding the garbage as it is now) if given.
+        Each item is only checked against the bodies of the star system it is in.
+        """
+        self.celestial.advance(dt) # Update orbiting planets
 
         items_to_remove = [] # For garbage that gets pushed out of bounds
-        for i, G_item in enumerate(self.all_garbage_items):
+        if frame is not None:
+            checked = self._garbage_near_bodies(frame.garbage_x, frame.garbage_y, frame.garbage_size)
+        else:
+            items, count = self.all_garbage_items, len(self.all_garbage_items)
+            checked = self._garbage_near_bodies(np.fromiter((G_item.world_x for G_item in items), dtype=float, count=count),
+                                                np.fromiter((G_item.world_y for G_item in items), dtype=float, count=count),
+                                                np.fromiter((G_item.size for G_item in items), dtype=float, count=count))
+        for i in checked:
+            G_item = self.all_garbage_items[i]
             # Simple collision response: push garbage out from overlapping sun/planets
-            for celestial_body_data in [self.sun_data] + self.solar_system_planets:
+            for celestial_body_data in self.celestial.bodies_at(G_item.world_x, G_item.world_y):
                 cb_x, cb_y = celestial_body_data['world_pos']
                 cb_r = celestial_body_data['radius']
 
@@ -372,69 +561,243 @@ class Background:
                 combined_radius = cb_r + G_item.size / 2.0
 
                 if dist_sq < combined_radius**2 and dist_sq > 1e-6: # Check for overlap
+                    if G_item.vx or G_item.vy: # Drifting debris burns up instead of piling up against the body
+                        items_to_remove.append(i); break
                     dist = math.sqrt(dist_sq)
                     overlap = combined_radius - dist
                     push_factor = overlap / dist * 0.5 # Push by half the overlap distance
                     G_item.world_x += dx * push_factor
                     G_item.world_y += dy * push_factor
                     G_item.rect.center = (G_item.world_x, G_item.world_y)
-
-            # Check if garbage was pushed out of world bounds after interactions
-            dist_from_center = math.hypot(G_item.world_x - WORLD_CENTER_X, G_item.world_y - WORLD_CENTER_Y)
-            # Remove if its center is significantly beyond the world radius
-            if dist_from_center > WORLD_RADIUS + G_item.size:
-                 items_to_remove.append(i)
+            else:
+                # Check if garbage was pushed (or drifted) out of world bounds after interactions
+                dist_from_center = math.hypot(G_item.world_x - WORLD_CENTER_X, G_item.world_y - WORLD_CENTER_Y)
+                # Remove if its center is significantly beyond the world radius
+                if dist_from_center > WORLD_RADIUS + G_item.size:
+                     items_to_remove.append(i)
 
         # Remove items marked for deletion (e.g., pushed out of bounds)
         for i in sorted(items_to_remove, reverse=True):
-            self.all_garbage_items.pop(i)
-
-    def draw(self, surface, camera_x, camera_y):
-        """Draws all background elements, using the spatial grid for optimization of static parts."""
-        surface.fill(self.bg_color)
+            G_item = self.all_garbage_items.pop(i)
+            if self.garbage_pool is not None: self.garbage_pool.release(G_item)
+
+    def _scaled_blob(self, blob_surf, scale):
+        """Returns a gas/dust blob surface resized for the given render scale (cached until the scale changes)."""
+        if scale == 1.0: return blob_surf
+        if scale != self._blob_cache_scale:
+            self._scaled_blob_cache = {}; self._blob_cache_scale = scale
+        scaled = self._scaled_blob_cache.get(blob_surf)
+        if scaled is None:
+            w, h = blob_surf.get_size()
+            scaled = pygame.transform.scale(blob_surf, (max(1, int(w * scale)), max(1, int(h * scale))))
+            self._scaled_blob_cache[blob_surf] = scaled
+        return scaled
+
+    def _draw_static_items(self, surface, camera_x, camera_y, scale, star_glow, blob_density, profile=False,
+                           layers=('gas_blob', 'dust_blob', 'distant_planet', 'star')):
+        """Draws the stars, gas, dust and distant planets in the grid cells overlapping surface, layer by layer."""
+        screen_w, screen_h = surface.get_size()
+        view_w, view_h = screen_w / scale, screen_h / scale # Visible world area
 
         # Determine visible grid cells based on camera
-        cam_min_gx = int((camera_x - self.world_min_x - CELL_SIZE) / CELL_SIZE)
-        cam_max_gx = int(((camera_x + SCREEN_WIDTH) - self.world_min_x + CELL_SIZE) / CELL_SIZE)
-        cam_min_gy = int((camera_y - self.world_min_y - CELL_SIZE) / CELL_SIZE)
-        cam_max_gy = int(((camera_y + SCREEN_HEIGHT) - self.world_min_y + CELL_SIZE) / CELL_SIZE)
-
-        start_col = max(0, cam_min_gx); end_col = min(self.grid_cols - 1, cam_max_gx)
-        start_row = max(0, cam_min_gy); end_row = min(self.grid_rows - 1, cam_max_gy)
-
-        # Layered drawing of static elements from the visible grid cells
-        for layer_type in ['gas_blob', 'dust_blob', 'distant_planet', 'star']:
+        static = self.static
+        cam_min_gx = int((camera_x - static.world_min_x - CELL_SIZE) / CELL_SIZE)
+        cam_max_gx = int(((camera_x + view_w) - static.world_min_x + CELL_SIZE) / CELL_SIZE)
+        cam_min_gy = int((camera_y - static.world_min_y - CELL_SIZE) / CELL_SIZE)
+        cam_max_gy = int(((camera_y + view_h) - static.world_min_y + CELL_SIZE) / CELL_SIZE)
+
+        start_col = max(0, cam_min_gx); end_col = min(static.grid_cols - 1, cam_max_gx)
+        start_row = max(0, cam_min_gy); end_row = min(static.grid_rows - 1, cam_max_gy)
+
+        # Layered drawing of static elements from the visible grid cells: each layer is queued, then
+        # culled and drawn in one batch.
+        for layer_type in layers:
+            layer_start = PROFILER.start() if profile else 0.0
+            queue_layer = _QUEUE_LAYERS[layer_type]
+            if layer_type == 'star' and surface.get_bytesize() >= 3: # Stars come from their own index, not the grid
+                self._draw_star_layer(surface, camera_x, camera_y, scale, star_glow, start_col, end_col, start_row, end_row)
+                if profile: PROFILER.stop(PHASE_BG_STARS, layer_start)
+                continue
             for gy_idx in range(start_row, end_row + 1):
                 for gx_idx in range(start_col, end_col + 1):
-                    # Grid indices are already clamped, direct access is safe
-                    for item in self.grid[gy_idx][gx_idx]:
+                    for item in static.grid.get((gx_idx, gy_idx), ()):
                         if item.get('type') == layer_type:
-                            screen_x = item['world_pos'][0] - camera_x
-                            screen_y = item['world_pos'][1] - camera_y
+                            screen_x = (item['world_pos'][0] - camera_x) * scale
+                            screen_y = (item['world_pos'][1] - camera_y) * scale
                             if layer_type == 'gas_blob' or layer_type == 'dust_blob':
-                                blob_surf = item['surface']
-                                blob_s = blob_surf.get_size()
-                                # Basic culling for blob surfaces
-                                if screen_x + blob_s[0] > 0 and screen_x < SCREEN_WIDTH and \
-                                   screen_y + blob_s[1] > 0 and screen_y < SCREEN_HEIGHT:
-                                    surface.blit(blob_surf, (screen_x, screen_y))
+                                if item['lod_rank'] >= blob_density: continue
+                                RENDER_QUEUE.submit(queue_layer, self._scaled_blob(item['surface'], scale), screen_x, screen_y)
                             elif layer_type == 'distant_planet':
-                                draw_pixel_circle(surface, item['color'], screen_x, screen_y, item['radius'])
+                                radius = int(max(1, item['radius'] * scale))
+                                RENDER_QUEUE.submit(queue_layer, disc_sprite(item['color'], radius),
+                                                    int(screen_x) - radius, int(screen_y) - radius)
                             elif layer_type == 'star':
-                                draw_pixel_star(surface, screen_x, screen_y, item['color'], item['size_cat'])
-
-        # Draw Solar System Planets (dynamic, positions updated each frame)
-        for planet_data in self.solar_system_planets:
-            draw_pixel_circle(surface, planet_data['color'],
-                              planet_data['world_pos'][0] - camera_x,
-                              planet_data['world_pos'][1] - camera_y,
-                              planet_data['radius'])
-
-        # Draw Sun
-        sun_screen_x = self.sun_data['world_pos'][0] - camera_x
-        sun_screen_y = self.sun_data['world_pos'][1] - camera_y
-        sun_radius_val = self.sun_data['radius']
-        # Culling for the Sun before drawing
-        if not (sun_screen_x + sun_radius_val < 0 or sun_screen_x - sun_radius_val > SCREEN_WIDTH or \
-                sun_screen_y + sun_radius_val < 0 or sun_screen_y - sun_radius_val > SCREEN_HEIGHT):
-            pygame.draw.circle(surface, self.sun_data['color'], (int(sun_screen_x), int(sun_screen_y)), sun_radius_val)
+                                sprite, offset = star_sprite(item['color'], item['size_cat'], star_glow)
+                                RENDER_QUEUE.submit(queue_layer, sprite, int(screen_x) + offset, int(screen_y) + offset)
+            RENDER_QUEUE.flush(surface, (queue_layer,))
+            if profile: PROFILER.stop(_LAYER_PHASES[layer_type], layer_start)
+
+    def _draw_star_layer(self, surface, camera_x, camera_y, scale, star_glow, start_col, end_col, start_row, end_row):
+        """
+        Draws the stars in the given range of grid cells. Small and medium stars are gathered with numpy and
+        rasterized into the surface's pixels in one pass; large ones are blitted as sprites over them.
+        """
+        index = self.static.star_index()
+        first_cells = np.arange(start_row, end_row + 1) * self.static.grid_cols + start_col
+        first = np.searchsorted(index['cells'], first_cells)
+        counts = np.searchsorted(index['cells'], first_cells + (end_col - start_col + 1)) - first
+        total = int(counts.sum())
+        if not total: return
+        # Concatenation of each row's run of stars (as in autopilot.GarbageIndex).
+        visible = np.repeat(first - (np.cumsum(counts) - counts), counts) + np.arange(total)
+        sx = ((index['x'][visible] - camera_x) * scale).astype(np.int64) # Truncated like int(), as the sprites are
+        sy = ((index['y'][visible] - camera_y) * scale).astype(np.int64)
+        point = index['point'][visible]
+        _rasterize_point_stars(surface, sx[point], sy[point], index['color'][visible[point]], index['core'][visible[point]],
+                               star_glow)
+        sprites = np.flatnonzero(~point)
+        if not len(sprites): return
+        items = index['items']
+        for i, x, y in zip(visible[sprites].tolist(), sx[sprites].tolist(), sy[sprites].tolist()):
+            item = items[i]
+            sprite, offset = star_sprite(item['color'], item['size_cat'], star_glow)
+            RENDER_QUEUE.submit(LAYER_STARS, sprite, x + offset, y + offset)
+        RENDER_QUEUE.flush(surface, (LAYER_STARS,))
+
+    def _draw_static_tiles(self, surface, camera_x, camera_y, scale):
+        """
+        Draws the static layers from BG_TILE_SIZE tiles rendered at this exact scale. Tiles sit on a fixed
+        grid in world space, so panning only builds the row or column coming into view.
+        """
+        t = BG_TILE_SIZE
+        origin_x, origin_y = int(round(camera_x * scale)), int(round(camera_y * scale)) # Camera in scaled px
+        screen_w, screen_h = surface.get_size()
+        for row in range(origin_y // t, (origin_y + screen_h - 1) // t + 1):
+            for column in range(origin_x // t, (origin_x + screen_w - 1) // t + 1):
+                key = (scale, column, row)
+                tile = self._static_tiles.pop(key, False) # Re-inserted below, so the dict stays in drawing order
+                if tile is False:
+                    if len(self._static_tiles) >= BG_TILE_CACHE_SIZE: del self._static_tiles[next(iter(self._static_tiles))]
+                    tile = self._build_static_tile(column * t / scale, row * t / scale, scale)
+                self._static_tiles[key] = tile
+                if tile is not None: surface.blit(tile, (column * t - origin_x, row * t - origin_y))
+
+    def _build_static_tile(self, world_x, world_y, scale):
+        """One tile of the static layers with its top-left corner at (world_x, world_y); None if it would be empty."""
+        t = BG_TILE_SIZE
+        world_size = t / scale
+        if world_x > self.world_min_x + self.world_width or world_x + world_size < self.world_min_x or \
+           world_y > self.world_min_y + self.world_height or world_y + world_size < self.world_min_y:
+            return None
+        tile = pygame.Surface((t, t))
+        if pygame.display.get_surface(): tile = tile.convert()
+        tile.fill(self.bg_color)
+        if scale < BG_DENSITY_MAX_SCALE: # Items are a few pixels at most: composite their coverage per pixel
+            _draw_density_tile(tile, self.static.density_layers(), world_x, world_y, scale)
+        else: # Draw the items themselves; glow is skipped because a cached tile cannot twinkle
+            self._draw_static_items(tile, world_x, world_y, scale, 'none', 1.0)
+        return tile
+
+    def _garbage_near_bodies(self, x, y, size):
+        """
+        Indices of the garbage (positions and sizes as arrays) that overlaps a body of its star system or whose
+        centre is beyond the world radius, with a margin so rounding never skips an item update() would handle.
+        """
+        flagged = np.hypot(x - WORLD_CENTER_X, y - WORLD_CENTER_Y) > WORLD_RADIUS + size - 1.0
+        celestial = self.celestial
+        system = celestial.systems_at(x, y)
+        inside = np.flatnonzero(system >= 0)
+        if len(inside):
+            s, x, y, half = system[inside], x[inside], y[inside], size[inside] / 2.0 + 1.0
+            reach = celestial.sun_radius[s] + half
+            near = (x - celestial.center_x[s]) ** 2 + (y - celestial.center_y[s]) ** 2 < reach * reach
+            planet_x, planet_y = celestial.planet_positions()
+            for slot in range(celestial.planet_table.shape[1]):
+                p = celestial.planet_table[s, slot]
+                has = p >= 0
+                p = np.where(has, p, 0)
+                reach = celestial.planet_radius[p] + half
+                near |= has & ((x - planet_x[p]) ** 2 + (y - planet_y[p]) ** 2 < reach * reach)
+            flagged[inside] |= near
+        return np.flatnonzero(flagged).tolist()
+
+    def bodies(self, planet_positions=None):
+        """
+        Every sun and planet: the home sun, the planets, then the other suns; a body's index here identifies its sprite.
+        With planet_positions ((x, y) arrays from CelestialIndex.planet_positions) the planets are copies placed
+        there instead of the live dicts, which are then left untouched.
+        """
+        if planet_positions is None: return [self.sun_data] + self.solar_system_planets + self.suns[1:]
+        planets_x, planets_y = planet_positions
+        return [self.sun_data] + [dict(p, world_pos=(planets_x[i], planets_y[i])) for i, p in enumerate(self.solar_system_planets)] + \
+               self.suns[1:]
+
+    def bodies_in_view(self, x, y, reach, planet_positions=None):
+        """
+        (sprite index, body) for the planets and then the suns of the systems within reach of (x, y), in drawing
+        order (suns over their planets), with their positions brought up to date. With planet_positions (see
+        bodies) the planets are copies placed there and nothing shared is written, so a render thread can ask
+        while the simulation thread moves the planets.
+        """
+        systems = self.celestial.systems_near(x, y, reach, sync=planet_positions is None)
+        planet_count = len(self.solar_system_planets)
+        planets = [(1 + i, p) for k in systems
+                   for i, p in enumerate(self.systems[k]['planets'], self.systems[k]['planet_start'])]
+        if planet_positions is not None:
+            planets_x, planets_y = planet_positions
+            planets = [(index, dict(p, world_pos=(planets_x[index - 1], planets_y[index - 1]))) for index, p in planets]
+        return planets + [(0 if k == 0 else planet_count + k, self.systems[k]['sun']) for k in systems]
+
+    def _body_sprite(self, index, body):
+        """Shaded sprite for a body, rebuilt if its size or color changed (e.g. planets restored from a save)."""
+        look = (body['radius'], tuple(body['color']))
+        entry = self._body_sprites.pop(index, None) # Re-inserted below, so the dict stays in drawing order
+        if entry is None or entry[0] != look:
+            is_sun = body['type'] == 'sun'
+            sprite = BodySprite(body['radius'], body['color'], SUN_LIMB_DARKENING if is_sun else PLANET_LIMB_DARKENING,
+                                SUN_SURFACE_NOISE if is_sun else PLANET_SURFACE_NOISE, body_seed(self.seed, index))
+            entry = (look, sprite)
+            if len(self._body_sprites) >= BODY_SPRITE_CACHE_SIZE: del self._body_sprites[next(iter(self._body_sprites))]
+        self._body_sprites[index] = entry
+        return entry[1]
+
+    def prepare_body_sprites(self):
+        """
+        Renders the home system's textures now (about 0.1 s per body) rather than when it first comes into view.
+        Bodies of other star systems are rendered as they come into view.
+        """
+        # Sprites only need the bodies' looks, so nothing shared is synced (this may run beside the simulation thread)
+        for index, body in self.bodies_in_view(WORLD_CENTER_X, WORLD_CENTER_Y, 0, self.celestial.planet_positions()):
+            self._body_sprite(index, body)
+
+    def draw_body(self, surface, index, body, screen_x, screen_y, screen_radius):
+        """Draws one body from its cached sprite; only the on-screen part is touched."""
+        self._body_sprite(index, body).draw(surface, screen_x, screen_y, screen_radius)
+
+    def draw(self, surface, camera_x, camera_y, scale=1.0, planet_positions=None):
+        """
+        Draws all background elements, using the spatial grid for optimization of static parts.
+        scale is the render scale: world offsets from the camera are multiplied by it, so a surface
+        smaller than the screen shows the same part of the world. planet_positions, if given, places the
+        planets (see bodies_in_view).
+        """
+        surface.fill(self.bg_color)
+        star_glow = GOVERNOR.settings['star_glow']
+        blob_density = GOVERNOR.settings['blob_density']
+
+        if scale < BG_TILE_MAX_SCALE: # Zoomed out: whole regions of the static layers come from cached tiles
+            tiles_start = PROFILER.start()
+            self._draw_static_tiles(surface, camera_x, camera_y, scale)
+            PROFILER.stop(PHASE_BG_TILES, tiles_start)
+        else:
+            self._draw_static_items(surface, camera_x, camera_y, scale, star_glow, blob_density, profile=True)
+
+        # Draw the planets of the systems in view (dynamic, positions updated each frame), then their suns over them
+        bodies_start = PROFILER.start()
+        if not self._body_sprites: self.prepare_body_sprites() # All at once, so none appears with a hitch later
+        view_w, view_h = surface.get_width() / scale, surface.get_height() / scale
+        for index, body in self.bodies_in_view(camera_x + view_w / 2, camera_y + view_h / 2, math.hypot(view_w, view_h) / 2,
+                                               planet_positions):
+            self.draw_body(surface, index, body, (body['world_pos'][0] - camera_x) * scale,
+                           (body['world_pos'][1] - camera_y) * scale, max(0.5, body['radius'] * scale))
+        PROFILER.stop(PHASE_BG_BODIES, bodies_start)
@@ -3,40 +3,105 @@
 import pygame
 import random
 import math
-from config import (GARBAGE_SIZE_RANGE, GARBAGE_SPRITE_FILE, SCREEN_WIDTH, SCREEN_HEIGHT,
+import numpy as np
+from renderqueue import RENDER_QUEUE, LAYER_GARBAGE
+from config import (GARBAGE_SIZE_RANGE, GARBAGE_SPRITE_FILE, GARBAGE_DOT_SIZE, GARBAGE_DOT_COLOR,
                     SHIP_MAGNET_RANGE, BASE_MAGNET_STRENGTH, MIN_GARBAGE_ATTRACTION_SPEED_FACTOR)
 
-try:
-    ORIGINAL_GARBAGE_IMAGE = pygame.image.load(GARBAGE_SPRITE_FILE).convert_alpha()
-except pygame.error as e:
-    print(f"Error loading {GARBAGE_SPRITE_FILE}: {e}")
-    ORIGINAL_GARBAGE_IMAGE = pygame.Surface((50, 50), pygame.SRCALPHA)
-    pygame.draw.circle(ORIGINAL_GARBAGE_IMAGE, (100, 100, 100), (25, 25), 25)
+_original_image = None # Loaded on first use so that importing this module never touches the display.
+
+def get_original_garbage_image():
+    """Loads the garbage sprite once. Converted for fast blits when a display mode is already set."""
+    global _original_image
+    if _original_image is None:
+        try:
+            _original_image = pygame.image.load(GARBAGE_SPRITE_FILE)
+            if pygame.display.get_surface() is not None: _original_image = _original_image.convert_alpha()
+        except pygame.error as e:
+            print(f"Error loading {GARBAGE_SPRITE_FILE}: {e}")
+            _original_image = pygame.Surface((50, 50), pygame.SRCALPHA)
+            pygame.draw.circle(_original_image, (100, 100, 100), (25, 25), 25)
+    return _original_image
+
+# Scaled sprites are shared by every garbage item of the same size; they are never modified after scaling.
+_scaled_image_cache = {}
+
+def get_garbage_image(size):
+    """Returns the garbage sprite scaled to size x size, scaling it only on first use."""
+    image = _scaled_image_cache.get(size)
+    if image is None:
+        image = pygame.transform.smoothscale(get_original_garbage_image(), (size, size))
+        _scaled_image_cache[size] = image
+    return image
+
+_dot_image = None
+
+def get_garbage_dot_image():
+    """The 2 x 2 dot that stands in for garbage too small on screen to show its sprite."""
+    global _dot_image
+    if _dot_image is None:
+        _dot_image = pygame.Surface((2, 2))
+        if pygame.display.get_surface() is not None: _dot_image = _dot_image.convert()
+        _dot_image.fill(GARBAGE_DOT_COLOR)
+    return _dot_image
+
+def submit_garbage(x, y, size, camera_x, camera_y, scale, view_width, view_height):
+    """
+    Garbage.submit for items given as arrays (positions and sizes copied out of the simulation), skipping
+    those entirely outside the view_width x view_height surface.
+    """
+    screen_x, screen_y, screen_size = (x - camera_x) * scale, (y - camera_y) * scale, size * scale
+    visible = np.flatnonzero((screen_x > -screen_size) & (screen_x < view_width + screen_size) &
+                             (screen_y > -screen_size) & (screen_y < view_height + screen_size))
+    for sx, sy, item_size, sprite_size in zip(screen_x[visible].tolist(), screen_y[visible].tolist(),
+                                              screen_size[visible].tolist(), size[visible].tolist()):
+        if item_size < GARBAGE_DOT_SIZE:
+            RENDER_QUEUE.submit(LAYER_GARBAGE, get_garbage_dot_image(), int(sx) - 1, int(sy) - 1); continue
+        image = get_garbage_image(int(sprite_size)) if scale == 1.0 else get_garbage_image(max(1, int(round(item_size))))
+        w, h = image.get_size()
+        RENDER_QUEUE.submit(LAYER_GARBAGE, image, int(sx) - w // 2, int(sy) - h // 2)
 
 class Garbage:
     """
     Represents a single piece of collectable space garbage.
     It can be attracted to the spaceship by its magnet.
     """
-    def __init__(self, world_x, world_y, loaded_size=None):
+    def __init__(self, world_x, world_y, loaded_size=None, rng=random):
         self.world_x = float(world_x)
         self.world_y = float(world_y)
+        self.prev_x, self.prev_y = self.world_x, self.world_y # Position before the last update (for swept collection)
 
         if loaded_size is not None:
             self.size = loaded_size  # Use provided size if loading
         else:
             # Otherwise, determine size randomly for new garbage
-            self.size = random.randint(GARBAGE_SIZE_RANGE[0], GARBAGE_SIZE_RANGE[1])
+            self.size = rng.randint(GARBAGE_SIZE_RANGE[0], GARBAGE_SIZE_RANGE[1])
 
-        self.image = pygame.transform.smoothscale(ORIGINAL_GARBAGE_IMAGE, (self.size, self.size))
+        self.image = get_garbage_image(self.size)
         self.rect = self.image.get_rect(center=(self.world_x, self.world_y))
         self.type = 'garbage'
+        self.vx = self.vy = 0.0 # Drift velocity in px/s (endless mode debris); generated garbage stays put
+
+    def reset(self, world_x, world_y, size, vx=0.0, vy=0.0):
+        """Reinitialises a pooled item in place, reusing its Rect and the shared scaled sprite."""
+        self.world_x = self.prev_x = float(world_x)
+        self.world_y = self.prev_y = float(world_y)
+        self.size = size
+        self.image = get_garbage_image(size)
+        self.rect.size = self.image.get_size()
+        self.rect.center = (self.world_x, self.world_y)
+        self.vx, self.vy = vx, vy
 
     def update(self, ship_x, ship_y, dt):
         """
-        Updates the garbage item's state, primarily handling its attraction
+        Updates the garbage item's state: its drift, if any, and its attraction
         towards the spaceship if within magnet range.
         """
+        self.prev_x, self.prev_y = self.world_x, self.world_y
+        if self.vx or self.vy:
+            self.world_x += self.vx * dt
+            self.world_y += self.vy * dt
+            self.rect.center = (self.world_x, self.world_y)
         dx = ship_x - self.world_x
         dy = ship_y - self.world_y
         dist_sq = dx*dx + dy*dy
@@ -56,26 +121,57 @@ class Garbage:
             self.world_y += (dy / dist) * move_dist_this_frame
             self.rect.center = (self.world_x, self.world_y)
 
-    def draw(self, surface, camera_x, camera_y):
-        """Draws the garbage item on the screen if it's visible, adjusted for camera."""
-        screen_x = self.world_x - camera_x
-        screen_y = self.world_y - camera_y
-        if screen_x + self.size < 0 or screen_x - self.size > SCREEN_WIDTH or \
-           screen_y + self.size < 0 or screen_y - self.size > SCREEN_HEIGHT:
-            return
-        draw_rect = self.image.get_rect(center=(int(screen_x), int(screen_y)))
-        surface.blit(self.image, draw_rect)
-
-    def get_collider(self):
+    def draw(self, surface, camera_x, camera_y, scale=1.0):
+        """Draws the garbage item on the screen if it's visible, adjusted for camera and render scale."""
+        self.submit(camera_x, camera_y, scale)
+        RENDER_QUEUE.flush(surface, (LAYER_GARBAGE,))
+
+    def submit(self, camera_x, camera_y, scale=1.0):
+        """
+        Queues the garbage item on RENDER_QUEUE (culled and drawn when the caller flushes it).
+        Zoomed far out, where the sprite would be a few pixels wide, it is drawn as a dot instead.
+        """
+        screen_x = (self.world_x - camera_x) * scale
+        screen_y = (self.world_y - camera_y) * scale
+        size = self.size * scale
+        if size < GARBAGE_DOT_SIZE:
+            RENDER_QUEUE.submit(LAYER_GARBAGE, get_garbage_dot_image(), int(screen_x) - 1, int(screen_y) - 1); return
+        image = self.image if scale == 1.0 else get_garbage_image(max(1, int(round(size))))
+        w, h = image.get_size()
+        RENDER_QUEUE.submit(LAYER_GARBAGE, image, int(screen_x) - w // 2, int(screen_y) - h // 2)
+
+    def get_collider(self, x=None, y=None):
         """
         Returns a pygame.Rect in world coordinates for collision detection
-        with the spaceship (e.g., for collection).
+        with the spaceship (e.g., for collection), centred on the item (or on x, y if given).
         Collider is smaller for harder recollection.
         """
-        # Collider is centered on the garbage item.
+        if x is None: x, y = self.world_x, self.world_y
         return pygame.Rect(
-            self.world_x - self.size / 4.0,
-            self.world_y - self.size / 4.0,
+            x - self.size / 4.0,
+            y - self.size / 4.0,
             self.size / 2.0,
             self.size / 2.0
         )
+
+class GarbagePool:
+    """
+    Free-list of Garbage objects for endless mode. Every object is created up front, so spawning
+    (acquire) and collecting (release) reuse them and a long session never allocates garbage.
+    """
+    def __init__(self, capacity):
+        self._free = [Garbage(0.0, 0.0, loaded_size=GARBAGE_SIZE_RANGE[0]) for _ in range(max(0, capacity))]
+
+    def __len__(self):
+        return len(self._free)
+
+    def acquire(self, world_x, world_y, size, vx=0.0, vy=0.0):
+        """Returns a free item reset to the given state, or None when every item is in use."""
+        if not self._free: return None
+        G_item = self._free.pop()
+        G_item.reset(world_x, world_y, size, vx, vy)
+        return G_item
+
+    def release(self, G_item):
+        """Returns a collected or lost item to the free-list."""
+        self._free.append(G_item)
@@ -18,7 +18,7 @@ dockerfile_common = textwrap.dedent("""
         libsm6 \\
         && rm -rf /var/lib/apt/lists/*
 
-    RUN pip install pygame
+    RUN pip install pygame numpy
 
     WORKDIR /app
     COPY . /app
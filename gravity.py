@@ -0,0 +1,246 @@
+# gravity.py
+
+import math
+import numpy as np
+from config import (GRAVITY_CONSTANT, GRAVITY_SOFTENING, GRAVITY_DEBRIS_SCALE, GRAVITY_DEBRIS_SOFTENING,
+                    GRAVITY_OPENING_ANGLE, GRAVITY_LEAF_SIZE, PLANET_GARBAGE_ZONE_RADIUS_FACTOR)
+
+# Gravitational parameters (G * mass, px^3/s^2) use radius cubed as the mass proxy, for the sun and planets
+# (their radius) and for debris (half its size). Accelerations are in px/s^2 in world coordinates (Y down).
+
+QUADTREE_MAX_DEPTH = 16 # Levels below the root; cells at the deepest level are 1/65536 of the root wide.
+
+def body_parameters(suns, planets_list):
+    """Positions and gravitational parameters of the suns and planets as arrays (suns first)."""
+    bodies = list(suns) + list(planets_list)
+    x = np.array([b['world_pos'][0] for b in bodies], dtype=float)
+    y = np.array([b['world_pos'][1] for b in bodies], dtype=float)
+    mu = GRAVITY_CONSTANT * np.array([b['radius'] for b in bodies], dtype=float) ** 3
+    return x, y, mu
+
+def body_accelerations(x, y, body_x, body_y, body_mu, softening=GRAVITY_SOFTENING):
+    """Acceleration of every point (x, y arrays) towards the given bodies, summed over bodies."""
+    dx = body_x[:, None] - x[None, :]
+    dy = body_y[:, None] - y[None, :]
+    r_sq = dx * dx + dy * dy + softening * softening
+    inv_r3 = 1.0 / (r_sq * np.sqrt(r_sq))
+    return (body_mu[:, None] * dx * inv_r3).sum(axis=0), (body_mu[:, None] * dy * inv_r3).sum(axis=0)
+
+def system_accelerations(x, y, celestial):
+    """
+    Acceleration of every point (x, y arrays) towards the sun and planets of the star system it is in
+    (CelestialIndex.systems_at); points in deep space feel none. Each point sums its own system's bodies,
+    sun first, as body_accelerations does for a single system.
+    """
+    system = celestial.systems_at(x, y)
+    ax, ay = np.zeros(len(x)), np.zeros(len(x))
+    inside = np.flatnonzero(system >= 0)
+    if not len(inside): return ax, ay
+    touched = np.unique(system[inside]).tolist()
+    for k in touched: celestial.sync(k)
+    # (system, slot) -> body position and parameter, slot 0 being the sun; gathered for the touched systems only
+    slots = 1 + celestial.planet_table.shape[1]
+    body_x, body_y, body_mu = np.zeros((len(touched), slots)), np.zeros((len(touched), slots)), np.zeros((len(touched), slots))
+    for row, k in enumerate(touched):
+        system_data = celestial.systems[k]
+        x_k, y_k, mu_k = body_parameters([system_data['sun']], system_data['planets'])
+        body_x[row, :len(x_k)], body_y[row, :len(y_k)], body_mu[row, :len(mu_k)] = x_k, y_k, mu_k
+    row = np.searchsorted(np.array(touched), system[inside])
+    px, py = x[inside], y[inside]
+    bodies_in = 1 + (celestial.planet_table[system[inside]] >= 0).sum(axis=1)
+    total_x, total_y = np.zeros(len(inside)), np.zeros(len(inside))
+    for slot in range(slots):
+        dx = body_x[row, slot] - px
+        dy = body_y[row, slot] - py
+        r_sq = dx * dx + dy * dy + GRAVITY_SOFTENING * GRAVITY_SOFTENING
+        inv_r3 = 1.0 / (r_sq * np.sqrt(r_sq))
+        present = slot < bodies_in
+        total_x = np.where(present, total_x + body_mu[row, slot] * dx * inv_r3, total_x)
+        total_y = np.where(present, total_y + body_mu[row, slot] * dy * inv_r3, total_y)
+    ax[inside], ay[inside] = total_x, total_y
+    return ax, ay
+
+def debris_parameters(sizes):
+    """Gravitational parameters of debris items of the given sizes (scaled by GRAVITY_DEBRIS_SCALE)."""
+    return GRAVITY_DEBRIS_SCALE * GRAVITY_CONSTANT * (np.asarray(sizes, dtype=float) / 2) ** 3
+
+def _expand_ranges(starts, counts):
+    """Concatenation of arange(start, start + count) for each range (as in autopilot.GarbageIndex)."""
+    total = int(counts.sum())
+    return np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+
+class _Level:
+    """The occupied quadtree cells of one depth, in Morton order, with their mass and centre of mass."""
+    def __init__(self, prefix, mu, x, y):
+        n = len(prefix)
+        self.start = np.flatnonzero(np.r_[True, prefix[1:] != prefix[:-1]]) # First item of each cell
+        self.count = np.diff(np.r_[self.start, n])
+        self.mu = np.add.reduceat(mu, self.start)
+        weight = np.where(self.mu > 0, self.mu, 1.0)
+        self.x = np.add.reduceat(mu * x, self.start) / weight
+        self.y = np.add.reduceat(mu * y, self.start) / weight
+
+def debris_accelerations(x, y, mu, theta=GRAVITY_OPENING_ANGLE, softening=GRAVITY_DEBRIS_SOFTENING,
+                         leaf_size=GRAVITY_LEAF_SIZE):
+    """
+    Mutual gravity between all items (x, y, mu arrays) with the Barnes-Hut approximation, O(n log n).
+    Items are sorted along a Morton curve, so every quadtree cell is a contiguous run. Cells holding at most
+    leaf_size items are leaves; each leaf is a group whose items share one interaction list. A cell seen
+    from a group is used as a single mass at its centre of mass when its width is below theta times its
+    distance to the group's box; otherwise it is opened, or if it is a leaf its items are summed directly.
+    The traversal runs one tree level at a time for every group at once.
+    Smaller theta is more accurate and slower; theta = 0 sums every pair directly.
+    """
+    n = len(x)
+    ax, ay = np.zeros(n), np.zeros(n)
+    if n < 2: return ax, ay
+    # Morton keys on a 2^depth grid over the bounding square.
+    depth = QUADTREE_MAX_DEPTH
+    min_x, min_y = x.min(), y.min()
+    width = max(x.max() - min_x, y.max() - min_y, 1e-9) * (1 + 1e-9)
+    cells = 1 << depth
+    ix = np.minimum(((x - min_x) / width * cells).astype(np.int64), cells - 1)
+    iy = np.minimum(((y - min_y) / width * cells).astype(np.int64), cells - 1)
+    keys = np.zeros(n, dtype=np.int64)
+    for bit in range(depth):
+        keys |= ((ix >> bit) & 1) << (2 * bit) | ((iy >> bit) & 1) << (2 * bit + 1)
+    order = np.argsort(keys, kind='stable')
+    keys, xs, ys, mus = keys[order], x[order], y[order], mu[order]
+    ixs, iys = ix[order], iy[order]
+
+    # Levels are built lazily, down to the depth where every cell has become a leaf.
+    levels = [_Level(keys >> (2 * depth), mus, xs, ys)]
+    def level(l):
+        while len(levels) <= l: levels.append(_Level(keys >> (2 * (depth - len(levels))), mus, xs, ys))
+        return levels[l]
+
+    # Groups: leaves whose parent is not a leaf, found top down. Each keeps its box for the opening test.
+    group_start, group_count, group_x0, group_y0, group_width = [], [], [], [], []
+    open_cells = np.zeros(1, dtype=np.int64) # Non-leaf cells reached at the current level
+    l = 0
+    while len(open_cells):
+        lv = level(l)
+        leaf = (lv.count[open_cells] <= leaf_size) | (l == depth)
+        groups = open_cells[leaf]
+        if len(groups):
+            cell_width = width / (1 << l)
+            shift = depth - l
+            group_start.append(lv.start[groups]); group_count.append(lv.count[groups])
+            group_x0.append(min_x + (ixs[lv.start[groups]] >> shift) * cell_width)
+            group_y0.append(min_y + (iys[lv.start[groups]] >> shift) * cell_width)
+            group_width.append(np.full(len(groups), cell_width))
+        parents = open_cells[~leaf]
+        if not len(parents): break
+        child = level(l + 1)
+        first = np.searchsorted(child.start, lv.start[parents])
+        last = np.searchsorted(child.start, lv.start[parents] + lv.count[parents])
+        open_cells = _expand_ranges(first, last - first)
+        l += 1
+    g_start, g_count = np.concatenate(group_start), np.concatenate(group_count)
+    g_x0, g_y0, g_width = np.concatenate(group_x0), np.concatenate(group_y0), np.concatenate(group_width)
+    soft_sq = softening * softening
+
+    def accumulate(items, dx, dy, mu_other):
+        r_sq = dx * dx + dy * dy + soft_sq
+        inv_r3 = 1.0 / (r_sq * np.sqrt(r_sq))
+        ax[:] += np.bincount(items, mu_other * dx * inv_r3, n)
+        ay[:] += np.bincount(items, mu_other * dy * inv_r3, n)
+
+    # Traversal: (group, cell) pairs, starting with every group against the root.
+    pair_group = np.arange(len(g_start))
+    pair_cell = np.zeros(len(g_start), dtype=np.int64)
+    l = 0
+    while len(pair_group):
+        lv = level(l)
+        cell_width = width / (1 << l)
+        cx, cy = lv.x[pair_cell], lv.y[pair_cell]
+        # Distance from the cell's centre of mass to the nearest point of the group's box.
+        gap_x = np.maximum(np.maximum(g_x0[pair_group] - cx, cx - g_x0[pair_group] - g_width[pair_group]), 0)
+        gap_y = np.maximum(np.maximum(g_y0[pair_group] - cy, cy - g_y0[pair_group] - g_width[pair_group]), 0)
+        far = cell_width * cell_width < theta * theta * (gap_x * gap_x + gap_y * gap_y)
+        if far.any(): # Far cells act as one mass on every item of the group
+            g, c = pair_group[far], pair_cell[far]
+            items = _expand_ranges(g_start[g], g_count[g])
+            c = np.repeat(c, g_count[g])
+            accumulate(items, lv.x[c] - xs[items], lv.y[c] - ys[items], lv.mu[c])
+        near_group, near_cell = pair_group[~far], pair_cell[~far]
+        leaf = (lv.count[near_cell] <= leaf_size) | (l == depth)
+        if leaf.any(): # Near leaves: every item of the group against every item of the leaf
+            g, c = near_group[leaf], near_cell[leaf]
+            items = _expand_ranges(g_start[g], g_count[g])
+            c = np.repeat(c, g_count[g])
+            other_count = lv.count[c]
+            others = _expand_ranges(lv.start[c], other_count)
+            items = np.repeat(items, other_count)
+            accumulate(items, xs[others] - xs[items], ys[others] - ys[items], mus[others]) # Self-pairs add 0
+        near_group, near_cell = near_group[~leaf], near_cell[~leaf]
+        if not len(near_group): break
+        child = level(l + 1)
+        first = np.searchsorted(child.start, lv.start[near_cell])
+        last = np.searchsorted(child.start, lv.start[near_cell] + lv.count[near_cell])
+        pair_group = np.repeat(near_group, last - first)
+        pair_cell = _expand_ranges(first, last - first)
+        l += 1
+
+    result_x, result_y = np.empty(n), np.empty(n)
+    result_x[order] = ax; result_y[order] = ay
+    return result_x, result_y
+
+class GravityField:
+    """
+    Gravity for one game: the sun and planets pull the ship and the garbage (vectorized over every item),
+    and with debris=True the garbage also pulls itself together through debris_accelerations.
+    Planets keep their fixed orbits; only the ship and the garbage respond.
+    """
+    def __init__(self, debris=False, theta=GRAVITY_OPENING_ANGLE):
+        self.debris = debris
+        self.theta = theta
+
+    def apply(self, dt, ship, garbage_items, celestial):
+        """
+        Adds one tick of gravity to the ship's and the garbage's velocities (positions move in their updates).
+        celestial is the background's CelestialIndex: the ship is pulled by the systems near it, and each item
+        by the bodies of its own system.
+        """
+        if ship is not None and ship.alive:
+            body_x, body_y, body_mu = body_parameters(*celestial.bodies_near(ship.x, ship.y))
+            ax, ay = body_accelerations(np.array([ship.x]), np.array([ship.y]), body_x, body_y, body_mu)
+            # Ship velocity is in px per tick with Y pointing up.
+            ship.vx_0 += float(ax[0]) * dt * dt; ship.vy_0 -= float(ay[0]) * dt * dt
+        count = len(garbage_items)
+        if not count: return
+        x = np.fromiter((G_item.world_x for G_item in garbage_items), dtype=float, count=count)
+        y = np.fromiter((G_item.world_y for G_item in garbage_items), dtype=float, count=count)
+        ax, ay = system_accelerations(x, y, celestial)
+        if self.debris:
+            mu = debris_parameters(np.fromiter((G_item.size for G_item in garbage_items), dtype=float, count=count))
+            debris_ax, debris_ay = debris_accelerations(x, y, mu, self.theta)
+            ax += debris_ax; ay += debris_ay
+        for G_item, dvx, dvy in zip(garbage_items, (ax * dt).tolist(), (ay * dt).tolist()):
+            G_item.vx += dvx; G_item.vy += dvy
+
+    def launch_orbits(self, garbage_items, celestial):
+        """
+        Gives each item the velocity of a circular orbit in the planets' direction of travel: around its
+        system's sun, or for items in a planet's garbage cluster, around that planet while moving along with it.
+        """
+        for G_item in garbage_items:
+            bodies = celestial.bodies_at(G_item.world_x, G_item.world_y)
+            if not bodies: continue # Deep space: nothing to orbit
+            center, base_vx, base_vy = bodies[0], 0.0, 0.0
+            for p in bodies[1:]:
+                px, py = p['world_pos']
+                if (G_item.world_x - px) ** 2 + (G_item.world_y - py) ** 2 < (p['radius'] * PLANET_GARBAGE_ZONE_RADIUS_FACTOR) ** 2:
+                    orbit_speed = p['orbit_speed'] * p['orbit_radius'] # The planet's own velocity in px/s
+                    angle = p['current_orbit_angle']
+                    center, base_vx, base_vy = p, -orbit_speed * math.sin(angle), orbit_speed * math.cos(angle)
+                    break
+            dx, dy = G_item.world_x - center['world_pos'][0], G_item.world_y - center['world_pos'][1]
+            r = math.hypot(dx, dy)
+            if r < 1e-6: continue
+            speed = math.sqrt(GRAVITY_CONSTANT * center['radius'] ** 3 / r)
+            G_item.vx, G_item.vy = base_vx - dy / r * speed, base_vy + dx / r * speed
+
+    def capture_state(self):
+        """JSON-serialisable settings (saves and replay keyframes); velocities are saved with the garbage."""
+        return {"debris": self.debris, "theta": self.theta}
@@ -0,0 +1,69 @@
+# idle.py
+
+import pygame
+
+class IdleScreen:
+    """
+    Presents screens where almost nothing moves (pause, game over, win) without redrawing the world.
+    The world layer is captured once; afterwards only overlay elements whose signature changed are
+    redrawn over it and pushed to the display with pygame.display.update(rects).
+    """
+    def __init__(self):
+        self.active = False      # True while the last frame was presented by this class
+        self._kind = None        # Idle screen currently shown (e.g. 'paused'); None forces a full redraw
+        self._world_layer = None # Copy of the screen with only the world drawn
+        self._items = {}         # slot -> (signature, rect) of the overlay elements on screen
+
+    def invalidate(self):
+        """Forces a full redraw on the next idle frame (e.g. after the window was exposed)."""
+        self._kind = None
+
+    def leave(self):
+        """Called on every normally drawn frame."""
+        self.active = False
+        self._kind = None
+
+    def present(self, screen, kind, world_changed, draw_world, items):
+        """
+        Shows one idle frame. draw_world() draws the world onto the screen and is only called when the
+        screen is entered or world_changed is true. items are (slot, signature, rect, draw) overlay
+        elements in drawing order; draw(surface) must only touch pixels inside rect.
+        Returns the number of pixels pushed to the display.
+        """
+        self.active = True
+        if kind != self._kind or world_changed:
+            self._kind = kind
+            draw_world()
+            if self._world_layer is None or self._world_layer.get_size() != screen.get_size():
+                self._world_layer = screen.copy()
+            else:
+                self._world_layer.blit(screen, (0, 0))
+            for _, _, _, draw in items: draw(screen)
+            self._items = {slot: (signature, rect) for slot, signature, rect, _ in items}
+            pygame.display.flip()
+            return screen.get_width() * screen.get_height()
+
+        current = {slot: (signature, rect) for slot, signature, rect, _ in items}
+        dirty = []
+        for slot, (signature, rect) in current.items():
+            previous = self._items.get(slot)
+            if previous == (signature, rect): continue
+            dirty.append(rect.union(previous[1]) if previous else rect.copy())
+        dirty += [rect.copy() for slot, (_, rect) in self._items.items() if slot not in current]
+        self._items = current
+        if not dirty: return 0
+
+        # Elements touching a dirty area are redrawn whole, so their full rect becomes dirty too
+        # (otherwise translucent elements would blend over themselves outside the area).
+        redraw = set()
+        while True:
+            touched = {i for i, (_, _, rect, _) in enumerate(items) if i not in redraw and rect.collidelist(dirty) != -1}
+            if not touched: break
+            redraw |= touched
+            dirty += [items[i][2].copy() for i in touched]
+
+        # Restore the world under every dirty area, then redraw the affected elements in order.
+        for area in dirty: screen.blit(self._world_layer, area, area)
+        for i in sorted(redraw): items[i][3](screen)
+        pygame.display.update(dirty)
+        return sum(area.width * area.height for area in dirty)
@@ -0,0 +1,145 @@
+# loadtest.py
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import statistics
+import subprocess
+
+from server import SERVER_HOST, SERVER_PORT
+from simulation import INPUT_ROTATE_LEFT, INPUT_ROTATE_RIGHT, INPUT_THRUST
+
+INPUT_RATE = 20              # Inputs each simulated pilot sends per second.
+INPUT_CHANGE_CHANCE = 0.1    # Chance per input that a pilot picks new controls.
+CONTROL_CHOICES = (0, INPUT_THRUST, INPUT_THRUST | INPUT_ROTATE_LEFT, INPUT_THRUST | INPUT_ROTATE_RIGHT,
+                   INPUT_ROTATE_LEFT, INPUT_ROTATE_RIGHT)
+
+class Pilot:
+    """One simulated client: sends random controls and tracks snapshot bytes and input round trips."""
+    def __init__(self, index, seed, view):
+        self.index = index
+        self.rng = random.Random(f"{seed}:{index}")
+        self.view = view
+        self.bytes_received = 0
+        self.snapshots = 0
+        self.latencies_ms = []
+        self.visible_ships = 0
+        self.visible_garbage = 0
+        self._known_ships = set()
+        self._known_garbage = set()
+        self._last_echo = None
+
+    async def run(self, host, port, duration, warmup):
+        # The first snapshot of a crowded view can exceed the default line limit.
+        reader, writer = await asyncio.open_connection(host, port, limit=2**24)
+        writer.write(json.dumps({"type": "hello", "name": f"pilot{self.index}", "view": list(self.view)}).encode() + b'\n')
+        await writer.drain()
+        await reader.readline() # welcome
+        receive = asyncio.ensure_future(self._receive(reader, time.perf_counter() + warmup))
+        bits, seq = 0, 0
+        end = time.perf_counter() + warmup + duration
+        try:
+            while time.perf_counter() < end:
+                if self.rng.random() < INPUT_CHANGE_CHANCE: bits = self.rng.choice(CONTROL_CHOICES)
+                seq += 1
+                writer.write(json.dumps({"type": "input", "seq": seq, "bits": bits, "t": time.perf_counter()}).encode() + b'\n')
+                await writer.drain()
+                await asyncio.sleep(1.0 / INPUT_RATE)
+        finally:
+            receive.cancel()
+            writer.close()
+
+    async def _receive(self, reader, measure_from):
+        while True:
+            line = await reader.readline()
+            if not line: return
+            now = time.perf_counter()
+            message = json.loads(line)
+            if message.get('type') != 'snapshot': continue
+            self._known_ships.update(message['ships']); self._known_ships.difference_update(message['gone_ships'])
+            self._known_garbage.update(message['garbage']); self._known_garbage.difference_update(message['gone_garbage'])
+            if now < measure_from: continue
+            self.bytes_received += len(line)
+            self.snapshots += 1
+            self.visible_ships += len(self._known_ships)
+            self.visible_garbage += len(self._known_garbage)
+            echo = message.get('echo')
+            # Latency: input sent -> first snapshot that reflects it (same process clock, so directly comparable).
+            if echo is not None and echo != self._last_echo:
+                self._last_echo = echo
+                self.latencies_ms.append((now - echo) * 1000.0)
+
+async def query_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"type": "stats"}\n')
+    await writer.drain()
+    stats = json.loads(await reader.readline())
+    writer.close()
+    return stats
+
+async def run_load(host, port, pilots, duration, warmup, seed, view, ramp):
+    crew = [Pilot(i, seed, view) for i in range(pilots)]
+    tasks = []
+    for pilot in crew:
+        tasks.append(asyncio.ensure_future(pilot.run(host, port, duration, warmup)))
+        await asyncio.sleep(ramp / max(1, pilots)) # Stagger connections so inputs are not sent in lockstep
+    # Server timings are a rolling window, so sample them while every pilot is still connected.
+    await asyncio.sleep(warmup + duration * 0.95 - ramp)
+    server_stats = await query_stats(host, port)
+    await asyncio.gather(*tasks)
+    return crew, server_stats
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+def report(crew, duration, server_stats):
+    latencies = sorted(ms for pilot in crew for ms in pilot.latencies_ms)
+    per_client = [pilot.bytes_received / duration for pilot in crew]
+    snapshots = sum(pilot.snapshots for pilot in crew) or 1
+    tick = server_stats.get('tick_ms', {}); snapshot = server_stats.get('snapshot_ms', {})
+    print(f"\n{len(crew)} pilots for {duration:.0f} s ({server_stats.get('garbage', '?')} garbage left)")
+    print(f"  Server tick:     {tick.get('median_ms', 0):.2f} ms median, {tick.get('p99_ms', 0):.2f} ms p99, "
+          f"{tick.get('max_ms', 0):.2f} ms max (budget {1000.0 / 60:.2f} ms)")
+    print(f"  Snapshot build:  {snapshot.get('median_ms', 0):.2f} ms median, {snapshot.get('p99_ms', 0):.2f} ms p99 (every 3rd tick)")
+    print(f"  Bandwidth:       {statistics.mean(per_client) / 1024:.1f} KiB/s per client mean, "
+          f"{max(per_client) / 1024:.1f} KiB/s max, {sum(per_client) / 1024:.0f} KiB/s total")
+    print(f"  Visible:         {sum(p.visible_ships for p in crew) / snapshots:.1f} ships, "
+          f"{sum(p.visible_garbage for p in crew) / snapshots:.1f} garbage per snapshot")
+    print(f"  Input latency:   {percentile(latencies, 0.5):.1f} ms median, {percentile(latencies, 0.99):.1f} ms p99 "
+          f"({len(latencies)} samples)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-tests the GreenSpace.io server with simulated pilots.")
+    parser.add_argument('--pilots', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=20.0, help="measured seconds")
+    parser.add_argument('--warmup', type=float, default=3.0, help="seconds ignored after connecting")
+    parser.add_argument('--ramp', type=float, default=2.0, help="seconds over which pilots connect")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--view', type=int, nargs=2, default=(1920, 1080), metavar=('W', 'H'))
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--connect', action='store_true', help="use a running server instead of starting one")
+    args = parser.parse_args(argv)
+
+    server_process = None
+    if not args.connect:
+        server_process = subprocess.Popen([sys.executable, 'server.py', '--port', str(args.port), '--seed', str(args.seed),
+                                           '--stats-interval', '0'], stdout=subprocess.PIPE, text=True)
+        while True: # Wait for the listening banner (pygame prints its own first)
+            line = server_process.stdout.readline()
+            if not line: raise SystemExit("Server exited during startup")
+            if line.startswith("GreenSpace.io server"): print(line.rstrip()); break
+    try:
+        crew, server_stats = asyncio.run(run_load(args.host, args.port, args.pilots, args.duration, args.warmup,
+                                                  args.seed, args.view, args.ramp))
+    finally:
+        if server_process:
+            server_process.terminate(); server_process.wait()
+    report(crew, args.duration, server_stats)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,16 +3,45 @@
 import pygame
 import os
 import math
-import random
 import json
+import time
+import argparse
+import threading
+import copy
+import numpy as np
 
-from config import (SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN, ROTATION_SPEED, THRUST_MAGNITUDE,
-                    WORLD_RADIUS, WORLD_CENTER_X, WORLD_CENTER_Y,
+import rng
+
+import config
+from config import (ROTATION_SPEED, THRUST_MAGNITUDE,
+                    WORLD_RADIUS, WORLD_CENTER_X, WORLD_CENTER_Y, SYSTEM_RADIUS, NUM_STAR_SYSTEMS, STAR_SYSTEMS_ENV_VAR,
                     SUN_RADIUS, SUN_COLOR, DESIRED_SIZE, NUM_SOLAR_SYSTEM_PLANETS,
-                    SHIP_MAGNET_RANGE)
+                    TARGET_FRAME_RATE, IDLE_FRAME_RATE, IDLE_MINIMAP_REFRESH_MS, CAMERA_ZOOM_LEVELS, ENDLESS_SPAWN_RATE, ENDLESS_MAX_GARBAGE,
+                    AUTOPILOT_SHIP_RADIUS_APPROX, AUTOPILOT_DANGER_PROXIMITY_OBSTACLE, AUTOPILOT_DANGER_PROXIMITY_BOUNDARY,
+                    AUTOPILOT_GARBAGE_SEEK_RADIUS, AUTOPILOT_ARRIVE_SLOWDOWN_RADIUS,
+                    AUTOPILOT_WANDER_CHANGE_DIR_INTERVAL, AUTOPILOT_WANDER_CONE_ANGLE)
 from spaceship import SpaceShip
 from galaxy import Background
-from garbage import Garbage
+from garbage import Garbage, submit_garbage
+from endless import DebrisSpawner
+from fonts import get_font
+from simulation import (INPUT_ROTATE_LEFT, INPUT_ROTATE_RIGHT, INPUT_THRUST, INPUT_AUTOPILOT,
+                        INPUT_PAUSED, INPUT_RESPAWN, angle_to_target, apply_manual_controls,
+                        steer_towards_heading, check_ship_crash, get_safe_spawn_position)
+from replay import ReplayWriter
+from resolution import RenderResolution
+from quality import GOVERNOR
+from idle import IdleScreen
+from renderqueue import RENDER_QUEUE
+from memprofile import MEMPROFILER
+from autopilot import OrbitEphemeris, evade_predicted_collision
+from clumping import GarbageCollisions
+from gravity import GravityField
+from worldframe import WorldFrame
+from simthread import SimulationThread
+from profiler import (PROFILER, PHASE_TICK_WAIT, PHASE_EVENTS, PHASE_AUTOPILOT, PHASE_GRAVITY, PHASE_SHIP_UPDATE,
+                      PHASE_BACKGROUND_UPDATE, PHASE_GARBAGE_UPDATE, PHASE_COLLECTION, PHASE_GARBAGE_SUBMIT,
+                      PHASE_QUEUE_FLUSH, PHASE_HUD, PHASE_MINIMAP, PHASE_FLIP)
 
 SAVE_FILE = "savegame.txt"
 
@@ -44,6 +73,13 @@ AUTOPILOT_FONT_SIZE = 30
 AUTOPILOT_ON_COLOR = (0, 255, 0)  # Color for autopilot 'ON' indicator.
 AUTOPILOT_OFF_COLOR = (255, 0, 0) # Color for autopilot 'OFF' indicator.
 
+MENU_PLACEHOLDER_COLOR = (15, 0, 30) # Shown behind the menu until its galaxy has been generated.
+
+# Profiler Keys
+PROFILER_TOGGLE_KEY = pygame.K_F3 # Shows/hides the frame profiler overlay (recording only runs while shown).
+PROFILER_DUMP_KEY = pygame.K_F4   # Dumps the last frames to a Chrome trace-event JSON file.
+MEMPROFILE_MARK_KEY = pygame.K_F5 # With --memprofile: first press marks a snapshot, second writes the diff since the mark.
+
 # World Boundary Warning Constants
 WORLD_BOUNDARY_WARN_COLOR = (255, 0, 0, 150) # Color for the world boundary warning (includes alpha).
 WORLD_BOUNDARY_WARN_THICKNESS = 15
@@ -51,83 +87,94 @@ BOUNDARY_PROXIMITY_THRESHOLD = 0.90
 
 # Minimap Variables
 MINIMAP_SIZE_RADIUS = 80; MINIMAP_MARGIN = 15
-MINIMAP_CENTER_X_ON_SCREEN = SCREEN_WIDTH - MINIMAP_SIZE_RADIUS - MINIMAP_MARGIN
-MINIMAP_CENTER_Y_ON_SCREEN = MINIMAP_SIZE_RADIUS + MINIMAP_MARGIN
 MINIMAP_BG_COLOR = (20,20,40,180); MINIMAP_BORDER_COLOR = (100,100,120,200)
 SHIP_MINIMAP_COLOR = (255,255,0); GARBAGE_MINIMAP_COLOR = (0,255,0)
 
-# Autopilot Constants
-AUTOPILOT_SHIP_RADIUS_APPROX = max(DESIRED_SIZE) / 2.0 if DESIRED_SIZE else 50.0
-AUTOPILOT_DANGER_PROXIMITY_OBSTACLE = 550
-AUTOPILOT_DANGER_PROXIMITY_BOUNDARY = 600
-AUTOPILOT_GARBAGE_SEEK_RADIUS = SHIP_MAGNET_RANGE * 2.0
-AUTOPILOT_ARRIVE_SLOWDOWN_RADIUS = 360
-AUTOPILOT_WANDER_CHANGE_DIR_INTERVAL = 3.0
-AUTOPILOT_WANDER_CONE_ANGLE = 90
-
 # Global game variables
 main_game_background = None
+world_generating = False # True while a new game's or a loaded game's world is being generated
+menu_world_seed = None # Seed of the galaxy behind the menu; the next new game plays it, sharing its static layers
 all_garbage_objects = []
+endless_mode = False # New games keep spawning debris and never end in a win (--endless or E on the menu)
+endless_spawn_rate = ENDLESS_SPAWN_RATE # Debris per second in endless mode (--spawn-rate)
+debris_spawner = None # DebrisSpawner of the current endless game, None in a regular game
+gravity_mode = 'off' # New games use gravity from the sun and planets ('bodies') and between debris too ('debris') (--gravity)
+gravity_field = None # GravityField of the current game, None without gravity
 spaceShip = None
 camera_x, camera_y = 0.0, 0.0
+camera_zoom_level = 0 # Index into CAMERA_ZOOM_LEVELS (view only; the simulation never reads it)
 score = 0; game_time = 0.0; crash_time_elapsed = 0.0; ship_crash_count = 0
 autopilot_on = False
+is_game_paused = False
 current_state = STATE_LOADING_PROMPT
+previous_tick_state = STATE_LOADING_PROMPT # State at the end of the previous simulated tick.
+respawn_requested = False
+
+# Replay recording (enabled with --record)
+replay_record_path = None
+replay_recorder = None
+replay_session_count = 0
 
 # Autopilot global state variables
 autopilot_wander_timer = 0.0
 autopilot_target_wander_heading = 0.0
 autopilot_first_wander_decision = True
+autopilot_ephemeris = OrbitEphemeris() # Sun and planet positions over the autopilot's look-ahead, rebuilt every autopilot tick
+garbage_collisions = GarbageCollisions() # Separates garbage that moved this tick (magnet clumping)
+world_frame = WorldFrame() # Ship, body and garbage geometry of the last tick, shared by the autopilot, collection and crash checks
+
+# Fonts and pre-rendered UI elements, created by init_ui() once the display exists
+ui_font = title_font = debug_font = score_font = game_over_font = None
+restart_button_font = crash_timer_font = crash_count_font = prompt_font = autopilot_font = None
+win_title_main_font = win_info_font = win_text_surface = win_text_rect = None
+play_again_button_font = play_again_button_text_surface = play_again_button_rect_inner = play_again_button_rect_outer = None
+respawn_button_text_surface = respawn_button_rect_inner = respawn_button_rect_outer = None
+paused_text_render = paused_text_rect = paused_text_hover_render = None
+
+def init_ui():
+    """Creates fonts and pre-rendered UI elements. Must run after config.init_display()."""
+    global ui_font, title_font, debug_font, score_font, game_over_font
+    global restart_button_font, crash_timer_font, crash_count_font, prompt_font, autopilot_font
+    global win_title_main_font, win_info_font, win_text_surface, win_text_rect
+    global play_again_button_font, play_again_button_text_surface, play_again_button_rect_inner, play_again_button_rect_outer
+    global respawn_button_text_surface, respawn_button_rect_inner, respawn_button_rect_outer
+    global paused_text_render, paused_text_rect, paused_text_hover_render
+    SCREEN_WIDTH, SCREEN_HEIGHT = config.SCREEN_WIDTH, config.SCREEN_HEIGHT
+    ui_font = get_font(UI_FONT_SIZE, bold=True)
+    title_font = get_font(TITLE_FONT_SIZE, bold=True)
+    debug_font = get_font(24)
+    score_font = get_font(30, bold=True)
+    game_over_font = ui_font
+    restart_button_font = get_font(35, bold=True)
+    crash_timer_font = get_font(28, bold=True)
+    crash_count_font = get_font(28, bold=True)
+    prompt_font = get_font(40, bold=True)
+    autopilot_font = get_font(AUTOPILOT_FONT_SIZE, bold=True)
+
+    # Win Screen UI elements
+    win_title_main_font = get_font(TITLE_FONT_SIZE + 10, bold=True)
+    win_info_font = get_font(UI_FONT_SIZE - 15, bold=True)
+    win_text_surface = win_title_main_font.render("YOU WIN!", True, WIN_TEXT_COLOR)
+    win_text_rect = win_text_surface.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 3 - 20))
+
+    play_again_button_font = restart_button_font
+    play_again_button_text_surface = play_again_button_font.render("Play Again", True, RESTART_TEXT_COLOR)
+    play_again_button_rect_inner = play_again_button_text_surface.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 + 180))
+    padding_x_button = 40; padding_y_button = 20
+    play_again_button_rect_outer = play_again_button_rect_inner.inflate(padding_x_button * 2, padding_y_button * 2)
+
+    respawn_button_text_surface = restart_button_font.render("Respawn",True,RESTART_TEXT_COLOR)
+    padding_x = 30; padding_y = 15
+    respawn_button_rect_inner = respawn_button_text_surface.get_rect(center=(config.SCREEN_WIDTH//2, config.SCREEN_HEIGHT//2+150))
+    respawn_button_rect_outer = respawn_button_rect_inner.inflate(padding_x*2, padding_y*2)
 
-pygame.font.init()
-ui_font = pygame.font.SysFont('Arial', UI_FONT_SIZE, bold=True)
-title_font = pygame.font.SysFont('Arial', TITLE_FONT_SIZE, bold=True)
-debug_font = pygame.font.SysFont('Arial', 24)
-score_font = pygame.font.SysFont('Arial', 30, bold=True)
-game_over_font = ui_font
-restart_button_font = pygame.font.SysFont('Arial', 35, bold=True)
-crash_timer_font = pygame.font.SysFont('Arial', 28, bold=True)
-crash_count_font = pygame.font.SysFont('Arial', 28, bold=True)
-prompt_font = pygame.font.SysFont('Arial', 40, bold=True)
-autopilot_font = pygame.font.SysFont('Arial', AUTOPILOT_FONT_SIZE, bold=True)
-
-# Win Screen UI elements
-win_title_main_font = pygame.font.SysFont('Arial', TITLE_FONT_SIZE + 10, bold=True)
-win_info_font = pygame.font.SysFont('Arial', UI_FONT_SIZE - 15, bold=True)
-win_text_surface = win_title_main_font.render("YOU WIN!", True, WIN_TEXT_COLOR)
-win_text_rect = win_text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3 - 20))
-
-play_again_button_font = restart_button_font
-play_again_button_text_surface = play_again_button_font.render("Play Again", True, RESTART_TEXT_COLOR)
-play_again_button_rect_inner = play_again_button_text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 180))
-padding_x_button = 40; padding_y_button = 20
-play_again_button_rect_outer = play_again_button_rect_inner.inflate(padding_x_button * 2, padding_y_button * 2)
-
-respawn_button_text_surface = restart_button_font.render("Respawn",True,RESTART_TEXT_COLOR)
-padding_x = 30; padding_y = 15
-respawn_button_rect_inner = respawn_button_text_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2+150))
-respawn_button_rect_outer = respawn_button_rect_inner.inflate(padding_x*2, padding_y*2)
-
-
-# --- Autopilot Helper Functions ---
-def angle_to_target(current_x, current_y, target_x, target_y):
-    """Calculates the angle in degrees from current to target point.
-    Matches the spaceship's angle convention (0 East, 90 North/Up).
-    """
-    delta_x = target_x - current_x
-    delta_y = target_y - current_y
-    # -delta_y because ship's "up" (angle 90) corresponds to decreasing world Y coordinate
-    angle_rad = math.atan2(-delta_y, delta_x)
-    return (math.degrees(angle_rad) + 360) % 360
-
-def normalize_angle_degrees_180(angle):
-    """Normalizes an angle to the range [-180, 180] degrees."""
-    angle = (angle + 180) % 360 - 180
-    return angle
+    paused_text_render = ui_font.render("PAUSED (Click or P to Resume)", True, UI_TEXT_COLOR)
+    paused_text_rect = paused_text_render.get_rect(center=(config.SCREEN_WIDTH//2, config.SCREEN_HEIGHT//2))
+    paused_text_hover_render = ui_font.render("PAUSED (Click or P to Resume)", True, UI_TEXT_HOVER_COLOR)
 
 # --- Autopilot Decision Function ---
-def get_autopilot_decision(ship, sun_data, planets_list, garbage_items_list, world_r, world_cx, world_cy, current_dt):
-    """Determines autopilot actions (desired heading and thrust) based on game state."""
+def get_autopilot_decision(ship, frame, current_dt):
+    """Determines autopilot actions (desired heading and thrust) from the tick's WorldFrame."""
     global autopilot_wander_timer, autopilot_target_wander_heading, autopilot_first_wander_decision
 
     ship_x, ship_y = ship.x, ship.y
@@ -137,28 +184,23 @@ def get_autopilot_decision(ship, sun_data, planets_list, garbage_items_list, wor
     should_thrust = False                  # Default: no thrust
 
     # Priority 1: Avoid Imminent Danger
-    obstacles_to_check = [{'x': sun_data['world_pos'][0], 'y': sun_data['world_pos'][1], 'radius': sun_data['radius'], 'type': 'sun'}]
-    for p in planets_list:
-        obstacles_to_check.append({'x': p['world_pos'][0], 'y': p['world_pos'][1], 'radius': p['radius'], 'type': 'planet'})
-
+    surface_dist = frame.body_dist - frame.body_radius - AUTOPILOT_SHIP_RADIUS_APPROX
+    threats = np.flatnonzero(surface_dist < AUTOPILOT_DANGER_PROXIMITY_OBSTACLE)
     closest_obstacle_surface_dist = float('inf')
     action_flee = False
 
-    for obs in obstacles_to_check:
-        dist_to_obs_center = math.hypot(ship_x - obs['x'], ship_y - obs['y'])
-        surface_dist = dist_to_obs_center - obs['radius'] - AUTOPILOT_SHIP_RADIUS_APPROX
-        if surface_dist < AUTOPILOT_DANGER_PROXIMITY_OBSTACLE:
-            if surface_dist < closest_obstacle_surface_dist: # Prioritize closest threat
-                closest_obstacle_surface_dist = surface_dist
-                desired_heading = (angle_to_target(obs['x'], obs['y'], ship_x, ship_y) + 360) % 360 # Flee from obstacle center
-                should_thrust = True
-                action_flee = True
-
-    dist_from_world_center = math.hypot(ship_x - world_cx, ship_y - world_cy)
-    dist_to_boundary = world_r - (dist_from_world_center + AUTOPILOT_SHIP_RADIUS_APPROX) # Distance from ship edge to boundary
+    if len(threats): # Prioritize closest threat
+        closest = int(threats[np.argmin(surface_dist[threats])])
+        closest_obstacle_surface_dist = float(surface_dist[closest])
+        obs_x, obs_y = float(frame.body_x[closest]), float(frame.body_y[closest])
+        desired_heading = (angle_to_target(obs_x, obs_y, ship_x, ship_y) + 360) % 360 # Flee from obstacle center
+        should_thrust = True
+        action_flee = True
+
+    dist_to_boundary = WORLD_RADIUS - (frame.center_dist + AUTOPILOT_SHIP_RADIUS_APPROX) # Distance from ship edge to boundary
     if dist_to_boundary < AUTOPILOT_DANGER_PROXIMITY_BOUNDARY:
         if not action_flee or dist_to_boundary < closest_obstacle_surface_dist: # If boundary is a more pressing danger
-            desired_heading = (angle_to_target(ship_x, ship_y, world_cx, world_cy) + 360) % 360 # Flee towards world center
+            desired_heading = (angle_to_target(ship_x, ship_y, WORLD_CENTER_X, WORLD_CENTER_Y) + 360) % 360 # Flee towards world center
             should_thrust = True
             action_flee = True
 
@@ -167,28 +209,20 @@ def get_autopilot_decision(ship, sun_data, planets_list, garbage_items_list, wor
         return desired_heading, should_thrust
 
     # Priority 2: Collect Garbage
-    closest_garbage_obj = None
-    min_dist_sq_to_garbage = AUTOPILOT_GARBAGE_SEEK_RADIUS ** 2
-
-    for g_item in garbage_items_list:
-        dx_g = ship_x - g_item.world_x
-        dy_g = ship_y - g_item.world_y
-        dist_sq = dx_g*dx_g + dy_g*dy_g
-        if dist_sq < min_dist_sq_to_garbage:
-            min_dist_sq_to_garbage = dist_sq
-            closest_garbage_obj = g_item
-
-    if closest_garbage_obj:
+    closest = frame.nearest_garbage(AUTOPILOT_GARBAGE_SEEK_RADIUS)
+
+    if closest is not None:
+        closest_garbage_obj = frame.items[closest]
         autopilot_first_wander_decision = True # Reset wander state
-        dist_to_garbage = math.sqrt(min_dist_sq_to_garbage)
+        dist_to_garbage = math.sqrt(frame.garbage_dist_sq[closest])
         desired_heading = angle_to_target(ship_x, ship_y, closest_garbage_obj.world_x, closest_garbage_obj.world_y)
 
         # Thrust logic based on proximity, with some randomness
         should_thrust_normally = dist_to_garbage > AUTOPILOT_ARRIVE_SLOWDOWN_RADIUS
         if not should_thrust_normally: # Close to target
-            should_thrust = random.random() < 0.2 # Low chance of pulsing thrust
+            should_thrust = rng.sim.random() < 0.2 # Low chance of pulsing thrust
         else: # Further from target
-            should_thrust = random.random() < 0.4 # Moderate chance of thrusting
+            should_thrust = rng.sim.random() < 0.4 # Moderate chance of thrusting
         return desired_heading, should_thrust
 
     # Priority 3: Wander
@@ -196,82 +230,91 @@ def get_autopilot_decision(ship, sun_data, planets_list, garbage_items_list, wor
     if autopilot_first_wander_decision or autopilot_wander_timer >= AUTOPILOT_WANDER_CHANGE_DIR_INTERVAL:
         autopilot_first_wander_decision = False
         autopilot_wander_timer = 0.0
-        wander_offset = random.uniform(-AUTOPILOT_WANDER_CONE_ANGLE / 2, AUTOPILOT_WANDER_CONE_ANGLE / 2)
+        wander_offset = rng.sim.uniform(-AUTOPILOT_WANDER_CONE_ANGLE / 2, AUTOPILOT_WANDER_CONE_ANGLE / 2)
         autopilot_target_wander_heading = (ship_current_heading + wander_offset + 360) % 360
 
     desired_heading = autopilot_target_wander_heading
-    should_thrust = random.random() < 0.7 # Probabilistic thrust during wander
+    should_thrust = rng.sim.random() < 0.7 # Probabilistic thrust during wander
 
     return desired_heading, should_thrust
 
 
 # --- Game State Functions ---
-def get_safe_spawn_position(bg_obj, ship_radius_approx):
-    max_attempts = 100
-    for _ in range(max_attempts):
-        angle = random.uniform(0, 2 * math.pi)
-        dist = random.uniform(WORLD_RADIUS*0.3, WORLD_RADIUS*0.7) # Spawn between 30% and 70% of world radius
-        spawn_x = WORLD_CENTER_X + dist * math.cos(angle)
-        spawn_y = WORLD_CENTER_Y + dist * math.sin(angle)
-        sun_dist_sq = (spawn_x - WORLD_CENTER_X)**2 + (spawn_y - WORLD_CENTER_Y)**2
-        if sun_dist_sq < (SUN_RADIUS + ship_radius_approx + 200)**2: continue # Min distance from Sun
-        safe = True
-        if hasattr(bg_obj, 'solar_system_planets') and bg_obj.solar_system_planets:
-            for p_data in bg_obj.solar_system_planets:
-                p_x, p_y, p_r = p_data['world_pos'][0], p_data['world_pos'][1], p_data['radius']
-                if (spawn_x - p_x)**2 + (spawn_y - p_y)**2 < (p_r + ship_radius_approx + 200)**2: # Min distance from planets
-                    safe = False; break
-        if safe: return float(spawn_x), float(spawn_y)
-    print("Warning: Fallback spawn position used.")
-    return float(WORLD_CENTER_X + random.uniform(SUN_RADIUS+300, SUN_RADIUS+500)), float(WORLD_CENTER_Y + random.uniform(SUN_RADIUS+300, SUN_RADIUS+500))
-
-def draw_minimap(surface, current_ship, bg_obj, cam_x, cam_y, garbage_list):
+def render_minimap(view):
+    """Renders the minimap of a view (see capture_view) onto a new transparent surface (see blit_minimap)."""
+    current_ship, bg_obj = view['ship'], view['background']
     minimap_render_surface = pygame.Surface((MINIMAP_SIZE_RADIUS*2, MINIMAP_SIZE_RADIUS*2), pygame.SRCALPHA)
     minimap_render_surface.fill((0,0,0,0))
     pygame.draw.circle(minimap_render_surface, MINIMAP_BG_COLOR, (MINIMAP_SIZE_RADIUS,MINIMAP_SIZE_RADIUS), MINIMAP_SIZE_RADIUS)
     pygame.draw.circle(minimap_render_surface, MINIMAP_BORDER_COLOR, (MINIMAP_SIZE_RADIUS,MINIMAP_SIZE_RADIUS), MINIMAP_SIZE_RADIUS, 2)
     scale = float(MINIMAP_SIZE_RADIUS) / WORLD_RADIUS if WORLD_RADIUS > 0 else 0.001
-    # Draw Sun on minimap
-    if hasattr(bg_obj, 'sun_data'):
-        sx,sy,sr = bg_obj.sun_data['world_pos'][0],bg_obj.sun_data['world_pos'][1],bg_obj.sun_data['radius']
-        msx,msy,msr = MINIMAP_SIZE_RADIUS+(sx-WORLD_CENTER_X)*scale, MINIMAP_SIZE_RADIUS+(sy-WORLD_CENTER_Y)*scale, max(1,int(sr*scale))
-        pygame.draw.circle(minimap_render_surface, bg_obj.sun_data['color'], (int(msx),int(msy)), msr)
-    # Draw planets on minimap
-    if hasattr(bg_obj, 'solar_system_planets') and bg_obj.solar_system_planets:
-        for p in bg_obj.solar_system_planets:
-            px,py,pr = p['world_pos'][0],p['world_pos'][1],p['radius']
-            mpx,mpy,mpr = MINIMAP_SIZE_RADIUS+(px-WORLD_CENTER_X)*scale, MINIMAP_SIZE_RADIUS+(py-WORLD_CENTER_Y)*scale, max(1,int(pr*scale))
-            pygame.draw.circle(minimap_render_surface, p['color'], (int(mpx),int(mpy)), mpr)
+    garbage_x, garbage_y, _ = view['garbage']
+    if len(bg_obj.systems) > 1: # A galaxy: each system is a dot, too small for its planets and garbage to show
+        for sun in bg_obj.suns:
+            mbx,mby = MINIMAP_SIZE_RADIUS+(sun['world_pos'][0]-WORLD_CENTER_X)*scale, MINIMAP_SIZE_RADIUS+(sun['world_pos'][1]-WORLD_CENTER_Y)*scale
+            pygame.draw.circle(minimap_render_surface, sun['color'], (int(mbx),int(mby)), 1)
+        garbage_x = garbage_y = np.zeros(0)
+    else: # Draw Sun and planets on minimap, from the same cached sprites as the world view
+        for index, body in enumerate(bg_obj.bodies(view['planets'])):
+            bx,by,br = body['world_pos'][0],body['world_pos'][1],body['radius']
+            mbx,mby = MINIMAP_SIZE_RADIUS+(bx-WORLD_CENTER_X)*scale, MINIMAP_SIZE_RADIUS+(by-WORLD_CENTER_Y)*scale
+            bg_obj.draw_body(minimap_render_surface, index, body, mbx, mby, max(1,br*scale))
     # Draw garbage on minimap
-    for G_item in garbage_list:
-        gx,gy = G_item.world_x, G_item.world_y
-        mgx,mgy = MINIMAP_SIZE_RADIUS+(gx-WORLD_CENTER_X)*scale, MINIMAP_SIZE_RADIUS+(gy-WORLD_CENTER_Y)*scale
-        if math.hypot(mgx-MINIMAP_SIZE_RADIUS, mgy-MINIMAP_SIZE_RADIUS) <= MINIMAP_SIZE_RADIUS:
-            pygame.draw.circle(minimap_render_surface, GARBAGE_MINIMAP_COLOR, (int(mgx),int(mgy)), 1)
+    mgx, mgy = MINIMAP_SIZE_RADIUS+(garbage_x-WORLD_CENTER_X)*scale, MINIMAP_SIZE_RADIUS+(garbage_y-WORLD_CENTER_Y)*scale
+    inside = np.hypot(mgx-MINIMAP_SIZE_RADIUS, mgy-MINIMAP_SIZE_RADIUS) <= MINIMAP_SIZE_RADIUS
+    for point in zip(mgx[inside].astype(int).tolist(), mgy[inside].astype(int).tolist()):
+        pygame.draw.circle(minimap_render_surface, GARBAGE_MINIMAP_COLOR, point, 1)
     # Draw ship on minimap
     if current_ship and current_ship.alive:
         shx,shy = current_ship.x, current_ship.y
         mshx,mshy = MINIMAP_SIZE_RADIUS+(shx-WORLD_CENTER_X)*scale, MINIMAP_SIZE_RADIUS+(shy-WORLD_CENTER_Y)*scale
         cs=4; pygame.draw.line(minimap_render_surface,SHIP_MINIMAP_COLOR,(int(mshx-cs),int(mshy)),(int(mshx+cs),int(mshy)),1)
         pygame.draw.line(minimap_render_surface,SHIP_MINIMAP_COLOR,(int(mshx),int(mshy-cs)),(int(mshx),int(mshy+cs)),1)
-    surface.blit(minimap_render_surface, (MINIMAP_CENTER_X_ON_SCREEN-MINIMAP_SIZE_RADIUS, MINIMAP_CENTER_Y_ON_SCREEN-MINIMAP_SIZE_RADIUS))
+    return minimap_render_surface
+
+def blit_minimap(surface, minimap_render_surface):
+    """Places a rendered minimap in the top-right corner of surface."""
+    minimap_center_x = surface.get_width() - MINIMAP_SIZE_RADIUS - MINIMAP_MARGIN
+    minimap_center_y = MINIMAP_SIZE_RADIUS + MINIMAP_MARGIN
+    surface.blit(minimap_render_surface, (minimap_center_x-MINIMAP_SIZE_RADIUS, minimap_center_y-MINIMAP_SIZE_RADIUS))
+
+def draw_minimap(surface, view):
+    blit_minimap(surface, render_minimap(view))
+
+def build_world(seed):
+    """Background(seed=seed), with world_generating set meanwhile (with --threaded it spans several frames)."""
+    global world_generating
+    world_generating = True
+    try: return Background(seed=seed)
+    finally: world_generating = False
 
 def reset_game_state():
     global main_game_background, all_garbage_objects, spaceShip, camera_x, camera_y, score, game_time, ship_crash_count, crash_time_elapsed, autopilot_on
     global autopilot_wander_timer, autopilot_target_wander_heading, autopilot_first_wander_decision
+    global is_game_paused, previous_tick_state, respawn_requested, debris_spawner, gravity_field, menu_world_seed
     print("Resetting game state for a new game...")
-    main_game_background = Background()
+    world_seed = menu_world_seed if menu_world_seed is not None else rng.new_seed()
+    menu_world_seed = None # Later new games get a world of their own
+    rng.seed_all(world_seed) # One recorded seed drives the world and every simulation stream
+    main_game_background = build_world(world_seed)
     all_garbage_objects = main_game_background.all_garbage_items # Link to the newly generated garbage
+    debris_spawner = DebrisSpawner(main_game_background, rate=endless_spawn_rate) if endless_mode else None
+    gravity_field = GravityField(debris=gravity_mode == 'debris') if gravity_mode != 'off' else None
+    if gravity_field: gravity_field.launch_orbits(all_garbage_objects, main_game_background.celestial) # Orbit instead of falling in
     ship_radius = max(DESIRED_SIZE)/2.0 if DESIRED_SIZE else 50.0
     init_ship_x, init_ship_y = get_safe_spawn_position(main_game_background, ship_radius)
     spaceShip = SpaceShip(init_ship_x, init_ship_y)
-    camera_x=spaceShip.x-SCREEN_WIDTH//2; camera_y=spaceShip.y-SCREEN_HEIGHT//2
+    camera_x=spaceShip.x-config.SCREEN_WIDTH//2; camera_y=spaceShip.y-config.SCREEN_HEIGHT//2
     score=0; game_time=0.0; ship_crash_count=0; crash_time_elapsed=0.0
     autopilot_on = False # Default autopilot to off
+    is_game_paused = False; respawn_requested = False
+    previous_tick_state = STATE_READY_TO_START
 
     autopilot_wander_timer = 0.0
     autopilot_target_wander_heading = spaceShip.current_angle if spaceShip else 90.0
     autopilot_first_wander_decision = True
+    world_frame.invalidate()
+    start_replay_recording()
 
 def respawn_ship():
     global spaceShip, camera_x, camera_y
@@ -280,318 +323,653 @@ def respawn_ship():
     ship_radius = max(DESIRED_SIZE)/2.0 if DESIRED_SIZE else 50.0
     init_ship_x, init_ship_y = get_safe_spawn_position(main_game_background, ship_radius)
     spaceShip = SpaceShip(init_ship_x, init_ship_y)
-    camera_x=spaceShip.x-SCREEN_WIDTH//2; camera_y=spaceShip.y-SCREEN_HEIGHT//2
+    camera_x=spaceShip.x-config.SCREEN_WIDTH//2; camera_y=spaceShip.y-config.SCREEN_HEIGHT//2
     # Score, game_time, crash_count, background and garbage persist
 
     autopilot_wander_timer = 0.0
     autopilot_target_wander_heading = spaceShip.current_angle
     autopilot_first_wander_decision = True
+    world_frame.invalidate()
+
+def capture_game_state():
+    """Returns the persistent game state as a JSON-serialisable dict (the save file format)."""
+    main_game_background.celestial.sync_all() # Planet dicts of systems out of reach lag behind their orbits
+    data = {"world_seed": main_game_background.seed, "star_systems": len(main_game_background.systems),
+        "spaceship": {"x": spaceShip.x, "y": spaceShip.y, "vx_0": spaceShip.vx_0, "vy_0": spaceShip.vy_0, "current_angle": spaceShip.current_angle},
+        "game_progress": {"score": score, "game_time": game_time, "ship_crash_count": ship_crash_count, "autopilot_on": autopilot_on},
+        "solar_system_planets_state": [{'world_pos': p['world_pos'][:], 'radius': p['radius'], 'color': p['color'], 'orbit_radius': p['orbit_radius'], 'orbit_speed': p['orbit_speed'], 'current_orbit_angle': p['current_orbit_angle'], 'system': p['system']} for p in main_game_background.solar_system_planets],
+        "remaining_garbage": [garbage_state(g) for g in all_garbage_objects]}
+    if debris_spawner: data["endless"] = debris_spawner.capture_state()
+    if gravity_field: data["gravity"] = gravity_field.capture_state()
+    return data
+
+def garbage_state(G_item):
+    """One remaining_garbage entry. Drift velocity is only stored for debris that has one."""
+    g_data = {"world_x": G_item.world_x, "world_y": G_item.world_y, "size": G_item.size}
+    if G_item.vx or G_item.vy: g_data["vx"] = G_item.vx; g_data["vy"] = G_item.vy
+    return g_data
+
+def restore_game_state(data, background):
+    """Replaces planets, garbage, ship and progress with the contents of a capture_game_state() dict."""
+    global main_game_background, all_garbage_objects, spaceShip, camera_x, camera_y, score, game_time, ship_crash_count, crash_time_elapsed, autopilot_on
+    global endless_mode, debris_spawner, gravity_mode, gravity_field
+    main_game_background = background
+    ship_data = data['spaceship']
+    spaceShip = SpaceShip(ship_data['x'], ship_data['y'])
+    spaceShip.vx_0=ship_data['vx_0']; spaceShip.vy_0=ship_data['vy_0']; spaceShip.current_angle=ship_data['current_angle']; spaceShip.alive=True
+
+    game_progress = data['game_progress']
+    score=game_progress['score']; game_time=game_progress['game_time']; ship_crash_count=game_progress['ship_crash_count']
+    autopilot_on = game_progress.get("autopilot_on", False)
+    crash_time_elapsed=0.0
+
+    main_game_background.solar_system_planets.clear()
+    for p_state in data['solar_system_planets_state']: # Load saved planet states
+        main_game_background.solar_system_planets.append({'type':'solar_system_planet','world_pos':list(p_state['world_pos']),'radius':p_state['radius'],'color':tuple(p_state['color']),'orbit_radius':p_state['orbit_radius'],'orbit_speed':p_state['orbit_speed'],'current_orbit_angle':p_state['current_orbit_angle'],'system':p_state.get('system', 0)})
+    main_game_background.celestial.rebuild(main_game_background.solar_system_planets)
+
+    all_garbage_objects = [Garbage(g_data['world_x'],g_data['world_y'],loaded_size=g_data['size']) for g_data in data['remaining_garbage']]
+    for G_item, g_data in zip(all_garbage_objects, data['remaining_garbage']):
+        G_item.vx = g_data.get('vx', 0.0); G_item.vy = g_data.get('vy', 0.0)
+    main_game_background.all_garbage_items = all_garbage_objects # Ensure Background uses the loaded garbage
+    endless_mode = "endless" in data
+    debris_spawner = None
+    if endless_mode:
+        endless = data['endless']
+        debris_spawner = DebrisSpawner(main_game_background, rate=endless['rate'], cap=endless['cap'])
+        debris_spawner.restore_state(endless)
+    gravity = data.get("gravity")
+    gravity_field = GravityField(debris=gravity['debris'], theta=gravity['theta']) if gravity else None
+    gravity_mode = ('debris' if gravity['debris'] else 'bodies') if gravity else 'off'
+    camera_x=spaceShip.x-config.SCREEN_WIDTH//2; camera_y=spaceShip.y-config.SCREEN_HEIGHT//2
+    world_frame.invalidate()
+
+def capture_sim_state():
+    """Extends capture_game_state() with everything a tick depends on (replay keyframes)."""
+    data = capture_game_state()
+    data['spaceship'].update({"alive": spaceShip.alive, "is_thrusting": spaceShip.is_thrusting,
+                              "particle_emit_cooldown": spaceShip.particle_emit_cooldown})
+    data['sim'] = {"current_state": current_state, "previous_tick_state": previous_tick_state,
+                   "crash_time_elapsed": crash_time_elapsed, "autopilot_wander_timer": autopilot_wander_timer,
+                   "autopilot_target_wander_heading": autopilot_target_wander_heading,
+                   "autopilot_first_wander_decision": autopilot_first_wander_decision, "rng": rng.get_state()}
+    return data
+
+def restore_sim_state(data, background):
+    """Restores a capture_sim_state() dict so that subsequent ticks continue identically."""
+    global current_state, previous_tick_state, crash_time_elapsed, is_game_paused, respawn_requested
+    global autopilot_wander_timer, autopilot_target_wander_heading, autopilot_first_wander_decision
+    restore_game_state(data, background)
+    ship_data = data['spaceship']
+    spaceShip.alive = ship_data['alive']; spaceShip.is_thrusting = ship_data['is_thrusting']
+    spaceShip.particle_emit_cooldown = ship_data['particle_emit_cooldown']
+    sim = data['sim']
+    current_state = sim['current_state']; previous_tick_state = sim['previous_tick_state']
+    crash_time_elapsed = sim['crash_time_elapsed']
+    autopilot_wander_timer = sim['autopilot_wander_timer']
+    autopilot_target_wander_heading = sim['autopilot_target_wander_heading']
+    autopilot_first_wander_decision = sim['autopilot_first_wander_decision']
+    is_game_paused = False; respawn_requested = False
+    rng.set_state(sim['rng'])
 
 def save_game():
     global spaceShip, score, game_time, ship_crash_count, main_game_background, all_garbage_objects, autopilot_on
     if not spaceShip or not main_game_background: print("Cannot save: core objects not ready."); return
     print(f"Saving game to {SAVE_FILE}...")
-    game_data = {"spaceship": {"x": spaceShip.x, "y": spaceShip.y, "vx_0": spaceShip.vx_0, "vy_0": spaceShip.vy_0, "current_angle": spaceShip.current_angle},
-        "game_progress": {"score": score, "game_time": game_time, "ship_crash_count": ship_crash_count, "autopilot_on": autopilot_on},
-        "solar_system_planets_state": [{'world_pos': p['world_pos'][:], 'radius': p['radius'], 'color': p['color'], 'orbit_radius': p['orbit_radius'], 'orbit_speed': p['orbit_speed'], 'current_orbit_angle': p['current_orbit_angle']} for p in main_game_background.solar_system_planets],
-        "remaining_garbage": [{"world_x": g.world_x, "world_y": g.world_y, "size": g.size} for g in all_garbage_objects]}
+    game_data = capture_game_state()
     try:
         with open(SAVE_FILE, 'w') as f: json.dump(game_data, f, indent=4)
         print("Game saved successfully.")
     except Exception as e: print(f"Error saving game: {e}")
 
 def load_game():
-    global main_game_background, all_garbage_objects, spaceShip, camera_x, camera_y, score, game_time, ship_crash_count, current_state, crash_time_elapsed, autopilot_on
+    global current_state, previous_tick_state, is_game_paused, respawn_requested
     global autopilot_wander_timer, autopilot_target_wander_heading, autopilot_first_wander_decision
     print(f"Attempting to load game from {SAVE_FILE}...")
     try:
         with open(SAVE_FILE, 'r') as f: data = json.load(f)
-        # Re-initialize background before loading planets, so it doesn't double-generate its own set
-        main_game_background = Background()
-        # Clear default generated items from the new Background instance
-        main_game_background.solar_system_planets.clear()
-        main_game_background.all_garbage_items.clear()
-
-        ship_data = data['spaceship']
-        spaceShip = SpaceShip(ship_data['x'], ship_data['y'])
-        spaceShip.vx_0=ship_data['vx_0']; spaceShip.vy_0=ship_data['vy_0']; spaceShip.current_angle=ship_data['current_angle']; spaceShip.alive=True
-
-        game_progress = data['game_progress']
-        score=game_progress['score']; game_time=game_progress['game_time']; ship_crash_count=game_progress['ship_crash_count']
-        autopilot_on = game_progress.get("autopilot_on", False)
-        crash_time_elapsed=0.0
-
-        for p_state in data['solar_system_planets_state']: # Load saved planet states
-            main_game_background.solar_system_planets.append({'type':'solar_system_planet','world_pos':list(p_state['world_pos']),'radius':p_state['radius'],'color':tuple(p_state['color']),'orbit_radius':p_state['orbit_radius'],'orbit_speed':p_state['orbit_speed'],'current_orbit_angle':p_state['current_orbit_angle']})
-
-        all_garbage_objects.clear() # Clear any existing garbage in the global list
-        for g_data in data['remaining_garbage']: # Load saved garbage
-            all_garbage_objects.append(Garbage(g_data['world_x'],g_data['world_y'],loaded_size=g_data['size']))
-        main_game_background.all_garbage_items = all_garbage_objects # Ensure Background uses the loaded garbage
-
-        camera_x=spaceShip.x-SCREEN_WIDTH//2; camera_y=spaceShip.y-SCREEN_HEIGHT//2
+        if data.get('star_systems', 1) != NUM_STAR_SYSTEMS: # Older saves have a single system
+            raise ValueError(f"saved with {data.get('star_systems', 1)} star systems, {STAR_SYSTEMS_ENV_VAR} gives {NUM_STAR_SYSTEMS}")
+        world_seed = data.get('world_seed', rng.new_seed()) # Older saves have no seed
+        rng.seed_all(world_seed)
+        # Saved planets and garbage replace the ones the new Background generates
+        restore_game_state(data, build_world(world_seed))
         current_state = STATE_PLAYING
+        previous_tick_state = STATE_LOADING_PROMPT
+        is_game_paused = False; respawn_requested = False
 
         autopilot_wander_timer = 0.0
         autopilot_target_wander_heading = spaceShip.current_angle
         autopilot_first_wander_decision = True
+        start_replay_recording()
 
         print("Game loaded successfully."); return True
     except FileNotFoundError: print(f"Save file '{SAVE_FILE}' not found. Starting new game."); return False
     except Exception as e: print(f"Error loading game: {e}. Starting new game."); return False
 
-def draw_world_boundary_warning(surface, ship_pos_x, ship_pos_y, cam_x, cam_y):
-    """Draws a red circle indicating world boundary if ship is close."""
-    dist_to_center = math.hypot(ship_pos_x - WORLD_CENTER_X, ship_pos_y - WORLD_CENTER_Y)
-    if dist_to_center > WORLD_RADIUS * BOUNDARY_PROXIMITY_THRESHOLD:
-        boundary_screen_x = WORLD_CENTER_X - cam_x
-        boundary_screen_y = WORLD_CENTER_Y - cam_y
-        warn_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+def start_replay_recording():
+    """Starts a new recording for the freshly created or loaded world (if --record was given)."""
+    global replay_recorder, replay_session_count
+    stop_replay_recording()
+    if not replay_record_path: return
+    replay_session_count += 1
+    path = replay_record_path
+    if replay_session_count > 1: # Later worlds in the same session get numbered files
+        root, ext = os.path.splitext(replay_record_path)
+        path = f"{root}-{replay_session_count}{ext}"
+    replay_recorder = ReplayWriter(path, main_game_background.seed, len(main_game_background.systems))
+    print(f"Recording replay to {path}")
+
+def stop_replay_recording():
+    global replay_recorder
+    if replay_recorder:
+        replay_recorder.close()
+        print(f"Replay saved ({replay_recorder.tick_count} ticks).")
+        replay_recorder = None
+
+def draw_world_boundary_warning(surface, center_dist, cam_x, cam_y, scale=1.0):
+    """Draws a red circle indicating world boundary if the ship (center_dist from the world centre) is close."""
+    if center_dist > WORLD_RADIUS * BOUNDARY_PROXIMITY_THRESHOLD:
+        boundary_screen_x = (WORLD_CENTER_X - cam_x) * scale
+        boundary_screen_y = (WORLD_CENTER_Y - cam_y) * scale
+        surface_w, surface_h = surface.get_size()
+        boundary_radius = WORLD_RADIUS * scale
+        warn_surface = pygame.Surface((surface_w, surface_h), pygame.SRCALPHA)
         warn_surface.fill((0,0,0,0))
         # This is a simplified check; more accurate would involve checking rect intersection.
-        if abs(boundary_screen_x) < SCREEN_WIDTH + WORLD_RADIUS and \
-           abs(boundary_screen_y) < SCREEN_HEIGHT + WORLD_RADIUS :
+        if abs(boundary_screen_x) < surface_w + boundary_radius and \
+           abs(boundary_screen_y) < surface_h + boundary_radius :
             pygame.draw.circle(warn_surface, WORLD_BOUNDARY_WARN_COLOR,
                                (int(boundary_screen_x), int(boundary_screen_y)),
-                               int(WORLD_RADIUS), WORLD_BOUNDARY_WARN_THICKNESS)
+                               int(boundary_radius), max(1, int(WORLD_BOUNDARY_WARN_THICKNESS * scale)))
             surface.blit(warn_surface, (0,0))
 
-def main_program():
-    global main_game_background, all_garbage_objects, spaceShip, camera_x, camera_y
-    global score, game_time, current_state, crash_time_elapsed, ship_crash_count, autopilot_on
-    global autopilot_wander_timer, autopilot_target_wander_heading, autopilot_first_wander_decision
+def dt_from_tick_ms(tick_ms):
+    """Converts a clock.tick() result to the dt used by the simulation."""
+    return tick_ms / 1000.0 if tick_ms else 1/60.0 # Prevent dt=0 if game is frozen momentarily
+
+def read_held_keys():
+    """Samples the live keyboard into the rotation and thrust input flags (main thread only)."""
+    held_bits = 0
+    keys = pygame.key.get_pressed()
+    if keys[pygame.K_LEFT]: held_bits |= INPUT_ROTATE_LEFT
+    if keys[pygame.K_RIGHT]: held_bits |= INPUT_ROTATE_RIGHT
+    if keys[pygame.K_UP]: held_bits |= INPUT_THRUST
+    return held_bits
+
+def read_input_bits(held_bits=None):
+    """Simulation input flags for this tick: the held keys (sampled now unless given) and the UI toggles."""
+    global respawn_requested
+    input_bits = read_held_keys() if held_bits is None else held_bits
+    if autopilot_on: input_bits |= INPUT_AUTOPILOT
+    if is_game_paused: input_bits |= INPUT_PAUSED
+    if respawn_requested: input_bits |= INPUT_RESPAWN; respawn_requested = False
+    return input_bits
+
+def advance_simulation(tick_ms, held_bits=None):
+    """One tick of the PLAYING, GAME_OVER and WIN states, recorded if a replay is being made; menus do not tick."""
+    if current_state in (STATE_PLAYING, STATE_GAME_OVER, STATE_WIN):
+        input_bits = read_input_bits(held_bits)
+        if replay_recorder: replay_recorder.record_tick(tick_ms, input_bits, capture_sim_state)
+        simulate_tick(dt_from_tick_ms(tick_ms), input_bits)
+
+def simulate_tick(dt, input_bits):
+    """Advances the PLAYING, GAME_OVER and WIN states by one tick.
+    Depends only on dt, input_bits and the seeded rng streams, so recorded ticks replay identically.
+    """
+    global score, game_time, current_state, previous_tick_state, crash_time_elapsed, ship_crash_count
+    global autopilot_on, is_game_paused, camera_x, camera_y
+    global autopilot_target_wander_heading, autopilot_first_wander_decision
+
+    autopilot_on = bool(input_bits & INPUT_AUTOPILOT)
+    is_game_paused = bool(input_bits & INPUT_PAUSED)
+    if input_bits & INPUT_RESPAWN and current_state == STATE_GAME_OVER:
+        respawn_ship(); current_state = STATE_PLAYING
+
+    # Initialize wander heading once ship is ready and if entering playing state
+    if spaceShip and current_state == STATE_PLAYING and \
+       (previous_tick_state != STATE_PLAYING or autopilot_first_wander_decision):
+         autopilot_target_wander_heading = spaceShip.current_angle
+         autopilot_first_wander_decision = False # Mark as initialized for this play session
+
+    if current_state == STATE_PLAYING:
+        if not spaceShip.alive:
+            if previous_tick_state == STATE_PLAYING: ship_crash_count += 1; crash_time_elapsed = 0.0
+            current_state = STATE_GAME_OVER
+        elif not is_game_paused:
+            # The bodies of the star systems near the ship: the only ones this tick's checks look at
+            suns, planets = main_game_background.celestial.bodies_near(spaceShip.x, spaceShip.y)
+            if autopilot_on:
+                # --- AUTOPILOT CONTROLS SHIP ---
+                if spaceShip and main_game_background: # Ensure objects are available
+                    phase_start = PROFILER.start()
+                    if world_frame.stale: world_frame.refresh(spaceShip, suns, planets, all_garbage_objects)
+                    ai_desired_heading, ai_should_thrust = get_autopilot_decision(spaceShip, world_frame, dt)
+                    autopilot_ephemeris.update(suns, planets, dt)
+                    evasion = evade_predicted_collision(spaceShip, ai_desired_heading, ai_should_thrust, autopilot_ephemeris)
+                    if evasion: # The plan runs into a body's future position (or the edge): steer clear early
+                        ai_desired_heading, ai_should_thrust = evasion
+                        autopilot_first_wander_decision = True # Re-roll the wander heading afterwards, as after fleeing
+                    PROFILER.stop(PHASE_AUTOPILOT, phase_start)
+                    steer_towards_heading(spaceShip, ai_desired_heading, ai_should_thrust)
+            else:
+                # --- MANUAL CONTROL ---
+                apply_manual_controls(spaceShip, input_bits)
+
+            # Common updates for playing state. Start positions feed the swept collision checks below.
+            ship_start = (spaceShip.x, spaceShip.y)
+            planet_start_angles = [p['current_orbit_angle'] for p in planets]
+            if gravity_field:
+                phase_start = PROFILER.start()
+                gravity_field.apply(dt, spaceShip, all_garbage_objects, main_game_background.celestial)
+                PROFILER.stop(PHASE_GRAVITY, phase_start)
+            phase_start = PROFILER.start(); spaceShip.update(); PROFILER.stop(PHASE_SHIP_UPDATE, phase_start)
+            phase_start = PROFILER.start()
+            main_game_background.update(dt, None if world_frame.stale else world_frame)
+            world_frame.update_bodies(spaceShip, suns, planets)
+            PROFILER.stop(PHASE_BACKGROUND_UPDATE, phase_start)
+            phase_start = PROFILER.start()
+            awake = world_frame.move_garbage(all_garbage_objects, dt)
+            if debris_spawner: debris_spawner.update(dt)
+            garbage_collisions.resolve(all_garbage_objects, awake)
+            world_frame.sync_garbage(all_garbage_objects)
+            PROFILER.stop(PHASE_GARBAGE_UPDATE, phase_start)
+            camera_x=spaceShip.x-config.SCREEN_WIDTH//2; camera_y=spaceShip.y-config.SCREEN_HEIGHT//2; game_time += dt
+            phase_start = PROFILER.start()
+            score += world_frame.collect_garbage(spaceShip, all_garbage_objects, ship_start, main_game_background.garbage_pool)
+            PROFILER.stop(PHASE_COLLECTION, phase_start)
+
+            # Check for Win Condition
+            if not debris_spawner and not all_garbage_objects and (score > 0 or game_time > 2.0) : # Win if all garbage collected after some play (never in endless mode)
+                print("Win condition met!")
+                current_state = STATE_WIN
+                if spaceShip: # Ensure ship stops moving actively
+                    spaceShip.is_thrusting = False
+                    spaceShip.vx_1, spaceShip.vy_1 = 0.0, 0.0
 
-    pygame.init()
-    screen = SCREEN
+            check_ship_crash(spaceShip, suns, planets, ship_start, planet_start_angles, world_frame)
+    elif current_state == STATE_GAME_OVER:
+        crash_time_elapsed += dt
+        if spaceShip: spaceShip.update() # Keep updating explosion particles
+        if main_game_background: main_game_background.update(dt); world_frame.invalidate() # Keep planets orbiting
+    elif current_state == STATE_WIN:
+        if main_game_background: main_game_background.update(dt); world_frame.invalidate() # Keep background animated
+        if spaceShip:
+            spaceShip.is_thrusting = False # Ensure ship is not thrusting on win screen
+            spaceShip.update() # Update particles if any from previous state
+    previous_tick_state = current_state
+
+def capture_view():
+    """
+    What a frame draws of the game, copied so it stays as it was while the simulation moves on: the state
+    and HUD values, the camera, the ship (with its particles), the garbage as position and size arrays, and
+    the planets' positions. With --threaded the simulation thread publishes one after every tick; otherwise
+    the main loop captures one after its tick. The Background itself is shared: drawing only reads its static
+    layers and owns its sprite caches.
+    """
+    view = {'state': current_state, 'paused': is_game_paused, 'autopilot': autopilot_on, 'score': score,
+            'game_time': game_time, 'crash_time_elapsed': crash_time_elapsed, 'ship_crash_count': ship_crash_count,
+            'camera': (camera_x, camera_y), 'background': main_game_background, 'ship': None}
+    if not (main_game_background and spaceShip): return view
+    ship = view['ship'] = copy.copy(spaceShip)
+    ship.particles = [dict(p) for p in spaceShip.particles]
+    if not world_frame.stale and len(world_frame.items) == len(all_garbage_objects): # Arrays already in step with the list
+        view['garbage'] = (world_frame.garbage_x.copy(), world_frame.garbage_y.copy(), world_frame.garbage_size.copy())
+    else:
+        count = len(all_garbage_objects)
+        view['garbage'] = tuple(np.fromiter((getattr(G_item, attr) for G_item in all_garbage_objects), dtype=float, count=count)
+                                for attr in ('world_x', 'world_y', 'size'))
+    view['planets'] = main_game_background.celestial.planet_positions()
+    return view
+
+def view_camera(view):
+    """Top-left world position of the zoomed view and its zoom factor. The view's camera frames it at 1x."""
+    zoom = CAMERA_ZOOM_LEVELS[camera_zoom_level]
+    half_w, half_h = config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2
+    cam_x, cam_y = view['camera']
+    return cam_x + half_w - half_w / zoom, cam_y + half_h - half_h / zoom, zoom
+
+def draw_world(surface, view, scale=1.0):
+    """Draws the game world of a view (background, boundary warning, garbage, ship) for its camera and the zoom.
+    scale is the render scale of surface relative to the screen (see resolution.py).
+    """
+    view_x, view_y, zoom = view_camera(view)
+    scale *= zoom
+    view['background'].draw(surface, view_x, view_y, scale, view['planets'])
+    ship = view['ship']
+    if view['state'] == STATE_PLAYING: # Only draw boundary warning when actively playing
+        draw_world_boundary_warning(surface, math.hypot(ship.x - WORLD_CENTER_X, ship.y - WORLD_CENTER_Y), view_x, view_y, scale)
+    # Queue garbage if any (e.g. for game over screen or if win screen still shows them), then the ship
+    # and its particles, and draw them all in one pass of per-layer batches.
+    phase_start = PROFILER.start()
+    submit_garbage(*view['garbage'], view_x, view_y, scale, surface.get_width(), surface.get_height())
+    PROFILER.stop(PHASE_GARBAGE_SUBMIT, phase_start)
+    ship.submit(view_x, view_y, scale)
+    phase_start = PROFILER.start()
+    RENDER_QUEUE.flush(surface)
+    PROFILER.stop(PHASE_QUEUE_FLUSH, phase_start)
+
+def draw_world_scaled(screen, render_resolution, view):
+    """Draws the world through the internal render target and scales it up onto the screen."""
+    world_surface = render_resolution.begin_frame()
+    draw_world(world_surface, view, render_resolution.scale)
+    render_resolution.present()
+
+def _text_item(slot, font, text, color, center):
+    """An overlay element for text centred at center. The text is only rendered when the element is drawn."""
+    rect = pygame.Rect((0, 0), font.size(text)); rect.center = center
+    return (slot, (text, color), rect, lambda surface: surface.blit(font.render(text, True, color), rect))
+
+def _button_item(slot, rect_outer, text_surface, rect_inner, mouse_pos):
+    hovered = rect_outer.collidepoint(mouse_pos)
+    bg_color = RESTART_BUTTON_BG_HOVER_COLOR if hovered else RESTART_BUTTON_BG_COLOR
+    def draw(surface):
+        pygame.draw.rect(surface, bg_color, rect_outer, border_radius=10); surface.blit(text_surface, rect_inner)
+    return (slot, hovered, rect_outer, draw)
+
+def overlay_items(view, mouse_pos):
+    """
+    Elements drawn over the world on the pause, game over and win screens of a view, as (slot, signature,
+    rect, draw) tuples in drawing order. The signature changes whenever the element would look different.
+    """
+    state, autopilot_on, score = view['state'], view['autopilot'], view['score']
+    center_x, center_y = config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2
+    items = []
+    if state == STATE_PLAYING and view['paused']:
+        hovered = paused_text_rect.collidepoint(mouse_pos)
+        paused_surf = paused_text_hover_render if hovered else paused_text_render
+        items.append(('paused', hovered, paused_text_rect, lambda surface: surface.blit(paused_surf, paused_text_rect)))
+        items.append(_text_item('autopilot', autopilot_font, "Automatic Pilot ON" if autopilot_on else "Automatic Pilot OFF",
+                                AUTOPILOT_ON_COLOR if autopilot_on else AUTOPILOT_OFF_COLOR, (center_x, 30)))
+    elif state == STATE_GAME_OVER:
+        items.append(_text_item('title', game_over_font, "GAME OVER", GAMEOVER_TEXT_COLOR, (center_x, center_y - 120)))
+        items.append(_text_item('score', score_font, f"Final Score: {score}", SCORE_TEXT_COLOR, (center_x, items[-1][2].bottom + 35)))
+        items.append(_text_item('crash_timer', crash_timer_font, f"Time Since Crash: {view['crash_time_elapsed']:.1f}s",
+                                CRASH_TIMER_TEXT_COLOR, (center_x, items[-1][2].bottom + 35)))
+        items.append(_text_item('crash_count', crash_count_font, f"Crashes: {view['ship_crash_count']}",
+                                CRASH_COUNT_TEXT_COLOR, (center_x, items[-1][2].bottom + 35)))
+        items.append(_button_item('respawn', respawn_button_rect_outer, respawn_button_text_surface, respawn_button_rect_inner, mouse_pos))
+    elif state == STATE_WIN:
+        items.append(('title', None, win_text_rect, lambda surface: surface.blit(win_text_surface, win_text_rect)))
+        items.append(_text_item('score', win_info_font, f"Final Score: {score}", SCORE_TEXT_COLOR, (center_x, win_text_rect.bottom + 70)))
+        items.append(_text_item('time', win_info_font, f"Clear Time: {view['game_time']:.1f} seconds", WIN_INFO_COLOR,
+                                (center_x, items[-1][2].bottom + 50)))
+        items.append(_button_item('play_again', play_again_button_rect_outer, play_again_button_text_surface,
+                                  play_again_button_rect_inner, mouse_pos))
+    return items
+
+def idle_screen_kind(view):
+    """Name of the view's near-static screen ('paused', 'game_over', 'win'), or None while playing."""
+    if not view['ship']: return None
+    if view['state'] == STATE_PLAYING and view['paused']: return 'paused'
+    if view['state'] == STATE_GAME_OVER: return 'game_over'
+    if view['state'] == STATE_WIN: return 'win'
+    return None
+
+def world_is_animated(view):
+    """True if the world layer moves on its own: explosion particles, or an orbiting planet in view (not while paused)."""
+    if view['paused'] and view['state'] == STATE_PLAYING: return False
+    if view['ship'].particles: return True
+    view_x, view_y, zoom = view_camera(view)
+    view_w, view_h = config.SCREEN_WIDTH / zoom, config.SCREEN_HEIGHT / zoom
+    for _, p in view['background'].bodies_in_view(view_x + view_w / 2, view_y + view_h / 2, math.hypot(view_w, view_h) / 2,
+                                                   view['planets']):
+        if p['type'] == 'sun': continue
+        px, py, pr = (p['world_pos'][0] - view_x) * zoom, (p['world_pos'][1] - view_y) * zoom, p['radius'] * zoom
+        if -pr < px < config.SCREEN_WIDTH + pr and -pr < py < config.SCREEN_HEIGHT + pr: return True
+    return False
+
+def minimap_item(view, signature):
+    """The minimap as an overlay element; it is re-rendered only when signature changes."""
+    size = MINIMAP_SIZE_RADIUS * 2
+    rect = pygame.Rect(config.SCREEN_WIDTH - size - MINIMAP_MARGIN, MINIMAP_MARGIN, size, size)
+    return ('minimap', signature, rect, lambda surface: blit_minimap(surface, render_minimap(view)))
+
+def apply_game_event(event, mouse_pos, start_rect):
+    """
+    The part of an input event that changes the game's state (menu choices, pause, autopilot, respawn, play
+    again). With --threaded it runs on the simulation thread, between ticks; start_rect is the start prompt's.
+    """
+    global current_state, autopilot_on, is_game_paused, respawn_requested, endless_mode
+    if event.type == pygame.KEYDOWN:
+        if current_state == STATE_LOADING_PROMPT:
+            if event.key == pygame.K_l:
+                if not load_game(): reset_game_state(); current_state = STATE_READY_TO_START
+            elif event.key == pygame.K_n:
+                reset_game_state(); current_state = STATE_READY_TO_START
+            elif event.key == pygame.K_e:
+                endless_mode = True; reset_game_state(); current_state = STATE_READY_TO_START
+        elif current_state == STATE_READY_TO_START and event.key == pygame.K_RETURN:
+            current_state = STATE_PLAYING
+        elif current_state == STATE_PLAYING and spaceShip and spaceShip.alive:
+            if event.key == pygame.K_p: is_game_paused = not is_game_paused
+            elif event.key == pygame.K_SPACE: autopilot_on = not autopilot_on
+        elif current_state == STATE_GAME_OVER and event.key == pygame.K_RETURN:
+            respawn_requested = True
+        elif current_state == STATE_WIN:
+            if event.key == pygame.K_RETURN: # Play Again
+                reset_game_state()
+                current_state = STATE_LOADING_PROMPT
+    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+        if current_state == STATE_READY_TO_START and start_rect.collidepoint(mouse_pos):
+            current_state = STATE_PLAYING
+        elif current_state == STATE_PLAYING and spaceShip and spaceShip.alive and is_game_paused and paused_text_rect.collidepoint(mouse_pos):
+            is_game_paused = False
+        elif current_state == STATE_GAME_OVER and respawn_button_rect_outer.collidepoint(mouse_pos):
+            respawn_requested = True
+        elif current_state == STATE_WIN and play_again_button_rect_outer.collidepoint(mouse_pos): # Play Again button
+             reset_game_state()
+             current_state = STATE_LOADING_PROMPT
+
+def main_program(startup_report=False, render_scale=None, threaded=False):
+    global camera_zoom_level, menu_world_seed
+
+    startup_start = time.perf_counter()
+    screen = config.init_display()
+    init_ui()
     clock = pygame.time.Clock()
-
-    menu_background_instance = Background()
-    menu_ship_world_x = WORLD_CENTER_X + WORLD_RADIUS * 0.5
-    menu_ship_world_y = WORLD_CENTER_Y + WORLD_RADIUS * 0.5
+    # The world is drawn at an internal resolution (adjusted automatically unless render_scale fixes it)
+    # and scaled up; HUD, minimap and overlays are drawn on the screen at native resolution.
+    render_resolution = RenderResolution(screen, fixed_scale=render_scale)
+    idle_screen = IdleScreen()
+    minimap_surface = None; minimap_age = 0 # Last rendered minimap, redrawn every GOVERNOR minimap_interval frames
+
+    # The menu galaxy is generated on a worker thread so the first menu frame does not wait for it;
+    # until it is ready the menu shows plain deep space.
+    menu_background_holder = []
+    menu_world_seed = menu_seed = rng.new_seed()
+    def build_menu_background():
+        menu_bg = Background(seed=menu_seed); menu_bg.prepare_body_sprites()
+        menu_background_holder.append(menu_bg)
+    menu_background_thread = threading.Thread(target=build_menu_background, daemon=True)
+    menu_background_thread.start()
+    menu_background_instance = None
+    menu_ship_world_x = WORLD_CENTER_X + SYSTEM_RADIUS * 0.5
+    menu_ship_world_y = WORLD_CENTER_Y + SYSTEM_RADIUS * 0.5
     menu_ship = SpaceShip(menu_ship_world_x, menu_ship_world_y)
     menu_ship.is_thrusting = True
     menu_ship_rotation_speed = 0.4
-    menu_camera_x = menu_ship_world_x - SCREEN_WIDTH // 2
-    menu_camera_y = menu_ship_world_y - SCREEN_HEIGHT // 2
+    menu_camera_x = menu_ship_world_x - config.SCREEN_WIDTH // 2
+    menu_camera_y = menu_ship_world_y - config.SCREEN_HEIGHT // 2
 
     title_text_surface = title_font.render("GREENSPACE.IO", True, TITLE_TEXT_COLOR)
-    title_text_rect = title_text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
+    title_text_rect = title_text_surface.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 3))
     prompt_load_text = prompt_font.render("L: Load Game", True, UI_TEXT_COLOR)
-    prompt_load_rect = prompt_load_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
+    prompt_load_rect = prompt_load_text.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 + 60))
     prompt_new_text = prompt_font.render("N: New Game", True, UI_TEXT_COLOR)
-    prompt_new_rect = prompt_new_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 120))
+    prompt_new_rect = prompt_new_text.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 + 120))
+    prompt_endless_text = prompt_font.render("E: Endless Game", True, UI_TEXT_COLOR)
+    prompt_endless_rect = prompt_endless_text.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 + 180))
 
     start_text_render = ui_font.render("Click or Press Enter to Start", True, UI_TEXT_COLOR)
-    start_text_rect = start_text_render.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2+100))
+    start_text_rect = start_text_render.get_rect(center=(config.SCREEN_WIDTH//2, config.SCREEN_HEIGHT//2+100))
     start_text_hover_render = ui_font.render("Click or Press Enter to Start", True, UI_TEXT_HOVER_COLOR)
-    paused_text_render = ui_font.render("PAUSED (Click or P to Resume)", True, UI_TEXT_COLOR)
-    paused_text_rect = paused_text_render.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
-    paused_text_hover_render = ui_font.render("PAUSED (Click or P to Resume)", True, UI_TEXT_HOVER_COLOR)
 
-    is_game_paused = False
+    # With threaded, the game is stepped on a SimulationThread and this loop only draws its latest snapshot,
+    # handing input over without locks; otherwise each frame runs one tick and then draws.
+    sim_thread = SimulationThread(advance_simulation, capture_view, TARGET_FRAME_RATE) if threaded else None
+    def run_game_event(event, mouse_pos):
+        if sim_thread: sim_thread.handoff.post(lambda: apply_game_event(event, mouse_pos, start_text_rect))
+        else: apply_game_event(event, mouse_pos, start_text_rect)
+    if sim_thread: sim_thread.start()
+
     running = True
-    game_fully_initialized = False # Flag to ensure full setup before certain logic (like win check)
+    first_frame = True
 
     while running:
-        dt = clock.tick(60) / 1000.0
-        if dt == 0: dt = 1/60.0 # Prevent dt=0 if game is frozen momentarily
+        PROFILER.begin_frame()
+        RENDER_QUEUE.begin_frame()
+        MEMPROFILER.begin_frame()
+        phase_start = PROFILER.start()
+        tick_ms = clock.tick(IDLE_FRAME_RATE if idle_screen.active else TARGET_FRAME_RATE)
+        PROFILER.stop(PHASE_TICK_WAIT, phase_start)
+        frame_work_start = time.perf_counter()
+        frame_background = main_game_background # A new one by the end of the frame means a world was generated in it
+        frame_generating = world_generating
+        dt = dt_from_tick_ms(tick_ms)
         mouse_pos = pygame.mouse.get_pos()
-        previous_game_state = current_state
+        if sim_thread and sim_thread.error: raise sim_thread.error
 
+        phase_start = PROFILER.start()
         for event in pygame.event.get():
             if event.type == pygame.QUIT: running = False
+            if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE): idle_screen.invalidate()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE: running = False
-                if current_state == STATE_LOADING_PROMPT:
-                    if event.key == pygame.K_l:
-                        if load_game(): game_fully_initialized = True
-                        else: reset_game_state(); current_state = STATE_READY_TO_START; game_fully_initialized = True
-                    elif event.key == pygame.K_n:
-                        reset_game_state(); current_state = STATE_READY_TO_START; game_fully_initialized = True
-                elif current_state == STATE_READY_TO_START and event.key == pygame.K_RETURN:
-                    current_state = STATE_PLAYING
-                elif current_state == STATE_PLAYING and spaceShip and spaceShip.alive:
-                    if event.key == pygame.K_p: is_game_paused = not is_game_paused
-                    elif event.key == pygame.K_SPACE: autopilot_on = not autopilot_on
-                elif current_state == STATE_GAME_OVER and event.key == pygame.K_RETURN:
-                    respawn_ship(); current_state = STATE_PLAYING
-                elif current_state == STATE_WIN:
-                    if event.key == pygame.K_RETURN: # Play Again
-                        reset_game_state()
-                        current_state = STATE_LOADING_PROMPT
-                        game_fully_initialized = True # Re-initialize for new game
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if current_state == STATE_READY_TO_START and start_text_rect.collidepoint(mouse_pos):
-                    current_state = STATE_PLAYING
-                elif current_state == STATE_PLAYING and spaceShip and spaceShip.alive and is_game_paused and paused_text_rect.collidepoint(mouse_pos):
-                    is_game_paused = False
-                elif current_state == STATE_GAME_OVER and respawn_button_rect_outer.collidepoint(mouse_pos):
-                    respawn_ship(); current_state = STATE_PLAYING
-                elif current_state == STATE_WIN and play_again_button_rect_outer.collidepoint(mouse_pos): # Play Again button
-                     reset_game_state()
-                     current_state = STATE_LOADING_PROMPT
-                     game_fully_initialized = True # Re-initialize for new game
-
-        # Initialize wander heading once ship is ready and if entering playing state
-        if game_fully_initialized and spaceShip and current_state == STATE_PLAYING and \
-           (previous_game_state != STATE_PLAYING or autopilot_first_wander_decision):
-             autopilot_target_wander_heading = spaceShip.current_angle
-             autopilot_first_wander_decision = False # Mark as initialized for this play session
-
-
-        if current_state == STATE_LOADING_PROMPT:
-            menu_background_instance.update(dt)
+                if event.key == PROFILER_TOGGLE_KEY: PROFILER.set_enabled(not PROFILER.enabled)
+                elif event.key == PROFILER_DUMP_KEY and PROFILER.enabled:
+                    trace_path = f"frame_trace_{time.strftime('%Y%m%d_%H%M%S')}.json"
+                    print(f"Wrote {PROFILER.dump_chrome_trace(trace_path)} frames to {trace_path}")
+                elif event.key == MEMPROFILE_MARK_KEY and MEMPROFILER.enabled:
+                    diff_path = MEMPROFILER.mark()
+                    print(f"Wrote memory snapshot diff to {diff_path}" if diff_path else "Memory snapshot marked (F5 again writes the diff)")
+            if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN): run_game_event(event, mouse_pos)
+            if event.type == pygame.MOUSEWHEEL and current_state in (STATE_PLAYING, STATE_GAME_OVER, STATE_WIN):
+                # Wheel up zooms in, wheel down zooms out
+                camera_zoom_level = max(0, min(len(CAMERA_ZOOM_LEVELS) - 1, camera_zoom_level - event.y))
+                idle_screen.invalidate()
+        PROFILER.stop(PHASE_EVENTS, phase_start)
+
+        if menu_background_instance is None and menu_background_holder:
+            menu_background_instance = menu_background_holder[0]
+            if startup_report: print(f"Startup: menu galaxy ready after {(time.perf_counter() - startup_start) * 1000:.0f} ms")
+
+        if sim_thread:
+            sim_thread.handoff.publish(read_held_keys())
+            view = sim_thread.snapshot
+        else:
+            advance_simulation(tick_ms)
+            view = capture_view()
+        if view['state'] == STATE_LOADING_PROMPT:
+            if menu_background_instance: menu_background_instance.update(dt)
             menu_ship.current_angle = (menu_ship.current_angle + menu_ship_rotation_speed * (dt*60)) % 360
             menu_ship.update()
-        elif current_state == STATE_PLAYING:
-            if not spaceShip.alive:
-                if previous_game_state == STATE_PLAYING: ship_crash_count += 1; crash_time_elapsed = 0.0
-                current_state = STATE_GAME_OVER
-            elif not is_game_paused:
-                if autopilot_on:
-                    # --- AUTOPILOT CONTROLS SHIP ---
-                    if spaceShip and main_game_background: # Ensure objects are available
-                        ai_desired_heading, ai_should_thrust = get_autopilot_decision(
-                            spaceShip, main_game_background.sun_data, main_game_background.solar_system_planets,
-                            all_garbage_objects, WORLD_RADIUS, WORLD_CENTER_X, WORLD_CENTER_Y, dt
-                        )
-                        angle_difference = normalize_angle_degrees_180(ai_desired_heading - spaceShip.current_angle)
-                        rotation_step = ROTATION_SPEED
-                        if abs(angle_difference) > 1.0: # Rotation deadzone
-                            if angle_difference > 0: spaceShip.current_angle = (spaceShip.current_angle + rotation_step) % 360
-                            else: spaceShip.current_angle = (spaceShip.current_angle - rotation_step + 360) % 360
-                        else: spaceShip.current_angle = ai_desired_heading # Snap if very close
-
-                        spaceShip.is_thrusting = ai_should_thrust
-                        if spaceShip.is_thrusting:
-                            thrust_rad = math.radians(spaceShip.current_angle)
-                            spaceShip.vx_1 = THRUST_MAGNITUDE * math.cos(thrust_rad); spaceShip.vy_1 = THRUST_MAGNITUDE * math.sin(thrust_rad)
-                            max_v = 8.0 # Velocity cap
-                            if spaceShip.vx_0 + spaceShip.vx_1 > max_v: spaceShip.vx_1 = max(0, max_v - spaceShip.vx_0)
-                            if spaceShip.vx_0 + spaceShip.vx_1 < -max_v: spaceShip.vx_1 = min(0, -max_v - spaceShip.vx_0)
-                            if spaceShip.vy_0 + spaceShip.vy_1 > max_v: spaceShip.vy_1 = max(0, max_v - spaceShip.vy_0)
-                            if spaceShip.vy_0 + spaceShip.vy_1 < -max_v: spaceShip.vy_1 = min(0, -max_v - spaceShip.vy_0)
-                        else: spaceShip.vx_1, spaceShip.vy_1 = 0.0, 0.0
-                else:
-                    # --- MANUAL CONTROL ---
-                    spaceShip.is_thrusting = False; keys = pygame.key.get_pressed()
-                    if keys[pygame.K_LEFT]: spaceShip.current_angle = (spaceShip.current_angle + ROTATION_SPEED) % 360
-                    if keys[pygame.K_RIGHT]: spaceShip.current_angle = (spaceShip.current_angle - ROTATION_SPEED + 360) % 360
-                    spaceShip.vx_1, spaceShip.vy_1 = 0.0, 0.0
-                    if keys[pygame.K_UP]:
-                        spaceShip.is_thrusting = True; thrust_rad = math.radians(spaceShip.current_angle)
-                        spaceShip.vx_1 = THRUST_MAGNITUDE*math.cos(thrust_rad); spaceShip.vy_1 = THRUST_MAGNITUDE*math.sin(thrust_rad)
-                        max_v = 8.0
-                        if spaceShip.vx_0+spaceShip.vx_1>max_v: spaceShip.vx_1=max(0,max_v-spaceShip.vx_0)
-                        if spaceShip.vx_0+spaceShip.vx_1<-max_v: spaceShip.vx_1=min(0,-max_v-spaceShip.vx_0)
-                        if spaceShip.vy_0+spaceShip.vy_1>max_v: spaceShip.vy_1=max(0,max_v-spaceShip.vy_0)
-                        if spaceShip.vy_0+spaceShip.vy_1<-max_v: spaceShip.vy_1=min(0,-max_v-spaceShip.vy_0)
-
-                # Common updates for playing state
-                spaceShip.update(); main_game_background.update(dt)
-                for G_item in all_garbage_objects: G_item.update(spaceShip.x, spaceShip.y, dt)
-                camera_x=spaceShip.x-SCREEN_WIDTH//2; camera_y=spaceShip.y-SCREEN_HEIGHT//2; game_time += dt
-                ship_collider = spaceShip.get_collider_world(); collected_indices = []
-                for i,G_item in enumerate(all_garbage_objects):
-                    if ship_collider.colliderect(G_item.get_collider()): collected_indices.append(i); score += 1
-                for i in sorted(collected_indices, reverse=True): all_garbage_objects.pop(i)
-
-                # Check for Win Condition
-                if not all_garbage_objects and game_fully_initialized and (score > 0 or game_time > 2.0) : # Win if all garbage collected after some play
-                    print("Win condition met!")
-                    current_state = STATE_WIN
-                    if spaceShip: # Ensure ship stops moving actively
-                        spaceShip.is_thrusting = False
-                        spaceShip.vx_1, spaceShip.vy_1 = 0.0, 0.0
-
-                if spaceShip.alive: # Continue with collision checks only if alive
-                    sr = spaceShip.get_collider_world().width / 2.2
-                    if (spaceShip.x - WORLD_CENTER_X)**2 + (spaceShip.y - WORLD_CENTER_Y)**2 < (SUN_RADIUS + sr)**2: spaceShip.explode()
-                    if spaceShip.alive:
-                        for p in main_game_background.solar_system_planets:
-                            if (spaceShip.x - p['world_pos'][0])**2 + (spaceShip.y - p['world_pos'][1])**2 < (p['radius'] + sr)**2:
-                                spaceShip.explode(); break
-                        if spaceShip.alive and math.hypot(spaceShip.x - WORLD_CENTER_X, spaceShip.y - WORLD_CENTER_Y) > WORLD_RADIUS - sr:
-                            spaceShip.explode()
-        elif current_state == STATE_GAME_OVER:
-            crash_time_elapsed += dt
-            if spaceShip: spaceShip.update() # Keep updating explosion particles
-            if main_game_background: main_game_background.update(dt) # Keep planets orbiting
-        elif current_state == STATE_WIN:
-            if main_game_background: main_game_background.update(dt) # Keep background animated
-            if spaceShip:
-                spaceShip.is_thrusting = False # Ensure ship is not thrusting on win screen
-                spaceShip.update() # Update particles if any from previous state
 
-        # Drawing logic
-        screen.fill((0,0,0))
-        if current_state == STATE_LOADING_PROMPT:
-            menu_background_instance.draw(screen, menu_camera_x, menu_camera_y)
-            menu_ship.draw(screen, menu_camera_x, menu_camera_y)
+        # Drawing logic (from the view only, never from the live game state)
+        idle_kind = idle_screen_kind(view) if not PROFILER.enabled else None
+        if idle_kind: # Near-static screen: only changed regions are redrawn and pushed to the display
+            minimap_signature = 0 if idle_kind == 'paused' else pygame.time.get_ticks() // IDLE_MINIMAP_REFRESH_MS
+            idle_screen.present(screen, idle_kind, world_is_animated(view), lambda: draw_world_scaled(screen, render_resolution, view),
+                                overlay_items(view, mouse_pos) + [minimap_item(view, minimap_signature)])
+            MEMPROFILER.end_frame()
+            continue # Idle frames are not representative, so they are not fed to the resolution and quality controllers
+        idle_screen.leave()
+
+        if view['state'] == STATE_LOADING_PROMPT:
+            world_surface = render_resolution.begin_frame()
+            render_scale = render_resolution.scale
+            if menu_background_instance: menu_background_instance.draw(world_surface, menu_camera_x, menu_camera_y, render_scale)
+            else: world_surface.fill(MENU_PLACEHOLDER_COLOR)
+            menu_ship.draw(world_surface, menu_camera_x, menu_camera_y, render_scale)
+            render_resolution.present()
             screen.blit(title_text_surface, title_text_rect)
             if not os.path.exists(SAVE_FILE):
-                screen.blit(prompt_new_text, prompt_new_rect)
+                screen.blit(prompt_new_text, prompt_new_rect); screen.blit(prompt_endless_text, prompt_endless_rect)
                 no_save_text = prompt_font.render("No save file found.", True, UI_TEXT_COLOR)
-                no_save_rect = no_save_text.get_rect(center=(SCREEN_WIDTH//2, prompt_load_rect.top - 60))
+                no_save_rect = no_save_text.get_rect(center=(config.SCREEN_WIDTH//2, prompt_load_rect.top - 60))
                 screen.blit(no_save_text, no_save_rect)
             else:
                 screen.blit(prompt_load_text, prompt_load_rect)
-                screen.blit(prompt_new_text, prompt_new_rect)
-        elif main_game_background and spaceShip: # Main drawing block for PLAYING, GAME_OVER, WIN
-            main_game_background.draw(screen, camera_x, camera_y)
-            if current_state == STATE_PLAYING: # Only draw boundary warning when actively playing
-                draw_world_boundary_warning(screen, spaceShip.x, spaceShip.y, camera_x, camera_y)
-            # Draw garbage if any (e.g. for game over screen or if win screen still shows them)
-            for G_item in all_garbage_objects: G_item.draw(screen, camera_x, camera_y)
-            spaceShip.draw(screen, camera_x, camera_y)
-
-            if current_state == STATE_READY_TO_START:
+                screen.blit(prompt_new_text, prompt_new_rect); screen.blit(prompt_endless_text, prompt_endless_rect)
+        elif view['ship']: # Main drawing block for PLAYING, GAME_OVER, WIN
+            draw_world_scaled(screen, render_resolution, view)
+            phase_start = PROFILER.start()
+
+            if view['state'] == STATE_READY_TO_START:
                 txt = start_text_hover_render if start_text_rect.collidepoint(mouse_pos) else start_text_render
                 screen.blit(txt, start_text_rect)
-            elif current_state == STATE_PLAYING:
-                if is_game_paused:
-                    txt = paused_text_hover_render if paused_text_rect.collidepoint(mouse_pos) else paused_text_render
-                    screen.blit(txt, paused_text_rect)
-                else: # In-game HUD elements
-                    s_surf=score_font.render(f"Score: {score}",True,SCORE_TEXT_COLOR); screen.blit(s_surf,(20,20))
-                    g_surf=debug_font.render(f"Garbage: {len(all_garbage_objects)}",True,UI_TEXT_COLOR); screen.blit(g_surf,(20,s_surf.get_height()+25))
-
-                autopilot_text_str = "Automatic Pilot ON" if autopilot_on else "Automatic Pilot OFF"
-                autopilot_text_color = AUTOPILOT_ON_COLOR if autopilot_on else AUTOPILOT_OFF_COLOR
+            elif view['state'] == STATE_PLAYING and not view['paused']: # In-game HUD elements
+                s_surf=score_font.render(f"Score: {view['score']}",True,SCORE_TEXT_COLOR); screen.blit(s_surf,(20,20))
+                g_surf=debug_font.render(f"Garbage: {len(view['garbage'][0])}",True,UI_TEXT_COLOR); screen.blit(g_surf,(20,s_surf.get_height()+25))
+                autopilot_text_str = "Automatic Pilot ON" if view['autopilot'] else "Automatic Pilot OFF"
+                autopilot_text_color = AUTOPILOT_ON_COLOR if view['autopilot'] else AUTOPILOT_OFF_COLOR
                 autopilot_surf = autopilot_font.render(autopilot_text_str, True, autopilot_text_color)
-                autopilot_rect = autopilot_surf.get_rect(center=(SCREEN_WIDTH // 2, 30))
+                autopilot_rect = autopilot_surf.get_rect(center=(config.SCREEN_WIDTH // 2, 30))
                 screen.blit(autopilot_surf, autopilot_rect)
-
-                if spaceShip: draw_minimap(screen,spaceShip,main_game_background,camera_x,camera_y,all_garbage_objects)
-            elif current_state == STATE_GAME_OVER:
-                go_surf=game_over_font.render("GAME OVER",True,GAMEOVER_TEXT_COLOR); go_r=go_surf.get_rect(center=(SCREEN_WIDTH//2,SCREEN_HEIGHT//2-120)); screen.blit(go_surf,go_r)
-                fs_surf=score_font.render(f"Final Score: {score}",True,SCORE_TEXT_COLOR); fs_r=fs_surf.get_rect(center=(SCREEN_WIDTH//2,go_r.bottom+35)); screen.blit(fs_surf,fs_r)
-                ct_surf=crash_timer_font.render(f"Time Since Crash: {crash_time_elapsed:.1f}s",True,CRASH_TIMER_TEXT_COLOR); ct_r=ct_surf.get_rect(center=(SCREEN_WIDTH//2,fs_r.bottom+35)); screen.blit(ct_surf,ct_r)
-                cc_surf=crash_count_font.render(f"Crashes: {ship_crash_count}",True,CRASH_COUNT_TEXT_COLOR); cc_r=cc_surf.get_rect(center=(SCREEN_WIDTH//2,ct_r.bottom+35)); screen.blit(cc_surf,cc_r)
-                btn_c = RESTART_BUTTON_BG_HOVER_COLOR if respawn_button_rect_outer.collidepoint(mouse_pos) else RESTART_BUTTON_BG_COLOR
-                pygame.draw.rect(screen,btn_c,respawn_button_rect_outer,border_radius=10); screen.blit(respawn_button_text_surface,respawn_button_rect_inner)
-                if spaceShip and main_game_background: draw_minimap(screen,spaceShip,main_game_background,camera_x,camera_y,all_garbage_objects)
-            elif current_state == STATE_WIN:
-                screen.blit(win_text_surface, win_text_rect)
-                final_score_text = f"Final Score: {score}"
-                final_score_surf = win_info_font.render(final_score_text, True, SCORE_TEXT_COLOR)
-                final_score_rect = final_score_surf.get_rect(center=(SCREEN_WIDTH // 2, win_text_rect.bottom + 70))
-                screen.blit(final_score_surf, final_score_rect)
-                final_time_text = f"Clear Time: {game_time:.1f} seconds"
-                final_time_surf = win_info_font.render(final_time_text, True, WIN_INFO_COLOR)
-                final_time_rect = final_time_surf.get_rect(center=(SCREEN_WIDTH // 2, final_score_rect.bottom + 50))
-                screen.blit(final_time_surf, final_time_rect)
-                btn_bg_color_win = RESTART_BUTTON_BG_HOVER_COLOR if play_again_button_rect_outer.collidepoint(mouse_pos) else RESTART_BUTTON_BG_COLOR
-                pygame.draw.rect(screen, btn_bg_color_win, play_again_button_rect_outer, border_radius=10)
-                screen.blit(play_again_button_text_surface, play_again_button_rect_inner)
-                if spaceShip and main_game_background: draw_minimap(screen,spaceShip,main_game_background,camera_x,camera_y,all_garbage_objects) # Minimap on win screen
-
+            else: # Pause, game over and win screens
+                for _, _, _, draw in overlay_items(view, mouse_pos): draw(screen)
+            PROFILER.stop(PHASE_HUD, phase_start)
+
+            if view['state'] in (STATE_PLAYING, STATE_GAME_OVER, STATE_WIN): # Minimap is drawn over the HUD
+                phase_start = PROFILER.start()
+                minimap_age += 1
+                if minimap_surface is None or minimap_age >= GOVERNOR.settings['minimap_interval']:
+                    minimap_surface = render_minimap(view); minimap_age = 0
+                blit_minimap(screen, minimap_surface)
+                PROFILER.stop(PHASE_MINIMAP, phase_start)
+        else:
+            screen.fill((0,0,0))
+
+        PROFILER.draw_overlay(screen, debug_font, extra_lines=[RENDER_QUEUE.stats_text()] + MEMPROFILER.overlay_lines())
+        phase_start = PROFILER.start()
         pygame.display.flip()
-
+        PROFILER.stop(PHASE_FLIP, phase_start)
+        MEMPROFILER.end_frame()
+        frame_work_ms = (time.perf_counter() - frame_work_start) * 1000.0
+        if not (frame_generating or world_generating) and main_game_background is frame_background:
+            # One-off world generation (on this thread or the simulation thread) says nothing about the drawing cost
+            render_resolution.record_frame(frame_work_ms)
+            GOVERNOR.record_frame(frame_work_ms)
+        if startup_report and first_frame:
+            first_frame = False
+            print(f"Startup: first frame presented after {(time.perf_counter() - startup_start) * 1000:.0f} ms", flush=True)
+            running = False
+
+    if sim_thread: sim_thread.stop() # The game's state is this thread's again
     if spaceShip and ((current_state == STATE_PLAYING and spaceShip.alive) or current_state == STATE_GAME_OVER):
         save_game()
+    stop_replay_recording()
+    MEMPROFILER.report() # Whatever is left of the last window
 
+    menu_background_thread.join() # Never tear pygame down while the worker is still creating surfaces
     pygame.quit()
 
 if __name__ == '__main__':
-    main_program()
+    parser = argparse.ArgumentParser(description="GreenSpace.io")
+    parser.add_argument('--record', metavar='FILE', help="record every game session to a replay file (see replay.py)")
+    parser.add_argument('--profile', action='store_true', help="start with the frame profiler overlay shown (F3 toggles it)")
+    parser.add_argument('--render-scale', type=float, metavar='SCALE',
+                        help="draw the world at this fraction of the screen resolution (default: adjust automatically)")
+    parser.add_argument('--quality', default='auto', choices=['auto'] + [t['name'] for t in config.QUALITY_TIERS],
+                        help="effects quality tier (default: adjust automatically to the frame time)")
+    parser.add_argument('--threaded', action='store_true',
+                        help="step the simulation on its own thread while the main thread draws its latest snapshot")
+    parser.add_argument('--startup-report', action='store_true', help="print startup timings and exit after the first frame")
+    parser.add_argument('--endless', action='store_true', help="new games keep spawning debris and never end (E on the menu)")
+    parser.add_argument('--spawn-rate', type=float, default=ENDLESS_SPAWN_RATE, metavar='N',
+                        help=f"debris per second in endless mode, tapering off towards {ENDLESS_MAX_GARBAGE} items (default {ENDLESS_SPAWN_RATE})")
+    parser.add_argument('--memprofile', action='store_true',
+                        help="trace allocations and GC pauses, printing a report every few seconds (F5 marks/diffs snapshots)")
+    parser.add_argument('--gravity', default='off', choices=['off', 'bodies', 'debris'],
+                        help="new games have the sun and planets pull the ship and garbage ('bodies'), and debris pull each other too ('debris')")
+    args = parser.parse_args()
+    if args.memprofile:
+        MEMPROFILER.start() # Before the game allocates anything, so long-lived objects have call sites
+        MEMPROFILER.add_counter('particle dicts', lambda: len(spaceShip.particles) if spaceShip else 0)
+        MEMPROFILER.add_counter('pooled garbage', lambda: len(debris_spawner.pool) if debris_spawner else 0)
+    replay_record_path = args.record
+    endless_mode = args.endless; endless_spawn_rate = args.spawn_rate
+    gravity_mode = args.gravity
+    PROFILER.set_enabled(args.profile)
+    GOVERNOR.set_fixed_tier(args.quality)
+    main_program(startup_report=args.startup_report, render_scale=args.render_scale, threaded=args.threaded)
@@ -0,0 +1,190 @@
+# memprofile.py
+
+import gc
+import os
+import time
+import statistics
+import tracemalloc
+from array import array
+
+try:
+    import resource # Peak RSS; not available on Windows
+except ImportError:
+    resource = None
+
+MEMPROFILE_TRACE_DEPTH = 4       # Frames kept per allocation traceback (diffs group by the innermost one).
+MEMPROFILE_WINDOW_FRAMES = 600   # Frames between reports (~10 s at 60 FPS).
+MEMPROFILE_TOP_SITES = 12        # Call sites listed per report.
+MEMPROFILE_DIFF_SITES = 50       # Call sites written to a snapshot diff file.
+MEMPROFILE_COUNTED_TYPES = ('Garbage', 'SpaceShip', 'dict', 'list', 'tuple', 'Surface', 'Rect')
+_UNTRACKED_TYPES = ('Surface', 'Rect') # Not followed by gc; counted through the containers referring to them
+
+class MemoryProfiler:
+    """
+    Allocation profiling mode (--memprofile). tracemalloc records every Python allocation with its call site
+    and a gc callback times every collection. Each frame stores how much the traced memory grew and its
+    transient peak above the frame's start, which covers memory allocated and freed again within the frame.
+    Snapshots only see live blocks, so such short-lived churn shows up in the transient peak rather than
+    by call site. Every MEMPROFILE_WINDOW_FRAMES frames a report is printed: net allocations per frame by
+    call site since the previous report, peak and steady-state RSS, GC pauses and live object counts.
+    mark() stores a snapshot; the next mark() writes the diff between the two to a file.
+    Nothing is traced and no callback is installed until start() is called.
+    """
+    def __init__(self, window_frames=MEMPROFILE_WINDOW_FRAMES):
+        self.enabled = False
+        self.window_frames = window_frames
+        self._growth = array('d', bytes(8 * window_frames))    # Net traced bytes per frame of the window
+        self._transient = array('d', bytes(8 * window_frames)) # Peak above the frame's starting point
+        self._rss = array('d', bytes(8 * window_frames))       # Resident set size at the end of each frame
+        self._frames = 0              # Frames recorded in the current window
+        self._frame_start_bytes = 0
+        self._window_snapshot = None  # Snapshot the next report diffs against
+        self._mark_snapshot = None    # Snapshot stored by the first of two mark() calls
+        self._gc_started = 0.0
+        self._gc_pauses = [[0, 0.0, 0.0] for _ in range(3)] # Per generation: [collections, total s, max s] this window
+        self._counters = {} # name -> callable returning a count (e.g. particle dicts)
+        self.last_report = [] # Lines of the most recent report
+
+    def start(self):
+        """Starts tracing. Call as early as possible so that long-lived allocations are attributed."""
+        if self.enabled: return
+        tracemalloc.start(MEMPROFILE_TRACE_DEPTH)
+        gc.callbacks.append(self._on_gc)
+        self._window_snapshot = self._snapshot()
+        self.enabled = True
+
+    def stop(self):
+        if not self.enabled: return
+        gc.callbacks.remove(self._on_gc)
+        tracemalloc.stop()
+        self.enabled = False
+
+    def add_counter(self, name, count):
+        """Reports count() next to the object counts (for objects not identifiable by type, like particle dicts)."""
+        self._counters[name] = count
+
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            self._gc_started = time.perf_counter(); return
+        pause = time.perf_counter() - self._gc_started
+        stats = self._gc_pauses[info['generation']]
+        stats[0] += 1; stats[1] += pause; stats[2] = max(stats[2], pause)
+
+    def begin_frame(self):
+        if not self.enabled: return
+        tracemalloc.reset_peak()
+        self._frame_start_bytes = tracemalloc.get_traced_memory()[0]
+
+    def end_frame(self):
+        """Records the frame; prints a report once the window is full."""
+        if not self.enabled: return
+        current, peak = tracemalloc.get_traced_memory()
+        i = self._frames
+        self._growth[i] = current - self._frame_start_bytes
+        self._transient[i] = peak - self._frame_start_bytes
+        self._rss[i] = current_rss() or 0.0
+        self._frames += 1
+        if self._frames >= self.window_frames: self.report()
+
+    def _snapshot(self):
+        """A snapshot without the profiler's own bookkeeping."""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)))
+
+    def count_objects(self):
+        """Live objects of MEMPROFILE_COUNTED_TYPES plus the registered counters."""
+        counted = set(MEMPROFILE_COUNTED_TYPES)
+        counts = dict.fromkeys(MEMPROFILE_COUNTED_TYPES, 0)
+        untracked = {name: set() for name in _UNTRACKED_TYPES}
+        for obj in gc.get_objects():
+            name = type(obj).__name__
+            if name in counted: counts[name] += 1
+            for referent in gc.get_referents(obj):
+                ids = untracked.get(type(referent).__name__)
+                if ids is not None: ids.add(id(referent))
+        for name, ids in untracked.items(): counts[name] = len(ids)
+        for name, count in self._counters.items(): counts[name] = count()
+        return counts
+
+    def report(self):
+        """Prints and stores (last_report) the current window's report, then starts a new window."""
+        if not self.enabled or self._frames == 0: return
+        frames = self._frames
+        snapshot = self._snapshot()
+        sites = snapshot.compare_to(self._window_snapshot, 'lineno')
+        growth = self._growth[:frames]
+        transient = sorted(self._transient[:frames])
+        rss = [r for r in self._rss[:frames] if r > 0]
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        lines = [f"[memprofile] {frames} frames: traced {traced / 1e6:.1f} MB, "
+                 f"net {sum(growth) / frames / 1024:+.2f} KB/frame, transient median {transient[frames // 2] / 1024:.1f} KB/frame "
+                 f"(max {transient[-1] / 1024:.1f} KB)"]
+        if rss:
+            peak_rss = peak_rss_bytes()
+            lines.append(f"[memprofile] RSS steady {statistics.median(rss) / 1e6:.1f} MB (window {min(rss) / 1e6:.1f}-{max(rss) / 1e6:.1f} MB)"
+                         + (f", peak {peak_rss / 1e6:.1f} MB" if peak_rss else ""))
+        lines.append("[memprofile] GC " + ", ".join(
+            f"gen{gen} {n} ({total * 1000 / n:.2f} ms avg, {longest * 1000:.2f} ms max)" if n else f"gen{gen} 0"
+            for gen, (n, total, longest) in enumerate(self._gc_pauses)))
+        lines.append("[memprofile] objects " + ", ".join(f"{name} {count}" for name, count in self.count_objects().items()))
+        lines.append(f"[memprofile] net allocations per frame by call site:")
+        for stat in sites[:MEMPROFILE_TOP_SITES]:
+            if stat.size_diff == 0: break
+            frame = stat.traceback[0]
+            lines.append(f"[memprofile] {stat.size_diff / frames:+10.1f} B {stat.count_diff / frames:+8.2f} blocks  "
+                         f"{os.path.basename(frame.filename)}:{frame.lineno}")
+        for line in lines: print(line)
+        self.last_report = lines
+        self._window_snapshot = snapshot
+        self._frames = 0
+        self._gc_pauses = [[0, 0.0, 0.0] for _ in range(3)]
+
+    def mark(self, path=None):
+        """
+        First call: stores a snapshot. Second call: writes the allocations that changed since then, by call site
+        with their tracebacks, to path (default memdiff_<time>.txt) and returns the path.
+        """
+        if not self.enabled: return None
+        before = tracemalloc.get_traced_memory()[0]
+        snapshot = self._snapshot()
+        self._frame_start_bytes += tracemalloc.get_traced_memory()[0] - before # Not the frame's growth
+        if self._mark_snapshot is None:
+            self._mark_snapshot = snapshot; self._mark_time = time.time()
+            return None
+        path = path or f"memdiff_{time.strftime('%Y%m%d_%H%M%S')}.txt"
+        stats = snapshot.compare_to(self._mark_snapshot, 'traceback')
+        with open(path, 'w') as f:
+            f.write(f"Allocations changed over {time.time() - self._mark_time:.1f} s, largest change first\n")
+            f.write(f"total {sum(s.size_diff for s in stats) / 1024:+.1f} KB, {sum(s.count_diff for s in stats):+d} blocks\n\n")
+            for stat in stats[:MEMPROFILE_DIFF_SITES]:
+                f.write(f"{stat.size_diff / 1024:+.1f} KB {stat.count_diff:+d} blocks (now {stat.size / 1024:.1f} KB in {stat.count})\n")
+                for line in stat.traceback.format(most_recent_first=True): f.write(f"    {line}\n")
+                f.write("\n")
+        self._mark_snapshot = None
+        return path
+
+    def overlay_lines(self):
+        """Short summary for the F3 overlay."""
+        if not self.enabled: return []
+        traced, _ = tracemalloc.get_traced_memory()
+        rss = current_rss()
+        gen_counts = "/".join(str(n) for n, _, _ in self._gc_pauses)
+        longest = max(longest for _, _, longest in self._gc_pauses)
+        return [f"traced {traced / 1e6:.1f} MB" + (f", rss {rss / 1e6:.0f} MB" if rss else ""),
+                f"gc {gen_counts}, max pause {longest * 1000:.2f} ms"]
+
+def current_rss():
+    """Resident set size in bytes (Linux /proc), or None where it is not available."""
+    try:
+        with open('/proc/self/statm') as f: return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def peak_rss_bytes():
+    """Peak resident set size in bytes, or None where it is not available."""
+    if resource is None: return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024 # Linux reports KiB
+
+# Shared instance; main.py starts it for --memprofile.
+MEMPROFILER = MemoryProfiler()
@@ -0,0 +1,321 @@
+# pilotenv.py
+
+import math
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from config import (ROTATION_SPEED, THRUST_MAGNITUDE, DESIRED_SIZE, SYSTEM_RADIUS, SUN_RADIUS, NUM_SOLAR_SYSTEM_PLANETS,
+                    MIN_ORBIT_RADIUS, MAX_ORBIT_RADIUS, NUM_GENERAL_GARBAGE, GARBAGE_PER_PLANET_CLUSTER,
+                    PLANET_GARBAGE_ZONE_RADIUS_FACTOR, MIN_DIST_GARBAGE_FROM_PLANET_SURFACE, GARBAGE_SIZE_RANGE,
+                    SHIP_MAGNET_RANGE, BASE_MAGNET_STRENGTH, MIN_GARBAGE_ATTRACTION_SPEED_FACTOR,
+                    ENV_TICK_DT, ENV_MAX_STEPS, ENV_OBSERVED_GARBAGE, ENV_OBSERVED_BODIES, ENV_OBSERVATION_SCALE,
+                    ENV_COLLECT_REWARD, ENV_CRASH_REWARD)
+from simulation import MAX_SHIP_VELOCITY, SHIP_DRAG, INPUT_ROTATE_LEFT, INPUT_ROTATE_RIGHT, INPUT_THRUST
+
+# Training environments for learned pilots. The game's rules for one star system (ship controls and drag,
+# orbits, the garbage magnet, collection and crashes) restated over numpy arrays, so many independent
+# worlds step together without pygame objects or drawing. Actions are the replay input bits
+# (INPUT_ROTATE_LEFT | INPUT_ROTATE_RIGHT | INPUT_THRUST), one per world. World coordinates are relative
+# to the sun with Y down, as in the game; observations are Y up, as the ship's velocity and heading are.
+
+SHIP_COLLIDER_HALF = DESIRED_SIZE[0] * 0.7 / 2  # Half the ship's collection rect (SpaceShip.get_collider_world)
+SHIP_CRASH_RADIUS = DESIRED_SIZE[0] * 0.7 / 2.2 # Radius check_ship_crash gives the ship
+GARBAGE_COUNT = NUM_GENERAL_GARBAGE + NUM_SOLAR_SYSTEM_PLANETS * GARBAGE_PER_PLANET_CLUSTER # Items per world, as a game system
+BODY_COUNT = 1 + NUM_SOLAR_SYSTEM_PLANETS       # Sun first, then the planets
+OBSERVATION_SIZE = 7 + 3 * ENV_OBSERVED_GARBAGE + 3 * ENV_OBSERVED_BODIES
+ACTION_COUNT = (INPUT_ROTATE_LEFT | INPUT_ROTATE_RIGHT | INPUT_THRUST) + 1 # Actions are the bit combinations 0..7
+
+def _generate_world(generator):
+    """
+    One episode's world from a numpy Generator: planet radii, orbits, speeds and angles (spread and slowed
+    with distance as Background generates them), garbage clustered around the planets and scattered over
+    the system, and a spawn point clear of the bodies. Returns a dict of arrays.
+    """
+    planet_radius = generator.integers(800, 2000, NUM_SOLAR_SYSTEM_PLANETS, endpoint=True).astype(float)
+    segment = (MAX_ORBIT_RADIUS - MIN_ORBIT_RADIUS) / max(NUM_SOLAR_SYSTEM_PLANETS, 1)
+    orbit = MIN_ORBIT_RADIUS + segment * (np.arange(NUM_SOLAR_SYSTEM_PLANETS) + generator.uniform(0.25, 0.75, NUM_SOLAR_SYSTEM_PLANETS))
+    orbit = np.clip(orbit, MIN_ORBIT_RADIUS + planet_radius, MAX_ORBIT_RADIUS - planet_radius)
+    speed = generator.uniform(0.008, 0.02, NUM_SOLAR_SYSTEM_PLANETS) / (1 + (orbit / MAX_ORBIT_RADIUS) * 3)
+    angle = generator.uniform(0, 2 * math.pi, NUM_SOLAR_SYSTEM_PLANETS)
+    body_radius = np.concatenate(([float(SUN_RADIUS)], planet_radius))
+    body_x = np.concatenate(([0.0], orbit * np.cos(angle)))
+    body_y = np.concatenate(([0.0], orbit * np.sin(angle)))
+
+    # Garbage: GARBAGE_PER_PLANET_CLUSTER around each planet, the rest over the system, redrawn off the bodies
+    center_x = np.concatenate((np.repeat(body_x[1:], GARBAGE_PER_PLANET_CLUSTER), np.zeros(NUM_GENERAL_GARBAGE)))
+    center_y = np.concatenate((np.repeat(body_y[1:], GARBAGE_PER_PLANET_CLUSTER), np.zeros(NUM_GENERAL_GARBAGE)))
+    r_min = np.concatenate((np.repeat(planet_radius + MIN_DIST_GARBAGE_FROM_PLANET_SURFACE, GARBAGE_PER_PLANET_CLUSTER),
+                            np.full(NUM_GENERAL_GARBAGE, SUN_RADIUS + 200 + GARBAGE_SIZE_RANGE[1] / 2.0)))
+    r_max = np.concatenate((np.repeat(planet_radius * (1 + PLANET_GARBAGE_ZONE_RADIUS_FACTOR), GARBAGE_PER_PLANET_CLUSTER),
+                            np.full(NUM_GENERAL_GARBAGE, SYSTEM_RADIUS - GARBAGE_SIZE_RANGE[1] / 2.0)))
+    x, y = np.zeros(GARBAGE_COUNT), np.zeros(GARBAGE_COUNT)
+    todo = np.arange(GARBAGE_COUNT)
+    for _ in range(20):
+        a = generator.uniform(0, 2 * math.pi, len(todo))
+        r = np.sqrt(generator.uniform(r_min[todo] ** 2, r_max[todo] ** 2)) # Uniform by area
+        x[todo], y[todo] = center_x[todo] + r * np.cos(a), center_y[todo] + r * np.sin(a)
+        clear = GARBAGE_SIZE_RANGE[1] / 2.0 + body_radius
+        blocked = (((x[todo, None] - body_x) ** 2 + (y[todo, None] - body_y) ** 2 < clear ** 2).any(axis=1) |
+                   (x[todo] ** 2 + y[todo] ** 2 > r_max[-1] ** 2))
+        todo = todo[blocked]
+        if not len(todo): break
+    size = generator.integers(GARBAGE_SIZE_RANGE[0], GARBAGE_SIZE_RANGE[1], GARBAGE_COUNT, endpoint=True).astype(float)
+    active = np.ones(GARBAGE_COUNT, dtype=bool); active[todo] = False # Items that found no room are left out
+
+    # Spawn between 30% and 70% of the system radius, clear of the bodies (get_safe_spawn_position)
+    for _ in range(100):
+        a = generator.uniform(0, 2 * math.pi); r = generator.uniform(SYSTEM_RADIUS * 0.3, SYSTEM_RADIUS * 0.7)
+        ship_x, ship_y = r * math.cos(a), r * math.sin(a)
+        if (((ship_x - body_x) ** 2 + (ship_y - body_y) ** 2) >= (body_radius + SHIP_CRASH_RADIUS + 200) ** 2).all(): break
+    return {'orbit_radius': np.concatenate(([0.0], orbit)), 'orbit_speed': np.concatenate(([0.0], speed)),
+            'orbit_angle': np.concatenate(([0.0], angle)), 'body_radius': body_radius,
+            'garbage_x': x, 'garbage_y': y, 'garbage_size': size, 'garbage_active': active,
+            'ship_x': ship_x, 'ship_y': ship_y, 'ship_angle': generator.uniform(0, 360)}
+
+class VectorPilotEnv:
+    """
+    n independent single-system worlds stepped in lockstep. step(actions) takes an int array of input bits
+    and returns (observations, rewards, terminated, truncated, info) arrays; worlds whose episode ended start
+    a new one (from their own random stream) before step returns, and info['final_observation'] holds their
+    last observation. Each world draws its episodes from its own stream, so world i plays the same episodes
+    whatever n is and however the worlds are split across processes.
+    """
+    def __init__(self, n, autoreset=True):
+        self.n = n
+        self.autoreset = autoreset
+        self.streams = [None] * n
+        self.ship_x, self.ship_y = np.zeros(n), np.zeros(n)
+        self.ship_vx, self.ship_vy = np.zeros(n), np.zeros(n) # Y up, like SpaceShip.vx_0 / vy_0
+        self.ship_angle = np.zeros(n)                         # Degrees, counter-clockwise from +X
+        self.orbit_radius, self.orbit_speed = np.zeros((n, BODY_COUNT)), np.zeros((n, BODY_COUNT))
+        self.orbit_angle, self.body_radius = np.zeros((n, BODY_COUNT)), np.zeros((n, BODY_COUNT))
+        self.garbage_x, self.garbage_y = np.zeros((n, GARBAGE_COUNT)), np.zeros((n, GARBAGE_COUNT))
+        self.garbage_size = np.zeros((n, GARBAGE_COUNT))
+        self.garbage_active = np.zeros((n, GARBAGE_COUNT), dtype=bool)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.collected = np.zeros(n, dtype=np.int64) # This episode's score
+
+    def reset(self, seed=None):
+        """Starts a new episode in every world, reseeding the worlds' streams from seed. Returns the observations."""
+        self._seed(np.random.SeedSequence(seed).spawn(self.n))
+        return self._observe()
+
+    def _seed(self, sequences):
+        """Gives each world its own stream (one SeedSequence each) and starts its first episode."""
+        self.streams = [np.random.default_rng(sequence) for sequence in sequences]
+        self._start_episodes(range(self.n))
+
+    def _start_episodes(self, worlds):
+        for i in worlds:
+            world = _generate_world(self.streams[i])
+            self.ship_x[i], self.ship_y[i], self.ship_angle[i] = world['ship_x'], world['ship_y'], world['ship_angle']
+            self.ship_vx[i] = self.ship_vy[i] = 0.0
+            self.orbit_radius[i], self.orbit_speed[i] = world['orbit_radius'], world['orbit_speed']
+            self.orbit_angle[i], self.body_radius[i] = world['orbit_angle'], world['body_radius']
+            self.garbage_x[i], self.garbage_y[i] = world['garbage_x'], world['garbage_y']
+            self.garbage_size[i], self.garbage_active[i] = world['garbage_size'], world['garbage_active']
+            self.steps[i] = self.collected[i] = 0
+
+    def step(self, actions):
+        """
+        One game tick in every world, in the order simulate_tick runs it: controls and ship motion, orbits,
+        the magnet's pull on garbage, collection, then crashes. Collection and crashes are tested at the end
+        of the tick rather than swept along it; at the game's speeds (bodies at least 800 px across, the ship
+        under 12 px per tick) only grazing contacts can differ.
+        """
+        actions = np.asarray(actions)
+        # Controls, as apply_manual_controls and apply_thrust (the velocity cap is per axis)
+        angle = self.ship_angle
+        angle = np.where(actions & INPUT_ROTATE_LEFT, (angle + ROTATION_SPEED) % 360, angle)
+        self.ship_angle = angle = np.where(actions & INPUT_ROTATE_RIGHT, (angle - ROTATION_SPEED + 360) % 360, angle)
+        thrust = (actions & INPUT_THRUST) != 0
+        rad = np.radians(angle)
+        vx, vy = self.ship_vx, self.ship_vy
+        ax, ay = np.where(thrust, THRUST_MAGNITUDE * np.cos(rad), 0.0), np.where(thrust, THRUST_MAGNITUDE * np.sin(rad), 0.0)
+        max_v = MAX_SHIP_VELOCITY
+        ax = np.where(vx + ax > max_v, np.maximum(0, max_v - vx), ax); ax = np.where(vx + ax < -max_v, np.minimum(0, -max_v - vx), ax)
+        ay = np.where(vy + ay > max_v, np.maximum(0, max_v - vy), ay); ay = np.where(vy + ay < -max_v, np.minimum(0, -max_v - vy), ay)
+        # SpaceShip.update
+        self.ship_vx = vx = (vx + ax) * SHIP_DRAG
+        self.ship_vy = vy = (vy + ay) * SHIP_DRAG
+        self.ship_x += vx; self.ship_y -= vy
+        self.orbit_angle += self.orbit_speed * ENV_TICK_DT
+        self.steps += 1
+
+        # Magnet: the arithmetic of Garbage.update, on the few items in range only
+        dx = self.ship_x[:, None] - self.garbage_x
+        dy = self.ship_y[:, None] - self.garbage_y
+        dist_sq = dx * dx + dy * dy
+        world, item = np.divmod(np.flatnonzero(self.garbage_active & (dist_sq < SHIP_MAGNET_RANGE ** 2) & (dist_sq > 1e-6)),
+                                GARBAGE_COUNT)
+        if len(world):
+            size = self.garbage_size[world, item]
+            dist = np.sqrt(dist_sq[world, item])
+            size_range_delta = max(GARBAGE_SIZE_RANGE[1] - GARBAGE_SIZE_RANGE[0], 1e-5)
+            size_factor_normalized = np.clip((GARBAGE_SIZE_RANGE[1] - size) / size_range_delta, 0.0, 1.0)
+            effective_strength_factor = (MIN_GARBAGE_ATTRACTION_SPEED_FACTOR +
+                                         (1.0 - MIN_GARBAGE_ATTRACTION_SPEED_FACTOR) * size_factor_normalized)
+            target_speed_pps = np.minimum((BASE_MAGNET_STRENGTH / (size * (dist + 10.0))) * effective_strength_factor,
+                                          SHIP_MAGNET_RANGE)
+            move_dist_this_frame = target_speed_pps * ENV_TICK_DT
+            self.garbage_x[world, item] += dx[world, item] / dist * move_dist_this_frame
+            self.garbage_y[world, item] += dy[world, item] / dist * move_dist_this_frame
+            dx[world, item] = self.ship_x[world] - self.garbage_x[world, item]
+            dy[world, item] = self.ship_y[world] - self.garbage_y[world, item]
+            dist_sq[world, item] = dx[world, item] ** 2 + dy[world, item] ** 2
+            # Collection: the ship's and the item's rects overlap (find_collected_garbage)
+            reach = SHIP_COLLIDER_HALF + size / 4.0
+            hit = (np.abs(dx[world, item]) < reach) & (np.abs(dy[world, item]) < reach)
+            self.garbage_active[world[hit], item[hit]] = False
+            gained = np.bincount(world[hit], minlength=self.n)
+        else:
+            gained = np.zeros(self.n, dtype=np.int64)
+        self.collected += gained
+
+        # Crashes: the ship touching a body, or leaving the system (check_ship_crash)
+        body_dx = self.ship_x[:, None] - self.orbit_radius * np.cos(self.orbit_angle)
+        body_dy = self.ship_y[:, None] - self.orbit_radius * np.sin(self.orbit_angle)
+        clearance = np.sqrt(body_dx * body_dx + body_dy * body_dy) - self.body_radius - SHIP_CRASH_RADIUS
+        crashed = (clearance < 0).any(axis=1) | (np.hypot(self.ship_x, self.ship_y) > SYSTEM_RADIUS - SHIP_CRASH_RADIUS)
+
+        rewards = gained * ENV_COLLECT_REWARD + np.where(crashed, ENV_CRASH_REWARD, 0.0)
+        terminated = crashed | ~self.garbage_active.any(axis=1)
+        truncated = ~terminated & (self.steps >= ENV_MAX_STEPS)
+        observations = self._observe((dx, dy, dist_sq), (body_dx, body_dy, clearance))
+        info = {'collected': self.collected.copy()}
+        done = np.flatnonzero(terminated | truncated)
+        if self.autoreset and len(done):
+            info['final_observation'] = observations.copy()
+            self._start_episodes(done.tolist())
+            observations[done] = self._observe()[done]
+        return observations, rewards.astype(np.float32), terminated, truncated, info
+
+    def _observe(self, garbage_offsets=None, body_offsets=None):
+        """
+        Observations, one float32 row per world (Y up, offsets and clearances in ENV_OBSERVATION_SCALE units):
+        velocity / MAX_SHIP_VELOCITY (2), heading cos and sin (2), position / SYSTEM_RADIUS (2), clearance from
+        the system's edge / SYSTEM_RADIUS (1); then the ENV_OBSERVED_GARBAGE nearest items as (dx, dy, 1),
+        nearest first, padded with zeros once a world has fewer left; then the ENV_OBSERVED_BODIES bodies with
+        the least clearance as (dx, dy, clearance). step passes the ship-to-garbage and body-to-ship offsets
+        it has already worked out.
+        """
+        n, rows = self.n, np.arange(self.n)
+        if garbage_offsets is None:
+            dx, dy = self.ship_x[:, None] - self.garbage_x, self.ship_y[:, None] - self.garbage_y
+            garbage_offsets = (dx, dy, dx * dx + dy * dy)
+        if body_offsets is None:
+            body_dx = self.ship_x[:, None] - self.orbit_radius * np.cos(self.orbit_angle)
+            body_dy = self.ship_y[:, None] - self.orbit_radius * np.sin(self.orbit_angle)
+            body_offsets = (body_dx, body_dy, np.sqrt(body_dx * body_dx + body_dy * body_dy) - self.body_radius - SHIP_CRASH_RADIUS)
+        observations = np.zeros((n, OBSERVATION_SIZE), dtype=np.float32)
+        rad = np.radians(self.ship_angle)
+        observations[:, 0], observations[:, 1] = self.ship_vx / MAX_SHIP_VELOCITY, self.ship_vy / MAX_SHIP_VELOCITY
+        observations[:, 2], observations[:, 3] = np.cos(rad), np.sin(rad)
+        observations[:, 4], observations[:, 5] = self.ship_x / SYSTEM_RADIUS, -self.ship_y / SYSTEM_RADIUS
+        observations[:, 6] = (SYSTEM_RADIUS - SHIP_CRASH_RADIUS - np.hypot(self.ship_x, self.ship_y)) / SYSTEM_RADIUS
+
+        # Nearest garbage by repeated argmin: a few passes over the rows beat partitioning them
+        dx, dy, dist_sq = garbage_offsets
+        dist_sq = np.where(self.garbage_active, dist_sq, np.inf)
+        column = 7
+        for _ in range(ENV_OBSERVED_GARBAGE):
+            nearest = dist_sq.argmin(axis=1)
+            present = np.isfinite(dist_sq[rows, nearest])
+            observations[:, column] = np.where(present, -dx[rows, nearest], 0.0) / ENV_OBSERVATION_SCALE
+            observations[:, column + 1] = np.where(present, dy[rows, nearest], 0.0) / ENV_OBSERVATION_SCALE
+            observations[:, column + 2] = present
+            dist_sq[rows, nearest] = np.inf
+            column += 3
+
+        body_dx, body_dy, clearance = body_offsets
+        closest = np.argsort(clearance, axis=1)[:, :ENV_OBSERVED_BODIES]
+        bodies = observations[:, column:].reshape(n, ENV_OBSERVED_BODIES, 3)
+        bodies[:, :, 0] = -body_dx[rows[:, None], closest] / ENV_OBSERVATION_SCALE
+        bodies[:, :, 1] = body_dy[rows[:, None], closest] / ENV_OBSERVATION_SCALE
+        bodies[:, :, 2] = clearance[rows[:, None], closest] / ENV_OBSERVATION_SCALE
+        return observations
+
+class PilotEnv:
+    """One world with the reset(seed) / step(action) interface: step returns (observation, reward, terminated, truncated, info)."""
+    def __init__(self):
+        self.vector = VectorPilotEnv(1, autoreset=False)
+
+    def reset(self, seed=None):
+        return self.vector.reset(seed)[0]
+
+    def step(self, action):
+        observations, rewards, terminated, truncated, info = self.vector.step(np.array([action]))
+        return observations[0], float(rewards[0]), bool(terminated[0]), bool(truncated[0]), {'collected': int(info['collected'][0])}
+
+def _shared_array(memory, shape, dtype):
+    return np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+def _worker(connection, names, n, lo, hi):
+    """Steps worlds lo..hi of a ProcessVectorPilotEnv, reading actions from and writing results to its shared buffers."""
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    actions, observations, rewards, terminated, truncated, final = _buffers(blocks, n)
+    env = VectorPilotEnv(hi - lo)
+    while True:
+        command, argument = connection.recv()
+        if command == 'reset':
+            env._seed(argument)
+            observations[lo:hi] = env._observe()
+        elif command == 'step':
+            obs, reward, term, trunc, info = env.step(actions[lo:hi])
+            observations[lo:hi], rewards[lo:hi], terminated[lo:hi], truncated[lo:hi] = obs, reward, term, trunc
+            if 'final_observation' in info: final[lo:hi] = info['final_observation']
+        else: break
+        connection.send(None)
+    for block in blocks: block.close()
+    connection.send(None)
+
+_BUFFER_LAYOUT = ((np.int64, ()), (np.float32, (OBSERVATION_SIZE,)), (np.float32, ()), (bool, ()), (bool, ()),
+                  (np.float32, (OBSERVATION_SIZE,))) # actions, observations, rewards, terminated, truncated, final
+
+def _buffers(blocks, n):
+    return [_shared_array(block, (n,) + shape, dtype) for block, (dtype, shape) in zip(blocks, _BUFFER_LAYOUT)]
+
+class ProcessVectorPilotEnv:
+    """
+    VectorPilotEnv's interface with the n worlds split over a pool of worker processes. Actions and results
+    pass through shared-memory arrays, so a step sends each worker one small message and copies nothing
+    else between processes. World i plays the same episodes as in a VectorPilotEnv of any size; the one
+    difference is that info carries only 'final_observation' (valid for the worlds that just ended).
+    Call close() when done to stop the workers and free the buffers.
+    """
+    def __init__(self, n, workers=None):
+        self.n = n
+        workers = max(1, min(n, workers or multiprocessing.cpu_count()))
+        self.blocks = [shared_memory.SharedMemory(create=True, size=max(1, n * int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize))
+                       for dtype, shape in _BUFFER_LAYOUT]
+        self.actions, self.observations, self.rewards, self.terminated, self.truncated, self.final = _buffers(self.blocks, n)
+        bounds = np.linspace(0, n, workers + 1).astype(int).tolist()
+        self.slices = list(zip(bounds[:-1], bounds[1:]))
+        context = multiprocessing.get_context('spawn') # Workers never inherit a pygame display
+        self.connections, self.processes = [], []
+        for lo, hi in self.slices:
+            parent, child = context.Pipe()
+            process = context.Process(target=_worker, args=(child, [block.name for block in self.blocks], n, lo, hi), daemon=True)
+            process.start()
+            self.connections.append(parent); self.processes.append(process)
+
+    def _broadcast(self, messages):
+        for connection, message in zip(self.connections, messages): connection.send(message)
+        for connection in self.connections: connection.recv()
+
+    def reset(self, seed=None):
+        sequences = np.random.SeedSequence(seed).spawn(self.n)
+        self._broadcast([('reset', sequences[lo:hi]) for lo, hi in self.slices])
+        return self.observations.copy()
+
+    def step(self, actions):
+        self.actions[:] = actions
+        self._broadcast([('step', None)] * len(self.connections))
+        return (self.observations.copy(), self.rewards.copy(), self.terminated.copy(), self.truncated.copy(),
+                {'final_observation': self.final.copy()})
+
+    def close(self):
+        self._broadcast([('close', None)] * len(self.connections))
+        for process in self.processes: process.join()
+        for block in self.blocks: block.close(); block.unlink()
+        self.connections, self.processes, self.blocks = [], [], []
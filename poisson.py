@@ -0,0 +1,118 @@
+# poisson.py
+
+import math
+import numpy as np
+from autopilot import GarbageIndex
+from config import POISSON_FILL, POISSON_DARTS_PER_ITEM
+
+# Neighbour cells to test on a grid whose cells are spacing / sqrt(2) wide (at most one point each):
+# the 5x5 block around a cell without its corners, which lie entirely further than the spacing away.
+_NEIGHBOR_DX, _NEIGHBOR_DY = (np.array([(dx, dy) for dx in range(-2, 3) for dy in range(-2, 3)
+                                        if abs(dx) + abs(dy) < 4], dtype=np.int64).T)
+
+def lens_area(distance, r1, r2):
+    """Area of the intersection of two discs of radii r1 and r2 whose centres are distance apart."""
+    if distance >= r1 + r2: return 0.0
+    if distance <= abs(r1 - r2): return math.pi * min(r1, r2) ** 2
+    a1 = r1 * r1 * math.acos((distance * distance + r1 * r1 - r2 * r2) / (2 * distance * r1))
+    a2 = r2 * r2 * math.acos((distance * distance + r2 * r2 - r1 * r1) / (2 * distance * r2))
+    kite = math.sqrt((-distance + r1 + r2) * (distance + r1 - r2) * (distance - r1 + r2) * (distance + r1 + r2))
+    return a1 + a2 - kite / 2
+
+def annulus_area(center_x, center_y, r_min, r_max, exclusions=(), bound=None):
+    """
+    Area of the annulus r_min..r_max around (center_x, center_y), inside the bound disc (x, y, r) if given,
+    minus the exclusion discs (x, y, r) that overlap it. Exclusions are assumed not to overlap each other.
+    """
+    def ring_overlap(x, y, r): # Area of the disc (x, y, r) inside the annulus
+        d = math.hypot(x - center_x, y - center_y)
+        return lens_area(d, r, r_max) - lens_area(d, r, r_min)
+    area = ring_overlap(*bound) if bound is not None else math.pi * (r_max * r_max - r_min * r_min)
+    for x, y, r in exclusions: area -= ring_overlap(x, y, r)
+    return max(area, 0.0)
+
+def poisson_disk_annulus(rand, count, center_x, center_y, r_min, r_max, exclusions=(), bound=None,
+                         min_spacing=0.0, occupied=()):
+    """
+    Up to count points spread over an annulus with Poisson-disk spacing: no two closer than the spacing,
+    which is min_spacing or wider, as wide as the allowed area leaves room for (POISSON_FILL). Points lie
+    inside the bound disc (x, y, r) if given, outside every exclusion disc, and at least min_spacing away from
+    the occupied items (Garbage). Dart throwing in numpy batches: candidates uniform over the annulus are
+    tested analytically against the discs and through a background grid (one point per cell) against the
+    points accepted so far. Returns (x, y) arrays in acceptance order; fewer than count points only when
+    the region cannot hold them at min_spacing. rand (random.Random) seeds the draw.
+    """
+    empty = np.zeros(0)
+    if count <= 0 or r_max <= r_min: return empty, empty
+    area = annulus_area(center_x, center_y, r_min, r_max, exclusions, bound)
+    if area <= 0: return empty, empty
+    spacing = max(min_spacing, math.sqrt(4 * POISSON_FILL * area / (math.pi * count)), 1e-6)
+    spacing_sq = spacing * spacing
+    generator = np.random.default_rng(rand.getrandbits(64))
+
+    # Background grid over the annulus' bounding square, padded by two cells so neighbour lookups stay inside.
+    cell = spacing / math.sqrt(2)
+    min_x, min_y = center_x - r_max, center_y - r_max
+    cols = int(2 * r_max / cell) + 5
+    grid = np.full(cols * cols, -1, dtype=np.int64)     # Index of the accepted point in each cell, or -1
+    scratch = np.full(cols * cols, -1, dtype=np.int64)  # The same for one batch's candidates
+    neighbor_offsets = _NEIGHBOR_DY * cols + _NEIGHBOR_DX
+    occupied_index = None
+    if len(occupied):
+        occupied_index = GarbageIndex(cell_size=max(min_spacing, 1e-6))
+        occupied_index.rebuild(occupied)
+
+    xs, ys = np.empty(count), np.empty(count)
+    placed, darts = 0, 0
+    budget = POISSON_DARTS_PER_ITEM * count
+    batch = max(64, 2 * count)
+    while placed < count and darts < budget:
+        batch = min(batch, budget - darts)
+        darts += batch
+        angle = generator.uniform(0, 2 * math.pi, batch)
+        r = np.sqrt(generator.uniform(r_min * r_min, r_max * r_max, batch)) # Uniform by area
+        x, y = center_x + r * np.cos(angle), center_y + r * np.sin(angle)
+        keep = np.ones(batch, dtype=bool)
+        if bound is not None:
+            keep &= (x - bound[0]) ** 2 + (y - bound[1]) ** 2 < bound[2] * bound[2]
+        for ex, ey, er in exclusions:
+            keep &= (x - ex) ** 2 + (y - ey) ** 2 >= er * er
+        x, y = x[keep], y[keep]
+        cells = ((y - min_y) / cell).astype(np.int64) * cols + ((x - min_x) / cell).astype(np.int64) + 2 * cols + 2
+
+        # Against the points accepted in earlier batches.
+        neighbors = grid[cells[:, None] + neighbor_offsets]
+        found = neighbors >= 0
+        near = np.zeros(len(x), dtype=bool)
+        if found.any():
+            other = np.where(found, neighbors, 0)
+            dist_sq = (xs[other] - x[:, None]) ** 2 + (ys[other] - y[:, None]) ** 2
+            near = (found & (dist_sq < spacing_sq)).any(axis=1)
+        if occupied_index is not None and min_spacing > 0 and len(x):
+            first, second = occupied_index.candidates(x, y)
+            dist_sq = (occupied_index.x[second] - x[first]) ** 2 + (occupied_index.y[second] - y[first]) ** 2
+            close = dist_sq < min_spacing * min_spacing
+            near[first[close]] = True
+        x, y, cells = x[~near], y[~near], cells[~near]
+
+        # Against each other: a candidate stays if no earlier candidate of the batch lies within the spacing.
+        _, first_in_cell = np.unique(cells, return_index=True)
+        first_in_cell.sort()
+        x, y, cells = x[first_in_cell], y[first_in_cell], cells[first_in_cell]
+        order = np.arange(len(x))
+        scratch[cells] = order
+        neighbors = scratch[cells[:, None] + neighbor_offsets]
+        earlier = (neighbors >= 0) & (neighbors < order[:, None])
+        other = np.where(earlier, neighbors, 0)
+        dist_sq = (x[other] - x[:, None]) ** 2 + (y[other] - y[:, None]) ** 2
+        clear = ~(earlier & (dist_sq < spacing_sq)).any(axis=1)
+        scratch[cells] = -1
+
+        accepted = np.flatnonzero(clear)[:count - placed]
+        n = len(accepted)
+        xs[placed:placed + n], ys[placed:placed + n] = x[accepted], y[accepted]
+        grid[cells[accepted]] = np.arange(placed, placed + n)
+        placed += n
+        # Size the next batch for the acceptance rate seen, which falls as the region fills.
+        batch = max(64, int((count - placed) * batch / max(n, 1)) + 1)
+    return xs[:placed], ys[:placed]
@@ -0,0 +1,149 @@
+# profiler.py
+
+import json
+import time
+import threading
+from array import array
+import pygame
+
+# Frame phases. Call sites pass these integer ids so a disabled profiler costs one attribute check.
+# The *_submit phases only queue sprites on the render queue; their blits are timed under queue_flush.
+PHASE_NAMES = ('tick_wait', 'events', 'autopilot', 'gravity', 'ship_update', 'background_update', 'garbage_update',
+               'collection', 'bg_gas', 'bg_dust', 'bg_distant_planets', 'bg_stars', 'bg_tiles', 'bg_bodies',
+               'garbage_submit', 'particle_submit', 'ship_submit', 'queue_flush', 'upscale', 'hud', 'minimap', 'flip')
+(PHASE_TICK_WAIT, PHASE_EVENTS, PHASE_AUTOPILOT, PHASE_GRAVITY, PHASE_SHIP_UPDATE, PHASE_BACKGROUND_UPDATE, PHASE_GARBAGE_UPDATE,
+ PHASE_COLLECTION, PHASE_BG_GAS, PHASE_BG_DUST, PHASE_BG_DISTANT_PLANETS, PHASE_BG_STARS, PHASE_BG_TILES, PHASE_BG_BODIES,
+ PHASE_GARBAGE_SUBMIT, PHASE_PARTICLE_SUBMIT, PHASE_SHIP_SUBMIT, PHASE_QUEUE_FLUSH, PHASE_UPSCALE, PHASE_HUD,
+ PHASE_MINIMAP, PHASE_FLIP) = range(len(PHASE_NAMES))
+
+PROFILER_HISTORY_FRAMES = 600   # Ring buffer capacity (frames).
+PROFILER_ROLLING_FRAMES = 60    # Frames averaged for the per-phase breakdown.
+PROFILER_TRACE_FRAMES = 300     # Frames written by dump_chrome_trace().
+PROFILER_GRAPH_FRAMES = 240     # Frames shown in the frame-time graph (one pixel column each).
+PROFILER_GRAPH_HEIGHT = 90      # Graph height in pixels; the top edge represents PROFILER_GRAPH_MAX_MS.
+PROFILER_GRAPH_MAX_MS = 50.0
+PROFILER_BUDGET_MS = 1000.0 / 60 # Frame budget at 60 FPS.
+
+class FrameProfiler:
+    """
+    Records per-phase timings into a fixed-size ring buffer and renders them as an overlay.
+    While disabled, start() and stop() return immediately and nothing is stored. Only the thread that created
+    it is timed: with --threaded the simulation's phases run on another thread, outside the frames recorded here.
+    """
+    def __init__(self, history_frames=PROFILER_HISTORY_FRAMES):
+        self.enabled = False
+        self._thread_id = threading.get_ident() # Thread whose frames are recorded
+        self.history_frames = history_frames
+        num_phases = len(PHASE_NAMES)
+        # Flat preallocated buffers: row = frame slot, column = phase.
+        self._phase_start = array('d', bytes(8 * history_frames * num_phases))
+        self._phase_duration = array('d', bytes(8 * history_frames * num_phases))
+        self._frame_start = array('d', bytes(8 * history_frames))
+        self._frame_duration = array('d', bytes(8 * history_frames))
+        self._frame_count = 0   # Frames begun since the profiler was last enabled.
+        self._row = 0           # Offset of the current frame's row in the phase buffers.
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self._frame_count = 0
+
+    def begin_frame(self):
+        """Closes the previous frame and starts recording a new one."""
+        if not self.enabled: return
+        now = time.perf_counter()
+        if self._frame_count > 0:
+            prev_slot = (self._frame_count - 1) % self.history_frames
+            self._frame_duration[prev_slot] = now - self._frame_start[prev_slot]
+        slot = self._frame_count % self.history_frames
+        self._frame_start[slot] = now
+        self._frame_duration[slot] = 0.0
+        num_phases = len(PHASE_NAMES)
+        self._row = slot * num_phases
+        for i in range(self._row, self._row + num_phases):
+            self._phase_start[i] = 0.0; self._phase_duration[i] = 0.0
+        self._frame_count += 1
+
+    def start(self):
+        """Returns a timestamp to hand to stop(), or 0.0 when disabled."""
+        return time.perf_counter() if self.enabled and threading.get_ident() == self._thread_id else 0.0
+
+    def stop(self, phase, start_time):
+        """Adds the time since start_time to this frame's total for phase."""
+        if not self.enabled or self._frame_count == 0 or threading.get_ident() != self._thread_id: return
+        i = self._row + phase
+        if self._phase_duration[i] == 0.0: self._phase_start[i] = start_time
+        self._phase_duration[i] += time.perf_counter() - start_time
+
+    def _completed_slots(self, max_frames):
+        """Ring-buffer slots of the most recent fully recorded frames, oldest first."""
+        completed = min(self._frame_count - 1, self.history_frames - 1, max_frames)
+        first = self._frame_count - 1 - completed
+        return [(first + k) % self.history_frames for k in range(max(0, completed))]
+
+    def phase_averages_ms(self, frames=PROFILER_ROLLING_FRAMES):
+        """Mean milliseconds per phase over the last `frames` completed frames."""
+        slots = self._completed_slots(frames)
+        num_phases = len(PHASE_NAMES)
+        totals = [0.0] * num_phases
+        for slot in slots:
+            row = slot * num_phases
+            for phase in range(num_phases): totals[phase] += self._phase_duration[row + phase]
+        n = len(slots) or 1
+        return [t * 1000.0 / n for t in totals]
+
+    def dump_chrome_trace(self, path, frames=PROFILER_TRACE_FRAMES):
+        """Writes the last `frames` frames as Chrome trace-event JSON (open in chrome://tracing or Perfetto)."""
+        slots = self._completed_slots(frames)
+        if not slots: return 0
+        origin = self._frame_start[slots[0]]
+        num_phases = len(PHASE_NAMES)
+        events = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "GreenSpace.io"}}]
+        for slot in slots:
+            frame_ts = (self._frame_start[slot] - origin) * 1e6
+            events.append({"name": "frame", "cat": "frame", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": frame_ts, "dur": self._frame_duration[slot] * 1e6})
+            row = slot * num_phases
+            for phase in range(num_phases):
+                duration = self._phase_duration[row + phase]
+                if duration > 0.0:
+                    events.append({"name": PHASE_NAMES[phase], "cat": "phase", "ph": "X", "pid": 1, "tid": 1,
+                                   "ts": (self._phase_start[row + phase] - origin) * 1e6, "dur": duration * 1e6})
+        with open(path, 'w') as f: json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(slots)
+
+    def draw_overlay(self, surface, font, top_left=(20, 120), extra_lines=()):
+        """Draws the frame-time graph, the rolling per-phase breakdown and any extra_lines of text below them."""
+        if not self.enabled: return
+        x0, y0 = top_left
+        slots = self._completed_slots(PROFILER_GRAPH_FRAMES)
+        averages = self.phase_averages_ms()
+        recent = [self._frame_duration[s] for s in slots[-PROFILER_ROLLING_FRAMES:]]
+        frame_avg_ms = sum(recent) * 1000.0 / len(recent) if recent else 0.0
+        lines = [f"frame {frame_avg_ms:5.2f} ms  ({1000.0 / frame_avg_ms if frame_avg_ms else 0:.0f} FPS)"]
+        busiest = sorted((ms, name) for name, ms in zip(PHASE_NAMES, averages) if name != 'tick_wait')
+        lines += [f"{name:<19}{ms:6.2f} ms" for ms, name in reversed(busiest[-14:]) if ms > 0.0]
+        lines += list(extra_lines)
+        line_h = font.get_linesize()
+        # The first 8 lines sit beside the graph and the rest below it, so the panel grows with the line count.
+        panel_h = max(PROFILER_GRAPH_HEIGHT + 6 + line_h * max(0, len(lines) - 8), 2 + line_h * min(len(lines), 8)) + 6
+        panel = pygame.Surface((PROFILER_GRAPH_FRAMES + 260, panel_h), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        scale = PROFILER_GRAPH_HEIGHT / PROFILER_GRAPH_MAX_MS
+        for column, slot in enumerate(slots):
+            frame_ms = self._frame_duration[slot] * 1000.0
+            bar_h = min(PROFILER_GRAPH_HEIGHT, int(frame_ms * scale))
+            color = (80, 220, 80) if frame_ms <= PROFILER_BUDGET_MS * 1.05 else \
+                    (230, 200, 60) if frame_ms <= PROFILER_BUDGET_MS * 2 else (230, 70, 60)
+            pygame.draw.line(panel, color, (column, PROFILER_GRAPH_HEIGHT), (column, PROFILER_GRAPH_HEIGHT - bar_h))
+        for budget_ms in (PROFILER_BUDGET_MS, PROFILER_BUDGET_MS * 2): # 60 and 30 FPS reference lines
+            y = PROFILER_GRAPH_HEIGHT - int(budget_ms * scale)
+            pygame.draw.line(panel, (200, 200, 255, 140), (0, y), (PROFILER_GRAPH_FRAMES, y))
+
+        for i, text in enumerate(lines):
+            column_x = PROFILER_GRAPH_FRAMES + 10 if i < 8 else 10
+            row_y = 2 + i * line_h if i < 8 else PROFILER_GRAPH_HEIGHT + 6 + (i - 8) * line_h
+            panel.blit(font.render(text, True, (230, 230, 230)), (column_x, row_y))
+        surface.blit(panel, (x0, y0))
+
+# Shared instance used by every instrumented module.
+PROFILER = FrameProfiler()
@@ -0,0 +1,53 @@
+# quality.py
+
+from collections import deque
+from config import (QUALITY_TIERS, QUALITY_WINDOW_FRAMES, QUALITY_DOWNGRADE_RATIO, QUALITY_UPGRADE_RATIO,
+                    QUALITY_UPGRADE_HOLD_FRAMES, RENDER_FRAME_BUDGET_MS)
+
+class QualityGovernor:
+    """
+    Picks an effects quality tier from QUALITY_TIERS based on a rolling window of measured frame times.
+    Drawing code reads the active tier from `settings`. Tiers drop as soon as the window is over budget
+    but only rise after a sustained period well under it, so quality does not flicker.
+    """
+    def __init__(self, tiers=QUALITY_TIERS, budget_ms=RENDER_FRAME_BUDGET_MS):
+        self.tiers = tiers
+        self.budget_ms = budget_ms
+        self.automatic = True
+        self.tier = 0
+        self.settings = tiers[0]
+        self._frame_times = deque(maxlen=QUALITY_WINDOW_FRAMES)
+        self._frames_since_change = 0
+
+    def set_fixed_tier(self, name):
+        """Pins the tier with this name and stops automatic adjustment ('auto' resumes it)."""
+        if name == 'auto':
+            self.automatic = True; return
+        names = [t['name'] for t in self.tiers]
+        if name not in names: raise ValueError(f"Unknown quality tier '{name}' (expected one of {names})")
+        self.automatic = False
+        self._set_tier(names.index(name), "fixed")
+
+    def record_frame(self, work_ms):
+        """Feeds one frame's CPU time (excluding the frame-rate wait) to the governor."""
+        if not self.automatic: return
+        self._frame_times.append(work_ms)
+        self._frames_since_change += 1
+        if len(self._frame_times) < self._frame_times.maxlen: return
+        mean_ms = sum(self._frame_times) / len(self._frame_times)
+        if mean_ms > self.budget_ms * QUALITY_DOWNGRADE_RATIO and self.tier < len(self.tiers) - 1:
+            self._set_tier(self.tier + 1, f"mean frame {mean_ms:.1f} ms over {self.budget_ms:.1f} ms budget")
+        elif mean_ms < self.budget_ms * QUALITY_UPGRADE_RATIO and self.tier > 0 and \
+             self._frames_since_change >= QUALITY_UPGRADE_HOLD_FRAMES:
+            self._set_tier(self.tier - 1, f"mean frame {mean_ms:.1f} ms")
+
+    def _set_tier(self, tier, reason):
+        if tier != self.tier:
+            print(f"Quality tier {self.tiers[self.tier]['name']} -> {self.tiers[tier]['name']} ({reason})")
+        self.tier = tier
+        self.settings = self.tiers[tier]
+        self._frame_times.clear() # Judge the new tier only on frames rendered at it
+        self._frames_since_change = 0
+
+# Shared instance read by every module that draws tier-dependent effects.
+GOVERNOR = QualityGovernor()
@@ -0,0 +1,52 @@
+# renderqueue.py
+
+# Layers in drawing order. Each flush draws the queued layers lowest first.
+LAYER_NAMES = ('gas', 'dust', 'distant_planets', 'stars', 'garbage', 'particles', 'ship')
+(LAYER_GAS, LAYER_DUST, LAYER_DISTANT_PLANETS, LAYER_STARS, LAYER_GARBAGE, LAYER_PARTICLES,
+ LAYER_SHIP) = range(len(LAYER_NAMES))
+
+class RenderQueue:
+    """
+    Collects blit commands per layer during a frame and draws each layer with one Surface.blits call.
+    Drawables submit (surface, top-left screen position) instead of drawing themselves; flush() culls
+    every queued command against the target in one pass and blits the survivors in layer order.
+    """
+    def __init__(self):
+        self._layers = [[] for _ in LAYER_NAMES] # layer -> [(surface, (x, y), right, bottom)]
+        self.draw_calls = 0     # blits calls in the current frame
+        self.submitted = 0      # Commands flushed in the current frame...
+        self.culled = 0         # ...and how many of them were entirely off the target
+        self.last_frame = {'draw_calls': 0, 'submitted': 0, 'culled': 0} # Totals of the previous frame
+
+    def begin_frame(self):
+        """Stores the finished frame's counts in last_frame and starts counting a new one."""
+        self.last_frame = {'draw_calls': self.draw_calls, 'submitted': self.submitted, 'culled': self.culled}
+        self.draw_calls = self.submitted = self.culled = 0
+
+    def submit(self, layer, surface, x, y):
+        """Queues surface to be blitted with its top-left corner at (x, y) on the next flush."""
+        w, h = surface.get_size()
+        self._layers[layer].append((surface, (x, y), x + w, y + h))
+
+    def flush(self, target, layers=None):
+        """Draws and clears the queued commands of `layers` (default: every layer) onto target."""
+        target_w, target_h = target.get_size()
+        for layer in range(len(self._layers)) if layers is None else layers:
+            commands = self._layers[layer]
+            if not commands: continue
+            visible = [(surface, position) for surface, position, right, bottom in commands
+                       if right > 0 and bottom > 0 and position[0] < target_w and position[1] < target_h]
+            self.submitted += len(commands)
+            self.culled += len(commands) - len(visible)
+            if visible:
+                target.blits(visible, doreturn=False)
+                self.draw_calls += 1
+            commands.clear()
+
+    def stats_text(self):
+        """One-line summary of the previous frame, for the profiler overlay."""
+        frame = self.last_frame
+        return f"draw calls {frame['draw_calls']}, items {frame['submitted']}, culled {frame['culled']}"
+
+# Shared instance every drawable submits to; whoever owns the frame's target flushes it.
+RENDER_QUEUE = RenderQueue()
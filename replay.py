@@ -0,0 +1,225 @@
+# replay.py
+
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import argparse
+from array import array
+
+# File layout: MAGIC followed by one zlib stream of tagged records.
+#   b'H' <u32 len> <json>   header (format version, world seed, star system count, keyframe interval)
+#   b'K' <u32 len> <json>   keyframe: full simulation state before tick N (for seeking and divergence checks)
+#   b'T' <i16 dt_delta> <u8 input_bits> <u16 run>   'run' ticks whose dt changed by dt_delta ms from the previous tick
+#   b'A' <u32 dt_ms> <u8 input_bits> <u16 run>      same, with an absolute dt (used when the delta does not fit)
+# The stream is sync-flushed at every keyframe, so a recording cut short by a crash is readable up to there.
+MAGIC = b"GSRP"
+FORMAT_VERSION = 6 # 2: particle bursts draw once from the effects stream; 3: swept collisions change outcomes;
+                   # 4: the autopilot evades predicted collisions; 5: moving garbage collides with itself;
+                   # 6: headers and keyframes record the star systems
+KEYFRAME_INTERVAL = 600 # Ticks between keyframes (~10 s at 60 FPS).
+SEEK_STEP_TICKS = 600   # Ticks skipped by LEFT/RIGHT during windowed playback.
+
+_LEN = struct.Struct('<I')
+_DELTA_RUN = struct.Struct('<hBH')
+_ABS_RUN = struct.Struct('<IBH')
+_MAX_RUN = 0xFFFF
+
+class ReplayWriter:
+    """Streams a delta-encoded per-tick input log with periodic keyframes to disk."""
+    def __init__(self, path, world_seed, star_systems=1, keyframe_interval=KEYFRAME_INTERVAL):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.tick_count = 0
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+        self._compressor = zlib.compressobj(9)
+        self._last_tick_ms = 0
+        self._run = None # [tick_ms, dt_delta, input_bits, length] of the run being accumulated
+        self._write_json_record(b'H', {"version": FORMAT_VERSION, "world_seed": world_seed, "star_systems": star_systems,
+                                       "keyframe_interval": keyframe_interval, "recorded_at": time.time()})
+
+    def _write(self, data):
+        self._file.write(self._compressor.compress(data))
+
+    def _write_json_record(self, tag, payload):
+        encoded = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        self._write(tag + _LEN.pack(len(encoded)) + encoded)
+
+    def _flush_run(self):
+        if not self._run: return
+        tick_ms, dt_delta, input_bits, length = self._run
+        if -0x8000 <= dt_delta < 0x8000: self._write(b'T' + _DELTA_RUN.pack(dt_delta, input_bits, length))
+        else: self._write(b'A' + _ABS_RUN.pack(tick_ms, input_bits, length))
+        self._run = None
+
+    def record_tick(self, tick_ms, input_bits, capture_state):
+        """Records one simulated tick. capture_state is called (before the tick runs) when a keyframe is due."""
+        if self.tick_count % self.keyframe_interval == 0:
+            self._flush_run()
+            self._write_json_record(b'K', {"tick": self.tick_count, "state": capture_state()})
+            self._file.write(self._compressor.flush(zlib.Z_SYNC_FLUSH))
+
+        dt_delta = tick_ms - self._last_tick_ms
+        self._last_tick_ms = tick_ms
+        run = self._run
+        if run and dt_delta == 0 and run[2] == input_bits and run[3] < _MAX_RUN:
+            run[3] += 1 # Same dt and inputs as the previous tick: extend the run
+        else:
+            self._flush_run()
+            self._run = [tick_ms, dt_delta, input_bits, 1]
+        self.tick_count += 1
+
+    def close(self):
+        if self._file.closed: return
+        self._flush_run()
+        self._file.write(self._compressor.flush())
+        self._file.close()
+
+class ReplayReader:
+    """Loads a recording into flat per-tick arrays plus a {tick: state} keyframe map."""
+    def __init__(self, path):
+        with open(path, 'rb') as f: data = f.read()
+        if data[:len(MAGIC)] != MAGIC: raise ValueError(f"{path} is not a GreenSpace replay")
+        raw = zlib.decompressobj().decompress(data[len(MAGIC):]) # Tolerates a truncated tail
+
+        self.header = None
+        self.tick_ms = array('I')
+        self.input_bits = array('B')
+        self.keyframes = {}
+        last_tick_ms = 0
+        pos = 0
+        while pos < len(raw):
+            tag = raw[pos:pos + 1]; pos += 1
+            if tag in (b'H', b'K'):
+                if pos + _LEN.size > len(raw): break
+                (length,) = _LEN.unpack_from(raw, pos); pos += _LEN.size
+                if pos + length > len(raw): break
+                payload = json.loads(raw[pos:pos + length]); pos += length
+                if tag == b'H': self.header = payload
+                else: self.keyframes[payload['tick']] = payload['state']
+            elif tag in (b'T', b'A'):
+                fmt = _DELTA_RUN if tag == b'T' else _ABS_RUN
+                if pos + fmt.size > len(raw): break
+                value, input_bits, length = fmt.unpack_from(raw, pos); pos += fmt.size
+                tick_ms = last_tick_ms + value if tag == b'T' else value
+                for _ in range(length):
+                    self.tick_ms.append(tick_ms); self.input_bits.append(input_bits)
+                last_tick_ms = tick_ms
+            else:
+                break # Unknown or partial record: stop at the last complete one
+
+        if not self.header or 0 not in self.keyframes:
+            raise ValueError(f"{path} has no header or initial keyframe")
+        if self.header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported replay version {self.header.get('version')}")
+        # Keyframes beyond the last complete tick cannot be seeked to meaningfully.
+        self.keyframes = {t: s for t, s in self.keyframes.items() if t <= len(self.tick_ms)}
+
+    @property
+    def total_ticks(self):
+        return len(self.tick_ms)
+
+class ReplayPlayer:
+    """Drives the game's simulate_tick() from a recording, with keyframe seeking and divergence checks."""
+    def __init__(self, reader, game):
+        self.reader = reader
+        self.game = game
+        if reader.header['star_systems'] != game.NUM_STAR_SYSTEMS: # Checked before generating a galaxy of the wrong size
+            raise ValueError(f"Recorded with {reader.header['star_systems']} star systems; "
+                             f"set {game.STAR_SYSTEMS_ENV_VAR}={reader.header['star_systems']} to play it back")
+        self.background = game.Background(seed=reader.header['world_seed'])
+        self.tick = 0
+        self.divergences = []
+        self.seek(0)
+
+    def seek(self, target_tick):
+        """Restores the closest keyframe at or before target_tick, then simulates forward to it."""
+        target_tick = max(0, min(target_tick, self.reader.total_ticks))
+        keyframe_tick = max(t for t in self.reader.keyframes if t <= target_tick)
+        self.game.restore_sim_state(self.reader.keyframes[keyframe_tick], self.background)
+        self.tick = keyframe_tick
+        while self.tick < target_tick: self.step(verify=False)
+
+    def step(self, verify=True):
+        """Runs one recorded tick. Returns False once the recording is exhausted."""
+        if self.tick >= self.reader.total_ticks: return False
+        recorded = self.reader.keyframes.get(self.tick)
+        if verify and recorded is not None and self.tick > 0:
+            live = json.loads(json.dumps(self.game.capture_sim_state()))
+            if live != recorded:
+                self.divergences.append(self.tick)
+                print(f"Replay diverged from the recording at tick {self.tick}")
+        self.game.simulate_tick(self.game.dt_from_tick_ms(self.reader.tick_ms[self.tick]), self.reader.input_bits[self.tick])
+        self.tick += 1
+        return True
+
+def run_headless(player):
+    """Plays the whole recording as fast as possible and prints a summary."""
+    game = player.game
+    start = time.perf_counter()
+    first_tick = player.tick
+    while player.step(): pass
+    elapsed = time.perf_counter() - start
+    ticks = player.tick - first_tick
+    print(f"Replayed {ticks} ticks ({game.game_time:.1f}s of game time) in {elapsed:.2f}s "
+          f"({ticks / elapsed if elapsed > 0 else float('inf'):.0f} ticks/s)")
+    print(f"Final score: {game.score}  Crashes: {game.ship_crash_count}  Garbage left: {len(game.all_garbage_objects)}")
+    print("Recording verified: no divergence." if not player.divergences else
+          f"Diverged at ticks: {player.divergences}")
+    return 0 if not player.divergences else 1
+
+def run_windowed(player):
+    """Plays the recording in the game window. SPACE pauses, LEFT/RIGHT seek, ESC quits."""
+    import pygame
+    game = player.game
+    screen = game.config.init_display()
+    game.init_ui()
+    clock = pygame.time.Clock()
+    paused = False
+    running = True
+    while running:
+        clock.tick(60)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: running = False
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE: running = False
+                elif event.key == pygame.K_SPACE: paused = not paused
+                elif event.key == pygame.K_RIGHT: player.seek(player.tick + SEEK_STEP_TICKS)
+                elif event.key == pygame.K_LEFT: player.seek(player.tick - SEEK_STEP_TICKS)
+        if not paused and not player.step(): paused = True
+
+        screen.fill((0,0,0))
+        view = game.capture_view()
+        game.draw_world(screen, view)
+        game.draw_minimap(screen, view)
+        status = "PAUSED" if paused else "PLAYING"
+        info = f"REPLAY {status}  tick {player.tick}/{player.reader.total_ticks}  score {game.score}"
+        screen.blit(game.debug_font.render(info, True, game.UI_TEXT_COLOR), (20, 20))
+        pygame.display.flip()
+    pygame.quit()
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play back a GreenSpace.io recording (made with main.py --record).")
+    parser.add_argument('file', help="replay file to play")
+    parser.add_argument('--headless', action='store_true', help="no window; simulate at maximum speed and verify keyframes")
+    parser.add_argument('--seek', type=int, default=0, metavar='TICK', help="start playback at this tick")
+    args = parser.parse_args(argv)
+
+    if args.headless:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import main as game # Imported late so the video driver choice above takes effect
+
+    reader = ReplayReader(args.file)
+    print(f"Loaded {args.file}: {reader.total_ticks} ticks, {len(reader.keyframes)} keyframes, "
+          f"world seed {reader.header['world_seed']}")
+    player = ReplayPlayer(reader, game)
+    if args.seek: player.seek(args.seek)
+    return run_headless(player) if args.headless else run_windowed(player)
+
+if __name__ == '__main__':
+    sys.exit(main())
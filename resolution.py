@@ -0,0 +1,65 @@
+# resolution.py
+
+import pygame
+from config import (RENDER_SCALE_LEVELS, RENDER_FRAME_BUDGET_MS, RENDER_SCALE_DOWN_RATIO,
+                    RENDER_SCALE_UP_RATIO, RENDER_SCALE_SETTLE_FRAMES)
+from profiler import PROFILER, PHASE_UPSCALE
+
+FRAME_TIME_SMOOTHING = 0.1 # Weight of the newest frame in the exponential moving average.
+
+class RenderResolution:
+    """
+    Owns the internal render target the world is drawn into and scales it up to the screen.
+    In automatic mode it steps through RENDER_SCALE_LEVELS to keep the frame time within the budget.
+    """
+    def __init__(self, screen, fixed_scale=None, levels=RENDER_SCALE_LEVELS, budget_ms=RENDER_FRAME_BUDGET_MS):
+        if fixed_scale is not None and not 0.0 < fixed_scale <= 1.0:
+            raise ValueError(f"Render scale must be in (0, 1], got {fixed_scale}")
+        self.screen = screen
+        self.levels = levels
+        self.budget_ms = budget_ms
+        self.automatic = fixed_scale is None
+        self.scale = levels[0] if fixed_scale is None else fixed_scale
+        self._level = 0
+        self._surface = None        # Offscreen target, only used while scale < 1.0
+        self._frame_ms = None       # Smoothed CPU time per frame at the current level
+        self._frames_at_level = 0
+
+    def begin_frame(self):
+        """Returns the surface to draw the world into this frame (the screen itself at full scale)."""
+        if self.scale >= 1.0: return self.screen
+        screen_w, screen_h = self.screen.get_size()
+        size = (max(1, int(screen_w * self.scale)), max(1, int(screen_h * self.scale)))
+        if self._surface is None or self._surface.get_size() != size:
+            self._surface = pygame.Surface(size).convert() if pygame.display.get_surface() else pygame.Surface(size)
+        return self._surface
+
+    def present(self):
+        """Scales the world render up to the screen. Anything drawn on the screen afterwards stays native."""
+        if self.scale >= 1.0: return
+        phase_start = PROFILER.start()
+        pygame.transform.scale(self._surface, self.screen.get_size(), self.screen)
+        PROFILER.stop(PHASE_UPSCALE, phase_start)
+
+    def record_frame(self, work_ms):
+        """Feeds one frame's CPU time (excluding the frame-rate wait) to the controller."""
+        if not self.automatic: return
+        if self._frame_ms is None: self._frame_ms = work_ms
+        else: self._frame_ms += (work_ms - self._frame_ms) * FRAME_TIME_SMOOTHING
+        self._frames_at_level += 1
+        if self._frames_at_level < RENDER_SCALE_SETTLE_FRAMES: return
+
+        if self._frame_ms > self.budget_ms * RENDER_SCALE_DOWN_RATIO and self._level < len(self.levels) - 1:
+            self._set_level(self._level + 1)
+        elif self._level > 0:
+            # Assume the whole frame cost grows with pixel count; pessimistic, which keeps the levels from oscillating.
+            predicted_ms = self._frame_ms * (self.levels[self._level - 1] / self.levels[self._level]) ** 2
+            if predicted_ms < self.budget_ms * RENDER_SCALE_UP_RATIO: self._set_level(self._level - 1)
+
+    def _set_level(self, level):
+        print(f"Render scale {self.levels[self._level]:.2f} -> {self.levels[level]:.2f} "
+              f"(frame {self._frame_ms:.1f} ms, budget {self.budget_ms:.1f} ms)")
+        self._level = level
+        self.scale = self.levels[level]
+        self._frames_at_level = 0
+        self._frame_ms = None # Judge the new level only on frames rendered at it
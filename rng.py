@@ -0,0 +1,30 @@
+# rng.py
+
+import random
+
+# Independent random streams. Keeping them apart means the simulation replays identically
+# whether or not (and how often) the world is drawn.
+sim = random.Random()      # Gameplay decisions: autopilot thrust rolls, wander headings, spawn points.
+effects = random.Random()  # One draw per particle burst, seeding that burst's own generator.
+render = random.Random()   # Per-frame cosmetic flicker (e.g. star glow). Never affects the simulation.
+
+_STREAMS = {'sim': sim, 'effects': effects, 'render': render}
+
+def seed_all(seed):
+    """Seeds every stream from a single (recorded) seed. String seeds hash deterministically."""
+    for name, stream in _STREAMS.items():
+        stream.seed(f"{seed}:{name}")
+
+def get_state():
+    """Returns a JSON-serialisable snapshot of the gameplay-relevant streams."""
+    return {name: [s[0], list(s[1]), s[2]] for name, s in
+            (('sim', sim.getstate()), ('effects', effects.getstate()))}
+
+def set_state(state):
+    """Restores streams from a snapshot produced by get_state()."""
+    for name, (version, internal, gauss_next) in state.items():
+        _STREAMS[name].setstate((version, tuple(internal), gauss_next))
+
+def new_seed():
+    """Draws a fresh 32-bit seed from system entropy (independent of the streams above)."""
+    return random.SystemRandom().randrange(2**32)
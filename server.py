@@ -0,0 +1,391 @@
+# server.py
+
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import statistics
+
+# The server never opens a window; sprites are still loaded for collider sizes.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import rng
+from config import SHIP_MAGNET_RANGE, DESIRED_SIZE, NUM_STAR_SYSTEMS, STAR_SYSTEMS_ENV_VAR
+from galaxy import Background
+from spaceship import SpaceShip
+from autopilot import FleetAutopilot, ObstacleIndex, GarbageIndex
+from clumping import GarbageCollisions
+from simulation import (INPUT_ROTATE_LEFT, INPUT_ROTATE_RIGHT, INPUT_THRUST, apply_manual_controls,
+                        steer_towards_heading, collect_garbage, check_ship_crash, get_safe_spawn_position)
+
+# Protocol: one JSON object per line in each direction.
+#   client -> server  {"type": "hello", "name": str, "view": [w, h]}
+#                     {"type": "input", "seq": int, "bits": int, "t": client_clock}
+#                     {"type": "stats"}
+#   server -> client  {"type": "welcome", "id": str, "seed": int, "star_systems": int, "tick_rate": int, "tick": int,
+#                      "planet_angles": [a, ...]}
+#                     {"type": "snapshot", "tick": int, "ack": seq, "echo": t,
+#                      "ships": {id: state}, "garbage": {id: state}, "gone_ships": [id], "gone_garbage": [id]}
+#                     {"type": "stats", ...}
+# Snapshots are deltas against what was last sent to that client (TCP delivers them in order), and only
+# cover entities inside the client's view. Planets are not sent: the client builds the same Background from
+# the seed and advances the welcome's orbit angles by orbit_speed per tick. The galaxy also depends on the number of
+# star systems (config.STAR_SYSTEMS_ENV_VAR), so a client whose count differs from star_systems must refuse to join.
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 7350
+SERVER_TICK_RATE = 60           # Simulation ticks per second (ship physics is tuned per tick at 60).
+SERVER_SNAPSHOT_INTERVAL = 3    # Ticks between snapshots (20 Hz).
+SERVER_DEFAULT_VIEW = (1920, 1080)
+SERVER_MAX_VIEW = (3840, 2160)
+SERVER_VIEW_MARGIN = 200        # Entities this far outside the view are sent too, so they do not pop in.
+SERVER_RESPAWN_TICKS = 180      # Ticks a destroyed ship waits before respawning.
+SERVER_MAX_SEND_BUFFER = 256 * 1024 # Snapshots are skipped for clients with more unsent data than this.
+INTEREST_CELL_SIZE = 1000       # Interest-management grid cell size in world px.
+STATS_WINDOW_TICKS = 600        # Tick durations kept for the stats report.
+MANUAL_INPUT_MASK = INPUT_ROTATE_LEFT | INPUT_ROTATE_RIGHT | INPUT_THRUST # Inputs clients may send
+
+class ServerShip(SpaceShip):
+    """A SpaceShip without particle effects; clients draw those from the thrusting/alive flags."""
+    def _emit_particles(self):
+        pass
+
+    def explode(self):
+        self.alive = False
+        self.is_thrusting = False
+
+class InterestGrid:
+    """Uniform grid of entity ids by world cell, queried with view rectangles."""
+    def __init__(self, cell_size=INTEREST_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def rebuild(self, entries):
+        """entries: iterable of (id, x, y)."""
+        cells = {}
+        cs = self.cell_size
+        for key, x, y in entries:
+            cells.setdefault((int(x // cs), int(y // cs)), []).append(key)
+        self.cells = cells
+
+    def query(self, min_x, min_y, max_x, max_y):
+        """Ids in every cell overlapping the rectangle (callers filter exact bounds)."""
+        cs = self.cell_size
+        found = []
+        for cy in range(int(min_y // cs), int(max_y // cs) + 1):
+            for cx in range(int(min_x // cs), int(max_x // cs) + 1):
+                cell = self.cells.get((cx, cy))
+                if cell: found.extend(cell)
+        return found
+
+class Player:
+    """One pilot: its ship, latest input and what its client currently knows. Bots have no writer."""
+    def __init__(self, player_id, name, writer, view, bot_index=None):
+        self.id = player_id
+        self.name = name
+        self.writer = writer
+        self.view = view
+        self.bot_index = bot_index  # Slot in the server's FleetAutopilot for cleaner bots
+        self.ship = None
+        self.input_bits = 0
+        self.last_input_seq = 0
+        self.last_input_time = None # Client clock of the latest input, echoed for latency measurement
+        self.score = 0
+        self.respawn_in = 0
+        self.known_ships = {}   # id -> state last sent
+        self.known_garbage = {}
+        self.bytes_sent = 0
+        self.connected_at = time.perf_counter() # Bandwidth is per second of this player's own connection
+
+class GameServer:
+    """Owns one Background, all players' ships and any cleaner bots, and steps them at a fixed tick rate."""
+    def __init__(self, seed=None, tick_rate=SERVER_TICK_RATE, snapshot_interval=SERVER_SNAPSHOT_INTERVAL, bots=0):
+        self.seed = seed if seed is not None else rng.new_seed()
+        rng.seed_all(self.seed)
+        self.background = Background(seed=self.seed)
+        self.tick_rate = tick_rate
+        self.snapshot_interval = snapshot_interval
+        self.tick = 0
+        self.players = {}
+        self._next_player_id = 1
+        # Stable garbage ids for the protocol.
+        self.garbage_ids = {G_item: i for i, G_item in enumerate(self.background.all_garbage_items)}
+        self.garbage_grid = InterestGrid()
+        self.ship_grid = InterestGrid()
+        self._pulled_garbage = set()
+        self._nearby = {} # player id -> garbage within magnet reach this tick
+        self.tick_durations = []
+        self.snapshot_durations = []
+        self.bots = []
+        self.fleet = FleetAutopilot(bots)
+        self.obstacle_index = ObstacleIndex()
+        self.fleet_garbage_index = GarbageIndex()
+        self.garbage_collisions = GarbageCollisions()
+        for i in range(bots): self._add_bot(i)
+        self._rebuild_grids()
+
+    # --- Players ---
+
+    def add_player(self, name, writer, view):
+        player_id = str(self._next_player_id); self._next_player_id += 1
+        player = Player(player_id, name, writer, view)
+        self._spawn(player)
+        self.players[player_id] = player
+        print(f"Player {player_id} ({name}) joined; {len(self.players) - len(self.bots)} connected")
+        return player
+
+    def _add_bot(self, index):
+        bot = Player(f"bot{index + 1}", f"cleaner {index + 1}", None, None, bot_index=index)
+        self._spawn(bot)
+        self.players[bot.id] = bot
+        self.bots.append(bot)
+
+    def remove_player(self, player):
+        if self.players.pop(player.id, None):
+            print(f"Player {player.id} ({player.name}) left; {len(self.players) - len(self.bots)} connected")
+
+    def _spawn(self, player):
+        x, y = get_safe_spawn_position(self.background, max(DESIRED_SIZE) / 2.0)
+        player.ship = ServerShip(x, y)
+        if player.bot_index is not None: self.fleet.reset_ship(player.bot_index)
+
+    # --- Simulation ---
+
+    def step(self):
+        """Advances the world by one tick and sends snapshots when due."""
+        tick_start = time.perf_counter()
+        dt = 1.0 / self.tick_rate
+        bg = self.background
+        # Each ship's crash check looks at the bodies near it, as they are at the start of the tick and after it
+        nearby_bodies = {}
+        for player in self.players.values():
+            if not player.ship.alive: continue
+            suns, planets = bg.celestial.bodies_near(player.ship.x, player.ship.y)
+            nearby_bodies[player.id] = (suns, planets, [p['current_orbit_angle'] for p in planets])
+        bg.update(dt)
+        bot_headings, bot_thrust = self._decide_bots(dt)
+
+        ship_starts = {}
+        for player in self.players.values():
+            ship = player.ship
+            if not ship.alive:
+                player.respawn_in -= 1
+                if player.respawn_in <= 0: self._spawn(player)
+                continue
+            ship_starts[player.id] = (ship.x, ship.y)
+            if player.bot_index is None: apply_manual_controls(ship, player.input_bits)
+            else: steer_towards_heading(ship, bot_headings[player.bot_index], bot_thrust[player.bot_index])
+            ship.update()
+
+        self._update_garbage(dt)
+
+        collected = set()
+        for player_id, ship_start in ship_starts.items():
+            player = self.players[player_id]
+            ship = player.ship
+            # Only garbage in magnet range can reach the ship this tick; reuse the lookup made for the magnet.
+            candidates = [G_item for G_item in self._nearby.get(player_id, ()) if G_item not in collected]
+            remaining = list(candidates)
+            gained = collect_garbage(ship, remaining, ship_start)
+            if gained:
+                player.score += gained
+                collected.update(set(candidates) - set(remaining))
+            suns, planets, planet_start_angles = nearby_bodies[player_id]
+            check_ship_crash(ship, suns, planets, ship_start, planet_start_angles)
+            if not ship.alive: player.respawn_in = SERVER_RESPAWN_TICKS
+        if collected:
+            bg.all_garbage_items = [G_item for G_item in bg.all_garbage_items if G_item not in collected]
+            for G_item in collected: self._garbage_by_id.pop(self.garbage_ids.pop(G_item), None)
+            self._pulled_garbage -= collected
+
+        self.tick += 1
+        self._record(self.tick_durations, time.perf_counter() - tick_start)
+        if self.tick % self.snapshot_interval == 0:
+            snapshot_start = time.perf_counter()
+            self._rebuild_grids()
+            for player in list(self.players.values()):
+                if player.writer: self._send_snapshot(player)
+            self._record(self.snapshot_durations, time.perf_counter() - snapshot_start)
+
+    def _decide_bots(self, dt):
+        """All bots' autopilot decisions for this tick in one batched pass."""
+        if not self.bots: return None, None
+        ships = [bot.ship for bot in self.bots]
+        celestial = self.background.celestial
+        systems = [self.background.systems[k] for k in sorted({k for s in ships for k in celestial.systems_near(s.x, s.y)})]
+        self.obstacle_index.update([system['sun'] for system in systems], [p for system in systems for p in system['planets']])
+        self.fleet_garbage_index.rebuild(self.background.all_garbage_items)
+        return self.fleet.decide(np.array([s.x for s in ships]), np.array([s.y for s in ships]),
+                                 np.array([s.current_angle for s in ships], dtype=float), self.obstacle_index,
+                                 self.fleet_garbage_index, dt, np.array([s.alive for s in ships]))
+
+    def _update_garbage(self, dt):
+        """Magnet pull: each piece in range of any ship moves towards the nearest one."""
+        for G_item in self._pulled_garbage: # Pieces pulled last tick but maybe not this one
+            G_item.prev_x, G_item.prev_y = G_item.world_x, G_item.world_y
+        nearest = {}
+        self._nearby = {}
+        range_sq = SHIP_MAGNET_RANGE ** 2
+        for player in self.players.values():
+            ship = player.ship
+            if not ship.alive: continue
+            self._nearby[player.id] = nearby = self._garbage_near(ship.x, ship.y, SHIP_MAGNET_RANGE)
+            for G_item in nearby:
+                d_sq = (G_item.world_x - ship.x) ** 2 + (G_item.world_y - ship.y) ** 2
+                if d_sq < range_sq and (G_item not in nearest or d_sq < nearest[G_item][0]):
+                    nearest[G_item] = (d_sq, ship)
+        for G_item, (_, ship) in nearest.items(): G_item.update(ship.x, ship.y, dt)
+        self.garbage_collisions.resolve(list(nearest))
+        self._pulled_garbage = set(nearest)
+
+    def _garbage_near(self, x, y, radius):
+        # The grid is rebuilt per snapshot; pulled garbage can drift up to a cell since, hence the extra margin.
+        reach = radius + INTEREST_CELL_SIZE
+        ids = self.garbage_grid.query(x - reach, y - reach, x + reach, y + reach)
+        return [self._garbage_by_id[i] for i in ids if i in self._garbage_by_id]
+
+    def _rebuild_grids(self):
+        self._garbage_by_id = {i: G_item for G_item, i in self.garbage_ids.items()}
+        self.garbage_grid.rebuild((i, G_item.world_x, G_item.world_y) for G_item, i in self.garbage_ids.items())
+        self.ship_grid.rebuild((p.id, p.ship.x, p.ship.y) for p in self.players.values())
+
+    # --- Snapshots ---
+
+    def _send_snapshot(self, player):
+        transport = player.writer.transport
+        if transport.is_closing(): return
+        if transport.get_write_buffer_size() > SERVER_MAX_SEND_BUFFER: return # Slow client: skip, keep its known state
+
+        ship = player.ship
+        half_w = player.view[0] / 2 + SERVER_VIEW_MARGIN; half_h = player.view[1] / 2 + SERVER_VIEW_MARGIN
+        min_x, max_x, min_y, max_y = ship.x - half_w, ship.x + half_w, ship.y - half_h, ship.y + half_h
+
+        ships = {}
+        for other_id in self.ship_grid.query(min_x, min_y, max_x, max_y):
+            other = self.players.get(other_id)
+            if other is None: continue
+            s = other.ship
+            if min_x <= s.x <= max_x and min_y <= s.y <= max_y:
+                ships[other_id] = [round(s.x, 1), round(s.y, 1), round(s.current_angle, 1),
+                                   int(s.alive), int(s.is_thrusting), other.score]
+        garbage = {}
+        for gid in self.garbage_grid.query(min_x, min_y, max_x, max_y):
+            G_item = self._garbage_by_id[gid]
+            if min_x <= G_item.world_x <= max_x and min_y <= G_item.world_y <= max_y:
+                garbage[gid] = [round(G_item.world_x), round(G_item.world_y), G_item.size]
+
+        message = {"type": "snapshot", "tick": self.tick, "ack": player.last_input_seq, "echo": player.last_input_time,
+                   "ships": {k: v for k, v in ships.items() if player.known_ships.get(k) != v},
+                   "garbage": {k: v for k, v in garbage.items() if player.known_garbage.get(k) != v},
+                   "gone_ships": [k for k in player.known_ships if k not in ships],
+                   "gone_garbage": [k for k in player.known_garbage if k not in garbage]}
+        player.known_ships = ships; player.known_garbage = garbage
+        self._send(player, message)
+
+    def _send(self, player, message):
+        data = json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n'
+        player.writer.write(data)
+        player.bytes_sent += len(data)
+
+    # --- Stats ---
+
+    def _record(self, samples, seconds):
+        samples.append(seconds * 1000.0)
+        if len(samples) > STATS_WINDOW_TICKS: del samples[:len(samples) - STATS_WINDOW_TICKS]
+
+    def stats(self):
+        """Tick and snapshot timings (ms) over the recent window, plus per-client bandwidth."""
+        def summary(samples):
+            if not samples: return {}
+            ordered = sorted(samples)
+            return {"median_ms": statistics.median(ordered), "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+                    "max_ms": ordered[-1]}
+        now = time.perf_counter()
+        rates = [p.bytes_sent / max(now - p.connected_at, 1e-3) for p in self.players.values() if p.writer]
+        return {"type": "stats", "tick": self.tick, "players": len(rates), "bots": len(self.bots), "garbage": len(self.garbage_ids),
+                "tick_ms": summary(self.tick_durations), "snapshot_ms": summary(self.snapshot_durations),
+                "bytes_per_client_per_s": (sum(rates) / len(rates)) if rates else 0.0}
+
+def client_view(view):
+    """The (width, height) a hello asks for, capped at SERVER_MAX_VIEW; SERVER_DEFAULT_VIEW if missing or malformed."""
+    if not (isinstance(view, (list, tuple)) and len(view) == 2 and
+            all(isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v) and v > 0 for v in view)):
+        return SERVER_DEFAULT_VIEW
+    return (min(int(view[0]), SERVER_MAX_VIEW[0]), min(int(view[1]), SERVER_MAX_VIEW[1]))
+
+async def handle_client(server, reader, writer):
+    player = None
+    try:
+        while True:
+            line = await reader.readline()
+            if not line: break
+            try: message = json.loads(line)
+            except ValueError: continue
+            if not isinstance(message, dict): continue
+            kind = message.get('type')
+            if kind == 'hello' and player is None:
+                player = server.add_player(str(message.get('name', 'pilot'))[:32], writer, client_view(message.get('view')))
+                server.background.celestial.sync_all()
+                server._send(player, {"type": "welcome", "id": player.id, "seed": server.seed, "star_systems": NUM_STAR_SYSTEMS,
+                                      "tick_rate": server.tick_rate,
+                                      "tick": server.tick, "planet_angles": [p['current_orbit_angle'] for p in
+                                                                             server.background.solar_system_planets]})
+            elif kind == 'input' and player is not None:
+                bits = message.get('bits', 0)
+                player.input_bits = (bits if isinstance(bits, int) else 0) & MANUAL_INPUT_MASK
+                player.last_input_seq = message.get('seq', 0)
+                player.last_input_time = message.get('t')
+            elif kind == 'stats':
+                writer.write(json.dumps(server.stats()).encode('utf-8') + b'\n')
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        if player: server.remove_player(player)
+        writer.close()
+
+async def run_tick_loop(server, stats_interval=None):
+    """Steps the server at its tick rate; falls behind gracefully by dropping ticks it cannot catch up on."""
+    period = 1.0 / server.tick_rate
+    next_tick = time.perf_counter()
+    last_report = next_tick
+    while True:
+        server.step()
+        next_tick += period
+        now = time.perf_counter()
+        if now - next_tick > period * 5: next_tick = now # Too far behind: resynchronise instead of bursting
+        if stats_interval and now - last_report >= stats_interval:
+            last_report = now
+            s = server.stats()
+            print(f"tick {s['tick']}: {s['players']} players, tick {s['tick_ms'].get('median_ms', 0):.2f} ms median "
+                  f"/ {s['tick_ms'].get('p99_ms', 0):.2f} ms p99, {s['bytes_per_client_per_s'] / 1024:.1f} KiB/s per client")
+        await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+
+async def serve(host=SERVER_HOST, port=SERVER_PORT, seed=None, stats_interval=None, bots=0):
+    server = GameServer(seed=seed, bots=bots)
+    tcp_server = await asyncio.start_server(lambda r, w: handle_client(server, r, w), host, port)
+    print(f"GreenSpace.io server on {host}:{port}, world seed {server.seed}, {STAR_SYSTEMS_ENV_VAR}={NUM_STAR_SYSTEMS}, "
+          f"{len(server.garbage_ids)} garbage, {len(server.bots)} bots, {server.tick_rate} Hz", flush=True)
+    async with tcp_server:
+        await run_tick_loop(server, stats_interval)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Authoritative GreenSpace.io multiplayer server.")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--seed', type=int, help="world seed (default: random)")
+    parser.add_argument('--bots', type=int, default=0, help="autopiloted cleaner ships sharing the world")
+    parser.add_argument('--stats-interval', type=float, default=10.0, metavar='SECONDS',
+                        help="print tick timing and bandwidth this often (0 disables)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.seed, args.stats_interval or None, args.bots))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# simthread.py
+
+import threading
+from collections import deque
+import pygame
+
+class InputHandoff:
+    """
+    Input passed from the render (main) thread to the simulation thread without locks. The render thread
+    stores the keys held this frame with publish(), a single reference store, and queues requests (callables
+    that change the game's state, e.g. a key press on a menu) with post(); the simulation thread takes both
+    once per tick. deque appends and pops are atomic, so neither side ever waits for the other.
+    """
+    def __init__(self):
+        self.held_bits = 0
+        self._requests = deque()
+
+    def publish(self, held_bits):
+        self.held_bits = held_bits
+
+    def post(self, request):
+        self._requests.append(request)
+
+    def take(self):
+        """(held input bits, requests posted since the last take, oldest first)."""
+        requests = []
+        while self._requests: requests.append(self._requests.popleft())
+        return self.held_bits, requests
+
+class SimulationThread:
+    """
+    Steps the game on a worker thread at tick_rate while the main thread draws. Each loop runs the posted
+    requests, then step(tick_ms, held_bits), then publishes capture() as self.snapshot. capture() must return
+    copies, never objects the next tick changes: the snapshot being drawn and the one being built are then
+    always different objects (double buffering by replacement), and replacing the reference is atomic, so
+    the render thread reads a whole tick's state without locking. The tick is mostly Python code holding the
+    GIL, so the threads mostly take turns; only the render thread's blits and flips may run beside it. If step
+    raises, the thread stops and keeps the exception in self.error.
+    """
+    def __init__(self, step, capture, tick_rate=60):
+        self.handoff = InputHandoff()
+        self.snapshot = capture()
+        self.tick_count = 0
+        self.error = None
+        self._step, self._capture, self._tick_rate = step, capture, tick_rate
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Returns once the tick in progress has finished; the caller then owns the game's state again."""
+        self._running = False
+        if self._thread: self._thread.join(); self._thread = None
+
+    def _run(self):
+        clock = pygame.time.Clock()
+        try:
+            while self._running:
+                tick_ms = clock.tick(self._tick_rate)
+                held_bits, requests = self.handoff.take()
+                for request in requests: request()
+                self._step(tick_ms, held_bits)
+                self.snapshot = self._capture()
+                self.tick_count += 1
+        except Exception as e:
+            self.error = e
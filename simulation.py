@@ -0,0 +1,160 @@
+# simulation.py
+
+import math
+import rng
+from config import (ROTATION_SPEED, THRUST_MAGNITUDE, WORLD_RADIUS, WORLD_CENTER_X, WORLD_CENTER_Y,
+                    SUN_RADIUS, SYSTEM_RADIUS)
+from collision import (segment_circle_entry, segment_circle_exit, swept_circle_vs_orbit, swept_rects,
+                       ORBIT_SWEEP_TOLERANCE)
+
+# Per-tick input flags. A tick's input is the OR of these; the replay recorder stores exactly this value.
+INPUT_ROTATE_LEFT = 1   # Manual rotation counter-clockwise (LEFT key).
+INPUT_ROTATE_RIGHT = 2  # Manual rotation clockwise (RIGHT key).
+INPUT_THRUST = 4        # Manual thrust (UP key).
+INPUT_AUTOPILOT = 8     # Autopilot is switched on for this tick.
+INPUT_PAUSED = 16       # Game is paused for this tick.
+INPUT_RESPAWN = 32      # Player asked to respawn before this tick.
+
+MAX_SHIP_VELOCITY = 8.0 # Per-axis velocity cap enforced when thrusting.
+SHIP_DRAG = 0.99        # Fraction of its velocity the ship keeps each tick (applied in SpaceShip.update).
+
+def angle_to_target(current_x, current_y, target_x, target_y):
+    """Calculates the angle in degrees from current to target point.
+    Matches the spaceship's angle convention (0 East, 90 North/Up).
+    """
+    delta_x = target_x - current_x
+    delta_y = target_y - current_y
+    # -delta_y because ship's "up" (angle 90) corresponds to decreasing world Y coordinate
+    angle_rad = math.atan2(-delta_y, delta_x)
+    return (math.degrees(angle_rad) + 360) % 360
+
+def normalize_angle_degrees_180(angle):
+    """Normalizes an angle to the range [-180, 180] degrees."""
+    angle = (angle + 180) % 360 - 180
+    return angle
+
+def apply_thrust(ship):
+    """Sets this tick's thrust acceleration along the ship's heading, respecting the velocity cap."""
+    thrust_rad = math.radians(ship.current_angle)
+    ship.vx_1 = THRUST_MAGNITUDE * math.cos(thrust_rad); ship.vy_1 = THRUST_MAGNITUDE * math.sin(thrust_rad)
+    max_v = MAX_SHIP_VELOCITY
+    if ship.vx_0 + ship.vx_1 > max_v: ship.vx_1 = max(0, max_v - ship.vx_0)
+    if ship.vx_0 + ship.vx_1 < -max_v: ship.vx_1 = min(0, -max_v - ship.vx_0)
+    if ship.vy_0 + ship.vy_1 > max_v: ship.vy_1 = max(0, max_v - ship.vy_0)
+    if ship.vy_0 + ship.vy_1 < -max_v: ship.vy_1 = min(0, -max_v - ship.vy_0)
+
+def apply_manual_controls(ship, input_bits):
+    """Applies keyboard-style rotation and thrust flags to the ship."""
+    ship.is_thrusting = False
+    if input_bits & INPUT_ROTATE_LEFT: ship.current_angle = (ship.current_angle + ROTATION_SPEED) % 360
+    if input_bits & INPUT_ROTATE_RIGHT: ship.current_angle = (ship.current_angle - ROTATION_SPEED + 360) % 360
+    ship.vx_1, ship.vy_1 = 0.0, 0.0
+    if input_bits & INPUT_THRUST:
+        ship.is_thrusting = True
+        apply_thrust(ship)
+
+def steer_towards_heading(ship, desired_heading, should_thrust):
+    """Turns the ship towards desired_heading at ROTATION_SPEED and thrusts if requested (autopilot)."""
+    angle_difference = normalize_angle_degrees_180(desired_heading - ship.current_angle)
+    if abs(angle_difference) > 1.0: # Rotation deadzone
+        if angle_difference > 0: ship.current_angle = (ship.current_angle + ROTATION_SPEED) % 360
+        else: ship.current_angle = (ship.current_angle - ROTATION_SPEED + 360) % 360
+    else: ship.current_angle = desired_heading # Snap if very close
+
+    ship.is_thrusting = should_thrust
+    if ship.is_thrusting: apply_thrust(ship)
+    else: ship.vx_1, ship.vy_1 = 0.0, 0.0
+
+def find_collected_garbage(ship, garbage_list, ship_start=None, candidates=None):
+    """
+    Indices (ascending) of the garbage in garbage_list whose collider touched the ship's collider at any point
+    during the tick. ship_start is the ship's position at the start of the tick; garbage moves from
+    (prev_x, prev_y). Only the indices in candidates are tested, if given.
+    """
+    ship_collider = ship.get_collider_world(); collected_indices = []
+    start_collider = ship.get_collider_world(*ship_start) if ship_start else ship_collider
+    ship_path = start_collider.union(ship_collider) # Broadphase: everything the ship covered this tick
+    for i in range(len(garbage_list)) if candidates is None else candidates:
+        G_item = garbage_list[i]
+        garbage_collider = G_item.get_collider()
+        if ship_collider.colliderect(garbage_collider):
+            collected_indices.append(i)
+        elif G_item.prev_x == G_item.world_x and G_item.prev_y == G_item.world_y: # Garbage did not move
+            if ship_path.colliderect(garbage_collider) and \
+               swept_rects(start_collider, ship_collider, garbage_collider, garbage_collider) is not None:
+                collected_indices.append(i)
+        else: # Pulled by the magnet: sweep both motions
+            garbage_start = G_item.get_collider(G_item.prev_x, G_item.prev_y)
+            if ship_path.colliderect(garbage_start.union(garbage_collider)) and \
+               swept_rects(start_collider, ship_collider, garbage_start, garbage_collider) is not None:
+                collected_indices.append(i)
+    return collected_indices
+
+def collect_garbage(ship, garbage_list, ship_start=None, pool=None):
+    """
+    Removes garbage that touched the ship during the tick (see find_collected_garbage) from garbage_list.
+    Collected items go back to pool (a GarbagePool) if one is given. Returns how many were collected.
+    """
+    collected_indices = find_collected_garbage(ship, garbage_list, ship_start)
+    for i in reversed(collected_indices):
+        G_item = garbage_list.pop(i)
+        if pool is not None: pool.release(G_item)
+    return len(collected_indices)
+
+def check_ship_crash(ship, suns, planets_list, ship_start=None, planet_start_angles=None, frame=None):
+    """
+    Explodes the ship if it touched a sun, a planet, or the world boundary during the tick.
+    suns and planets_list are the bodies of the star systems near the ship (CelestialIndex.bodies_near).
+    ship_start is the ship's position at the start of the tick and planet_start_angles the planets'
+    orbit angles then; the ship is moved back to the point of first contact before exploding.
+    frame is the tick's WorldFrame, if any, whose distances from the ship's end position are reused.
+    """
+    if not ship.alive: return
+    sr = ship.get_collider_world().width / 2.2
+    start_x, start_y = ship_start if ship_start else (ship.x, ship.y)
+    hits = [segment_circle_entry(start_x, start_y, ship.x, ship.y, sun['world_pos'][0], sun['world_pos'][1], sun['radius'] + sr)
+            for sun in suns]
+    # Broadphase: every point of the ship's path is within path_half of its midpoint, so only orbits whose
+    # ring passes that close to the midpoint's distance from their center can be reached this tick.
+    path_half = math.hypot(ship.x - start_x, ship.y - start_y) / 2 + sr
+    mid_x, mid_y = (start_x + ship.x) / 2, (start_y + ship.y) / 2
+    for i, p in enumerate(planets_list):
+        center = p['orbit_center']
+        mid_dist = math.hypot(mid_x - center[0], mid_y - center[1])
+        if abs(p['orbit_radius'] - mid_dist) > path_half + p['radius'] + ORBIT_SWEEP_TOLERANCE: continue
+        angle_end = p['current_orbit_angle']
+        angle_start = planet_start_angles[i] if planet_start_angles else angle_end
+        # A contact this tick leaves the ship and planet apart by at most their radii plus how far each moved.
+        if frame is not None and frame.body_dist[len(suns) + i] > 2 * path_half + p['radius'] + ORBIT_SWEEP_TOLERANCE + 1.0 + \
+           p['orbit_radius'] * abs(angle_end - angle_start): continue
+        hits.append(swept_circle_vs_orbit((start_x, start_y), (ship.x, ship.y), sr, center,
+                                          p['orbit_radius'], angle_start, angle_end, p['radius']))
+    # The playable area is convex, so the ship can only have left it if it ends the tick outside.
+    center_dist = frame.center_dist if frame is not None else math.hypot(ship.x - WORLD_CENTER_X, ship.y - WORLD_CENTER_Y)
+    if center_dist > WORLD_RADIUS - sr:
+        hits.append(segment_circle_exit(start_x, start_y, ship.x, ship.y, WORLD_CENTER_X, WORLD_CENTER_Y, WORLD_RADIUS - sr) or 0.0)
+    hits = [t for t in hits if t is not None]
+    if hits:
+        t = min(hits)
+        ship.x, ship.y = start_x + (ship.x - start_x) * t, start_y + (ship.y - start_y) * t
+        ship.explode()
+
+def get_safe_spawn_position(bg_obj, ship_radius_approx):
+    """
+    Picks a spawn point (from the sim stream) in the home star system, between 30% and 70% of its radius
+    from the sun and clear of the sun and planets.
+    """
+    max_attempts = 100
+    for _ in range(max_attempts):
+        angle = rng.sim.uniform(0, 2 * math.pi)
+        dist = rng.sim.uniform(SYSTEM_RADIUS*0.3, SYSTEM_RADIUS*0.7) # Spawn between 30% and 70% of the system radius
+        spawn_x = WORLD_CENTER_X + dist * math.cos(angle)
+        spawn_y = WORLD_CENTER_Y + dist * math.sin(angle)
+        safe = True
+        for body in bg_obj.celestial.bodies_at(spawn_x, spawn_y):
+            b_x, b_y, b_r = body['world_pos'][0], body['world_pos'][1], body['radius']
+            if (spawn_x - b_x)**2 + (spawn_y - b_y)**2 < (b_r + ship_radius_approx + 200)**2: # Min distance from bodies
+                safe = False; break
+        if safe: return float(spawn_x), float(spawn_y)
+    print("Warning: Fallback spawn position used.")
+    return float(WORLD_CENTER_X + rng.sim.uniform(SUN_RADIUS+300, SUN_RADIUS+500)), float(WORLD_CENTER_Y + rng.sim.uniform(SUN_RADIUS+300, SUN_RADIUS+500))
@@ -3,26 +3,64 @@
 import pygame
 import math
 import random
+import rng
+from profiler import PROFILER, PHASE_PARTICLE_SUBMIT, PHASE_SHIP_SUBMIT
+from quality import GOVERNOR
+from renderqueue import RENDER_QUEUE, LAYER_PARTICLES, LAYER_SHIP
+from simulation import SHIP_DRAG
 
-from config import (SCREEN_WIDTH, SCREEN_HEIGHT, DESIRED_SIZE,
+from config import (DESIRED_SIZE,
                     SHIP_COLLISION_PARTICLE_COUNT, SHIP_COLLISION_PARTICLE_LIFESPAN_RANGE,
                     SHIP_COLLISION_PARTICLE_SPEED_RANGE, SHIP_COLLISION_PARTICLE_COLORS,
                     SHIP_COLLISION_PARTICLE_SIZE_RANGE)
 
-# Attempt to load and scale the spaceship sprite.
-# If loading fails, a fallback polygonal shape is created.
-try:
-    ORIGINAL_LOADED_IMAGE = pygame.image.load("spaceshipSprite.png").convert_alpha()
-    SCALED_SPACESHIP_IMAGE = pygame.transform.scale(ORIGINAL_LOADED_IMAGE, DESIRED_SIZE)
-except pygame.error as e:
-    print(f"Error loading or scaling spaceshipSprite.png: {e}")
-    SCALED_SPACESHIP_IMAGE = pygame.Surface(DESIRED_SIZE, pygame.SRCALPHA)
-    SCALED_SPACESHIP_IMAGE.fill((0,0,0,0)) # Fallback uses transparent background.
-    # Draw a simple triangle as the fallback sprite.
-    pygame.draw.polygon(SCALED_SPACESHIP_IMAGE, (255, 255, 255),
-                        [(DESIRED_SIZE[0] // 2, 10), # Top point.
-                         (10, DESIRED_SIZE[1] - 10), # Bottom-left point.
-                         (DESIRED_SIZE[0] - 10, DESIRED_SIZE[1] - 10)]) # Bottom-right point.
+_scaled_spaceship_image = None # Loaded on first use so that importing this module never touches the display.
+
+def get_spaceship_image():
+    """
+    Loads and scales the spaceship sprite once.
+    If loading fails, a fallback polygonal shape is created.
+    """
+    global _scaled_spaceship_image
+    if _scaled_spaceship_image is None:
+        try:
+            loaded_image = pygame.image.load("spaceshipSprite.png")
+            if pygame.display.get_surface() is not None: loaded_image = loaded_image.convert_alpha()
+            _scaled_spaceship_image = pygame.transform.scale(loaded_image, DESIRED_SIZE)
+        except pygame.error as e:
+            print(f"Error loading or scaling spaceshipSprite.png: {e}")
+            _scaled_spaceship_image = pygame.Surface(DESIRED_SIZE, pygame.SRCALPHA)
+            _scaled_spaceship_image.fill((0,0,0,0)) # Fallback uses transparent background.
+            # Draw a simple triangle as the fallback sprite.
+            pygame.draw.polygon(_scaled_spaceship_image, (255, 255, 255),
+                                [(DESIRED_SIZE[0] // 2, 10), # Top point.
+                                 (10, DESIRED_SIZE[1] - 10), # Bottom-left point.
+                                 (DESIRED_SIZE[0] - 10, DESIRED_SIZE[1] - 10)]) # Bottom-right point.
+    return _scaled_spaceship_image
+
+_render_scaled_images = {} # render scale -> spaceship sprite resized for it
+
+def get_spaceship_image_for_scale(scale):
+    """Returns the spaceship sprite resized for a render scale below 1.0 (cached per scale)."""
+    if scale == 1.0: return get_spaceship_image()
+    image = _render_scaled_images.get(scale)
+    if image is None:
+        size = (max(1, int(DESIRED_SIZE[0] * scale)), max(1, int(DESIRED_SIZE[1] * scale)))
+        image = pygame.transform.smoothscale(get_spaceship_image(), size)
+        _render_scaled_images[scale] = image
+    return image
+
+_particle_images = {} # (color, size) -> solid square; particles only come in a few colors and sizes
+
+def get_particle_image(color, size):
+    """Returns a size x size square of color, creating it on first use."""
+    image = _particle_images.get((color, size))
+    if image is None:
+        image = pygame.Surface((size, size))
+        if pygame.display.get_surface() is not None: image = image.convert()
+        image.fill(color)
+        _particle_images[(color, size)] = image
+    return image
 
 class SpaceShip:
     """
@@ -41,7 +79,7 @@ class SpaceShip:
         self.vx_1 = 0.0
         self.vy_1 = 0.0
 
-        self.original_image = SCALED_SPACESHIP_IMAGE # Base scaled image of the spaceship.
+        self.original_image = get_spaceship_image() # Base scaled image of the spaceship.
         self.image_to_draw = self.original_image    # Current image to draw (potentially rotated).
         self.current_angle = 90.0  # Spaceship's orientation in degrees (90.0 conventionally means facing 'up').
 
@@ -64,7 +102,10 @@ class SpaceShip:
             return
         self.particle_emit_cooldown = self.PARTICLE_EMIT_DELAY
 
-        num_particles_to_emit = random.randint(15, 31)
+        # Each burst draws from its own generator seeded by one effects draw, so the effects stream
+        # (part of replay keyframes) advances identically whatever the quality tier emits.
+        burst_rng = random.Random(rng.effects.getrandbits(32))
+        num_particles_to_emit = max(1, int(burst_rng.randint(15, 31) * GOVERNOR.settings['particle_factor']))
         emit_offset_distance = DESIRED_SIZE[1] / 4.5 # Distance from ship's center to particle emission point.
         emit_direction_rad = math.radians(self.current_angle) # Ship's current facing direction.
 
@@ -74,22 +115,22 @@ class SpaceShip:
         base_emit_y = self.y + emit_offset_distance * math.sin(emit_direction_rad)
 
         for _ in range(num_particles_to_emit):
-            particle_angle_offset = random.uniform(-25, 25) # Introduces a spread to the particle stream.
+            particle_angle_offset = burst_rng.uniform(-25, 25) # Introduces a spread to the particle stream.
             # Particles are emitted in the general direction the ship is facing, with some spread.
             particle_actual_direction_rad = math.radians(self.current_angle + particle_angle_offset)
-            particle_speed = random.uniform(1.5, 3.5)
+            particle_speed = burst_rng.uniform(1.5, 3.5)
             inherit_factor = 0.3 # Factor of ship's current velocity inherited by particles.
 
             particle_vx = (particle_speed * math.cos(particle_actual_direction_rad)) + self.vx_0 * inherit_factor
             particle_vy = (particle_speed * math.sin(particle_actual_direction_rad)) + self.vy_0 * inherit_factor
 
-            lifespan = random.randint(15, 40) # Particle lifespan in frames.
-            size = random.randint(2, 5)       # Particle size in pixels.
-            color_choice = random.choice([(255, 100, 0), (255, 150, 0), (255, 200, 50), (255, 50, 0)]) # Orange/Yellow hues.
+            lifespan = burst_rng.randint(15, 40) # Particle lifespan in frames.
+            size = burst_rng.randint(2, 5)       # Particle size in pixels.
+            color_choice = burst_rng.choice([(255, 100, 0), (255, 150, 0), (255, 200, 50), (255, 50, 0)]) # Orange/Yellow hues.
 
             # Final particle spawn position with a slight random jitter.
-            px = base_emit_x + random.uniform(-5, 5)
-            py = base_emit_y + random.uniform(-5, 5)
+            px = base_emit_x + burst_rng.uniform(-5, 5)
+            py = base_emit_y + burst_rng.uniform(-5, 5)
             self.particles.append({
                 'world_x': px, 'world_y': py, 'vx': particle_vx, 'vy': particle_vy,
                 'lifespan': lifespan, 'max_lifespan': lifespan, # max_lifespan for effects like fading.
@@ -102,18 +143,19 @@ class SpaceShip:
         self.alive = False
         self.is_thrusting = False # Stop thrusting effects.
 
-        for _ in range(SHIP_COLLISION_PARTICLE_COUNT):
-            angle_rad = random.uniform(0, 2 * math.pi) # Particles scatter in all directions.
-            speed = random.uniform(SHIP_COLLISION_PARTICLE_SPEED_RANGE[0], SHIP_COLLISION_PARTICLE_SPEED_RANGE[1])
+        burst_rng = random.Random(rng.effects.getrandbits(32)) # See _emit_particles()
+        for _ in range(max(1, int(SHIP_COLLISION_PARTICLE_COUNT * GOVERNOR.settings['particle_factor']))):
+            angle_rad = burst_rng.uniform(0, 2 * math.pi) # Particles scatter in all directions.
+            speed = burst_rng.uniform(SHIP_COLLISION_PARTICLE_SPEED_RANGE[0], SHIP_COLLISION_PARTICLE_SPEED_RANGE[1])
             particle_vx = math.cos(angle_rad) * speed
             particle_vy = math.sin(angle_rad) * speed
-            lifespan = random.randint(SHIP_COLLISION_PARTICLE_LIFESPAN_RANGE[0], SHIP_COLLISION_PARTICLE_LIFESPAN_RANGE[1])
-            size = random.randint(SHIP_COLLISION_PARTICLE_SIZE_RANGE[0], SHIP_COLLISION_PARTICLE_SIZE_RANGE[1])
-            color_choice = random.choice(SHIP_COLLISION_PARTICLE_COLORS)
+            lifespan = burst_rng.randint(SHIP_COLLISION_PARTICLE_LIFESPAN_RANGE[0], SHIP_COLLISION_PARTICLE_LIFESPAN_RANGE[1])
+            size = burst_rng.randint(SHIP_COLLISION_PARTICLE_SIZE_RANGE[0], SHIP_COLLISION_PARTICLE_SIZE_RANGE[1])
+            color_choice = burst_rng.choice(SHIP_COLLISION_PARTICLE_COLORS)
 
             self.particles.append({
-                'world_x': self.x + random.uniform(-5,5), # Spawn particles around the ship's last position.
-                'world_y': self.y + random.uniform(-5,5),
+                'world_x': self.x + burst_rng.uniform(-5,5), # Spawn particles around the ship's last position.
+                'world_y': self.y + burst_rng.uniform(-5,5),
                 'vx': particle_vx, 'vy': particle_vy,
                 'lifespan': lifespan, 'max_lifespan': lifespan,
                 'color': color_choice, 'size': size, 'type': 'explosion'
@@ -132,8 +174,8 @@ class SpaceShip:
             self.vy_0 += self.vy_1
 
             # Apply friction/drag to gradually slow down the ship.
-            self.vx_0 *= 0.99
-            self.vy_0 *= 0.99
+            self.vx_0 *= SHIP_DRAG
+            self.vy_0 *= SHIP_DRAG
 
             # Update position based on velocity.
             self.x += self.vx_0
@@ -153,50 +195,53 @@ class SpaceShip:
                 new_particles.append(p)
         self.particles = new_particles
 
-    def draw(self, surface, camera_x, camera_y):
-        """Draws the spaceship and its particles onto the given surface, adjusted for camera."""
-        # Draw all active particles.
-        for p in self.particles:
-            # Convert particle world to screen coordinates.
-            screen_px = p['world_x'] - camera_x
-            screen_py = p['world_y'] - camera_y
+    def draw(self, surface, camera_x, camera_y, scale=1.0):
+        """Draws the spaceship and its particles onto the given surface, adjusted for camera and render scale."""
+        self.submit(camera_x, camera_y, scale)
+        RENDER_QUEUE.flush(surface, (LAYER_PARTICLES, LAYER_SHIP))
 
+    def submit(self, camera_x, camera_y, scale=1.0):
+        """Queues the particles and the ship on RENDER_QUEUE; they appear when the caller flushes it."""
+        # Queue all active particles.
+        particles_start = PROFILER.start()
+        for p in self.particles:
             # Particle size may decrease over its lifespan for a fading effect.
-            current_size = int(p['size'] * (p['lifespan'] / p['max_lifespan']))
+            current_size = int(p['size'] * (p['lifespan'] / p['max_lifespan']) * scale)
             if current_size < 1: current_size = 1 # Ensure minimum size of 1 pixel.
-
-            # Basic culling for particles: only draw if on or near the screen.
-            if screen_px + current_size > 0 and screen_px - current_size < SCREEN_WIDTH and \
-               screen_py + current_size > 0 and screen_py - current_size < SCREEN_HEIGHT:
-                pygame.draw.rect(surface, p['color'],
-                                 (int(screen_px - current_size / 2),
-                                  int(screen_py - current_size / 2),
-                                  current_size, current_size))
+            # Convert particle world to screen coordinates (top-left of the particle square).
+            RENDER_QUEUE.submit(LAYER_PARTICLES, get_particle_image(p['color'], current_size),
+                                int((p['world_x'] - camera_x) * scale - current_size / 2),
+                                int((p['world_y'] - camera_y) * scale - current_size / 2))
+        PROFILER.stop(PHASE_PARTICLE_SUBMIT, particles_start)
 
         if self.alive:
+            ship_start = PROFILER.start()
             # Rotate the ship's image based on its current angle.
             # The '- 90' offset is used to align the sprite's visual 'up' (if designed pointing right)
             # or to correct for angle conventions if current_angle = 0 is right.
-            self.image_to_draw = pygame.transform.rotate(self.original_image, self.current_angle - 90)
+            base_image = self.original_image if scale == 1.0 else get_spaceship_image_for_scale(scale)
+            self.image_to_draw = pygame.transform.rotate(base_image, self.current_angle - 90)
 
-            screen_draw_x = self.x - camera_x
-            screen_draw_y = self.y - camera_y
+            screen_draw_x = (self.x - camera_x) * scale
+            screen_draw_y = (self.y - camera_y) * scale
 
             # Update the drawing rectangle's center for accurate blitting post-rotation.
             self.rect = self.image_to_draw.get_rect(center=(screen_draw_x, screen_draw_y))
-            surface.blit(self.image_to_draw, self.rect)
+            RENDER_QUEUE.submit(LAYER_SHIP, self.image_to_draw, self.rect.x, self.rect.y)
+            PROFILER.stop(PHASE_SHIP_SUBMIT, ship_start)
 
-    def get_collider_world(self):
+    def get_collider_world(self, x=None, y=None):
         """
-        Returns a pygame.Rect in world coordinates for collision detection.
-        The collider is intentionally made smaller than the visual sprite for gameplay forgiveness.
+        Returns a pygame.Rect in world coordinates for collision detection, centred on the ship
+        (or on x, y if given). The collider is intentionally made smaller than the visual sprite for gameplay forgiveness.
         """
+        if x is None: x, y = self.x, self.y
         collider_width = DESIRED_SIZE[0] * 0.7 # 70% of the visual width.
         collider_height = DESIRED_SIZE[1] * 0.7# 70% of the visual height.
         # Center the collider rect on ship's world position.
         return pygame.Rect(
-            self.x - collider_width / 2.0,
-            self.y - collider_height / 2.0,
+            x - collider_width / 2.0,
+            y - collider_height / 2.0,
             collider_width,
             collider_height
         )
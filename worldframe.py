@@ -0,0 +1,163 @@
+# worldframe.py
+
+import math
+import numpy as np
+from config import (WORLD_RADIUS, WORLD_CENTER_X, WORLD_CENTER_Y, GARBAGE_SIZE_RANGE, SHIP_MAGNET_RANGE,
+                    BASE_MAGNET_STRENGTH, MIN_GARBAGE_ATTRACTION_SPEED_FACTOR)
+from simulation import find_collected_garbage
+
+class WorldFrame:
+    """
+    The geometry of one tick, computed once and read by every consumer: the suns and planets near the ship as
+    arrays with the vectors and distances from the ship to each, the ship's distance to the world edge, and
+    the garbage as arrays (in the order of the garbage list) with each item's vector and squared distance
+    from the ship. Built after the ship and planets have moved, the same frame serves the next tick's
+    autopilot and Background.update too, since nothing moves in between; invalidate() after anything else
+    moves them (new game, respawn, load).
+    """
+    def __init__(self):
+        self.stale = True
+        self.ship_x = self.ship_y = 0.0
+        self.body_x = self.body_y = self.body_radius = np.zeros(0)
+        self.body_dx = self.body_dy = self.body_dist = np.zeros(0) # From the ship to each body's centre
+        self.center_dist = self.boundary_dist = 0.0 # Ship to the world centre, and to the world edge
+        self.items = [] # Garbage objects, in the order of the arrays below
+        self.garbage_x = self.garbage_y = self.garbage_size = np.zeros(0)
+        self.garbage_dx = self.garbage_dy = self.garbage_dist_sq = np.zeros(0) # From each item to the ship
+        self._moved = np.zeros(0, dtype=np.int64) # Items move_garbage moved, for sync_garbage
+
+    def invalidate(self):
+        """Marks the frame out of date; refresh() rebuilds it before it is read again."""
+        self.stale = True
+
+    def refresh(self, ship, suns, planets_list, garbage_items):
+        """Rebuilds the whole frame for the world as it is, without moving anything."""
+        self.update_bodies(ship, suns, planets_list)
+        self.items = list(garbage_items)
+        count = len(self.items)
+        self.garbage_x = np.fromiter((G_item.world_x for G_item in self.items), dtype=float, count=count)
+        self.garbage_y = np.fromiter((G_item.world_y for G_item in self.items), dtype=float, count=count)
+        self.garbage_size = np.fromiter((G_item.size for G_item in self.items), dtype=float, count=count)
+        self._ship_deltas()
+        self.stale = False
+
+    def update_bodies(self, ship, suns, planets_list):
+        """
+        Body positions (suns, then planets, as CelestialIndex.bodies_near gives them for the ship) and their
+        vectors and distances from the ship, and the ship's distance to the edge.
+        """
+        bodies = list(suns) + list(planets_list)
+        self.body_x = np.array([b['world_pos'][0] for b in bodies], dtype=float)
+        self.body_y = np.array([b['world_pos'][1] for b in bodies], dtype=float)
+        self.body_radius = np.array([b['radius'] for b in bodies], dtype=float)
+        self.ship_x, self.ship_y = ship.x, ship.y
+        self.body_dx = self.body_x - ship.x; self.body_dy = self.body_y - ship.y
+        self.body_dist = np.hypot(self.body_dx, self.body_dy)
+        self.center_dist = math.hypot(ship.x - WORLD_CENTER_X, ship.y - WORLD_CENTER_Y)
+        self.boundary_dist = WORLD_RADIUS - self.center_dist
+
+    def _ship_deltas(self, indices=None):
+        """Recomputes the items' vectors and squared distances to the ship (only for indices, if given)."""
+        if indices is None:
+            self.garbage_dx = self.ship_x - self.garbage_x; self.garbage_dy = self.ship_y - self.garbage_y
+            self.garbage_dist_sq = self.garbage_dx * self.garbage_dx + self.garbage_dy * self.garbage_dy
+            return
+        dx = self.garbage_dx[indices] = self.ship_x - self.garbage_x[indices]
+        dy = self.garbage_dy[indices] = self.ship_y - self.garbage_y[indices]
+        self.garbage_dist_sq[indices] = dx * dx + dy * dy
+
+    def move_garbage(self, garbage_items, dt):
+        """
+        The garbage's part of a tick, as Garbage.update does it for each item but with numpy over all of them:
+        drift, then the magnet's pull towards the ship. Call update_bodies first. Returns the items that
+        moved (the awake items for GarbageCollisions.resolve); call sync_garbage once nothing else moves them.
+        """
+        items = self.items = list(garbage_items)
+        count = len(items)
+        x = np.fromiter((G_item.world_x for G_item in items), dtype=float, count=count)
+        y = np.fromiter((G_item.world_y for G_item in items), dtype=float, count=count)
+        prev_x = np.fromiter((G_item.prev_x for G_item in items), dtype=float, count=count)
+        prev_y = np.fromiter((G_item.prev_y for G_item in items), dtype=float, count=count)
+        for i in np.flatnonzero((prev_x != x) | (prev_y != y)).tolist(): # Moved last tick, or pushed since
+            G_item = items[i]; G_item.prev_x, G_item.prev_y = G_item.world_x, G_item.world_y
+        start_x, start_y = x.copy(), y.copy()
+        vx = np.fromiter((G_item.vx for G_item in items), dtype=float, count=count)
+        vy = np.fromiter((G_item.vy for G_item in items), dtype=float, count=count)
+        drifting = (vx != 0) | (vy != 0)
+        x[drifting] += vx[drifting] * dt; y[drifting] += vy[drifting] * dt
+        self.garbage_x, self.garbage_y = x, y
+        self.garbage_size = np.fromiter((G_item.size for G_item in items), dtype=float, count=count)
+        self._ship_deltas()
+
+        dist_sq = self.garbage_dist_sq
+        pulled = np.flatnonzero((dist_sq < SHIP_MAGNET_RANGE ** 2) & (dist_sq > 1e-6))
+        if len(pulled): # Same arithmetic, in the same order, as Garbage.update
+            size = self.garbage_size[pulled]
+            dist = np.sqrt(dist_sq[pulled])
+            size_range_delta = max(GARBAGE_SIZE_RANGE[1] - GARBAGE_SIZE_RANGE[0], 1e-5)
+            size_factor_normalized = np.clip((GARBAGE_SIZE_RANGE[1] - size) / size_range_delta, 0.0, 1.0)
+            effective_strength_factor = (MIN_GARBAGE_ATTRACTION_SPEED_FACTOR +
+                                         (1.0 - MIN_GARBAGE_ATTRACTION_SPEED_FACTOR) * size_factor_normalized)
+            target_speed_pps = np.minimum((BASE_MAGNET_STRENGTH / (size * (dist + 10.0))) * effective_strength_factor,
+                                          SHIP_MAGNET_RANGE)
+            move_dist_this_frame = target_speed_pps * dt
+            x[pulled] += (self.garbage_dx[pulled] / dist) * move_dist_this_frame
+            y[pulled] += (self.garbage_dy[pulled] / dist) * move_dist_this_frame
+            self._ship_deltas(pulled)
+
+        moved = np.flatnonzero((x != start_x) | (y != start_y))
+        awake = []
+        for i, new_x, new_y in zip(moved.tolist(), x[moved].tolist(), y[moved].tolist()):
+            G_item = items[i]
+            G_item.world_x = new_x; G_item.world_y = new_y
+            G_item.rect.center = (new_x, new_y)
+            awake.append(G_item)
+        self._moved = moved
+        return awake
+
+    def sync_garbage(self, garbage_items):
+        """
+        Catches the arrays up after move_garbage: re-reads the items that moved (GarbageCollisions may have
+        pushed them) and adds items appended to garbage_items since (new debris).
+        """
+        moved = self._moved
+        if len(moved):
+            self.garbage_x[moved] = [self.items[i].world_x for i in moved.tolist()]
+            self.garbage_y[moved] = [self.items[i].world_y for i in moved.tolist()]
+            self._ship_deltas(moved)
+        start = len(self.items)
+        if len(garbage_items) > start:
+            added = garbage_items[start:]
+            self.items.extend(added)
+            self.garbage_x = np.concatenate((self.garbage_x, [G_item.world_x for G_item in added]))
+            self.garbage_y = np.concatenate((self.garbage_y, [G_item.world_y for G_item in added]))
+            self.garbage_size = np.concatenate((self.garbage_size, [G_item.size for G_item in added]))
+            self._ship_deltas()
+        self.stale = False
+
+    def nearest_garbage(self, max_dist):
+        """Index of the item closest to the ship within max_dist (the first of equals), or None."""
+        near = np.flatnonzero(self.garbage_dist_sq < max_dist * max_dist)
+        if not len(near): return None
+        return int(near[np.argmin(self.garbage_dist_sq[near])])
+
+    def collect_garbage(self, ship, garbage_list, ship_start=None, pool=None):
+        """
+        simulation.collect_garbage for the frame's garbage list, testing only the items in magnet range (nothing
+        further away can reach the ship's collider this tick). Keeps the arrays in step; returns the count.
+        """
+        candidates = np.flatnonzero(self.garbage_dist_sq < SHIP_MAGNET_RANGE ** 2).tolist()
+        collected = find_collected_garbage(ship, garbage_list, ship_start, candidates)
+        for i in reversed(collected):
+            G_item = garbage_list.pop(i)
+            if pool is not None: pool.release(G_item)
+        if collected: self.remove_garbage(collected)
+        return len(collected)
+
+    def remove_garbage(self, indices):
+        """Drops the items at indices (sorted) from the arrays, as they were from the garbage list."""
+        for i in reversed(indices): del self.items[i]
+        self.garbage_x = np.delete(self.garbage_x, indices); self.garbage_y = np.delete(self.garbage_y, indices)
+        self.garbage_size = np.delete(self.garbage_size, indices)
+        self.garbage_dx = np.delete(self.garbage_dx, indices); self.garbage_dy = np.delete(self.garbage_dy, indices)
+        self.garbage_dist_sq = np.delete(self.garbage_dist_sq, indices)